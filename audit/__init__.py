@@ -0,0 +1,7 @@
+"""
+Adventure Forge audit toolkit.
+
+Shared building blocks for the Playwright UX/QA audits: device and network
+profiles, async page checks and the parallel matrix runner.
+Run modules from the repository root, e.g. `python -m audit.matrix_runner`.
+"""
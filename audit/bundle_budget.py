@@ -0,0 +1,302 @@
+"""
+Bundle Budget - Adventure Forge
+Checks a production build (`npm run build`) against size budgets and, with
+--measure, times the cold start of the main menu on an emulated network.
+
+Static report, from build/asset-manifest.json:
+
+  initial     JS/CSS the entry point loads before the main menu can render
+  lazy        route and SDK chunks (Game, AdventureSelection, SettingsModal,
+              Google sign-in, animation features) fetched on demand or on idle
+  media       bundled images plus public/music, which must never be initial
+
+Sizes are reported raw and gzipped, with the time the initial payload needs
+on the chosen network profile (latency per request plus bytes / throughput).
+--measure loads the built app N times in fresh browser contexts and records
+when the "new adventure" button becomes interactive and how many script
+bytes were transferred by then. --warm adds a returning-player pass to every
+run: once the service worker (public/sw.js) controls the page, the app is
+reloaded and every request made before the menu is interactive is classified
+as served by the worker or sent to the network. A warm start should need no
+network round trip at all. Writes audit_v2_bundle_report.json and exits with
+1 when a budget is exceeded, so CI can keep the cold start where it is.
+
+Usage:
+    npm run build
+    python -m audit.bundle_budget --build build
+    npx serve -s build -l 3000 &
+    AUDIT_BASE_URL=http://localhost:3000 python -m audit.bundle_budget --measure --runs 5 --network slow-3g
+    AUDIT_BASE_URL=http://localhost:3000 python -m audit.bundle_budget --measure --warm --runs 3
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+from audit.profiles import BASE_URL, DEVICES, NETWORK_PROFILES, context_options, network_conditions
+from audit.stats import summarize
+
+DEFAULT_REPORT = "audit_v2_bundle_report.json"
+MENU_READY = '[data-testid="new-adventure-btn"]:not([disabled])'
+_SW_CONTROLLING_JS = "() => !!navigator.serviceWorker && !!navigator.serviceWorker.controller"
+
+# Gzipped KB. Starting points that fit the split build; tighten them as the numbers settle.
+DEFAULT_BUDGETS = {
+    "initial_js_kb": 170,
+    "initial_css_kb": 25,
+    "lazy_chunk_kb": 250,
+}
+
+_MENU_TIMING_JS = """() => ({
+    interactive_ms: performance.now(),
+    script_bytes: performance.getEntriesByType('resource')
+        .filter(r => r.initiatorType === 'script' || r.name.endsWith('.js'))
+        .reduce((sum, r) => sum + (r.transferSize || 0), 0),
+    scripts: performance.getEntriesByType('resource').filter(r => r.name.endsWith('.js')).length,
+})"""
+
+
+def file_sizes(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    return {"bytes": len(data), "gzip_bytes": len(gzip.compress(data, compresslevel=9))}
+
+
+def asset_kind(name):
+    if name.endswith(".js"):
+        return "js"
+    if name.endswith(".css"):
+        return "css"
+    return "media"
+
+
+def collect_assets(build_dir):
+    """Every emitted asset with its sizes, flagged initial when the entry point loads it."""
+    with open(os.path.join(build_dir, "asset-manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    initial = {name.lstrip("/") for name in manifest.get("entrypoints", [])}
+    assets = []
+    for key, url in manifest.get("files", {}).items():
+        rel = url.split("/", 1)[-1] if url.startswith("/") else url
+        # The manifest's URLs carry the homepage prefix; keep the part under build/
+        rel = rel[rel.index("static/"):] if "static/" in rel else rel
+        path = os.path.join(build_dir, rel)
+        if key.endswith(".map") or not os.path.isfile(path) or rel.endswith((".html", ".txt")):
+            continue
+        assets.append({"name": rel, "kind": asset_kind(rel), "initial": rel in initial, **file_sizes(path)})
+    music_dir = os.path.join(build_dir, "music")
+    if os.path.isdir(music_dir):
+        for name in sorted(os.listdir(music_dir)):
+            size = os.path.getsize(os.path.join(music_dir, name))
+            # Already compressed audio: gzip would not change it
+            assets.append({"name": f"music/{name}", "kind": "media", "initial": False, "bytes": size, "gzip_bytes": size})
+    return sorted(assets, key=lambda a: -a["gzip_bytes"])
+
+
+def transfer_ms(gzip_bytes, requests, network_id):
+    """Rough download time: one round trip per request plus the bytes at the profile's throughput."""
+    profile = NETWORK_PROFILES[network_id]
+    if not profile["download_kbps"]:
+        return 0
+    return round(requests * profile["latency"] + gzip_bytes * 8 / profile["download_kbps"], 0)
+
+
+def static_report(build_dir, network_id, budgets):
+    assets = collect_assets(build_dir)
+    initial = [a for a in assets if a["initial"]]
+    lazy = [a for a in assets if not a["initial"] and a["kind"] == "js"]
+    kb = lambda items, kind: round(sum(a["gzip_bytes"] for a in items if a["kind"] == kind) / 1024, 1)
+    report = {
+        "initial": {
+            "js_gzip_kb": kb(initial, "js"),
+            "css_gzip_kb": kb(initial, "css"),
+            "files": [a["name"] for a in initial],
+            "transfer_ms": transfer_ms(sum(a["gzip_bytes"] for a in initial), len(initial), network_id),
+        },
+        "lazy_chunks": [{"name": a["name"], "gzip_kb": round(a["gzip_bytes"] / 1024, 1)} for a in lazy],
+        "media": [{"name": a["name"], "kb": round(a["bytes"] / 1024, 1)} for a in assets if a["kind"] == "media"],
+        "assets": assets,
+    }
+    violations = []
+    if report["initial"]["js_gzip_kb"] > budgets["initial_js_kb"]:
+        violations.append(f"initial JS {report['initial']['js_gzip_kb']} KB > {budgets['initial_js_kb']} KB")
+    if report["initial"]["css_gzip_kb"] > budgets["initial_css_kb"]:
+        violations.append(f"initial CSS {report['initial']['css_gzip_kb']} KB > {budgets['initial_css_kb']} KB")
+    for chunk in report["lazy_chunks"]:
+        if chunk["gzip_kb"] > budgets["lazy_chunk_kb"]:
+            violations.append(f"chunk {chunk['name']} {chunk['gzip_kb']} KB > {budgets['lazy_chunk_kb']} KB")
+    for asset in initial:
+        if asset["kind"] == "media":
+            violations.append(f"media {asset['name']} is loaded by the entry point")
+    return report, violations
+
+
+async def load_menu(page, url, reload=False):
+    """Navigate (or reload) and wait until the main menu is interactive; returns its timing sample."""
+    if reload:
+        await page.reload(wait_until="commit")
+    else:
+        await page.goto(url, wait_until="commit")
+    await page.wait_for_selector(MENU_READY, state="visible", timeout=120000)
+    return await page.evaluate(_MENU_TIMING_JS)
+
+
+async def warm_start(page, context, url):
+    """Reload once the service worker controls the page; split the requests made before the menu was ready."""
+    await page.wait_for_function(_SW_CONTROLLING_JS, timeout=120000)
+    # Let the worker finish precaching the build before measuring
+    await page.evaluate("() => navigator.serviceWorker.ready.then(() => true)")
+    await page.wait_for_timeout(1000)
+    requests = []
+    menu_ready = {"done": False}
+
+    def on_finished(request):
+        if not menu_ready["done"]:
+            requests.append(request)
+
+    context.on("requestfinished", on_finished)
+    sample = await load_menu(page, url, reload=True)
+    menu_ready["done"] = True
+    context.remove_listener("requestfinished", on_finished)
+
+    from_worker, network, background = [], [], []
+    for request in requests:
+        if request.service_worker is not None:
+            background.append(request.url)  # revalidation issued by the worker itself
+            continue
+        response = await request.response()
+        (from_worker if response is not None and response.from_service_worker else network).append(request.url)
+    sample.update(from_service_worker=len(from_worker), network_requests=len(network),
+                  network_urls=network[:20], background_revalidations=len(background))
+    return sample
+
+
+async def measure_start(url, device_id, network_id, runs, warm=False):
+    from playwright.async_api import async_playwright
+
+    cold, warmed = [], []
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            for run in range(1, runs + 1):
+                context = await browser.new_context(**context_options(p, device_id), service_workers="allow")
+                page = await context.new_page()
+                cdp = await context.new_cdp_session(page)
+                await cdp.send("Network.emulateNetworkConditions", network_conditions(network_id))
+                try:
+                    sample = await load_menu(page, url)
+                    cold.append(sample)
+                    print(f"[BUNDLE] run {run}/{runs}: menu interactive at {sample['interactive_ms'] / 1000:.1f}s, "
+                          f"{sample['script_bytes'] / 1024:.0f} KB of scripts ({sample['scripts']} files)")
+                    if warm:
+                        sample = await warm_start(page, context, url)
+                        warmed.append(sample)
+                        print(f"[BUNDLE] run {run}/{runs} warm: menu interactive at {sample['interactive_ms'] / 1000:.1f}s, "
+                              f"{sample['from_service_worker']} requests from the service worker, "
+                              f"{sample['network_requests']} to the network")
+                except Exception as e:
+                    print(f"[BUNDLE] run {run}/{runs}: main menu never became interactive ({str(e)[:80]})")
+                finally:
+                    await context.close()
+        finally:
+            await browser.close()
+    return cold, warmed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--build", default="build", help="Directory produced by `npm run build`")
+    parser.add_argument("--network", default="slow-3g", choices=list(NETWORK_PROFILES))
+    parser.add_argument("--device", default="pixel-5", choices=list(DEVICES))
+    parser.add_argument("--measure", action="store_true", help="Also time the main menu cold start in a browser")
+    parser.add_argument("--warm", action="store_true", help="With --measure: also time a service-worker warm start per run")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--out", default=DEFAULT_REPORT)
+    parser.add_argument("--max-initial-js-kb", type=float, default=DEFAULT_BUDGETS["initial_js_kb"])
+    parser.add_argument("--max-initial-css-kb", type=float, default=DEFAULT_BUDGETS["initial_css_kb"])
+    parser.add_argument("--max-chunk-kb", type=float, default=DEFAULT_BUDGETS["lazy_chunk_kb"])
+    parser.add_argument("--max-menu-ms", type=float, default=None, help="Fail when the measured p50 cold start is slower")
+    parser.add_argument("--max-warm-network", type=int, default=0,
+                        help="Fail when a warm start sends more requests than this to the network before the menu (default 0)")
+    args = parser.parse_args()
+
+    budgets = {
+        "initial_js_kb": args.max_initial_js_kb,
+        "initial_css_kb": args.max_initial_css_kb,
+        "lazy_chunk_kb": args.max_chunk_kb,
+    }
+    report = {
+        "audit_version": "v2-bundle",
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "network": NETWORK_PROFILES[args.network]["label"],
+        "budgets": budgets,
+    }
+    violations = []
+    if os.path.isfile(os.path.join(args.build, "asset-manifest.json")):
+        report["bundle"], violations = static_report(args.build, args.network, budgets)
+    elif not args.measure:
+        print(f"[BUNDLE] No asset-manifest.json in {args.build}; run `npm run build` first")
+        return 1
+
+    if args.measure:
+        samples, warm = asyncio.run(measure_start(args.url, args.device, args.network, args.runs, args.warm))
+        report["cold_start"] = {
+            "url": args.url,
+            "device": DEVICES[args.device]["label"],
+            "runs": args.runs,
+            "completed": len(samples),
+            "menu_interactive_ms": summarize([s["interactive_ms"] for s in samples]) if samples else None,
+            "script_kb": summarize([s["script_bytes"] / 1024 for s in samples]) if samples else None,
+        }
+        if len(samples) < args.runs:
+            violations.append(f"main menu not interactive in {args.runs - len(samples)} run(s)")
+        menu = report["cold_start"]["menu_interactive_ms"]
+        if menu and args.max_menu_ms is not None and menu["p50"] > args.max_menu_ms:
+            violations.append(f"menu interactive p50 {menu['p50']:.0f} ms > {args.max_menu_ms:.0f} ms")
+        if args.warm:
+            report["warm_start"] = {
+                "completed": len(warm),
+                "menu_interactive_ms": summarize([s["interactive_ms"] for s in warm]) if warm else None,
+                "network_requests": [s["network_requests"] for s in warm],
+                "from_service_worker": [s["from_service_worker"] for s in warm],
+                "samples": warm,
+            }
+            if len(warm) < args.runs:
+                violations.append(f"warm start did not complete in {args.runs - len(warm)} run(s)")
+            worst = max((s["network_requests"] for s in warm), default=0)
+            if worst > args.max_warm_network:
+                violations.append(f"warm start sent {worst} request(s) to the network before the menu "
+                                  f"(allowed {args.max_warm_network})")
+
+    report["violations"] = violations
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"\nBundle report saved: {args.out}")
+    bundle = report.get("bundle")
+    if bundle:
+        initial = bundle["initial"]
+        print(f"  initial  JS {initial['js_gzip_kb']} KB + CSS {initial['css_gzip_kb']} KB gzip "
+              f"({len(initial['files'])} files, ~{initial['transfer_ms'] / 1000:.1f}s on {args.network})")
+        for chunk in bundle["lazy_chunks"][:8]:
+            print(f"  lazy     {chunk['gzip_kb']:>7.1f} KB  {chunk['name']}")
+    menu = report.get("cold_start", {}).get("menu_interactive_ms")
+    if menu:
+        print(f"  cold start: menu interactive p50 {menu['p50'] / 1000:.1f}s / p95 {menu['p95'] / 1000:.1f}s")
+    warm_menu = report.get("warm_start", {}).get("menu_interactive_ms")
+    if warm_menu:
+        print(f"  warm start: menu interactive p50 {warm_menu['p50'] / 1000:.1f}s, "
+              f"network requests per start {report['warm_start']['network_requests']}")
+
+    for violation in violations:
+        print(f"[REGRESSION] {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+Async page checks used by the matrix runner.
+Same rules as the helpers in iuqa_deep_audit_20260219.py, ported to
+playwright.async_api so several contexts can be audited concurrently.
+"""
+import os
+import time
+
+from audit.dom_audit import INTERACTIVE_SELECTOR, SNAPSHOT_JS, print_summary, run_rules
+from audit.visual_diff import MASK_RECTS_JS, MASK_SELECTORS, write_sidecar
+
+LOADER_SELECTOR = '[class*="spinner"], [class*="skeleton"], [class*="loading"], [role="progressbar"], [aria-busy="true"]'
+
+
+async def capture(page, out_dir, prefix, name, note="", full_page=False, visual=None):
+    """Screenshot; with `visual` ({"device", "locale"}) also the sidecar audit/visual_diff.py compares it by."""
+    path = os.path.join(out_dir, f"{prefix}_{name}.png")
+    masks = await page.evaluate(MASK_RECTS_JS, [MASK_SELECTORS, full_page]) if visual else None
+    await page.screenshot(path=path, full_page=full_page)
+    if visual:
+        write_sidecar(path, name, visual["device"], visual["locale"], masks)
+    print(f"[SCREENSHOT] {path} — {note}")
+    return path
+
+
+async def audit_screen(page, context_label, rules=None):
+    """Hit areas, 0x0 focusables, text overflow and WCAG contrast from one page.evaluate (audit/dom_audit.py)."""
+    started = time.perf_counter()
+    raw = await page.evaluate(SNAPSHOT_JS, INTERACTIVE_SELECTOR)
+    roundtrip_ms = (time.perf_counter() - started) * 1000
+    result = run_rules(raw, context_label, rules)
+    result["roundtrip_ms"] = round(roundtrip_ms, 1)
+    print_summary(result, roundtrip_ms)
+    return result
+
+
+async def check_loading_states(page, context_label):
+    """Check for spinner/skeleton presence."""
+    spinners = await page.query_selector_all(LOADER_SELECTOR)
+    print(f"[LOADING-STATE] {context_label}: {len(spinners)} loader elements visible")
+    return len(spinners)
+
+
+def click_depth_finding(steps):
+    """Finding for the total steps needed to reach the game."""
+    return {
+        "id": "UX-CD-001",
+        "severity": "P2" if steps <= 4 else "P1",
+        "type": "UX",
+        "title": f"Click depth to gameplay: {steps} steps",
+        "detail": f"User needs {steps} interactions to reach active gameplay. Recommended: ≤3 for mobile.",
+        "screen": "Full Flow"
+    }
@@ -0,0 +1,231 @@
+"""
+Conversation Context Benchmark - Adventure Forge
+Plays one long adventure (default 100 turns) per context mode against the
+stand-in API and records, per turn, how big the /game/stream request was and
+how long the first event took:
+
+  windowed  the intro prompt, the last REACT_APP_CONTEXT_TURNS turns verbatim
+            and a summary of the older ones (src/common/services/ConversationContext.ts)
+  full      the whole gameHistory on every request (localStorage
+            adventure_forge_context=full), as before
+
+The stand-in charges `latency.connect.per_kb_ms` for every KB of request
+body, standing in for prompt processing, so time to first event follows the
+request size the way it does with a real model. The report has the per-turn
+series, the growth per turn (least-squares slope) of bytes and time to first
+event, and early vs late turn percentiles, and goes to
+audit_v2_context_report.json; --csv also writes the series for plotting.
+Speculative turns are switched off so every request is a real choice.
+
+Usage:
+    npm run standin -- --profile default &
+    REACT_APP_API_URL=http://localhost:3001 npm start &
+    AUDIT_BASE_URL=http://localhost:3000 python -m audit.context_bench --turns 100 --csv context.csv
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+from playwright.async_api import async_playwright
+
+from audit.memory_bench import OPTION_BUTTON, click_through_turn
+from audit.profiles import BASE_URL, DEVICES, NETWORK_PROFILES, context_options, network_conditions
+from audit.readiness import AsyncReadiness, install_stream_probe
+from audit.stats import linear_slope, summarize
+
+DEFAULT_REPORT = "audit_v2_context_report.json"
+MODES = ("windowed", "full")
+SIZE_BUCKETS_KB = [1, 4, 16, 64, 256, 1024]
+# Early / late turn windows compared in the summary
+EDGE_TURNS = 10
+
+
+def mode_init_js(mode):
+    return f"""
+localStorage.setItem('adventure_forge_context', '{'full' if mode == 'full' else 'windowed'}');
+localStorage.setItem('adventure_forge_speculative_turns', 'false');
+"""
+
+
+_REQUEST_MARK_JS = """(since) => {
+    const perf = window.__afPerf;
+    if (!perf) return null;
+    const request = perf.entries(since, 'stream.request').pop();
+    const first = perf.entries(since, 'stream.first_event').pop();
+    return { request: request ? request.data : null, firstEventMs: first ? first.ms : null, seq: perf.lastSeq };
+}"""
+
+
+async def run_mode(p, mode, device_id, network_id, turns, base_url):
+    results = []
+    bodies = []
+
+    def on_request(request):
+        if request.method == "POST" and request.url.endswith("/game/stream"):
+            bodies.append(len(request.post_data_buffer or b""))
+
+    browser = await p.chromium.launch(headless=True)
+    context = await browser.new_context(**context_options(p, device_id))
+    await install_stream_probe(context)
+    await context.add_init_script(script=mode_init_js(mode))
+    page = await context.new_page()
+    page.on("request", on_request)
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Network.emulateNetworkConditions", network_conditions(network_id))
+    ready = AsyncReadiness(page)
+    try:
+        await page.goto(base_url)
+        await ready.test_id("new-adventure-btn", "main menu", probe="app_shell")
+        await page.click('[data-testid="new-adventure-btn"]')
+        await ready.test_id("start-adventure-btn", "adventure selection")
+        since = 0
+        mark = await ready.stream_mark()
+        await page.click('[data-testid="start-adventure-btn"]')
+
+        for turn in range(1, turns + 1):
+            if not await ready.stream_event("done", since=mark, timeout_ms=120000):
+                print(f"[CONTEXT] {mode} turn {turn}: stream never finished, stopping")
+                break
+            timing = await page.evaluate(_REQUEST_MARK_JS, since) or {"request": None, "firstEventMs": None, "seq": since}
+            since = timing["seq"]
+            request = timing["request"] or {}
+            results.append({
+                "turn": turn,
+                "request_bytes": bodies[0] if bodies else None,  # Resumed connections add more; the first is the turn
+                "history_bytes": request.get("historyBytes"),
+                "folded_turns": request.get("folded"),
+                "first_event_ms": timing["firstEventMs"],
+            })
+            if turn % 10 == 0 or turn == 1:
+                r = results[-1]
+                print(f"[CONTEXT] {mode} turn {turn}/{turns}: request {(r['request_bytes'] or 0) / 1024:.1f} KB, "
+                      f"first event {r['first_event_ms'] or 0:.0f} ms, {r['folded_turns'] or 0} turns folded")
+            if turn == turns:
+                break
+            if not await click_through_turn(page, ready):
+                print(f"[CONTEXT] {mode} turn {turn}: options never became clickable, stopping")
+                break
+            bodies.clear()
+            mark = await ready.stream_mark()
+            await page.click(OPTION_BUTTON)
+    finally:
+        await context.close()
+        await browser.close()
+    return results, ready.log.summary()
+
+
+def summarize_mode(turns):
+    if not turns:
+        return {"turns": 0}
+    numbers = [t["turn"] for t in turns]
+    sizes = [t["request_bytes"] for t in turns]
+    first_event = [t["first_event_ms"] for t in turns]
+    bytes_slope = linear_slope(numbers, sizes)
+    ms_slope = linear_slope(numbers, first_event)
+    return {
+        "turns": len(turns),
+        "request_bytes_first": sizes[0],
+        "request_bytes_last": sizes[-1],
+        "request_bytes_total": sum(s for s in sizes if s),
+        "request_bytes_growth_per_turn": round(bytes_slope) if bytes_slope is not None else None,
+        "first_event_ms_growth_per_turn": round(ms_slope, 2) if ms_slope is not None else None,
+        "request_kb": summarize([s / 1024 for s in sizes if s is not None], edges=SIZE_BUCKETS_KB),
+        "first_event_ms_early": summarize(first_event[:EDGE_TURNS]),
+        "first_event_ms_late": summarize(first_event[-EDGE_TURNS:]),
+    }
+
+
+def text_chart(turns, key, scale, unit, width=40):
+    """One bar per 10 turns, for a quick look at the growth in the console."""
+    rows = [t for t in turns if t["turn"] == 1 or t["turn"] % 10 == 0]
+    peak = max((t[key] or 0 for t in rows), default=0) or 1
+    return [f"    turn {t['turn']:>4} {'#' * max(1, round((t[key] or 0) / peak * width)):<{width}} {(t[key] or 0) / scale:.1f} {unit}"
+            for t in rows]
+
+
+async def run_benchmark(modes, device_id, network_id, turns, base_url):
+    results = {}
+    async with async_playwright() as p:
+        for mode in modes:
+            series, readiness = await run_mode(p, mode, device_id, network_id, turns, base_url)
+            results[mode] = {"summary": summarize_mode(series), "turns": series, "readiness": readiness}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma-separated subset of {', '.join(MODES)}")
+    parser.add_argument("--device", default="desktop-1440", choices=list(DEVICES))
+    parser.add_argument("--network", default="wifi", choices=list(NETWORK_PROFILES))
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--out", default=DEFAULT_REPORT)
+    parser.add_argument("--csv", default=None, help="Also write the per-turn series (mode, turn, bytes, first event) as CSV")
+    parser.add_argument("--max-request-kb", type=float, default=None,
+                        help="Fail when a windowed request is larger than this")
+    args = parser.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)}")
+
+    results = asyncio.run(run_benchmark(modes, args.device, args.network, args.turns, args.url))
+    report = {
+        "audit_version": "v2-context",
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": args.url,
+        "device": DEVICES[args.device]["label"],
+        "network": NETWORK_PROFILES[args.network]["label"],
+        "turns_requested": args.turns,
+        "modes": results,
+    }
+    windowed = results.get("windowed", {}).get("summary", {})
+    full = results.get("full", {}).get("summary", {})
+    if windowed.get("turns") and full.get("turns") and full["request_bytes_total"]:
+        report["windowed_vs_full"] = {
+            "total_bytes_ratio": round(windowed["request_bytes_total"] / full["request_bytes_total"], 4),
+            "late_first_event_p50_ratio": round(windowed["first_event_ms_late"]["p50"] / full["first_event_ms_late"]["p50"], 3)
+            if full["first_event_ms_late"].get("p50") else None,
+        }
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["mode", "turn", "request_bytes", "history_bytes", "folded_turns", "first_event_ms"])
+            for mode, result in results.items():
+                for t in result["turns"]:
+                    writer.writerow([mode, t["turn"], t["request_bytes"], t["history_bytes"], t["folded_turns"], t["first_event_ms"]])
+
+    print(f"\nContext report saved: {args.out}")
+    for mode, result in results.items():
+        s = result["summary"]
+        if not s.get("turns"):
+            print(f"  {mode:<8} no turns completed")
+            continue
+        print(f"  {mode:<8} {s['turns']} turns, request {s['request_bytes_first'] / 1024:.1f} -> {s['request_bytes_last'] / 1024:.1f} KB "
+              f"({(s['request_bytes_growth_per_turn'] or 0) / 1024:+.2f} KB/turn), first event p50 "
+              f"{s['first_event_ms_early'].get('p50', 0):.0f} ms early / {s['first_event_ms_late'].get('p50', 0):.0f} ms late")
+        print("\n".join(text_chart(result["turns"], "request_bytes", 1024, "KB")))
+    if "windowed_vs_full" in report:
+        print(f"  windowed sends {report['windowed_vs_full']['total_bytes_ratio'] * 100:.1f}% of the full-history bytes")
+
+    if any(result["summary"].get("turns", 0) < args.turns for result in results.values()):
+        print("[CONTEXT] Not every mode completed all turns")
+        return 1
+    if args.max_request_kb is not None:
+        worst = max((t["request_bytes"] or 0 for t in results.get("windowed", {}).get("turns", [])), default=0)
+        if worst > args.max_request_kb * 1024:
+            print(f"[REGRESSION] A windowed request sent {worst / 1024:.1f} KB (budget {args.max_request_kb:.0f} KB)")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
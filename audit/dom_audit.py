@@ -0,0 +1,320 @@
+"""
+DOM Audit Engine - Adventure Forge
+Audits a screen in one round trip: a single page.evaluate collects geometry,
+computed style and the background layers behind the text of every relevant
+element (interactive controls, text-bearing elements, overflow candidates)
+as flat columns, and the rules run in Python on NumPy arrays of that
+snapshot:
+
+  touch_target        visible interactive elements smaller than 44x44 px
+  hidden_interactive  keyboard-focusable interactive elements laid out at 0x0
+  text_overflow       text containers whose content is larger than their box
+  contrast            WCAG 2.x contrast ratio of text against its composited
+                      background (4.5:1, or 3:1 for large text); text over
+                      background images or gradients is counted as unknown
+
+Used by the deep audit and the matrix runner (audit_screen in audit/checks.py);
+the cost per screen is one evaluate however many elements there are.
+
+Usage:
+    python -m audit.dom_audit --url http://localhost:3000 --device iphone-13
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+INTERACTIVE_SELECTOR = 'button, a, [role="button"], input[type="checkbox"], input[type="radio"]'
+MIN_TARGET_PX = 44
+OVERFLOW_TOLERANCE_PX = 2
+CONTRAST_MIN = 4.5
+CONTRAST_MIN_LARGE = 3.0
+
+# Element flags set by SNAPSHOT_JS
+INTERACTIVE, TEXT, OVERFLOW_CANDIDATE, VISIBLE, BACKGROUND_IMAGE, FOCUSABLE = 1, 2, 4, 8, 16, 32
+
+SNAPSHOT_JS = r"""
+(interactiveSelector) => {
+    const started = performance.now();
+    const OVERFLOW_TAGS = new Set(['P', 'H1', 'H2', 'H3', 'SPAN', 'BUTTON', 'A']);
+    const SKIP_TAGS = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE', 'svg', 'path']);
+    const out = {
+        tag: [], text: [], flags: [], rect: [], scroll: [], color: [], font: [], opacity: [],
+        bgOffsets: [0], bgLayers: [], viewport: [innerWidth, innerHeight, devicePixelRatio],
+    };
+    const styles = new Map();
+    const styleOf = el => {
+        let style = styles.get(el);
+        if (!style) styles.set(el, style = getComputedStyle(el));
+        return style;
+    };
+    const rgba = value => {
+        const m = value && value.match(/rgba?\(([^)]+)\)/);
+        if (!m) return [NaN, NaN, NaN, NaN];
+        const p = m[1].split(/[\s,\/]+/).filter(Boolean).map(parseFloat);
+        return [p[0], p[1], p[2], p.length > 3 ? p[3] : 1];
+    };
+    // Background layers from the element outwards, up to the first opaque one (memoized per ancestor)
+    const chains = new Map();
+    const chainOf = el => {
+        if (!el || el.nodeType !== 1) return { layers: [], image: false, opacity: 1 };
+        let chain = chains.get(el);
+        if (chain) return chain;
+        const style = styleOf(el);
+        const own = rgba(style.backgroundColor);
+        const image = style.backgroundImage !== 'none';
+        const opacity = parseFloat(style.opacity);
+        if (own[3] >= 1) {
+            const parent = chainOf(el.parentElement);
+            chain = { layers: own, image, opacity: opacity * parent.opacity };
+        } else {
+            const parent = chainOf(el.parentElement);
+            chain = {
+                layers: own[3] > 0 ? own.concat(parent.layers) : parent.layers,
+                image: image || parent.image,
+                opacity: opacity * parent.opacity,
+            };
+        }
+        chains.set(el, chain);
+        return chain;
+    };
+
+    for (const el of document.body.querySelectorAll('*')) {
+        if (SKIP_TAGS.has(el.tagName)) continue;
+        const interactive = el.matches(interactiveSelector);
+        let ownText = '';
+        for (const node of el.childNodes) {
+            if (node.nodeType === 3) ownText += node.nodeValue;
+        }
+        ownText = ownText.trim();
+        const overflowCandidate = OVERFLOW_TAGS.has(el.tagName);
+        if (!interactive && !ownText && !overflowCandidate) continue;
+
+        const style = styleOf(el);
+        if (style.display === 'none') continue;
+        const rect = el.getBoundingClientRect();
+        const chain = chainOf(el);
+        const visible = style.visibility !== 'hidden' && chain.opacity > 0;
+        const focusable = el.tabIndex >= 0 && !el.disabled && el.getAttribute('aria-hidden') !== 'true';
+        out.tag.push(el.tagName);
+        out.text.push((interactive ? (el.innerText || el.getAttribute('aria-label') || '') : ownText).trim().substring(0, 40));
+        out.flags.push((interactive ? 1 : 0) | (ownText ? 2 : 0) | (overflowCandidate ? 4 : 0) | (visible ? 8 : 0)
+            | (chain.image ? 16 : 0) | (focusable ? 32 : 0));
+        out.rect.push(rect.x, rect.y, rect.width, rect.height);
+        out.scroll.push(el.scrollWidth, el.scrollHeight, el.clientWidth, el.clientHeight);
+        out.color.push(...rgba(style.color));
+        out.font.push(parseFloat(style.fontSize) || 16, parseFloat(style.fontWeight) || 400);
+        out.opacity.push(chain.opacity);
+        if (ownText) out.bgLayers.push(...chain.layers);
+        out.bgOffsets.push(out.bgLayers.length / 4);
+    }
+    out.collectMs = performance.now() - started;
+    return out;
+}
+"""
+
+
+class DomSnapshot:
+    """Columns of one SNAPSHOT_JS result as NumPy arrays (one row per element)."""
+
+    def __init__(self, raw):
+        self.tags = raw["tag"]
+        self.texts = raw["text"]
+        self.count = len(self.tags)
+        self.flags = np.asarray(raw["flags"], dtype=np.int32)
+        self.rect = np.asarray(raw["rect"], dtype=float).reshape(-1, 4)
+        self.scroll = np.asarray(raw["scroll"], dtype=float).reshape(-1, 4)
+        self.color = np.asarray(raw["color"], dtype=float).reshape(-1, 4)
+        self.font = np.asarray(raw["font"], dtype=float).reshape(-1, 2)
+        self.opacity = np.asarray(raw["opacity"], dtype=float)
+        self.bg_offsets = np.asarray(raw["bgOffsets"], dtype=np.int64)
+        self.bg_layers = np.asarray(raw["bgLayers"], dtype=float).reshape(-1, 4)
+        self.collect_ms = raw.get("collectMs")
+
+    def has(self, flag):
+        return (self.flags & flag) != 0
+
+    @property
+    def width(self):
+        return self.rect[:, 2]
+
+    @property
+    def height(self):
+        return self.rect[:, 3]
+
+    def backgrounds(self, base=(255.0, 255.0, 255.0)):
+        """Effective RGB behind each element: its layers composited outermost first over `base` (the canvas)."""
+        lengths = np.diff(self.bg_offsets)
+        depth = int(lengths.max()) if self.count else 0
+        result = np.tile(np.asarray(base, dtype=float), (self.count, 1))
+        for level in range(depth - 1, -1, -1):
+            has_layer = lengths > level
+            layer = self.bg_layers[self.bg_offsets[:-1][has_layer] + level]
+            alpha = np.nan_to_num(layer[:, 3:4])
+            result[has_layer] = np.nan_to_num(layer[:, :3]) * alpha + result[has_layer] * (1 - alpha)
+        return result
+
+
+def relative_luminance(rgb):
+    """WCAG relative luminance of sRGB rows (0-255)."""
+    c = np.asarray(rgb, dtype=float) / 255.0
+    linear = np.where(c <= 0.03928, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def contrast_ratio(foreground, background):
+    a, b = relative_luminance(foreground), relative_luminance(background)
+    return (np.maximum(a, b) + 0.05) / (np.minimum(a, b) + 0.05)
+
+
+def _css(rgb):
+    return "rgb({:.0f}, {:.0f}, {:.0f})".format(*rgb)
+
+
+def _label(snapshot, i):
+    return snapshot.texts[i] or "[icon/no-text]"
+
+
+# --- Rules: (snapshot, context_label) -> list of issues ---------------------
+
+def rule_touch_target(snapshot, context_label):
+    w, h = snapshot.width, snapshot.height
+    mask = snapshot.has(INTERACTIVE) & snapshot.has(VISIBLE) & (w > 0) & (h > 0) & ((w < MIN_TARGET_PX) | (h < MIN_TARGET_PX))
+    return [{
+        "context": context_label,
+        "element": _label(snapshot, i),
+        "size": f"{w[i]:.0f}x{h[i]:.0f}px",
+        "issue": f"BELOW {MIN_TARGET_PX}px",
+    } for i in np.flatnonzero(mask)]
+
+
+def rule_hidden_interactive(snapshot, context_label):
+    w, h = snapshot.width, snapshot.height
+    mask = snapshot.has(INTERACTIVE) & snapshot.has(FOCUSABLE) & snapshot.has(VISIBLE) & ((w == 0) | (h == 0))
+    return [{
+        "context": context_label,
+        "element": _label(snapshot, i),
+        "tag": snapshot.tags[i],
+        "size": f"{w[i]:.0f}x{h[i]:.0f}px",
+        "issue": "FOCUSABLE BUT 0x0",
+    } for i in np.flatnonzero(mask)]
+
+
+def rule_text_overflow(snapshot, context_label):
+    sw, sh, cw, ch = snapshot.scroll.T
+    mask = snapshot.has(OVERFLOW_CANDIDATE) & ((sw > cw + OVERFLOW_TOLERANCE_PX) | (sh > ch + OVERFLOW_TOLERANCE_PX))
+    return [{
+        "context": context_label,
+        "tag": snapshot.tags[i],
+        "text": snapshot.texts[i],
+        "scrollW": int(sw[i]), "clientW": int(cw[i]),
+        "scrollH": int(sh[i]), "clientH": int(ch[i]),
+    } for i in np.flatnonzero(mask)]
+
+
+def _contrast_rows(snapshot):
+    """(rendered text, text whose background can be computed) masks; images and gradients are not."""
+    text = snapshot.has(TEXT) & snapshot.has(VISIBLE) & (snapshot.width > 0) & (snapshot.height > 0)
+    return text, text & ~snapshot.has(BACKGROUND_IMAGE) & ~np.isnan(snapshot.color).any(axis=1)
+
+
+def rule_contrast(snapshot, context_label):
+    """Text below the WCAG AA ratio, worst first."""
+    text, known = _contrast_rows(snapshot)
+    background = snapshot.backgrounds()
+    # Text colour alpha and inherited opacity blend the glyphs into the background
+    alpha = (np.nan_to_num(snapshot.color[:, 3]) * snapshot.opacity)[:, None]
+    foreground = np.nan_to_num(snapshot.color[:, :3]) * alpha + background * (1 - alpha)
+    ratio = contrast_ratio(foreground, background)
+    size, weight = snapshot.font.T
+    large = (size >= 24) | ((size >= 18.66) & (weight >= 700))
+    required = np.where(large, CONTRAST_MIN_LARGE, CONTRAST_MIN)
+    failing = np.flatnonzero(known & (ratio < required))
+    issues = [{
+        "context": context_label,
+        "text": snapshot.texts[i],
+        "color": _css(foreground[i]),
+        "bg": _css(background[i]),
+        "ratio": round(float(ratio[i]), 2),
+        "required": float(required[i]),
+    } for i in failing[np.argsort(ratio[failing])]]
+    return issues
+
+
+RULES = {
+    "touch_target": rule_touch_target,
+    "hidden_interactive": rule_hidden_interactive,
+    "text_overflow": rule_text_overflow,
+    "contrast": rule_contrast,
+}
+
+
+def run_rules(raw, context_label, rules=None):
+    """Runs `rules` (default: all of RULES) on a SNAPSHOT_JS result; returns issues per rule plus timings."""
+    started = time.perf_counter()
+    snapshot = DomSnapshot(raw)
+    result = {"context": context_label, "elements": snapshot.count, "collect_ms": round(snapshot.collect_ms or 0, 1)}
+    for name in rules or RULES:
+        result[name] = RULES[name](snapshot, context_label)
+    if "contrast" in result:
+        text, known = _contrast_rows(snapshot)
+        result["contrast_unknown"] = int((text & ~known).sum())
+    result["rules_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+def print_summary(result, roundtrip_ms=None):
+    timing = f", {roundtrip_ms:.0f} ms round trip" if roundtrip_ms is not None else ""
+    print(f"[DOM-AUDIT] {result['context']}: {result['elements']} elements, collected in {result['collect_ms']:.0f} ms"
+          f"{timing}, rules {result['rules_ms']:.1f} ms")
+    if "touch_target" in result:
+        print(f"[HIT-AREA] {result['context']}: {len(result['touch_target'])} too small, "
+              f"{len(result.get('hidden_interactive', []))} focusable at 0x0")
+    for item in result.get("text_overflow", [])[:5]:
+        print(f"  → <{item['tag']}> '{item['text']}' scroll={item['scrollW']}x{item['scrollH']} client={item['clientW']}x{item['clientH']}")
+    if result.get("contrast"):
+        worst = result["contrast"][0]
+        print(f"[CONTRAST] {result['context']}: {len(result['contrast'])} below WCAG AA "
+              f"(worst {worst['ratio']}:1 '{worst['text']}'), {result['contrast_unknown']} over images")
+
+
+def audit_screen(page, context_label, rules=None):
+    """One round trip for a playwright.sync_api page."""
+    started = time.perf_counter()
+    raw = page.evaluate(SNAPSHOT_JS, INTERACTIVE_SELECTOR)
+    roundtrip_ms = (time.perf_counter() - started) * 1000
+    result = run_rules(raw, context_label, rules)
+    result["roundtrip_ms"] = round(roundtrip_ms, 1)
+    print_summary(result, roundtrip_ms)
+    return result
+
+
+def main():
+    from playwright.sync_api import sync_playwright
+
+    from audit.profiles import BASE_URL, DEVICES, context_options
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--device", default="iphone-13", choices=list(DEVICES))
+    parser.add_argument("--out", default=None, help="Write the full result as JSON")
+    args = parser.parse_args()
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        context = browser.new_context(**context_options(p, args.device))
+        page = context.new_page()
+        page.goto(args.url, wait_until="networkidle")
+        result = audit_screen(page, args.url)
+        browser.close()
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"DOM audit saved: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Frame Budget Benchmark - Adventure Forge
+Reads through N turns (default 3) sentence by sentence, once per Typewriter
+renderer, with the CPU throttled like a mid-range Android phone:
+
+  frame      requestAnimationFrame reveal paced by the narration clock (default)
+  interval   the previous renderer: one React state update per character
+
+While a sentence is being typed it samples every animation frame and, through
+the Performance API, long tasks (PerformanceObserver 'longtask') and long
+animation frames ('long-animation-frame', where Chromium supports it). Per
+mode it reports frame-time percentiles, dropped frames (frames later than
+1.5x the display interval count the vsyncs they missed) and long-task time per
+second of typing, and writes audit_v2_frame_report.json. The renderer is
+chosen through the `adventure_forge_typewriter_mode` localStorage key.
+
+Usage:
+    npm run standin -- --profile ci-fast &
+    REACT_APP_API_URL=http://localhost:3001 npm start &
+    AUDIT_BASE_URL=http://localhost:3000 python -m audit.frame_bench --turns 3 --cpu-throttle 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+from playwright.async_api import async_playwright
+
+from audit.memory_bench import OPTION_BUTTON, _OPTIONS_CLICKABLE_JS
+from audit.profiles import BASE_URL, DEVICES, NETWORK_PROFILES, context_options, network_conditions
+from audit.readiness import AsyncReadiness, install_stream_probe
+from audit.stats import percentile, summarize
+
+DEFAULT_REPORT = "audit_v2_frame_report.json"
+MODES = ("frame", "interval")
+FRAME_BUCKETS_MS = [8, 17, 25, 33, 50, 100, 250]
+TYPEWRITER_DONE = '.cinematic-text-overlay.visible [data-testid="typewriter"][data-done="true"]'
+
+FRAME_PROBE_JS = r"""
+(() => {
+    if (window.__afFrames) return;
+    const log = window.__afFrames = { frames: [], typingMs: 0, longTasks: [], loaf: [] };
+    let last = null;
+    const tick = (now) => {
+        const typing = !!document.querySelector('[data-testid="typewriter"][data-done="false"]');
+        if (last !== null && typing) {
+            log.frames.push(now - last);
+            log.typingMs += now - last;
+        }
+        last = now;
+        requestAnimationFrame(tick);
+    };
+    requestAnimationFrame(tick);
+    const observe = (type, record) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(e => record(e))).observe({ type, buffered: true });
+        } catch (e) { /* entry type not supported by this browser */ }
+    };
+    observe('longtask', e => log.longTasks.push({ start: e.startTime, duration: e.duration }));
+    observe('long-animation-frame', e => log.loaf.push({ start: e.startTime, duration: e.duration, blocking: e.blockingDuration || 0 }));
+})();
+"""
+
+
+def set_mode_js(mode):
+    return f"localStorage.setItem('adventure_forge_typewriter_mode', {json.dumps(mode)});"
+
+
+def dropped_frames(intervals, refresh_ms):
+    """Vsyncs missed: a frame that took k display intervals dropped k - 1 of them."""
+    return sum(max(0, round(ms / refresh_ms) - 1) for ms in intervals if ms > refresh_ms * 1.5)
+
+
+async def read_through_turn(page, ready, max_sentences=40):
+    """Advance each sentence once the Typewriter has revealed all of it."""
+    for _ in range(max_sentences):
+        if await page.evaluate(_OPTIONS_CLICKABLE_JS):
+            return True
+        if await ready.selector(TYPEWRITER_DONE, "sentence typed", timeout_ms=30000):
+            await page.click('[data-testid="game-cinematic-container"]')
+    return await page.evaluate(_OPTIONS_CLICKABLE_JS)
+
+
+async def run_mode(p, mode, device_id, network_id, turns, base_url, cpu_throttle):
+    browser = await p.chromium.launch(headless=True)
+    context = await browser.new_context(**context_options(p, device_id))
+    await install_stream_probe(context)
+    await context.add_init_script(script=set_mode_js(mode))
+    await context.add_init_script(script=FRAME_PROBE_JS)
+    page = await context.new_page()
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Network.emulateNetworkConditions", network_conditions(network_id))
+    await cdp.send("Emulation.setCPUThrottlingRate", {"rate": cpu_throttle})
+    ready = AsyncReadiness(page)
+    played = 0
+    try:
+        await page.goto(base_url)
+        await ready.test_id("new-adventure-btn", "main menu", probe="app_shell")
+        await page.click('[data-testid="new-adventure-btn"]')
+        await ready.test_id("start-adventure-btn", "adventure selection")
+        mark = await ready.stream_mark()
+        await page.click('[data-testid="start-adventure-btn"]')
+        for turn in range(1, turns + 1):
+            if not await ready.stream_event("done", since=mark, timeout_ms=120000):
+                print(f"[FRAMES] {mode} turn {turn}: stream never finished, stopping")
+                break
+            if not await read_through_turn(page, ready):
+                print(f"[FRAMES] {mode} turn {turn}: options never became clickable, stopping")
+                break
+            played = turn
+            print(f"[FRAMES] {mode} turn {turn}/{turns} read")
+            if turn < turns:
+                mark = await ready.stream_mark()
+                await page.click(OPTION_BUTTON)
+        log = await page.evaluate("() => window.__afFrames")
+    finally:
+        await context.close()
+        await browser.close()
+    return {"turns_played": played, "log": log, "readiness": ready.log.summary()}
+
+
+def summarize_mode(result):
+    log = result["log"]
+    frames = log["frames"]
+    if not frames:
+        return {"turns_played": result["turns_played"], "frames": 0}
+    # Display interval estimated from the fastest frames (the throttled median can already be late)
+    refresh_ms = max(percentile(frames, 10), 1000 / 144)
+    typing_s = log["typingMs"] / 1000
+    long_task_ms = sum(t["duration"] for t in log["longTasks"])
+    blocking_ms = sum(f["blocking"] for f in log["loaf"])
+    dropped = dropped_frames(frames, refresh_ms)
+    return {
+        "turns_played": result["turns_played"],
+        "typing_seconds": round(typing_s, 1),
+        "frames": len(frames),
+        "refresh_ms": round(refresh_ms, 1),
+        # Thousands of frames per run: keep the percentiles and histogram, not every sample
+        "frame_ms": {k: v for k, v in summarize(frames, edges=FRAME_BUCKETS_MS).items() if k != "samples"},
+        "dropped_frames": dropped,
+        "dropped_pct": round(100 * dropped / (len(frames) + dropped), 2),
+        "long_tasks": len(log["longTasks"]),
+        "long_task_ms": round(long_task_ms, 1),
+        "long_task_ms_per_s": round(long_task_ms / typing_s, 1) if typing_s else None,
+        "long_animation_frames": len(log["loaf"]),
+        "loaf_blocking_ms": round(blocking_ms, 1),
+    }
+
+
+async def run_benchmark(modes, device_id, network_id, turns, base_url, cpu_throttle):
+    results = {}
+    async with async_playwright() as p:
+        for mode in modes:
+            result = await run_mode(p, mode, device_id, network_id, turns, base_url, cpu_throttle)
+            results[mode] = {"summary": summarize_mode(result), "readiness": result["readiness"]}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma-separated subset of {', '.join(MODES)}")
+    parser.add_argument("--device", default="pixel-5", choices=list(DEVICES))
+    parser.add_argument("--network", default="wifi", choices=list(NETWORK_PROFILES))
+    parser.add_argument("--cpu-throttle", type=float, default=4, help="CDP CPU slowdown factor (1 = none)")
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--out", default=DEFAULT_REPORT)
+    parser.add_argument("--max-dropped-pct", type=float, default=None, help="Fail when the frame renderer drops more")
+    args = parser.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)}")
+
+    results = asyncio.run(run_benchmark(modes, args.device, args.network, args.turns, args.url, args.cpu_throttle))
+    report = {
+        "audit_version": "v2-frames",
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": args.url,
+        "device": DEVICES[args.device]["label"],
+        "network": NETWORK_PROFILES[args.network]["label"],
+        "cpu_throttle": args.cpu_throttle,
+        "turns_requested": args.turns,
+        "modes": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"\nFrame report saved: {args.out}")
+    for mode, result in results.items():
+        s = result["summary"]
+        if not s.get("frames"):
+            print(f"  {mode:<8} no typing frames recorded")
+            continue
+        print(f"  {mode:<8} frames p95 {s['frame_ms']['p95']:>6.1f} ms  dropped {s['dropped_pct']:>5.1f}%  "
+              f"long tasks {s['long_tasks']} ({s['long_task_ms_per_s']} ms/s typing)  LoAF blocking {s['loaf_blocking_ms']:.0f} ms")
+
+    if any(r["summary"]["turns_played"] < args.turns for r in results.values()):
+        print("[FRAMES] Not every mode completed all turns")
+        return 1
+    frame = results.get("frame", {}).get("summary", {})
+    if args.max_dropped_pct is not None and frame.get("frames") and frame["dropped_pct"] > args.max_dropped_pct:
+        print(f"[REGRESSION] frame renderer dropped {frame['dropped_pct']:.1f}% of frames (budget {args.max_dropped_pct}%)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Image Delivery Benchmark - Adventure Forge
+Plays N turns (default 5) per device and image delivery mode against the
+stand-in API and measures how fast the scene shows something and how many
+image bytes it costs:
+
+  inline        `image` events carry the whole base64 PNG inside /game/stream
+  progressive   `image` events carry a reference with an LQIP placeholder; the
+                client fetches GET /game/image/<id> at a width picked from the
+                box size, DPR and measured bandwidth (src/common/services/ImageLoader.ts)
+
+Per turn, relative to the start of the /game/stream request:
+  first_visual_ms   first scene pixels (placeholder or full image) loaded
+  full_image_ms     full image of the first segment loaded
+  stream_done_ms    `done` event received (large inline images hold it back)
+  image_bytes       image payload sent by the stand-in (stream events + fetches)
+
+Devices default to the two sessions of iuqa_deep_audit_20260219.py: iPhone 13
+on Slow 3G and Desktop 1440x900 unthrottled. The report goes to
+audit_v2_image_report.json.
+
+Usage:
+    npm run standin -- --profile default &
+    REACT_APP_API_URL=http://localhost:3001 npm start &
+    AUDIT_BASE_URL=http://localhost:3000 python -m audit.image_bench --turns 5 --standin http://localhost:3001
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import urllib.request
+from datetime import datetime, timezone
+
+from playwright.async_api import async_playwright
+
+from audit.memory_bench import OPTION_BUTTON, click_through_turn
+from audit.profiles import BASE_URL, DEVICES, NETWORK_PROFILES, context_options, network_conditions
+from audit.readiness import AsyncReadiness, install_stream_probe
+from audit.save_bench import set_standin_features
+from audit.stats import summarize
+
+DEFAULT_REPORT = "audit_v2_image_report.json"
+MODES = ("inline", "progressive")
+# The device/network pairs of iuqa_deep_audit_20260219.py
+DEVICE_NETWORKS = {"iphone-13": "slow-3g", "desktop-1440": "wifi"}
+
+# Records every scene image (and placeholder) as it finishes loading
+VISUAL_PROBE_JS = """
+(() => {
+    if (window.__afVisual) return;
+    const state = window.__afVisual = { marks: [] };
+    document.addEventListener('load', event => {
+        const img = event.target;
+        if (!(img instanceof HTMLImageElement)) return;
+        const kind = img.classList.contains('game-image-placeholder') ? 'placeholder'
+            : img.classList.contains('game-image') ? 'image' : null;
+        if (kind) state.marks.push({ kind, t: performance.now(), width: img.naturalWidth, height: img.naturalHeight });
+    }, true);
+})();
+"""
+
+_LAST_STREAM_JS = "() => { const s = window.__afStream; return s && s.requests.length ? s.requests[s.requests.length - 1] : null; }"
+
+_FULL_IMAGE_SINCE_JS = "(t0) => !!window.__afVisual && window.__afVisual.marks.some(m => m.kind === 'image' && m.t >= t0)"
+
+_TURN_JS = """() => {
+    const stream = window.__afStream;
+    const request = stream.requests[stream.requests.length - 1];
+    const t0 = request.start;
+    const marks = (window.__afVisual ? window.__afVisual.marks : []).filter(m => m.t >= t0);
+    const full = marks.find(m => m.kind === 'image');
+    const done = stream.events.find(e => e.request === request.id && e.type === 'done');
+    return {
+        first_visual_ms: marks.length ? marks[0].t - t0 : null,
+        first_visual_kind: marks.length ? marks[0].kind : null,
+        full_image_ms: full ? full.t - t0 : null,
+        full_image_width: full ? full.width : null,
+        stream_done_ms: done ? done.t - t0 : null,
+        stream_bytes_received: request.bytes,
+        loader: window.__afImages ? window.__afImages.getStats() : null,
+    };
+}"""
+
+
+def standin_stats(standin_url):
+    with urllib.request.urlopen(f"{standin_url.rstrip('/')}/__standin/stats", timeout=10) as response:
+        return json.load(response)
+
+
+def image_bytes_between(before, after):
+    return {
+        "stream_image_bytes": after["stream_image_bytes"] - before["stream_image_bytes"],
+        "fetched_image_bytes": after["image_bytes"] - before["image_bytes"],
+        "image_requests": after["image_requests"] - before["image_requests"],
+    }
+
+
+async def run_mode(p, mode, device_id, network_id, turns, base_url, standin_url):
+    results = []
+    browser = await p.chromium.launch(headless=True)
+    context = await browser.new_context(**context_options(p, device_id))
+    await install_stream_probe(context)
+    await context.add_init_script(script=VISUAL_PROBE_JS)
+    page = await context.new_page()
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Network.emulateNetworkConditions", network_conditions(network_id))
+    ready = AsyncReadiness(page)
+    try:
+        await page.goto(base_url)
+        await ready.test_id("new-adventure-btn", "main menu", probe="app_shell")
+        await page.click('[data-testid="new-adventure-btn"]')
+        await ready.test_id("start-adventure-btn", "adventure selection")
+        mark = await ready.stream_mark()
+        before = standin_stats(standin_url)
+        await page.click('[data-testid="start-adventure-btn"]')
+
+        for turn in range(1, turns + 1):
+            if not await ready.stream_event("done", since=mark, timeout_ms=180000):
+                print(f"[IMAGE] {mode} turn {turn}: stream never finished, stopping")
+                break
+            request = await page.evaluate(_LAST_STREAM_JS)
+            try:
+                await page.wait_for_function(_FULL_IMAGE_SINCE_JS, arg=request["start"], timeout=120000)
+            except Exception:
+                print(f"[IMAGE] {mode} turn {turn}: the first segment's image never loaded")
+            result = await page.evaluate(_TURN_JS)
+            after = standin_stats(standin_url)
+            result.update(image_bytes_between(before, after), turn=turn)
+            result["image_bytes"] = result["stream_image_bytes"] + result["fetched_image_bytes"]
+            results.append(result)
+            print(f"[IMAGE] {mode} turn {turn}/{turns}: first visual {result['first_visual_ms'] or 0:.0f} ms "
+                  f"({result['first_visual_kind']}), full image {result['full_image_ms'] or 0:.0f} ms "
+                  f"at {result['full_image_width']}px, {result['image_bytes'] / 1024:.0f} KB of images")
+
+            if not await click_through_turn(page, ready):
+                print(f"[IMAGE] {mode} turn {turn}: options never became clickable, stopping")
+                break
+            if turn < turns:
+                mark = await ready.stream_mark()
+                before = standin_stats(standin_url)
+                await page.click(OPTION_BUTTON)
+    finally:
+        await context.close()
+        await browser.close()
+    return results, ready.log.summary()
+
+
+def summarize_mode(turns):
+    if not turns:
+        return {"turns": 0}
+    return {
+        "turns": len(turns),
+        "first_visual_ms": summarize([t["first_visual_ms"] for t in turns]),
+        "full_image_ms": summarize([t["full_image_ms"] for t in turns]),
+        "stream_done_ms": summarize([t["stream_done_ms"] for t in turns]),
+        "image_bytes_total": sum(t["image_bytes"] for t in turns),
+        "image_bytes_per_turn": round(sum(t["image_bytes"] for t in turns) / len(turns)),
+        "image_requests": sum(t["image_requests"] for t in turns),
+        "full_image_widths": sorted({t["full_image_width"] for t in turns if t["full_image_width"]}),
+    }
+
+
+def compare(modes):
+    """Progressive relative to inline (ratios below 1 mean progressive is faster / lighter)."""
+    inline = modes.get("inline", {}).get("summary", {})
+    progressive = modes.get("progressive", {}).get("summary", {})
+    if not inline.get("turns") or not progressive.get("turns"):
+        return None
+
+    def ratio(key, stat="p50"):
+        a, b = progressive[key].get(stat), inline[key].get(stat)
+        return round(a / b, 3) if a is not None and b else None
+
+    return {
+        "first_visual_p50_ratio": ratio("first_visual_ms"),
+        "full_image_p50_ratio": ratio("full_image_ms"),
+        "stream_done_p50_ratio": ratio("stream_done_ms"),
+        "image_bytes_ratio": round(progressive["image_bytes_total"] / inline["image_bytes_total"], 4) if inline["image_bytes_total"] else None,
+    }
+
+
+async def run_benchmark(modes, cells, turns, base_url, standin_url):
+    results = {}
+    async with async_playwright() as p:
+        for device_id, network_id in cells:
+            device = {"device": DEVICES[device_id]["label"], "network": NETWORK_PROFILES[network_id]["label"], "modes": {}}
+            for mode in modes:
+                set_standin_features(standin_url, {"image_refs": mode == "progressive"})
+                turns_run, readiness = await run_mode(p, mode, device_id, network_id, turns, base_url, standin_url)
+                device["modes"][mode] = {"summary": summarize_mode(turns_run), "turns": turns_run, "readiness": readiness}
+            device["progressive_vs_inline"] = compare(device["modes"])
+            results[device_id] = device
+    set_standin_features(standin_url, {"image_refs": False})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma-separated subset of {', '.join(MODES)}")
+    parser.add_argument("--devices", default=",".join(DEVICE_NETWORKS), help="Comma-separated device ids from audit/profiles.py")
+    parser.add_argument("--network", default=None, choices=list(NETWORK_PROFILES),
+                        help="Network for every device (default: Slow 3G for iphone-13, unthrottled otherwise)")
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--standin", default="http://localhost:3001", help="Stand-in API base URL (used to switch delivery modes)")
+    parser.add_argument("--out", default=DEFAULT_REPORT)
+    parser.add_argument("--max-first-visual-ms", type=float, default=None,
+                        help="Fail when progressive first-visual p95 exceeds this on any device")
+    args = parser.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)}")
+    devices = [d.strip() for d in args.devices.split(",") if d.strip()]
+    unknown = [d for d in devices if d not in DEVICES]
+    if unknown:
+        parser.error(f"unknown device(s): {', '.join(unknown)}")
+    cells = [(d, args.network or DEVICE_NETWORKS.get(d, "wifi")) for d in devices]
+
+    results = asyncio.run(run_benchmark(modes, cells, args.turns, args.url, args.standin))
+    report = {
+        "audit_version": "v2-image",
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": args.url,
+        "turns_requested": args.turns,
+        "devices": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"\nImage report saved: {args.out}")
+    failed = False
+    for device_id, device in results.items():
+        print(f"  {device['device']} / {device['network']}")
+        for mode, result in device["modes"].items():
+            s = result["summary"]
+            if not s.get("turns"):
+                print(f"    {mode:<12} no turns completed")
+                continue
+            print(f"    {mode:<12} first visual p50 {s['first_visual_ms'].get('p50') or 0:.0f} ms, "
+                  f"full image p50 {s['full_image_ms'].get('p50') or 0:.0f} ms, "
+                  f"{s['image_bytes_per_turn'] / 1024:.0f} KB of images per turn")
+            failed = failed or s["turns"] < args.turns
+        comparison = device["progressive_vs_inline"]
+        if comparison:
+            print(f"    progressive: {comparison['first_visual_p50_ratio']}x first-visual time, "
+                  f"{comparison['image_bytes_ratio']}x image bytes")
+        if args.max_first_visual_ms is not None:
+            p95 = device["modes"].get("progressive", {}).get("summary", {}).get("first_visual_ms", {}).get("p95")
+            if p95 is not None and p95 > args.max_first_visual_ms:
+                print(f"[REGRESSION] {device_id}: progressive first visual p95 {p95:.0f} ms (budget {args.max_first_visual_ms:.0f} ms)")
+                failed = True
+
+    if failed:
+        print("[IMAGE] Not every run completed all turns or met its budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
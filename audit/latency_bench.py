@@ -0,0 +1,303 @@
+"""
+Latency Benchmark - Adventure Forge
+Measures the latencies players feel on the first turn of a new adventure:
+
+  stream_ttfb_ms          first byte of the /game/stream response
+  first_text_ms           first `text_structure` event
+  first_image_ms          first `image` event
+  first_audio_ms          first `audio` event
+  first_typewriter_ms     first character rendered by the cinematic Typewriter
+  options_clickable_ms    option buttons visible and enabled
+
+With --next-turn the run then waits --read-ms like a reading player, picks the
+first option and also records:
+
+  next_turn_text_ms       option click to the first character of the next turn
+
+--speculative on|off sets the `adventure_forge_speculative_turns` override, so
+one build can be measured with and without speculative next turns.
+
+All metrics except next_turn_text_ms are relative to the start of the first
+/game/stream request. Each network
+profile is measured N times in fresh contexts; p50/p95/p99 and histograms are
+written to audit_v2_latency_report.json next to audit_v2_report.json.
+
+Usage:
+    python -m audit.latency_bench run --networks slow-3g,4g --runs 20
+    python -m audit.latency_bench run --networks 4g --runs 10 --next-turn --speculative on
+    python -m audit.latency_bench compare baseline.json audit_v2_latency_report.json --threshold 0.15
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+from playwright.async_api import async_playwright
+
+from audit.profiles import BASE_URL, DEVICES, NETWORK_PROFILES, context_options, network_conditions
+from audit.readiness import AsyncReadiness, install_stream_probe
+from audit.stats import summarize
+
+METRICS = [
+    "stream_ttfb_ms",
+    "first_text_ms",
+    "first_image_ms",
+    "first_audio_ms",
+    "first_typewriter_ms",
+    "options_clickable_ms",
+    "next_turn_text_ms",
+]
+DEFAULT_REPORT = "audit_v2_latency_report.json"
+
+# Records UI milestones with in-page timestamps so polling lag never skews them.
+UI_PROBE_JS = r"""
+(() => {
+    if (window.__afUi) return;
+    const ui = window.__afUi = { firstChar: null, optionsClickable: null, choiceAt: null, choiceText: null, nextChar: null };
+    const overlayText = () => {
+        const overlay = document.querySelector('.cinematic-text-overlay p');
+        return overlay ? overlay.textContent.trim() : '';
+    };
+    document.addEventListener('click', event => {
+        if (ui.choiceAt === null && event.target.closest && event.target.closest('[data-testid="game-options-container"] button')) {
+            ui.choiceAt = performance.now();
+            ui.choiceText = overlayText();
+        }
+    }, true);
+    const check = () => {
+        if (ui.firstChar === null) {
+            if (overlayText().length > 0) ui.firstChar = performance.now();
+        }
+        if (ui.choiceAt !== null && ui.nextChar === null) {
+            const text = overlayText();
+            if (text.length > 0 && text !== ui.choiceText) ui.nextChar = performance.now();
+        }
+        if (ui.optionsClickable === null) {
+            const container = document.querySelector('[data-testid="game-options-container"]');
+            if (container && getComputedStyle(container).display !== 'none' && container.querySelector('button:not([disabled])')) {
+                ui.optionsClickable = performance.now();
+            }
+        }
+    };
+    new MutationObserver(check).observe(document, { subtree: true, childList: true, characterData: true, attributes: true });
+})();
+"""
+
+
+def metrics_from_timeline(stream, ui):
+    """Turn the in-page stream/UI timelines into metric values (ms from stream start)."""
+    if not stream["requests"]:
+        return {m: None for m in METRICS}
+    request = stream["requests"][0]
+    origin = request["start"]
+
+    def first_event(event_type):
+        times = [e["t"] for e in stream["events"] if e["request"] == request["id"] and e["type"] == event_type]
+        return min(times) - origin if times else None
+
+    def since_origin(value):
+        return value - origin if value is not None else None
+
+    return {
+        "stream_ttfb_ms": since_origin(request.get("firstByte")),
+        "first_text_ms": first_event("text_structure"),
+        "first_image_ms": first_event("image"),
+        "first_audio_ms": first_event("audio"),
+        "first_typewriter_ms": since_origin(ui.get("firstChar")),
+        "options_clickable_ms": since_origin(ui.get("optionsClickable")),
+        "next_turn_text_ms": ui["nextChar"] - ui["choiceAt"] if ui.get("nextChar") is not None and ui.get("choiceAt") is not None else None,
+    }
+
+
+async def advance_until_options(page, ready, max_clicks=30):
+    """Click through the cinematic like a player until the options are clickable."""
+    for _ in range(max_clicks):
+        if await page.evaluate("() => window.__afUi.optionsClickable !== null"):
+            return True
+        if await ready.selector('.cinematic-text-overlay.visible .click-hint', "click hint", timeout_ms=15000):
+            await page.click('[data-testid="game-cinematic-container"]')
+    return await page.evaluate("() => window.__afUi.optionsClickable !== null")
+
+
+async def measure_run(playwright, browser, device_id, network_id, base_url, next_turn=False, read_ms=8000, speculative=None):
+    context = await browser.new_context(**context_options(playwright, device_id))
+    await install_stream_probe(context)
+    await context.add_init_script(script=UI_PROBE_JS)
+    if speculative is not None:
+        await context.add_init_script(
+            script=f"localStorage.setItem('adventure_forge_speculative_turns', '{'true' if speculative else 'false'}');")
+    page = await context.new_page()
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Network.emulateNetworkConditions", network_conditions(network_id))
+    ready = AsyncReadiness(page)
+    try:
+        await page.goto(base_url)
+        await ready.test_id("new-adventure-btn", "main menu", probe="app_shell")
+        await page.click('[data-testid="new-adventure-btn"]')
+        await ready.test_id("start-adventure-btn", "adventure selection")
+        await page.click('[data-testid="start-adventure-btn"]')
+        if await ready.stream_event("text_structure"):
+            await advance_until_options(page, ready)
+            await ready.stream_event("done")
+            if next_turn:
+                # Read the options like a player would before picking one
+                await page.wait_for_timeout(read_ms)
+                await page.click('[data-testid="game-options-container"] button:not([disabled])')
+                try:
+                    await page.wait_for_function("() => window.__afUi.nextChar !== null", timeout=120000)
+                except Exception:
+                    print("[LATENCY] The next turn never showed text")
+        stream = await ready.stream_timeline()
+        ui = await page.evaluate("() => window.__afUi")
+        return metrics_from_timeline(stream, ui)
+    finally:
+        await context.close()
+
+
+async def run_benchmark(device_id, networks, runs, base_url, next_turn=False, read_ms=8000, speculative=None):
+    results = {}
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            for network_id in networks:
+                samples = {m: [] for m in METRICS}
+                for i in range(runs):
+                    started = time.perf_counter()
+                    try:
+                        values = await measure_run(p, browser, device_id, network_id, base_url, next_turn, read_ms, speculative)
+                    except Exception as e:
+                        print(f"[LATENCY] {network_id} run {i + 1} failed: {e}")
+                        values = {m: None for m in METRICS}
+                    for metric in METRICS:
+                        samples[metric].append(values[metric])
+                    print(f"[LATENCY] {network_id} run {i + 1}/{runs} in {time.perf_counter() - started:.1f}s: "
+                          + ", ".join(f"{m}={v:.0f}" for m, v in values.items() if v is not None))
+                results[network_id] = {
+                    "network": NETWORK_PROFILES[network_id]["label"],
+                    "metrics": {m: summarize(samples[m]) for m in METRICS},
+                }
+        finally:
+            await browser.close()
+    return results
+
+
+def _missing_rate(stats):
+    total = stats.get("n", 0) + stats.get("missing", 0)
+    return stats.get("missing", 0) / total if total else 0.0
+
+
+def compare_reports(baseline, candidate, threshold=0.1, percentile_key="p95", min_delta_ms=50):
+    """List metrics whose percentile regressed by more than `threshold` (relative) and `min_delta_ms`.
+
+    A profile or metric the baseline measured but the candidate did not (no samples at all, e.g. options
+    never became clickable) is a regression too, and so is a larger share of runs missing the metric.
+    """
+    regressions = []
+    for network_id, base in baseline["profiles"].items():
+        current = candidate["profiles"].get(network_id)
+        if not current:
+            regressions.append({"network": network_id, "metric": None, "percentile": percentile_key,
+                                "issue": "profile missing from the candidate"})
+            continue
+        for metric, base_stats in base["metrics"].items():
+            stats = current["metrics"].get(metric, {})
+            before = base_stats.get(percentile_key)
+            after = stats.get(percentile_key)
+            if before is None:
+                continue
+            entry = {"network": network_id, "metric": metric, "percentile": percentile_key, "baseline_ms": before}
+            if after is None:
+                regressions.append(dict(entry, candidate_ms=None, issue=f"no samples ({stats.get('missing', 0)} runs missing it)"))
+                continue
+            # One entry per metric: a slower percentile and a higher missing rate are reported together
+            entry["candidate_ms"] = after
+            delta = after - before
+            if delta > min_delta_ms and after > before * (1 + threshold):
+                entry.update(delta_ms=round(delta, 1), change_pct=round(delta / before * 100, 1) if before else None)
+            missing_before, missing_after = _missing_rate(base_stats), _missing_rate(stats)
+            if missing_after > missing_before:
+                entry["issue"] = f"missing in {missing_after:.0%} of runs (baseline {missing_before:.0%})"
+            if "delta_ms" in entry or "issue" in entry:
+                regressions.append(entry)
+    return regressions
+
+
+def _csv(value):
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Measure latencies and write a report")
+    run.add_argument("--device", default="iphone-13", choices=list(DEVICES))
+    run.add_argument("--networks", type=_csv, default=["slow-3g", "4g"])
+    run.add_argument("--runs", type=int, default=10)
+    run.add_argument("--url", default=BASE_URL)
+    run.add_argument("--out", default=DEFAULT_REPORT)
+    run.add_argument("--next-turn", action="store_true", help="Also pick an option and time the next turn's first text")
+    run.add_argument("--read-ms", type=int, default=8000, help="Time spent on the options before picking one (--next-turn)")
+    run.add_argument("--speculative", choices=["on", "off"], default=None,
+                     help="Force speculative next turns on or off (default: the build setting)")
+
+    compare = sub.add_parser("compare", help="Fail when a metric regressed between two reports")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+    compare.add_argument("--threshold", type=float, default=0.1, help="Allowed relative increase (0.1 = 10%%)")
+    compare.add_argument("--percentile", default="p95", choices=["p50", "p95", "p99"])
+    compare.add_argument("--min-delta-ms", type=float, default=50, help="Ignore changes smaller than this")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        unknown = [n for n in args.networks if n not in NETWORK_PROFILES]
+        if unknown:
+            parser.error(f"Unknown network profile(s): {', '.join(unknown)}")
+        speculative = None if args.speculative is None else args.speculative == "on"
+        profiles = asyncio.run(run_benchmark(args.device, args.networks, args.runs, args.url,
+                                             args.next_turn, args.read_ms, speculative))
+        report = {
+            "audit_version": "v2-latency",
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "url": args.url,
+            "device": DEVICES[args.device]["label"],
+            "runs_per_profile": args.runs,
+            "next_turn": args.next_turn,
+            "speculative": args.speculative,
+            "profiles": profiles,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nLatency report saved: {args.out}")
+        for network_id, data in profiles.items():
+            for metric, stats in data["metrics"].items():
+                if stats["n"]:
+                    print(f"  {network_id:<8} {metric:<22} p50={stats['p50']:>8.0f}  p95={stats['p95']:>8.0f}  p99={stats['p99']:>8.0f}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+    regressions = compare_reports(baseline, candidate, args.threshold, args.percentile, args.min_delta_ms)
+    for r in regressions:
+        if "delta_ms" in r:
+            # A zero baseline has no relative change: show the absolute one
+            change = f"+{r['change_pct']}%" if r["change_pct"] is not None else f"+{r['delta_ms']:.0f}ms"
+            line = (f"[REGRESSION] {r['network']} {r['metric']} {r['percentile']}: "
+                    f"{r['baseline_ms']:.0f}ms -> {r['candidate_ms']:.0f}ms ({change})")
+            print(f"{line}; {r['issue']}" if r.get("issue") else line)
+        else:
+            print(f"[REGRESSION] {' '.join(filter(None, (r['network'], r['metric'])))}: {r['issue']}")
+    if regressions:
+        return 1
+    print(f"[LATENCY] No {args.percentile} regression above {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
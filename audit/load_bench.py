@@ -0,0 +1,410 @@
+"""
+Stream Load Generator - Adventure Forge
+Drives many concurrent players through the /game/stream loop without a
+browser, to see how the endpoint behaves with 50 or 500 adventures at once.
+
+Every virtual user plays sessions like the app does (src/views/Game/Game.tsx
+through useGameStream): the intro prompt with the genre, then "I choose option
+N: ..." with the growing history, sending the same body (prompt, history,
+voice, genre, lang, saveId when the session has one) and api-key headers.
+Events are parsed incrementally as bytes arrive; dropped streams are resumed
+with Last-Event-ID like the client does.
+
+The number of users follows a ramp schedule of `users@seconds` stages, each
+ramping linearly from the previous target (k6 style): `50@30,50@60,0@10`
+ramps to 50 users over 30 s, holds them for 60 s and ramps down over 10 s.
+Users above the target finish their current turn and leave.
+
+Reported, for the whole run:
+  connections/sec      stream requests that got response headers (mean and peak second)
+  connect_ms           request start to response headers
+  first_event_ms       request start to the first SSE event
+  first_text_ms        request start to `text_structure`
+  turn_ms              request start to `done`
+  bytes_per_turn       response bytes per completed turn
+  errors               failed turns by kind (http_<status>, connect, timeout, dropped, stream_error)
+plus a per-second timeline (target users, active users, open streams,
+connections, errors). The report goes to audit_v2_load_report.json; the
+stand-in's own counters are included when the API is the stand-in.
+
+Usage:
+    npm run standin -- --profile ci-fast --port 3001 &
+    python -m audit.load_bench --api http://localhost:3001 --stages 50@30,50@60,0@10 --turns 3
+    python -m audit.load_bench --api http://localhost:3001 --users 500 --ramp-s 60 --hold-s 60 --max-error-rate 0.01
+"""
+import argparse
+import asyncio
+import codecs
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import httpx
+
+from audit.stats import summarize
+
+DEFAULT_REPORT = "audit_v2_load_report.json"
+DEFAULT_STAGES = "50@20,50@40,0@5"
+GENRES = ["fantasy", "scifi", "horror", "superheroes", "romance"]
+# Same text as translations.ts `intro_prompt` (en)
+INTRO_PROMPT = "Start the adventure in {genre}. Set the scene concisely (max 80 words) and give me 3 options."
+# Reconnects without progress before a turn counts as dropped (resumableStream.ts DEFAULT_RESUME_OPTIONS)
+MAX_RESUMES = 5
+BYTES_BUCKETS = [16 * 1024, 64 * 1024, 256 * 1024, 512 * 1024, 1024 * 1024, 2 * 1024 * 1024, 4 * 1024 * 1024, 8 * 1024 * 1024]
+
+
+def parse_stages(text):
+    """`users@seconds,...` into [(users, seconds), ...]."""
+    stages = []
+    for part in text.split(","):
+        users, _, seconds = part.strip().partition("@")
+        if not users or not seconds:
+            raise ValueError(f"stage '{part}' is not users@seconds")
+        stages.append((int(users), float(seconds)))
+    return stages
+
+
+def target_at(stages, elapsed):
+    """Target user count `elapsed` seconds into the run (linear ramps between stage targets)."""
+    previous, start = 0, 0.0
+    for users, seconds in stages:
+        if elapsed < start + seconds:
+            return round(previous + (users - previous) * (elapsed - start) / seconds) if seconds else users
+        previous, start = users, start + seconds
+    return previous
+
+
+class SSEParser:
+    """Incremental `id:` / `data:` parser with the same framing as sseUtils.SSEStreamParser."""
+
+    def __init__(self):
+        self.buffer = ""
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def feed(self, chunk):
+        """Bytes in, completed (event_id, event) pairs out."""
+        self.buffer += self.decoder.decode(chunk).replace("\r\n", "\n")
+        events = []
+        while True:
+            end = self.buffer.find("\n\n")
+            if end < 0:
+                return events
+            block, self.buffer = self.buffer[:end], self.buffer[end + 2:]
+            event_id, data = None, []
+            for line in block.split("\n"):
+                if line.startswith("id:"):
+                    event_id = line[3:].strip()
+                elif line.startswith("data:"):
+                    data.append(line[5:].strip())
+            for payload in data:
+                try:
+                    events.append((event_id, json.loads(payload)))
+                except ValueError:
+                    events.append((event_id, {"type": "parse_error"}))
+
+
+class LoadStats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.turns = []
+        self.errors = Counter()
+        self.connections = []  # Seconds since start at which response headers arrived
+        self.error_times = []
+        self.open_streams = 0
+        self.active_users = 0
+        self.sessions_started = 0
+        self.sessions_completed = 0
+        self.resumes = 0
+
+    def now(self):
+        return time.monotonic() - self.started
+
+    def fail(self, kind):
+        self.errors[kind] += 1
+        self.error_times.append(self.now())
+
+
+def build_headers(args, last_event_id=None):
+    headers = {
+        "Content-Type": "application/json",
+        "x-google-api-key": args.google_key,
+        "x-pollinations-token": args.pollinations_token,
+        "x-openai-api-key": args.openai_key,
+    }
+    if args.auth_token:
+        headers["Authorization"] = f"Bearer {args.auth_token}"
+    if last_event_id:
+        headers["Last-Event-ID"] = last_event_id
+    return headers
+
+
+def turn_body(prompt, history, args, genre, save_id=None):
+    body = {"prompt": prompt, "history": history, "voice": args.voice, "genre": genre, "lang": args.lang}
+    if save_id:
+        body["saveId"] = save_id
+    return body
+
+
+async def run_turn(client, args, stats, body):
+    """Streams one turn; returns the `text_structure` event, or None when the turn failed."""
+    record = {"t": round(stats.now(), 3), "connect_ms": None, "first_event_ms": None, "first_text_ms": None,
+              "turn_ms": None, "bytes": 0, "events": 0, "resumes": 0, "error": None}
+    started = time.perf_counter()
+    elapsed_ms = lambda: (time.perf_counter() - started) * 1000
+    text, last_id, last_progress_id, stalls = None, None, None, 0
+    stats.open_streams += 1
+    try:
+        while True:
+            parser = SSEParser()
+            try:
+                async with client.stream("POST", f"{args.api}/game/stream", json=body,
+                                         headers=build_headers(args, last_id)) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        if last_id is None:
+                            record["error"] = f"http_{response.status_code}"
+                            return None
+                        # A failed resume is retried like a dropped connection
+                        raise httpx.TransportError(f"resume failed: HTTP {response.status_code}")
+                    stats.connections.append(stats.now())
+                    if record["connect_ms"] is None:
+                        record["connect_ms"] = elapsed_ms()
+                    async for chunk in response.aiter_raw():
+                        record["bytes"] += len(chunk)
+                        for event_id, event in parser.feed(chunk):
+                            record["events"] += 1
+                            if event_id is not None:
+                                last_id = event_id
+                            if record["first_event_ms"] is None:
+                                record["first_event_ms"] = elapsed_ms()
+                            kind = event.get("type")
+                            if kind == "text_structure" and text is None:
+                                text = event
+                                record["first_text_ms"] = elapsed_ms()
+                            elif kind == "error":
+                                record["error"] = "stream_error"
+                                return None
+                            elif kind == "done":
+                                record["turn_ms"] = elapsed_ms()
+                                return text
+                # Closed without `done`: resumable when the server sent ids
+                raise httpx.RemoteProtocolError("stream closed before done")
+            except httpx.TimeoutException:
+                record["error"] = "timeout"
+                return None
+            except httpx.TransportError:
+                if last_id is None:
+                    record["error"] = "connect" if record["connect_ms"] is None else "dropped"
+                    return None
+                stalls = 0 if last_id != last_progress_id else stalls + 1
+                last_progress_id = last_id
+                if stalls >= MAX_RESUMES:
+                    record["error"] = "dropped"
+                    return None
+                record["resumes"] += 1
+                stats.resumes += 1
+                # Same backoff as the client: 0.5 s doubling per attempt without progress, with jitter
+                await asyncio.sleep(min(8.0, 0.5 * 2 ** stalls) * random.uniform(0.5, 1.0))
+    except asyncio.CancelledError:
+        # Still streaming when the drain ran out: a hung turn, counted as failed
+        record["error"] = "cancelled"
+        raise
+    finally:
+        stats.open_streams -= 1
+        stats.turns.append(record)
+        if record["error"]:
+            stats.fail(record["error"])
+
+
+async def virtual_user(user_id, client, args, stats, retire):
+    """Plays sessions of `--turns` turns until told to leave (between turns)."""
+    rng = random.Random(f"{args.seed}:{user_id}")
+    stats.active_users += 1
+    try:
+        while not retire.is_set():
+            stats.sessions_started += 1
+            genre = rng.choice(GENRES)
+            prompt = INTRO_PROMPT.format(genre=genre)
+            history = [{"role": "user", "parts": [{"text": prompt}]}]
+            completed = True
+            for turn in range(args.turns):
+                text = await run_turn(client, args, stats, turn_body(prompt, history, args, genre))
+                if text is None:
+                    completed = False
+                    break
+                options = text.get("options") or []
+                full_text = "\n\n".join(text.get("paragraphs") or []) + "\n\nOptions: " + ", ".join(options)
+                history = history + [{"role": "model", "parts": [{"text": full_text}]}]
+                if turn == args.turns - 1 or retire.is_set():
+                    completed = turn == args.turns - 1
+                    break
+                # Reading the scene before choosing, like a player
+                await asyncio.sleep(rng.uniform(0.5, 1.5) * args.think_ms / 1000)
+                choice = rng.randrange(len(options)) + 1 if options else 1
+                prompt = f"I choose option {choice}: {options[choice - 1] if options else f'Option {choice}'}. What happens next?"
+                history = history + [{"role": "user", "parts": [{"text": prompt}]}]
+            if completed:
+                stats.sessions_completed += 1
+    finally:
+        stats.active_users -= 1
+
+
+async def run_load(args, stages):
+    stats = LoadStats()
+    duration = sum(seconds for _, seconds in stages)
+    timeout = httpx.Timeout(connect=args.connect_timeout_s, read=args.read_timeout_s, write=10.0, pool=None)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=0)
+    users = []  # (task, retire event), oldest first
+    spawned = 0
+    timeline = []
+    next_sample = 1.0
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        while stats.now() < duration:
+            elapsed = stats.now()
+            target = target_at(stages, elapsed)
+            users = [(task, retire) for task, retire in users if not task.done()]
+            live = [(task, retire) for task, retire in users if not retire.is_set()]
+            for _ in range(target - len(live)):
+                retire = asyncio.Event()
+                users.append((asyncio.create_task(virtual_user(spawned, client, args, stats, retire)), retire))
+                spawned += 1
+            # Newest users leave first when the schedule ramps down
+            for _, retire in live[target:][::-1]:
+                retire.set()
+            if elapsed >= next_sample:
+                second = next_sample
+                timeline.append({
+                    "t": round(second),
+                    "target_users": target,
+                    "active_users": stats.active_users,
+                    "open_streams": stats.open_streams,
+                    "connections": sum(1 for c in stats.connections if second - 1 <= c < second),
+                    "errors": sum(1 for e in stats.error_times if second - 1 <= e < second),
+                })
+                next_sample += 1.0
+            await asyncio.sleep(0.1)
+
+        # Schedule over: nobody starts another turn; give running turns time to finish
+        for _, retire in users:
+            retire.set()
+        pending = [task for task, _ in users if not task.done()]
+        if pending:
+            _, still_running = await asyncio.wait(pending, timeout=args.drain_s)
+            for task in still_running:
+                task.cancel()
+            if still_running:
+                await asyncio.gather(*still_running, return_exceptions=True)
+        server = None
+        try:
+            response = await client.get(f"{args.api}/__standin/stats")
+            if response.status_code == 200:
+                server = response.json()
+        except httpx.HTTPError:
+            pass
+    return stats, timeline, server, stats.now()
+
+
+def build_report(args, stages, stats, timeline, server, wall_s):
+    completed = [t for t in stats.turns if not t["error"]]
+    attempted = len(stats.turns)
+    per_second = Counter(int(c) for c in stats.connections)
+    failed = sum(1 for t in stats.turns if t["error"])
+    return {
+        "audit_version": "v2-load",
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "api": args.api,
+        "stages": [{"users": u, "seconds": s} for u, s in stages],
+        "turns_per_session": args.turns,
+        "think_ms": args.think_ms,
+        "wall_s": round(wall_s, 1),
+        "summary": {
+            "peak_users": max((s["active_users"] for s in timeline), default=0),
+            "sessions_started": stats.sessions_started,
+            "sessions_completed": stats.sessions_completed,
+            "turns_attempted": attempted,
+            "turns_completed": len(completed),
+            "error_rate": round(failed / attempted, 4) if attempted else None,
+            "errors": dict(stats.errors),
+            "resumes": stats.resumes,
+            "connections": len(stats.connections),
+            "connections_per_s": round(len(stats.connections) / wall_s, 2) if wall_s else None,
+            "peak_connections_per_s": max(per_second.values(), default=0),
+        },
+        "connect_ms": summarize([t["connect_ms"] for t in stats.turns if t["connect_ms"] is not None]),
+        "first_event_ms": summarize([t["first_event_ms"] for t in stats.turns if t["first_event_ms"] is not None]),
+        "first_text_ms": summarize([t["first_text_ms"] for t in completed]),
+        "turn_ms": summarize([t["turn_ms"] for t in completed]),
+        "bytes_per_turn": summarize([t["bytes"] for t in completed], edges=BYTES_BUCKETS),
+        "timeline": timeline,
+        "server": server,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--api", default=os.environ.get("AUDIT_API_URL", "http://localhost:3001"), help="API base URL (the stand-in in CI)")
+    parser.add_argument("--stages", default=None, help=f"Ramp schedule of users@seconds stages (default {DEFAULT_STAGES})")
+    parser.add_argument("--users", type=int, default=None, help="Shorthand: ramp to this many users over --ramp-s, hold for --hold-s")
+    parser.add_argument("--ramp-s", type=float, default=30)
+    parser.add_argument("--hold-s", type=float, default=60)
+    parser.add_argument("--turns", type=int, default=3, help="Turns per session (intro + choices)")
+    parser.add_argument("--think-ms", type=int, default=2000, help="Mean reading time between turns")
+    parser.add_argument("--voice", default="alloy")
+    parser.add_argument("--lang", default="en")
+    parser.add_argument("--google-key", default=os.environ.get("LOAD_GOOGLE_API_KEY", ""))
+    parser.add_argument("--pollinations-token", default=os.environ.get("LOAD_POLLINATIONS_TOKEN", ""))
+    parser.add_argument("--openai-key", default=os.environ.get("LOAD_OPENAI_API_KEY", ""))
+    parser.add_argument("--auth-token", default=os.environ.get("LOAD_AUTH_TOKEN", ""))
+    parser.add_argument("--connect-timeout-s", type=float, default=10)
+    parser.add_argument("--read-timeout-s", type=float, default=45, help="Longest silence on a stream (useGameStream aborts after 45 s)")
+    parser.add_argument("--drain-s", type=float, default=60, help="Time running turns get to finish after the schedule ends")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default=DEFAULT_REPORT)
+    parser.add_argument("--max-error-rate", type=float, default=None, help="Fail when the failed-turn rate exceeds this (0.01 = 1%%)")
+    parser.add_argument("--max-first-event-ms", type=float, default=None, help="Fail when first-event p95 exceeds this")
+    args = parser.parse_args()
+    args.api = args.api.rstrip("/")
+
+    try:
+        if args.users is not None:
+            stages = [(args.users, args.ramp_s), (args.users, args.hold_s)]
+        else:
+            stages = parse_stages(args.stages or DEFAULT_STAGES)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"[LOAD] {args.api}: {', '.join(f'{u} users over {s:.0f}s' for u, s in stages)}, {args.turns} turns per session")
+    stats, timeline, server, wall_s = asyncio.run(run_load(args, stages))
+    report = build_report(args, stages, stats, timeline, server, wall_s)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    s = report["summary"]
+    first_event = report["first_event_ms"]
+    print(f"\nLoad report saved: {args.out}")
+    print(f"  peak users {s['peak_users']}, {s['turns_completed']}/{s['turns_attempted']} turns completed, "
+          f"{s['sessions_completed']}/{s['sessions_started']} sessions")
+    print(f"  connections {s['connections_per_s']}/s (peak {s['peak_connections_per_s']}/s), {s['resumes']} resumes")
+    if first_event.get("n"):
+        print(f"  first event p50 {first_event['p50']:.0f} ms, p95 {first_event['p95']:.0f} ms, p99 {first_event['p99']:.0f} ms")
+    if report["bytes_per_turn"].get("n"):
+        print(f"  {report['bytes_per_turn']['mean'] / 1024:.0f} KB per turn")
+    print(f"  error rate {s['error_rate']} {s['errors'] or ''}")
+
+    failed = not s["turns_completed"]
+    if args.max_error_rate is not None and (s["error_rate"] or 0) > args.max_error_rate:
+        print(f"[REGRESSION] error rate {s['error_rate']} (budget {args.max_error_rate})")
+        failed = True
+    if args.max_first_event_ms is not None and first_event.get("p95") is not None and first_event["p95"] > args.max_first_event_ms:
+        print(f"[REGRESSION] first event p95 {first_event['p95']:.0f} ms (budget {args.max_first_event_ms:.0f} ms)")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+"""
+IUQA Matrix Runner - Adventure Forge
+Runs the deep audit passes over a device x network matrix in parallel.
+
+Each worker process launches a single Chromium and audits its share of the
+matrix through isolated browser contexts (up to --concurrency at a time).
+Every cell writes its own report shaped like audit_v2_report.json.
+
+--cpus adds CPU throttling as a third axis, and --profile-trace records a
+Chrome trace per pass (audit/trace_profile.py) into each report's `profile`.
+With --visual the screenshots are then compared with the approved baselines
+(audit/visual_diff.py) and each report gets a `visual` section.
+
+Usage:
+    python -m audit.matrix_runner --devices iphone-13,desktop-1440 --networks slow-3g,4g
+    python -m audit.matrix_runner --devices iphone-13 --visual
+    python -m audit.matrix_runner --devices pixel-5 --networks 4g --cpus none,mid-tier-mobile --profile-trace
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from itertools import product
+
+from playwright.async_api import async_playwright
+
+from audit.checks import (
+    capture,
+    audit_screen,
+    check_loading_states,
+    click_depth_finding,
+)
+from audit.profiles import (
+    BASE_URL,
+    CPU_PROFILES,
+    DEFAULT_CPUS,
+    DEFAULT_DEVICES,
+    DEFAULT_NETWORKS,
+    DEVICES,
+    NETWORK_PROFILES,
+    cell_id,
+    context_options,
+    network_conditions,
+)
+from audit.readiness import AsyncReadiness, install_stream_probe, is_console_bug
+from audit.trace_profile import PassProfiler
+from audit.visual_diff import DEFAULT_BASELINE_DIR, BaselineStore, compare, print_summary, shot_from_sidecar
+
+DEFAULT_OUT_DIR = "audit_runs"
+OPTION_SELECTORS = ['[data-testid*="option"]', '[class*="option-btn"]', '[class*="choice"]', 'button[class*="game"]']
+PLACEHOLDER_OPTIONS = ['continue', 'continuar', 'option 1', 'option 2', 'opción 1', 'opción 2', '...', '']
+
+
+async def audit_cell(playwright, browser, device_id, network_id, base_url, out_dir, cpu_id="none", profile=False):
+    """Run every audit pass for one device/network(/cpu) cell and write its report."""
+    cid = cell_id(device_id, network_id, cpu_id)
+    prefix = f"audit_v2_{cid}"
+    started = time.perf_counter()
+    issues, findings, console_errors, screens = [], [], [], []
+    perf = None
+
+    options = context_options(playwright, device_id)
+    context = await browser.new_context(**options)
+    await install_stream_probe(context)
+    page = await context.new_page()
+    shoot = partial(capture, page, out_dir, prefix, visual={"device": device_id, "locale": options["locale"]})
+    ready = AsyncReadiness(page)
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Network.emulateNetworkConditions", network_conditions(network_id))
+    if CPU_PROFILES[cpu_id]["rate"] > 1:
+        await cdp.send("Emulation.setCPUThrottlingRate", {"rate": CPU_PROFILES[cpu_id]["rate"]})
+    profiler = PassProfiler(cdp, out_dir, prefix, enabled=profile)
+    page.on("console", lambda msg: console_errors.append({"type": msg.type, "text": msg.text}) if msg.type in ["error", "warning"] else None)
+
+    try:
+        print(f"\n=== [{cid}] PASS 1: MAIN MENU ===")
+        await profiler.start("main_menu")
+        await page.goto(base_url, wait_until="commit")
+        await ready.first_paint()
+        await shoot("01_loading_first_paint", "First paint loading state")
+        await ready.selector('button', "main menu shell", probe="app_shell")
+        await ready.fonts()
+        await ready.network_idle("main menu network idle")
+        await shoot("02_main_menu", "Main menu loaded")
+        screens.append(await audit_screen(page, "Main Menu"))
+
+        print(f"\n=== [{cid}] PASS 2: ADVENTURE SELECTION ===")
+        await profiler.start("adventure_selection")
+        click_steps = 0
+        try:
+            await page.click('[data-testid="new-adventure-btn"]', timeout=15000)
+            click_steps += 1
+            await ready.test_id("start-adventure-btn", "adventure selection")
+            await ready.animations_settled("selection transition")
+            await shoot("03_adventure_selection", "Adventure selection screen")
+            screens.append(await audit_screen(page, "Adventure Selection"))
+        except Exception as e:
+            print(f"[{cid}] [ERROR] Adventure Selection flow: {e}")
+            await shoot("04_error_adventure_selection", f"Error: {e}")
+
+        print(f"\n=== [{cid}] PASS 3: GAME START & STREAM ===")
+        await profiler.start("game_start")
+        try:
+            start_btn = page.locator('[data-testid="start-adventure-btn"]')
+            if await start_btn.count() > 0:
+                await start_btn.first.click()
+                click_steps += 1
+            findings.append(click_depth_finding(click_steps + 1))  # +1 for initial page load
+
+            await ready.selector('.spinner, [data-testid="game-cinematic-container"]', "game loading state")
+            await shoot("05_game_starting", "Game starting - loading state")
+            await check_loading_states(page, "Game Starting")
+            if (await ready.stream_event("text_structure") and await ready.cinematic()
+                    and await ready.selector('.cinematic-text-overlay.visible', "narrative overlay")):
+                await shoot("06_narrative_active", "Narrative streaming")
+            else:
+                await shoot("06_narrative_timeout", "Narrative timeout")
+        except Exception as e:
+            print(f"[{cid}] [ERROR] Game start: {e}")
+            await shoot("05_error_game_start", f"Error: {e}")
+
+        print(f"\n=== [{cid}] PASS 4: OPTION BUTTONS VALIDATION ===")
+        await profiler.start("option_buttons")
+        await ready.stream_event("done")
+        # The game container stays aria-busy until the turn (stream and narration setup) has settled
+        await ready.not_busy("game turn settled")
+        if not await ready.selector('[data-testid="game-options-container"] button', "option buttons", probe="options"):
+            print(f"[{cid}] [OPTIONS] ⚠️  No option buttons found — stream may not have completed")
+        for sel in OPTION_SELECTORS:
+            opts = page.locator(sel)
+            count = await opts.count()
+            if count == 0:
+                continue
+            for i in range(min(count, 3)):
+                opt = opts.nth(i)
+                text = (await opt.inner_text()).strip()[:60]
+                box = await opt.bounding_box()
+                if box and box['height'] < 44:
+                    findings.append({
+                        "id": f"UI-OPT-00{i+1}",
+                        "severity": "P1",
+                        "type": "UI",
+                        "title": f"Option button {i+1} below 44px height",
+                        "detail": f"Touch target {box['height']:.0f}px, text: '{text}'",
+                        "screen": "Game - Options"
+                    })
+                if text.lower() in PLACEHOLDER_OPTIONS:
+                    findings.append({
+                        "id": "UX-OPT-PLACEHOLDER",
+                        "severity": "P0",
+                        "type": "BUG",
+                        "title": "Option button shows placeholder text",
+                        "detail": f"Button text: '{text}' — placeholder not replaced",
+                        "screen": "Game - Options"
+                    })
+            break
+        await shoot("07_option_buttons", "Option buttons state")
+
+        await profiler.stop()
+        print(f"\n=== [{cid}] PASS 5: FULL PAGE SCROLL & OVERFLOW ===")
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        await ready.animations_settled("scroll settled")
+        await shoot("08_scroll_bottom", "Bottom of page / overflow check")
+        screens.append(await audit_screen(page, "Game Screen"))
+    except Exception as e:
+        print(f"[{cid}] [ERROR] Audit aborted: {e}")
+        findings.append({
+            "id": "AUDIT-ABORTED",
+            "severity": "P1",
+            "type": "BUG",
+            "title": f"Audit aborted: {str(e)[:80]}",
+            "screen": "Runtime"
+        })
+    finally:
+        await profiler.finish()
+        try:
+            perf = await ready.perf()
+        except Exception as e:
+            print(f"[{cid}] [PERF] Telemetry unavailable: {e}")
+        await context.close()
+
+    for screen in screens:
+        issues += screen["touch_target"] + screen["hidden_interactive"]
+    all_issues = issues + [
+        {
+            "id": f"CONSOLE-{i:03d}",
+            "severity": "P2",
+            "type": "BUG",
+            "title": e['text'][:80],
+            "context": "Browser Console",
+            "screen": "Runtime"
+        } for i, e in enumerate([e for e in console_errors if is_console_bug(e)][:5])
+    ] + findings
+
+    report = {
+        "audit_version": "v2-matrix",
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": base_url,
+        "device": DEVICES[device_id]["label"],
+        "network": NETWORK_PROFILES[network_id]["label"],
+        "cpu": CPU_PROFILES[cpu_id]["label"],
+        "cell": cid,
+        "duration_s": round(time.perf_counter() - started, 2),
+        "total_issues": len(all_issues),
+        "issues": all_issues,
+        "contrast_issues": [c for screen in screens for c in screen["contrast"]],
+        "overflow_issues": [o for screen in screens for o in screen["text_overflow"]],
+        "dom_audit": [{k: screen[k] for k in ("context", "elements", "collect_ms", "rules_ms", "roundtrip_ms", "contrast_unknown")}
+                      for screen in screens],
+        "console_errors": console_errors[:20],
+        "readiness": ready.log.summary(),
+        "perf": perf
+    }
+    if profile:
+        report["profile"] = profiler.passes
+    path = os.path.join(out_dir, f"audit_v2_report_{cid}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"[{cid}] Report saved: {path} ({report['duration_s']}s)")
+    return {"cell": cid, "report": path, "prefix": prefix, "total_issues": len(all_issues), "duration_s": report["duration_s"]}
+
+
+async def run_shard(cells, base_url, out_dir, concurrency, profile=False):
+    """Audit a list of (device, network, cpu) cells on one shared browser."""
+    # Chrome allows one trace per browser: traced cells take turns
+    semaphore = asyncio.Semaphore(1 if profile else concurrency)
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+
+        async def guarded(device_id, network_id, cpu_id):
+            async with semaphore:
+                try:
+                    return await audit_cell(p, browser, device_id, network_id, base_url, out_dir, cpu_id, profile)
+                except Exception as e:
+                    print(f"[{cell_id(device_id, network_id, cpu_id)}] [FATAL] {e}")
+                    return {"cell": cell_id(device_id, network_id, cpu_id), "error": str(e)}
+
+        try:
+            return await asyncio.gather(*(guarded(d, n, c) for d, n, c in cells))
+        finally:
+            await browser.close()
+
+
+def _run_shard_process(args):
+    return asyncio.run(run_shard(*args))
+
+
+def visual_regression(results, out_dir, baselines, workers=None, approve=False):
+    """Compares every cell's screenshots with the baselines and merges each cell's share into its report."""
+    cells = [r for r in results if r.get("report")]
+    shots = {}
+    for r in cells:
+        # Throttled cells extend the unthrottled prefix, so match the exact file name as well
+        candidates = [shot_from_sidecar(p) for p in sorted(glob.glob(os.path.join(out_dir, f"{r['prefix']}_*.png")))
+                      if os.path.exists(p + ".visual.json")]
+        shots[r["cell"]] = [s for s in candidates if os.path.basename(s["path"]) == f"{r['prefix']}_{s['screen']}.png"]
+    summary = compare([s for cell in shots.values() for s in cell], BaselineStore(baselines),
+                      os.path.join(out_dir, "visual_diff"), workers=workers, approve=approve)
+    by_path = {r["path"]: r for r in summary["results"]}
+    for r in cells:
+        cell_results = [by_path[s["path"]] for s in shots[r["cell"]]]
+        with open(r["report"], encoding="utf-8") as f:
+            report = json.load(f)
+        report["visual"] = {
+            "failed": sum(1 for v in cell_results if v["status"] == "failed"),
+            "new": sum(1 for v in cell_results if v["status"] == "new"),
+            "results": cell_results,
+        }
+        with open(r["report"], "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        r["visual_failed"] = report["visual"]["failed"]
+    print_summary(summary)
+    return {k: v for k, v in summary.items() if k != "results"}
+
+
+def run_matrix(devices=None, networks=None, base_url=BASE_URL, out_dir=DEFAULT_OUT_DIR, workers=None, concurrency=3,
+               visual=False, baselines=DEFAULT_BASELINE_DIR, approve=False, cpus=None, profile=False):
+    """Spread the device x network x cpu matrix across worker processes."""
+    cells = list(product(devices or DEFAULT_DEVICES, networks or DEFAULT_NETWORKS, cpus or DEFAULT_CPUS))
+    workers = max(1, min(workers or os.cpu_count() or 1, len(cells)))
+    os.makedirs(out_dir, exist_ok=True)
+    shards = [(cells[i::workers], base_url, out_dir, concurrency, profile) for i in range(workers)]
+
+    started = time.perf_counter()
+    if profile and concurrency > 1:
+        print("[MATRIX] --profile-trace: one context per worker at a time (Chrome traces one session per browser)")
+        concurrency = 1
+    print(f"[MATRIX] {len(cells)} cells across {workers} workers x {concurrency} contexts")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = [r for shard in pool.map(_run_shard_process, shards) for r in shard]
+
+    summary = {
+        "audit_version": "v2-matrix",
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": base_url,
+        "wall_clock_s": round(time.perf_counter() - started, 2),
+        "cells": sorted(results, key=lambda r: r["cell"])
+    }
+    if visual or approve:
+        summary["visual"] = visual_regression(results, out_dir, baselines, workers, approve)
+    with open(os.path.join(out_dir, "audit_v2_matrix_summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    print(f"\n=== MATRIX COMPLETE in {summary['wall_clock_s']}s — {out_dir}/audit_v2_matrix_summary.json ===")
+    return summary
+
+
+def _csv(value):
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=_csv, default=DEFAULT_DEVICES, help=f"Comma list from: {', '.join(DEVICES)}")
+    parser.add_argument("--networks", type=_csv, default=DEFAULT_NETWORKS, help=f"Comma list from: {', '.join(NETWORK_PROFILES)}")
+    parser.add_argument("--cpus", type=_csv, default=DEFAULT_CPUS, help=f"Comma list from: {', '.join(CPU_PROFILES)}")
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--out-dir", default=DEFAULT_OUT_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--concurrency", type=int, default=3, help="Browser contexts per worker")
+    parser.add_argument("--visual", action="store_true", help="Compare the screenshots with the baselines (audit/visual_diff.py)")
+    parser.add_argument("--baselines", default=DEFAULT_BASELINE_DIR)
+    parser.add_argument("--approve", action="store_true", help="Store this run's screenshots as the newest baselines")
+    parser.add_argument("--profile-trace", action="store_true",
+                        help="Record a Chrome trace and CDP metrics per pass (audit/trace_profile.py)")
+    args = parser.parse_args()
+
+    unknown = ([d for d in args.devices if d not in DEVICES] + [n for n in args.networks if n not in NETWORK_PROFILES]
+               + [c for c in args.cpus if c not in CPU_PROFILES])
+    if unknown:
+        parser.error(f"Unknown device/network profile(s): {', '.join(unknown)}")
+    run_matrix(args.devices, args.networks, args.url, args.out_dir, args.workers, args.concurrency,
+               args.visual, args.baselines, args.approve, args.cpus, args.profile_trace)
+
+
+if __name__ == "__main__":
+    main()
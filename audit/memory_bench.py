@@ -0,0 +1,181 @@
+"""
+Memory Benchmark - Adventure Forge
+Plays a session of N turns (default 20) and samples memory after each one:
+
+  used_js_heap / total_js_heap   performance.memory (precise memory info enabled)
+  cdp_heap_used / dom_nodes      CDP Performance.getMetrics
+  media                          window.__afMedia.stats(): live object URLs and their bytes
+  audio_cache                    window.__afAudioCache.stats(): clip cache size, hits/misses, evictions
+
+A CDP garbage collection runs before every sample so the series shows retained
+memory, not allocation noise. Meant to run against the stand-in API so every
+turn carries the same image/audio payloads. The report goes to
+audit_v2_memory_report.json; with --max-growth-kb the run fails when the heap
+grows faster than that per turn.
+
+Usage:
+    npm run standin -- --profile default &
+    REACT_APP_API_URL=http://localhost:3001 npm start &
+    AUDIT_BASE_URL=http://localhost:3000 python -m audit.memory_bench --turns 20 --max-growth-kb 512
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+from playwright.async_api import async_playwright
+
+from audit.profiles import BASE_URL, DEVICES, NETWORK_PROFILES, context_options, network_conditions
+from audit.readiness import AsyncReadiness, install_stream_probe
+from audit.stats import linear_slope
+
+DEFAULT_REPORT = "audit_v2_memory_report.json"
+OPTION_BUTTON = '[data-testid="game-options-container"] button:not([disabled])'
+
+_OPTIONS_CLICKABLE_JS = """() => {
+    const container = document.querySelector('[data-testid="game-options-container"]');
+    return !!container && getComputedStyle(container).display !== 'none' && !!container.querySelector('button:not([disabled])');
+}"""
+
+_SAMPLE_JS = """() => ({
+    used_js_heap: performance.memory ? performance.memory.usedJSHeapSize : null,
+    total_js_heap: performance.memory ? performance.memory.totalJSHeapSize : null,
+    media: window.__afMedia ? window.__afMedia.stats() : null,
+    audio_cache: window.__afAudioCache ? window.__afAudioCache.stats() : null,
+})"""
+
+
+async def click_through_turn(page, ready, max_clicks=40):
+    """Advance the cinematic like a player until the options are clickable."""
+    for _ in range(max_clicks):
+        if await page.evaluate(_OPTIONS_CLICKABLE_JS):
+            return True
+        if await ready.selector('.cinematic-text-overlay.visible .click-hint', "click hint", timeout_ms=15000):
+            await page.click('[data-testid="game-cinematic-container"]')
+    return await page.evaluate(_OPTIONS_CLICKABLE_JS)
+
+
+async def sample_memory(page, cdp, turn):
+    await cdp.send("HeapProfiler.collectGarbage")
+    sample = await page.evaluate(_SAMPLE_JS)
+    metrics = {m["name"]: m["value"] for m in (await cdp.send("Performance.getMetrics"))["metrics"]}
+    sample.update({
+        "turn": turn,
+        "cdp_heap_used": metrics.get("JSHeapUsedSize"),
+        "dom_nodes": metrics.get("Nodes"),
+    })
+    return sample
+
+
+async def run_session(device_id, network_id, turns, base_url):
+    samples = []
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=["--enable-precise-memory-info"])
+        context = await browser.new_context(**context_options(p, device_id))
+        await install_stream_probe(context)
+        page = await context.new_page()
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Network.emulateNetworkConditions", network_conditions(network_id))
+        await cdp.send("Performance.enable")
+        ready = AsyncReadiness(page)
+        try:
+            await page.goto(base_url)
+            await ready.test_id("new-adventure-btn", "main menu", probe="app_shell")
+            samples.append(await sample_memory(page, cdp, 0))
+
+            await page.click('[data-testid="new-adventure-btn"]')
+            await ready.test_id("start-adventure-btn", "adventure selection")
+            mark = await ready.stream_mark()
+            await page.click('[data-testid="start-adventure-btn"]')
+
+            for turn in range(1, turns + 1):
+                if not await ready.stream_event("done", since=mark, timeout_ms=120000):
+                    print(f"[MEMORY] Turn {turn}: stream never finished, stopping")
+                    break
+                if not await click_through_turn(page, ready):
+                    print(f"[MEMORY] Turn {turn}: options never became clickable, stopping")
+                    break
+                sample = await sample_memory(page, cdp, turn)
+                samples.append(sample)
+                media = sample["media"] or {}
+                print(f"[MEMORY] Turn {turn}/{turns}: heap {(sample['used_js_heap'] or 0) / 1e6:.1f} MB, "
+                      f"nodes {sample['dom_nodes']:.0f}, live media {media.get('live', '?')} ({media.get('bytes', 0) / 1e3:.0f} KB)")
+                if turn < turns:
+                    mark = await ready.stream_mark()
+                    await page.click(OPTION_BUTTON)
+        finally:
+            await context.close()
+            await browser.close()
+    return samples, ready.log.summary()
+
+
+def summarize_growth(samples):
+    """Growth of retained memory across turns (the app-shell sample is excluded)."""
+    turns = [s for s in samples if s["turn"] > 0]
+    if not turns:
+        return {}
+    xs = [s["turn"] for s in turns]
+
+    def series(key):
+        return [s.get(key) for s in turns]
+
+    used = [v for v in series("used_js_heap") if v is not None]
+    slope = linear_slope(xs, series("used_js_heap"))
+    return {
+        "turns_played": len(turns),
+        "first_turn_heap": used[0] if used else None,
+        "last_turn_heap": used[-1] if used else None,
+        "peak_heap": max(used) if used else None,
+        "heap_growth_per_turn": round(slope) if slope is not None else None,
+        "cdp_heap_growth_per_turn": round(linear_slope(xs, series("cdp_heap_used")) or 0),
+        "dom_node_growth_per_turn": round(linear_slope(xs, series("dom_nodes")) or 0, 1),
+        "live_media_last_turn": (turns[-1].get("media") or {}).get("live"),
+        "audio_cache_last_turn": turns[-1].get("audio_cache"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--device", default="desktop-1440", choices=list(DEVICES))
+    parser.add_argument("--network", default="wifi", choices=list(NETWORK_PROFILES))
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--out", default=DEFAULT_REPORT)
+    parser.add_argument("--max-growth-kb", type=float, default=None, help="Fail when heap grows faster than this per turn")
+    args = parser.parse_args()
+
+    samples, readiness = asyncio.run(run_session(args.device, args.network, args.turns, args.url))
+    growth = summarize_growth(samples)
+    report = {
+        "audit_version": "v2-memory",
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": args.url,
+        "device": DEVICES[args.device]["label"],
+        "network": NETWORK_PROFILES[args.network]["label"],
+        "turns_requested": args.turns,
+        "growth": growth,
+        "samples": samples,
+        "readiness": readiness,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\nMemory report saved: {args.out}")
+
+    per_turn = growth.get("heap_growth_per_turn")
+    if per_turn is not None:
+        print(f"  heap growth {per_turn / 1024:.1f} KB/turn over {growth['turns_played']} turns, "
+              f"peak {growth['peak_heap'] / 1e6:.1f} MB, live media after last turn: {growth['live_media_last_turn']}")
+    if growth.get("turns_played", 0) < args.turns:
+        print(f"[MEMORY] Only {growth.get('turns_played', 0)}/{args.turns} turns completed")
+        return 1
+    if args.max_growth_kb is not None and per_turn is not None and per_turn > args.max_growth_kb * 1024:
+        print(f"[REGRESSION] Heap grows {per_turn / 1024:.1f} KB/turn (budget {args.max_growth_kb:.0f} KB)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
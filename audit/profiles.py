@@ -0,0 +1,74 @@
+"""
+Audit Profiles - Adventure Forge
+Devices, network conditions and target URL shared by the audit scripts.
+"""
+import os
+import re
+
+PROD_URL = "https://adventure-forge.vercel.app"
+# Point the audits at a local build (e.g. http://localhost:3000) without editing code
+BASE_URL = os.environ.get("AUDIT_BASE_URL", PROD_URL)
+
+# Throughput in kbps, latency in ms. `None` throughput means "no throttling".
+NETWORK_PROFILES = {
+    "slow-3g": {"label": "Slow 3G (300kbps/500ms latency)", "latency": 500, "download_kbps": 300, "upload_kbps": 150},
+    "3g": {"label": "3G (400kbps/400ms latency)", "latency": 400, "download_kbps": 400, "upload_kbps": 200},
+    "fast-3g": {"label": "Fast 3G (1.6Mbps/150ms latency)", "latency": 150, "download_kbps": 1600, "upload_kbps": 750},
+    "4g": {"label": "4G (9Mbps/60ms latency)", "latency": 60, "download_kbps": 9000, "upload_kbps": 3000},
+    "wifi": {"label": "Unthrottled", "latency": 0, "download_kbps": None, "upload_kbps": None},
+}
+
+# CDP Emulation.setCPUThrottlingRate slowdown factors, recorded per cell next to the network profile
+CPU_PROFILES = {
+    "none": {"label": "No CPU throttling", "rate": 1},
+    "mid-tier-mobile": {"label": "Mid-tier mobile (4x slowdown)", "rate": 4},
+    "low-end-mobile": {"label": "Low-end mobile (6x slowdown)", "rate": 6},
+}
+
+# `descriptor` is a Playwright device name; custom entries define the viewport directly.
+DEVICES = {
+    "iphone-13": {"label": "iPhone 13 (375x812)", "descriptor": "iPhone 13"},
+    "iphone-se": {"label": "iPhone SE (320x568)", "descriptor": "iPhone SE"},
+    "iphone-13-pro-max": {"label": "iPhone 13 Pro Max (428x926)", "descriptor": "iPhone 13 Pro Max"},
+    "pixel-5": {"label": "Pixel 5 (393x851)", "descriptor": "Pixel 5"},
+    "pixel-7": {"label": "Pixel 7 (412x915)", "descriptor": "Pixel 7"},
+    "galaxy-s9": {"label": "Galaxy S9+ (320x658)", "descriptor": "Galaxy S9+"},
+    "ipad-mini": {"label": "iPad Mini (768x1024)", "descriptor": "iPad Mini"},
+    "galaxy-tab-s4": {"label": "Galaxy Tab S4 (712x1138)", "descriptor": "Galaxy Tab S4"},
+    "laptop-1280": {"label": "Laptop (1280x720)", "viewport": {"width": 1280, "height": 720}},
+    "desktop-1440": {"label": "Desktop (1440x900)", "viewport": {"width": 1440, "height": 900}},
+}
+
+DEFAULT_DEVICES = list(DEVICES.keys())
+DEFAULT_NETWORKS = ["slow-3g"]
+DEFAULT_CPUS = ["none"]
+
+
+def context_options(playwright, device_id, locale="es-ES", timezone_id="Europe/Madrid"):
+    """Build `browser.new_context()` kwargs for a device id."""
+    device = DEVICES[device_id]
+    if device.get("descriptor"):
+        options = dict(playwright.devices[device["descriptor"]])
+    else:
+        options = {"viewport": dict(device["viewport"])}
+    options.update(locale=locale, timezone_id=timezone_id)
+    return options
+
+
+def network_conditions(network_id):
+    """CDP `Network.emulateNetworkConditions` payload for a network profile."""
+    profile = NETWORK_PROFILES[network_id]
+    down = profile["download_kbps"]
+    up = profile["upload_kbps"]
+    return {
+        "offline": False,
+        "latency": profile["latency"],
+        "downloadThroughput": down * 1024 / 8 if down else -1,
+        "uploadThroughput": up * 1024 / 8 if up else -1,
+    }
+
+
+def cell_id(device_id, network_id, cpu_id="none"):
+    """Filesystem-safe identifier for one device/network(/cpu) matrix cell; unthrottled cells keep the short form."""
+    parts = [device_id, network_id] + ([cpu_id] if cpu_id != "none" else [])
+    return re.sub(r"[^a-z0-9_-]+", "-", "__".join(parts).lower())
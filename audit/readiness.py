@@ -0,0 +1,267 @@
+"""
+Readiness probes - Adventure Forge audits
+Event-driven replacements for fixed `time.sleep` waits.
+
+Probes wait on real app signals instead of wall-clock guesses:
+  - SSE events (`text_structure`, `image`, `audio`, `done`, ...) observed on
+    `/game/stream` through a fetch tee installed with `install_stream_probe()`
+  - `aria-busy` on the game container
+  - the `game-cinematic-container` test id (or any selector)
+  - `document.fonts`, first paint, running animations and network idle
+
+Every wait is timed against a per-probe latency budget and recorded in a
+`ReadinessLog`, so reports show how long each wait took.
+
+`perf()` reads the app's own telemetry (`window.__afPerf`, see
+src/common/services/PerfTelemetry.ts): span percentiles and marks for stream
+connect/first event/done, TTS, audio cache hits, image decode, typewriter
+frame drops and saves, measured in the page instead of from screenshot offsets.
+"""
+import time
+
+# Injected before any page script runs. Tees every /game/stream response so the
+# app keeps its stream while the probe records event types and timings.
+STREAM_PROBE_JS = r"""
+(() => {
+    if (window.__afStream) return;
+    const state = window.__afStream = { requests: [], events: [] };
+    const originalFetch = window.fetch.bind(window);
+    window.fetch = async (input, init) => {
+        const url = typeof input === 'string' ? input : (input && input.url) || '';
+        if (!url.includes('/game/stream')) return originalFetch(input, init);
+
+        const request = { id: state.requests.length, start: performance.now(), firstByte: null, end: null, bytes: 0 };
+        state.requests.push(request);
+        const response = await originalFetch(input, init);
+        request.status = response.status;
+        request.headers = performance.now();
+        if (!response.body) return response;
+
+        const [appBranch, probeBranch] = response.body.tee();
+        (async () => {
+            const reader = probeBranch.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            try {
+                while (true) {
+                    const { done, value } = await reader.read();
+                    if (done) break;
+                    if (request.firstByte === null) request.firstByte = performance.now();
+                    request.bytes += value.byteLength;
+                    buffer += decoder.decode(value, { stream: true });
+                    let boundary;
+                    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                        const block = buffer.slice(0, boundary);
+                        buffer = buffer.slice(boundary + 2);
+                        for (const line of block.split('\n')) {
+                            if (!line.startsWith('data:')) continue;
+                            try {
+                                const event = JSON.parse(line.slice(5).trim());
+                                state.events.push({ request: request.id, type: event.type, index: event.index, t: performance.now() });
+                            } catch (e) { /* partial or non-JSON line */ }
+                        }
+                    }
+                }
+            } catch (e) {
+                request.error = String(e);
+            }
+            request.end = performance.now();
+        })();
+        return new Response(appBranch, { status: response.status, statusText: response.statusText, headers: response.headers });
+    };
+})();
+"""
+
+# (budget_ms, timeout_ms): exceeding the budget is reported, exceeding the timeout fails the probe.
+DEFAULT_BUDGETS = {
+    "app_shell": (5000, 30000),
+    "first_paint": (3000, 15000),
+    "selector": (3000, 15000),
+    "animations": (1000, 5000),
+    "fonts": (2000, 10000),
+    "network_idle": (5000, 30000),
+    "not_busy": (10000, 45000),
+    "stream_event": (15000, 60000),
+    "cinematic": (15000, 60000),
+    "options": (20000, 90000),
+}
+
+_EVENT_SEEN_JS = """
+([type, since]) => !!window.__afStream && window.__afStream.events.slice(since).some(e => e.type === type)
+"""
+_NOT_BUSY_JS = "() => !document.querySelector('[aria-busy=\"true\"]')"
+_FIRST_PAINT_JS = "() => performance.getEntriesByType('paint').length > 0"
+_ANIMATIONS_DONE_JS = "() => document.getAnimations().every(a => a.playState !== 'running')"
+_FONTS_READY_JS = "() => document.fonts.status === 'loaded'"
+_PERF_JS = "() => window.__afPerf ? window.__afPerf.snapshot() : null"
+
+# Console warnings the app also records as telemetry (retries, stream resumes):
+# reported under `perf`, not as bugs
+TELEMETRY_WARNING_PREFIXES = ("[Resilience]", "[Stream]")
+
+
+def is_console_bug(entry):
+    """True for console errors/warnings that belong in the issue list."""
+    return not (entry["type"] == "warning" and entry["text"].startswith(TELEMETRY_WARNING_PREFIXES))
+
+
+def install_stream_probe(context):
+    """Register the /game/stream tee on a (sync or async) browser context.
+
+    Returns the coroutine for async contexts so callers can await it.
+    """
+    return context.add_init_script(script=STREAM_PROBE_JS)
+
+
+class ReadinessLog:
+    """Timings of every probe run against a page."""
+
+    def __init__(self):
+        self.entries = []
+
+    def record(self, probe, label, ok, elapsed_ms, budget_ms, error=None):
+        entry = {
+            "probe": probe,
+            "label": label,
+            "ok": ok,
+            "elapsed_ms": round(elapsed_ms, 1),
+            "budget_ms": budget_ms,
+            "over_budget": elapsed_ms > budget_ms,
+        }
+        if error:
+            entry["error"] = str(error)[:200]
+        self.entries.append(entry)
+        flag = "OK" if ok else "TIMEOUT"
+        if ok and entry["over_budget"]:
+            flag = "SLOW"
+        print(f"[READY] {label}: {flag} in {entry['elapsed_ms']:.0f}ms (budget {budget_ms}ms)")
+        return entry
+
+    def summary(self):
+        return {
+            "probes": self.entries,
+            "total_wait_ms": round(sum(e["elapsed_ms"] for e in self.entries), 1),
+            "over_budget": [e["label"] for e in self.entries if e["over_budget"]],
+            "failed": [e["label"] for e in self.entries if not e["ok"]],
+        }
+
+
+class _ReadinessBase:
+    def __init__(self, page, log=None, budgets=None):
+        self.page = page
+        self.log = log if log is not None else ReadinessLog()
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+
+    def _limits(self, probe, timeout_ms):
+        budget_ms, default_timeout = self.budgets[probe]
+        return budget_ms, timeout_ms or default_timeout
+
+
+class Readiness(_ReadinessBase):
+    """Readiness probes for playwright.sync_api pages."""
+
+    def _run(self, probe, label, wait, timeout_ms=None):
+        budget_ms, timeout_ms = self._limits(probe, timeout_ms)
+        started = time.perf_counter()
+        try:
+            wait(timeout_ms)
+            ok, error = True, None
+        except Exception as e:
+            ok, error = False, e
+        self.log.record(probe, label, ok, (time.perf_counter() - started) * 1000, budget_ms, error)
+        return ok
+
+    def _wait_for_function(self, probe, label, expression, arg=None, timeout_ms=None):
+        return self._run(probe, label, lambda t: self.page.wait_for_function(expression, arg=arg, timeout=t), timeout_ms)
+
+    def selector(self, selector, label=None, state="visible", probe="selector", timeout_ms=None):
+        return self._run(probe, label or selector, lambda t: self.page.wait_for_selector(selector, state=state, timeout=t), timeout_ms)
+
+    def test_id(self, test_id, label=None, probe="selector", timeout_ms=None):
+        return self.selector(f'[data-testid="{test_id}"]', label or test_id, probe=probe, timeout_ms=timeout_ms)
+
+    def cinematic(self, timeout_ms=None):
+        return self.test_id("game-cinematic-container", "cinematic container", probe="cinematic", timeout_ms=timeout_ms)
+
+    def first_paint(self, timeout_ms=None):
+        return self._wait_for_function("first_paint", "first paint", _FIRST_PAINT_JS, timeout_ms=timeout_ms)
+
+    def animations_settled(self, label="animations settled", timeout_ms=None):
+        return self._wait_for_function("animations", label, _ANIMATIONS_DONE_JS, timeout_ms=timeout_ms)
+
+    def fonts(self, timeout_ms=None):
+        return self._wait_for_function("fonts", "fonts loaded", _FONTS_READY_JS, timeout_ms=timeout_ms)
+
+    def network_idle(self, label="network idle", timeout_ms=None):
+        return self._run("network_idle", label, lambda t: self.page.wait_for_load_state("networkidle", timeout=t), timeout_ms)
+
+    def not_busy(self, label="aria-busy cleared", timeout_ms=None):
+        return self._wait_for_function("not_busy", label, _NOT_BUSY_JS, timeout_ms=timeout_ms)
+
+    def stream_mark(self):
+        """Number of stream events seen so far; pass as `since` to wait for the next turn."""
+        return self.page.evaluate("() => window.__afStream ? window.__afStream.events.length : 0")
+
+    def stream_event(self, event_type, since=0, timeout_ms=None):
+        return self._wait_for_function("stream_event", f"SSE {event_type}", _EVENT_SEEN_JS, [event_type, since], timeout_ms)
+
+    def stream_timeline(self):
+        return self.page.evaluate("() => window.__afStream || { requests: [], events: [] }")
+
+    def perf(self):
+        """Snapshot of window.__afPerf (entries, mark counts, span percentiles); None without telemetry."""
+        return self.page.evaluate(_PERF_JS)
+
+
+class AsyncReadiness(_ReadinessBase):
+    """Readiness probes for playwright.async_api pages."""
+
+    async def _run(self, probe, label, wait, timeout_ms=None):
+        budget_ms, timeout_ms = self._limits(probe, timeout_ms)
+        started = time.perf_counter()
+        try:
+            await wait(timeout_ms)
+            ok, error = True, None
+        except Exception as e:
+            ok, error = False, e
+        self.log.record(probe, label, ok, (time.perf_counter() - started) * 1000, budget_ms, error)
+        return ok
+
+    async def _wait_for_function(self, probe, label, expression, arg=None, timeout_ms=None):
+        return await self._run(probe, label, lambda t: self.page.wait_for_function(expression, arg=arg, timeout=t), timeout_ms)
+
+    async def selector(self, selector, label=None, state="visible", probe="selector", timeout_ms=None):
+        return await self._run(probe, label or selector, lambda t: self.page.wait_for_selector(selector, state=state, timeout=t), timeout_ms)
+
+    async def test_id(self, test_id, label=None, probe="selector", timeout_ms=None):
+        return await self.selector(f'[data-testid="{test_id}"]', label or test_id, probe=probe, timeout_ms=timeout_ms)
+
+    async def cinematic(self, timeout_ms=None):
+        return await self.test_id("game-cinematic-container", "cinematic container", probe="cinematic", timeout_ms=timeout_ms)
+
+    async def first_paint(self, timeout_ms=None):
+        return await self._wait_for_function("first_paint", "first paint", _FIRST_PAINT_JS, timeout_ms=timeout_ms)
+
+    async def animations_settled(self, label="animations settled", timeout_ms=None):
+        return await self._wait_for_function("animations", label, _ANIMATIONS_DONE_JS, timeout_ms=timeout_ms)
+
+    async def fonts(self, timeout_ms=None):
+        return await self._wait_for_function("fonts", "fonts loaded", _FONTS_READY_JS, timeout_ms=timeout_ms)
+
+    async def network_idle(self, label="network idle", timeout_ms=None):
+        return await self._run("network_idle", label, lambda t: self.page.wait_for_load_state("networkidle", timeout=t), timeout_ms)
+
+    async def not_busy(self, label="aria-busy cleared", timeout_ms=None):
+        return await self._wait_for_function("not_busy", label, _NOT_BUSY_JS, timeout_ms=timeout_ms)
+
+    async def stream_mark(self):
+        return await self.page.evaluate("() => window.__afStream ? window.__afStream.events.length : 0")
+
+    async def stream_event(self, event_type, since=0, timeout_ms=None):
+        return await self._wait_for_function("stream_event", f"SSE {event_type}", _EVENT_SEEN_JS, [event_type, since], timeout_ms)
+
+    async def stream_timeline(self):
+        return await self.page.evaluate("() => window.__afStream || { requests: [], events: [] }")
+
+    async def perf(self):
+        return await self.page.evaluate(_PERF_JS)
@@ -0,0 +1,232 @@
+"""
+Save Benchmark - Adventure Forge
+Plays a session of N turns (default 50) and saves after every one, once per
+save protocol, against the stand-in API:
+
+  delta   POST /game/save/delta: appended turns only, images as content hashes,
+          gzip bodies (SaveSession's default against servers that support it)
+  full    the stand-in's delta routes are switched off, so the client falls
+          back to the legacy self-contained POST /game/save
+
+Per save it records the bytes on the wire (request bodies seen by the
+browser), the JSON size before compression and the save latency measured by
+the client (window.__afSave.stats()). The report compares total and per-save
+bytes, how fast they grow per turn, and latency percentiles, and goes to
+audit_v2_save_report.json. The run signs in with a fake stored Google session;
+the stand-in does not check tokens.
+
+Usage:
+    npm run standin -- --profile ci-fast &
+    REACT_APP_API_URL=http://localhost:3001 npm start &
+    AUDIT_BASE_URL=http://localhost:3000 python -m audit.save_bench --turns 50 --standin http://localhost:3001
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import urllib.request
+from datetime import datetime, timezone
+
+from playwright.async_api import async_playwright
+
+from audit.memory_bench import OPTION_BUTTON, click_through_turn
+from audit.profiles import BASE_URL, DEVICES, NETWORK_PROFILES, context_options, network_conditions
+from audit.readiness import AsyncReadiness, install_stream_probe
+from audit.stats import linear_slope, summarize
+
+DEFAULT_REPORT = "audit_v2_save_report.json"
+MODES = ("delta", "full")
+SIZE_BUCKETS_KB = [1, 4, 16, 64, 256, 1024, 4096]
+
+FAKE_SESSION_JS = """
+localStorage.setItem('user', JSON.stringify({
+    email: 'bench@example.com', googleId: 'save-bench', firstName: 'Save', lastName: 'Bench', picture: ''
+}));
+localStorage.setItem('google_token', 'save-bench-token');
+"""
+
+_SAVES_JS = "() => window.__afSave ? window.__afSave.stats().saves : 0"
+_SAVED_AFTER_JS = "(count) => !!window.__afSave && window.__afSave.stats().saves > count"
+
+
+def set_standin_features(standin_url, features):
+    """Switch stand-in features at runtime (POST /__standin/profile)."""
+    request = urllib.request.Request(
+        f"{standin_url.rstrip('/')}/__standin/profile",
+        data=json.dumps({"features": features}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.load(response)
+
+
+async def save_now(page, wire, timeout_ms=60000):
+    """Click the save button and wait for SaveSession to finish; returns its stats and wire bytes."""
+    saves = await page.evaluate(_SAVES_JS)
+    wire.clear()
+    await page.click(".save-button")
+    try:
+        await page.wait_for_function(_SAVED_AFTER_JS, arg=saves, timeout=timeout_ms)
+    except Exception:
+        return None
+    stats = await page.evaluate("() => window.__afSave.stats()")
+    return {
+        "wire_bytes": sum(r["bytes"] for r in wire),
+        "requests": [r["url"] for r in wire],
+        "gzip": any(r["gzip"] for r in wire),
+        "client_bytes": stats["lastSaveBytes"],
+        "raw_bytes": stats["lastSaveRawBytes"],
+        "save_ms": stats["lastSaveMs"],
+        "session": stats,
+    }
+
+
+async def run_mode(p, mode, device_id, network_id, turns, base_url):
+    saves = []
+    wire = []
+
+    def on_request(request):
+        if request.method == "POST" and "/game/save" in request.url:
+            body = request.post_data_buffer or b""
+            wire.append({"url": request.url.rsplit("/game/", 1)[-1], "bytes": len(body),
+                         "gzip": request.headers.get("content-encoding") == "gzip"})
+
+    browser = await p.chromium.launch(headless=True)
+    context = await browser.new_context(**context_options(p, device_id))
+    await install_stream_probe(context)
+    await context.add_init_script(script=FAKE_SESSION_JS)
+    page = await context.new_page()
+    page.on("request", on_request)
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Network.emulateNetworkConditions", network_conditions(network_id))
+    ready = AsyncReadiness(page)
+    try:
+        await page.goto(base_url)
+        await ready.test_id("new-adventure-btn", "main menu", probe="app_shell")
+        await page.click('[data-testid="new-adventure-btn"]')
+        await ready.test_id("start-adventure-btn", "adventure selection")
+        mark = await ready.stream_mark()
+        await page.click('[data-testid="start-adventure-btn"]')
+
+        for turn in range(1, turns + 1):
+            if not await ready.stream_event("done", since=mark, timeout_ms=120000):
+                print(f"[SAVE] {mode} turn {turn}: stream never finished, stopping")
+                break
+            if not await click_through_turn(page, ready):
+                print(f"[SAVE] {mode} turn {turn}: options never became clickable, stopping")
+                break
+            result = await save_now(page, wire)
+            if result is None:
+                print(f"[SAVE] {mode} turn {turn}: save did not complete, stopping")
+                break
+            result["turn"] = turn
+            saves.append(result)
+            print(f"[SAVE] {mode} turn {turn}/{turns}: {result['wire_bytes'] / 1024:.1f} KB on the wire "
+                  f"({result['raw_bytes'] / 1024:.1f} KB JSON{', gzip' if result['gzip'] else ''}), {result['save_ms']} ms")
+            if turn < turns:
+                mark = await ready.stream_mark()
+                await page.click(OPTION_BUTTON)
+    finally:
+        await context.close()
+        await browser.close()
+    return saves, ready.log.summary()
+
+
+def summarize_mode(saves):
+    if not saves:
+        return {"saves": 0}
+    turns = [s["turn"] for s in saves]
+    wire = [s["wire_bytes"] for s in saves]
+    slope = linear_slope(turns, wire)
+    return {
+        "saves": len(saves),
+        "total_wire_bytes": sum(wire),
+        "total_raw_bytes": sum(s["raw_bytes"] for s in saves),
+        "first_save_bytes": wire[0],
+        "last_save_bytes": wire[-1],
+        "wire_growth_per_turn": round(slope) if slope is not None else None,
+        "wire_kb": summarize([b / 1024 for b in wire], edges=SIZE_BUCKETS_KB),
+        "save_ms": summarize([s["save_ms"] for s in saves]),
+        "gzip_saves": sum(1 for s in saves if s["gzip"]),
+        "protocols": sorted({url for s in saves for url in s["requests"]}),
+    }
+
+
+async def run_benchmark(modes, device_id, network_id, turns, base_url, standin_url):
+    results = {}
+    async with async_playwright() as p:
+        for mode in modes:
+            set_standin_features(standin_url, {"delta_saves": mode == "delta"})
+            saves, readiness = await run_mode(p, mode, device_id, network_id, turns, base_url)
+            results[mode] = {"summary": summarize_mode(saves), "saves": saves, "readiness": readiness}
+    set_standin_features(standin_url, {"delta_saves": True})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma-separated subset of {', '.join(MODES)}")
+    parser.add_argument("--device", default="desktop-1440", choices=list(DEVICES))
+    parser.add_argument("--network", default="wifi", choices=list(NETWORK_PROFILES))
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--standin", default="http://localhost:3001", help="Stand-in API base URL (used to switch save protocols)")
+    parser.add_argument("--out", default=DEFAULT_REPORT)
+    parser.add_argument("--max-delta-save-kb", type=float, default=None,
+                        help="Fail when a delta save after the first sends more than this")
+    args = parser.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(unknown)}")
+
+    results = asyncio.run(run_benchmark(modes, args.device, args.network, args.turns, args.url, args.standin))
+    report = {
+        "audit_version": "v2-save",
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": args.url,
+        "device": DEVICES[args.device]["label"],
+        "network": NETWORK_PROFILES[args.network]["label"],
+        "turns_requested": args.turns,
+        "modes": results,
+    }
+    delta = results.get("delta", {}).get("summary", {})
+    full = results.get("full", {}).get("summary", {})
+    if delta.get("saves") and full.get("saves"):
+        report["delta_vs_full"] = {
+            "total_bytes_ratio": round(delta["total_wire_bytes"] / full["total_wire_bytes"], 4),
+            "save_ms_p50_ratio": round(delta["save_ms"]["p50"] / full["save_ms"]["p50"], 3) if full["save_ms"]["p50"] else None,
+        }
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"\nSave report saved: {args.out}")
+    for mode, result in results.items():
+        s = result["summary"]
+        if not s.get("saves"):
+            print(f"  {mode:<6} no saves completed")
+            continue
+        print(f"  {mode:<6} {s['saves']} saves, {s['total_wire_bytes'] / 1e6:.2f} MB total, "
+              f"last {s['last_save_bytes'] / 1024:.1f} KB, growth {(s['wire_growth_per_turn'] or 0) / 1024:+.1f} KB/turn, "
+              f"save p50 {s['save_ms']['p50']:.0f} ms / p95 {s['save_ms']['p95']:.0f} ms")
+    if "delta_vs_full" in report:
+        print(f"  delta sends {report['delta_vs_full']['total_bytes_ratio'] * 100:.1f}% of the full-save bytes")
+
+    if any(result["summary"].get("saves", 0) < args.turns for result in results.values()):
+        print("[SAVE] Not every mode completed all turns")
+        return 1
+    if args.max_delta_save_kb is not None:
+        later = [s["wire_bytes"] for s in results.get("delta", {}).get("saves", [])[1:]]
+        worst = max(later, default=0)
+        if worst > args.max_delta_save_kb * 1024:
+            print(f"[REGRESSION] A delta save sent {worst / 1024:.1f} KB (budget {args.max_delta_save_kb:.0f} KB)")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
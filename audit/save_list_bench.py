@@ -0,0 +1,269 @@
+"""
+Save List Benchmark - Adventure Forge
+Seeds the stand-in API with a synthetic heavy account (default 1000 saves of
+30 turns each, inline base64 images like legacy saves) and measures what the
+load dialog and opening a save cost:
+
+  api       straight HTTP against the stand-in, no browser:
+              list    legacy GET /game/list (whole array) vs the first cursor
+                      page, and walking every page
+              load    legacy GET /game/load (full history, inline images) vs
+                      phase one of the two-phase load (latest turn, images as
+                      media references) and phase two (older history pages
+                      and the referenced media)
+  browser   the app against the stand-in: time to the first row of the load
+            dialog, the most rows ever in the DOM while scrolling to the end
+            of the list (virtualized: about a screenful whatever the count),
+            then opening a save until the latest turn shows and until the
+            older history has been paged in (window.__afPerf `save.history`)
+
+The report goes to audit_v2_save_list_report.json. The browser run signs in
+with a fake stored Google session; the stand-in does not check tokens.
+
+Usage:
+    npm run standin -- --profile default &
+    REACT_APP_API_URL=http://localhost:3001 npm start &
+    AUDIT_BASE_URL=http://localhost:3000 python -m audit.save_list_bench --saves 1000 --standin http://localhost:3001
+    python -m audit.save_list_bench --skip-browser --standin http://localhost:3001
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import httpx
+from playwright.async_api import async_playwright
+
+from audit.profiles import BASE_URL, DEVICES, NETWORK_PROFILES, context_options, network_conditions
+from audit.readiness import AsyncReadiness
+from audit.save_bench import FAKE_SESSION_JS
+from audit.stats import summarize
+
+DEFAULT_REPORT = "audit_v2_save_list_report.json"
+PAGE_SIZE = 30          # SAVE_LIST_PAGE_SIZE in src/common/services/GameService.ts
+LATEST_TURN_HISTORY = 2  # src/common/services/SaveSession.ts
+HISTORY_PAGE_SIZE = 20
+SIZE_BUCKETS_KB = [1, 4, 16, 64, 256, 1024, 4096]
+
+SAVE_ROW = '[data-testid="save-item"]'
+_LIST_STATE_JS = """() => {
+    const list = document.querySelector('[data-testid="saves-list"]');
+    if (!list) return null;
+    return {
+        rows: list.querySelectorAll('[data-testid="save-item"]').length,
+        scrollHeight: list.scrollHeight,
+        spacerHeight: list.firstElementChild ? list.firstElementChild.offsetHeight : 0,
+    };
+}"""
+_HISTORY_DONE_JS = "() => !!window.__afPerf && window.__afPerf.entries(0, 'save.history').length > 0"
+_SCROLL_TO_END_JS = """() => {
+    const list = document.querySelector('[data-testid="saves-list"]');
+    list.scrollTop = list.scrollHeight;
+}"""
+
+
+async def timed_get(client, path, **params):
+    """GET `path`; returns (json, bytes, ms)."""
+    started = time.perf_counter()
+    response = await client.get(path, params=params)
+    elapsed = (time.perf_counter() - started) * 1000
+    response.raise_for_status()
+    return response.json(), len(response.content), elapsed
+
+
+async def seed_account(client, saves, turns):
+    response = await client.post("/__standin/seed", json={"saves": saves, "turns": turns}, timeout=300)
+    response.raise_for_status()
+    return response.json()
+
+
+async def bench_list(client):
+    legacy, legacy_bytes, legacy_ms = await timed_get(client, "/game/list")
+    first, first_bytes, first_ms = await timed_get(client, "/game/list", limit=PAGE_SIZE)
+
+    pages, page_ms, page_bytes, seen = 1, [first_ms], [first_bytes], len(first["items"])
+    cursor = first["nextCursor"]
+    while cursor:
+        page, size, elapsed = await timed_get(client, "/game/list", limit=PAGE_SIZE, cursor=cursor)
+        pages += 1
+        page_ms.append(elapsed)
+        page_bytes.append(size)
+        seen += len(page["items"])
+        cursor = page["nextCursor"]
+    print(f"[LIST] legacy: {len(legacy)} saves, {legacy_bytes / 1024:.1f} KB, {legacy_ms:.0f} ms; "
+          f"first page: {len(first['items'])} saves, {first_bytes / 1024:.1f} KB, {first_ms:.0f} ms; "
+          f"{pages} pages for {seen} saves")
+    return {
+        "legacy": {"saves": len(legacy), "bytes": legacy_bytes, "ms": round(legacy_ms, 1)},
+        "first_page": {"saves": len(first["items"]), "bytes": first_bytes, "ms": round(first_ms, 1)},
+        "all_pages": {"pages": pages, "saves": seen, "bytes": sum(page_bytes), "page_ms": summarize(page_ms)},
+        "complete": seen == len(legacy),
+    }, [s["_id"] for s in legacy]
+
+
+async def bench_load(client, save_id):
+    """Legacy full load vs the two phases of GameService.loadGame + SaveSession paging."""
+    _, full_bytes, full_ms = await timed_get(client, "/game/load", saveId=save_id)
+
+    started = time.perf_counter()
+    latest, first_bytes, first_ms = await timed_get(client, "/game/load", saveId=save_id,
+                                                    historyLimit=LATEST_TURN_HISTORY, media="ref")
+    rest_bytes, offset = 0, latest.get("historyOffset", 0)
+    while offset > 0:
+        start = max(0, offset - HISTORY_PAGE_SIZE)
+        page, size, _ = await timed_get(client, "/game/history", saveId=save_id, offset=start, limit=offset - start)
+        rest_bytes += size
+        offset = page["offset"]
+    for ref in {i for i in latest.get("currentImages") or [] if i.startswith("media:")}:
+        _, size, _ = await timed_get(client, "/game/media", hash=ref[len("media:"):])
+        rest_bytes += size
+    total_ms = (time.perf_counter() - started) * 1000
+    return {
+        "full_bytes": full_bytes, "full_ms": full_ms,
+        "first_bytes": first_bytes, "first_ms": first_ms,
+        "two_phase_bytes": first_bytes + rest_bytes, "two_phase_ms": total_ms,
+    }
+
+
+async def run_api(standin_url, loads):
+    async with httpx.AsyncClient(base_url=standin_url, timeout=60) as client:
+        list_result, ids = await bench_list(client)
+        sample = ids[:: max(1, len(ids) // loads)][:loads] if ids else []
+        results = [await bench_load(client, save_id) for save_id in sample]
+    summary = {key: summarize([r[key] for r in results]) for key in ("full_ms", "first_ms", "two_phase_ms")}
+    summary.update({key: summarize([r[key] / 1024 for r in results], edges=SIZE_BUCKETS_KB)
+                    for key in ("full_bytes", "first_bytes", "two_phase_bytes")})
+    if results:
+        print(f"[LOAD] {len(results)} saves: full p50 {summary['full_bytes']['p50']:.1f} KB / {summary['full_ms']['p50']:.0f} ms, "
+              f"latest turn p50 {summary['first_bytes']['p50']:.1f} KB / {summary['first_ms']['p50']:.0f} ms")
+    return {"list": list_result, "load": {"saves": len(results), "summary": summary}}
+
+
+async def run_browser(p, device_id, network_id, base_url, expected_saves, row_height):
+    browser = await p.chromium.launch(headless=True)
+    context = await browser.new_context(**context_options(p, device_id))
+    await context.add_init_script(script=FAKE_SESSION_JS)
+    page = await context.new_page()
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Network.emulateNetworkConditions", network_conditions(network_id))
+    ready = AsyncReadiness(page)
+    result = {}
+    try:
+        await page.goto(base_url)
+        if not await ready.test_id("load-game-btn", "load game button", timeout_ms=30000):
+            print("[BROWSER] The menu never offered Load Game (is the app pointed at the stand-in?)")
+            return result, ready.log.summary()
+
+        started = time.perf_counter()
+        await page.click('[data-testid="load-game-btn"]')
+        if not await ready.selector(SAVE_ROW, "first save row", timeout_ms=30000):
+            return result, ready.log.summary()
+        result["first_row_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        # Scroll to the end until every page is in (the spacer grows by a page per fetch)
+        started = time.perf_counter()
+        max_rows, stalled, state = 0, 0, await page.evaluate(_LIST_STATE_JS)
+        while stalled < 10 and state["spacerHeight"] < expected_saves * row_height:
+            previous = state["spacerHeight"]
+            await page.evaluate(_SCROLL_TO_END_JS)
+            await page.wait_for_timeout(100)
+            state = await page.evaluate(_LIST_STATE_JS)
+            max_rows = max(max_rows, state["rows"])
+            stalled = stalled + 1 if state["spacerHeight"] == previous else 0
+        result["scroll_to_end_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        result["saves_listed"] = round(state["spacerHeight"] / row_height)
+        result["max_rendered_rows"] = max_rows
+        print(f"[BROWSER] first row {result['first_row_ms']:.0f} ms; {result['saves_listed']} saves listed with "
+              f"at most {max_rows} rows in the DOM; end of list after {result['scroll_to_end_ms']:.0f} ms")
+
+        started = time.perf_counter()
+        await page.locator(SAVE_ROW).last.click()
+        if await ready.test_id("game-options-container", "latest turn", timeout_ms=60000):
+            result["latest_turn_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        try:
+            await page.wait_for_function(_HISTORY_DONE_JS, timeout=60000)
+            result["history_complete_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        except Exception:
+            print("[BROWSER] The older history was never paged in")
+        result["perf"] = (await ready.perf()).get("spans", {})
+        print(f"[BROWSER] save opened: latest turn {result.get('latest_turn_ms') or 0:.0f} ms, "
+              f"history complete {result.get('history_complete_ms') or 0:.0f} ms")
+    finally:
+        await context.close()
+        await browser.close()
+    return result, ready.log.summary()
+
+
+async def run_benchmark(args):
+    async with httpx.AsyncClient(base_url=args.standin, timeout=300) as client:
+        seeded = await seed_account(client, args.saves, args.turns)
+    print(f"[SEED] {seeded['seeded']} saves added ({seeded['saves']} on the stand-in)")
+    report = {"seeded": seeded, "api": await run_api(args.standin, args.loads)}
+    if not args.skip_browser:
+        async with async_playwright() as p:
+            result, readiness = await run_browser(p, args.device, args.network, args.url, seeded["saves"], args.row_height)
+        report["browser"] = {**result, "readiness": readiness}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--saves", type=int, default=1000, help="Synthetic saves to add to the stand-in account")
+    parser.add_argument("--turns", type=int, default=30, help="Turns of history per synthetic save")
+    parser.add_argument("--loads", type=int, default=20, help="Saves to load in the API comparison")
+    parser.add_argument("--device", default="desktop-1440", choices=list(DEVICES))
+    parser.add_argument("--network", default="wifi", choices=list(NETWORK_PROFILES))
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--standin", default="http://localhost:3001", help="Stand-in API base URL (seeded through /__standin/seed)")
+    parser.add_argument("--skip-browser", action="store_true", help="Only the HTTP comparison (no app needed)")
+    parser.add_argument("--row-height", type=int, default=94, help="ROW_HEIGHT in src/views/MainMenu/LoadGameModal.tsx")
+    parser.add_argument("--out", default=DEFAULT_REPORT)
+    parser.add_argument("--max-rendered-rows", type=int, default=60,
+                        help="Fail when the load dialog ever holds more save rows in the DOM")
+    parser.add_argument("--max-first-page-ms", type=float, default=None,
+                        help="Fail when the first list page takes longer (API run)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args))
+    report = {
+        "audit_version": "v2-save-list",
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": None if args.skip_browser else args.url,
+        "device": None if args.skip_browser else DEVICES[args.device]["label"],
+        "network": None if args.skip_browser else NETWORK_PROFILES[args.network]["label"],
+        "saves_requested": args.saves,
+        "turns_per_save": args.turns,
+        **results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\nSave list report saved: {args.out}")
+
+    api = results["api"]
+    load = api["load"]["summary"]
+    if api["load"]["saves"]:
+        print(f"  opening a save: latest turn {load['first_bytes']['p50'] / load['full_bytes']['p50'] * 100:.2f}% "
+              f"of the full save's bytes, {load['first_ms']['p50']:.0f} ms vs {load['full_ms']['p50']:.0f} ms (p50)")
+    if not api["list"]["complete"]:
+        print("[LIST] Paging did not return every save")
+        return 1
+    browser = results.get("browser")
+    if browser is not None:
+        if "latest_turn_ms" not in browser or browser.get("saves_listed") != results["seeded"]["saves"]:
+            print("[BROWSER] The dialog did not list every save or the save never opened")
+            return 1
+        if browser["max_rendered_rows"] > args.max_rendered_rows:
+            print(f"[REGRESSION] {browser['max_rendered_rows']} save rows in the DOM (budget {args.max_rendered_rows})")
+            return 1
+    if args.max_first_page_ms is not None and api["list"]["first_page"]["ms"] > args.max_first_page_ms:
+        print(f"[REGRESSION] First list page took {api['list']['first_page']['ms']:.0f} ms (budget {args.max_first_page_ms:.0f} ms)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
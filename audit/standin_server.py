@@ -0,0 +1,703 @@
+"""
+Stand-in API - Adventure Forge
+Local asyncio replacement for the /game/* and /ai/audio endpoints of adventure-forge-api.
+
+With `features.image_refs` on, `image` events carry a reference (id, sizes,
+tiny LQIP placeholder) instead of inline base64, and the bytes are served by
+GET /game/image/<id>?w=<width> at the requested width.
+
+Saves follow the delta protocol of SaveSession (POST /game/save/delta with
+media references, gzip bodies, paged /game/load + /game/history); turn
+`features.delta_saves` off to get a server that only knows full saves.
+GET /game/list?limit=N pages newest first with an opaque `cursor` and adds a
+summary and LQIP thumbnail per save (no `limit` = the legacy full array);
+POST /__standin/seed fills the account with synthetic saves for benchmarks.
+
+Every /game/stream event carries an SSE id "<turn>:<seq>". A request with a
+Last-Event-ID header for a turn the server still remembers replays only the
+events after it, on the original schedule, instead of generating a new turn;
+injected drops (`errors.drop_connection`) apply to each connection, so the
+client's resume path can be exercised end to end.
+
+Emits the same StreamEvent shapes that useGameStream/processSSEBuffer consume
+(status, text_structure, image, audio, done, error) with latency, chunk
+splitting, payload sizes and error injection driven by a profile file.
+Every request draws from an RNG seeded by (profile seed, request number), so a
+run with the same profile replays the same timings and failures.
+
+Usage:
+    python -m audit.standin_server --profile slow-mobile --port 3001
+    REACT_APP_API_URL=http://localhost:3001 npm start
+"""
+import argparse
+import asyncio
+import base64
+import collections
+import copy
+import functools
+import gzip
+import hashlib
+import json
+import os
+import random
+import struct
+import time
+import uuid
+import zlib
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlsplit
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "standin_profiles")
+
+DEFAULT_PROFILE = {
+    "seed": 1,
+    "latency": {
+        # Delay before response headers / before each event type, in ms. /game/stream adds
+        # connect.per_kb_ms for every KB of request body (prompt processing grows with the history)
+        "connect": {"mean_ms": 150, "jitter_ms": 50, "per_kb_ms": 4},
+        "status": {"mean_ms": 50, "jitter_ms": 20},
+        "text_structure": {"mean_ms": 1500, "jitter_ms": 400},
+        "image": {"mean_ms": 1200, "jitter_ms": 500},
+        "audio": {"mean_ms": 300, "jitter_ms": 150},
+        "done": {"mean_ms": 50, "jitter_ms": 10},
+        # GET /game/image/<id> (image_refs): time to first byte of a referenced image
+        "image_fetch": {"mean_ms": 60, "jitter_ms": 20},
+        # Saves add per_kb_ms for every KB of (decompressed) body the server has to parse and store
+        "save": {"mean_ms": 120, "jitter_ms": 40, "per_kb_ms": 0.2},
+        # Loads and listings add per_kb_ms for every KB of JSON the server reads and sends
+        "load": {"mean_ms": 150, "jitter_ms": 40, "per_kb_ms": 0.05},
+        "list": {"mean_ms": 80, "jitter_ms": 20, "per_kb_ms": 0.05},
+        # /ai/audio synthesis time: base delay plus per_char_ms for every character of text
+        "tts": {"mean_ms": 600, "jitter_ms": 250, "per_char_ms": 4},
+    },
+    "chunking": {
+        # Each SSE message is written in chunks of [min_bytes, max_bytes]
+        "min_bytes": 512,
+        "max_bytes": 16384,
+        "delay_ms": 5,
+        # Optional throughput cap for the stream body (0 = unlimited)
+        "bandwidth_kbps": 0,
+    },
+    "payloads": {
+        "paragraphs": 3,
+        "sentences_per_paragraph": 3,
+        "options": 3,
+        "image_bytes": 150000,
+        "audio": True,
+        "audio_ms_per_char": 60,
+        "sample_rate": 24000,
+    },
+    "features": {
+        # POST /game/save/delta, paged loads and media references; off = legacy full saves only
+        "delta_saves": True,
+        # `image` events by reference + GET /game/image/<id>; off = inline base64 in the stream
+        "image_refs": False,
+    },
+    "errors": {
+        # Probabilities per request
+        "connect_failure": 0.0,
+        "connect_status": 503,
+        "stream_error_event": 0.0,
+        "drop_connection": 0.0,
+        "image_error": 0.0,
+        "tts_failure": 0.0,
+    },
+}
+
+SENTENCES = [
+    "The torchlight flickers across the ancient stones.",
+    "A distant bell tolls three times and then falls silent.",
+    "Something shifts in the shadows beyond the gate.",
+    "You feel the weight of the old map in your pocket.",
+    "The wind carries the smell of rain and iron.",
+    "A figure in a grey cloak watches you from the bridge.",
+    "Footsteps echo somewhere below, slow and deliberate.",
+    "The path ahead splits around a fallen statue.",
+    "Your companion whispers that this place is not on any chart.",
+]
+OPTIONS = [
+    "Follow the cloaked figure across the bridge",
+    "Descend the stairs toward the footsteps",
+    "Study the map beside the fallen statue",
+    "Call out to whoever is listening",
+    "Wait in the shadows and observe",
+]
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Content-Encoding, Authorization, x-google-api-key, x-pollinations-token, x-openai-api-key, Last-Event-ID",
+    "Access-Control-Max-Age": "600",
+}
+# Turns kept for Last-Event-ID resumes (oldest evicted first)
+MAX_STORED_TURNS = 50
+# GET /game/list page size bounds and summary length
+MAX_LIST_PAGE = 100
+SUMMARY_CHARS = 120
+STATUS_TEXT = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found", 409: "Conflict", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+def _merge(base, override):
+    merged = copy.deepcopy(base)
+    for key, value in (override or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_profile(name_or_path=None):
+    """Load a profile by file path or by name from audit/standin_profiles/."""
+    if not name_or_path:
+        return copy.deepcopy(DEFAULT_PROFILE)
+    path = name_or_path
+    if not os.path.exists(path):
+        path = os.path.join(PROFILE_DIR, f"{name_or_path}.json")
+    with open(path, encoding="utf-8") as f:
+        return _merge(DEFAULT_PROFILE, json.load(f))
+
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def _png(width, height, rows, target_bytes=0, rng=None):
+    """PNG bytes for raw RGB rows (filter byte included), padded to roughly target_bytes.
+
+    With an rng the padding is random, so every image is distinct and about as
+    incompressible as a real one (content-hash dedupe and gzip see no shortcut).
+    """
+    png = b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+    png += _png_chunk(b"IDAT", zlib.compress(rows))
+    padding = max(0, target_bytes - len(png) - 24)
+    if padding:
+        # Ancillary private chunk: decoders skip it, the payload keeps its size
+        png += _png_chunk(b"afPd", rng.randbytes(padding) if rng else b"\x00" * padding)
+    return png + _png_chunk(b"IEND", b"")
+
+
+def synthetic_png(target_bytes, rng=None):
+    """A valid 1x1 PNG data URL of roughly target_bytes (as base64)."""
+    png = _png(1, 1, b"\x00\x40\x30\x60", int(target_bytes * 3 / 4), rng)
+    return "data:image/png;base64," + base64.b64encode(png).decode("ascii")
+
+
+IMAGE_SIZE = (1920, 1080)
+IMAGE_WIDTHS = [320, 640, 960, 1280, 1920]
+
+
+def _image_color(image_id):
+    digest = zlib.crc32(image_id.encode("ascii"))
+    return bytes([64 + (digest >> shift) % 128 for shift in (0, 8, 16)])
+
+
+def image_placeholder(image_id):
+    """LQIP data URL: a 16x9 vertical gradient in the image's colour (a few hundred bytes)."""
+    color = _image_color(image_id)
+    rows = b"".join(b"\x00" + bytes(max(0, c - 6 * y) for c in color) * 16 for y in range(9))
+    return "data:image/png;base64," + base64.b64encode(_png(16, 9, rows)).decode("ascii")
+
+
+def image_ref(image_id, full_bytes):
+    """The `ref` of a by-reference `image` event (see ImageRef in src/common/services/ImageLoader.ts)."""
+    width, height = IMAGE_SIZE
+    return {"id": image_id, "url": f"/game/image/{image_id}", "width": width, "height": height,
+            "widths": IMAGE_WIDTHS, "bytes": full_bytes, "placeholder": image_placeholder(image_id)}
+
+
+@functools.lru_cache(maxsize=32)
+def image_variant(image_id, width, full_bytes):
+    """PNG bytes of `image_id` at `width`: real dimensions, size scaled with the pixel count."""
+    full_width, full_height = IMAGE_SIZE
+    height = max(1, round(width * full_height / full_width))
+    rows = (b"\x00" + _image_color(image_id) * width) * height
+    target = max(2048, int(full_bytes * (width / full_width) ** 2))
+    return _png(width, height, rows, target, random.Random(f"{image_id}:{width}"))
+
+
+def synthetic_wav(duration_ms, sample_rate=24000):
+    """Base64 WAV of silence (16-bit mono) lasting duration_ms."""
+    samples = int(sample_rate * duration_ms / 1000)
+    data_len = samples * 2
+    header = b"RIFF" + struct.pack("<I", 36 + data_len) + b"WAVEfmt " + struct.pack(
+        "<IHHIIHH", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16) + b"data" + struct.pack("<I", data_len)
+    return base64.b64encode(header + b"\x00" * data_len).decode("ascii")
+
+
+class LatencyModel:
+    """Seeded sampler for delays and injected failures of one request."""
+
+    def __init__(self, profile, request_no):
+        self.profile = profile
+        self.rng = random.Random(f"{profile['seed']}:{request_no}")
+
+    def delay(self, name):
+        spec = self.profile["latency"].get(name, {"mean_ms": 0, "jitter_ms": 0})
+        ms = spec["mean_ms"] + self.rng.uniform(-1, 1) * spec.get("jitter_ms", 0)
+        return max(0.0, ms) / 1000
+
+    def chance(self, name):
+        return self.rng.random() < self.profile["errors"].get(name, 0.0)
+
+
+def build_turn(profile, rng):
+    """The ordered StreamEvents of one turn."""
+    payloads = profile["payloads"]
+    paragraphs = []
+    sentences = []
+    for p in range(payloads["paragraphs"]):
+        chosen = [rng.choice(SENTENCES) for _ in range(payloads["sentences_per_paragraph"])]
+        sentences.append(chosen)
+        paragraphs.append(" ".join(chosen))
+    options = rng.sample(OPTIONS, min(payloads["options"], len(OPTIONS)))
+
+    events = [
+        {"type": "status", "message": "Thinking..."},
+        {"type": "text_structure", "paragraphs": paragraphs, "options": options},
+    ]
+    for index, paragraph_sentences in enumerate(sentences):
+        if rng.random() < profile["errors"].get("image_error", 0.0):
+            events.append({"type": "image_error", "index": index, "error": "Stand-in image failure"})
+        elif profile["features"].get("image_refs"):
+            events.append({"type": "image", "index": index, "ref": image_ref(f"{rng.getrandbits(64):016x}", payloads["image_bytes"])})
+        else:
+            events.append({"type": "image", "index": index, "data": synthetic_png(payloads["image_bytes"], rng)})
+        if payloads["audio"]:
+            for s_index, text in enumerate(paragraph_sentences):
+                duration = len(text) * payloads["audio_ms_per_char"]
+                events.append({"type": "audio", "pIndex": index, "sIndex": s_index, "text": text,
+                               "data": synthetic_wav(duration, payloads["sample_rate"])})
+    events.append({"type": "done"})
+    return events
+
+
+def sse_message(event, event_id=None):
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8")
+
+
+class StandinServer:
+    def __init__(self, profile):
+        self.profile = profile
+        self.request_no = 0
+        self.saves = {}
+        self.media = {}
+        self.turns = collections.OrderedDict()
+        self.stats = {"requests": 0, "streams": 0, "stream_bytes": 0, "errors_injected": 0, "drops_injected": 0,
+                      "tts_requests": 0, "tts_chars": 0, "save_requests": 0, "save_bytes": 0, "save_conflicts": 0,
+                      "stream_image_bytes": 0, "image_requests": 0, "image_bytes": 0, "speculative_streams": 0,
+                      "turns_generated": 0, "resumed_streams": 0, "replayed_events": 0, "stream_request_bytes": 0,
+                      "perf_beacons": 0, "perf_entries": 0}
+
+    # --- HTTP plumbing -------------------------------------------------
+
+    async def handle(self, reader, writer):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0) or 0)
+        body = await reader.readexactly(length) if length else b""
+
+        self.request_no += 1
+        self.stats["requests"] += 1
+        url = urlsplit(target)
+        request = {
+            "method": method,
+            "path": url.path,
+            "query": {k: v[0] for k, v in parse_qs(url.query).items()},
+            "headers": headers,
+            "body": body,
+            "model": LatencyModel(self.profile, self.request_no),
+        }
+        try:
+            await self.route(request, writer)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            print(f"[STANDIN] {method} {url.path} failed: {e}")
+            try:
+                await self._send_json(writer, request, 500, {"error": str(e)})
+            except ConnectionError:
+                pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def _head(self, request, status, extra):
+        origin = request["headers"].get("origin", "*")
+        headers = {"Access-Control-Allow-Origin": origin, "Vary": "Origin", "Connection": "close", **CORS_HEADERS, **extra}
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'OK')}"] + [f"{k}: {v}" for k, v in headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send_json(self, writer, request, status, payload, latency=None):
+        """With `latency`, wait that profile entry's delay plus its per_kb_ms for the body size first."""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        if latency:
+            per_kb = self.profile["latency"].get(latency, {}).get("per_kb_ms", 0)
+            await asyncio.sleep(request["model"].delay(latency) + len(body) / 1024 * per_kb / 1000)
+        writer.write(self._head(request, status, {"Content-Type": "application/json", "Content-Length": str(len(body))}) + body)
+        await writer.drain()
+
+    def _json_body(self, request):
+        body = request["body"]
+        if request["headers"].get("content-encoding") == "gzip":
+            body = gzip.decompress(body)
+        return json.loads(body or b"{}")
+
+    # --- Routes --------------------------------------------------------
+
+    async def route(self, request, writer):
+        method, path = request["method"], request["path"]
+        if method == "OPTIONS":
+            writer.write(self._head(request, 204, {"Content-Length": "0"}))
+            await writer.drain()
+        elif method == "POST" and path == "/game/stream":
+            await self.stream_turn(request, writer)
+        elif method == "POST" and path == "/ai/audio":
+            await self.synthesize(request, writer)
+        elif method == "POST" and path == "/game/save":
+            data = await self._save_body(request)
+            await self._send_json(writer, request, 200, self.save_game(data))
+        elif method == "POST" and path == "/game/save/delta" and self.profile["features"]["delta_saves"]:
+            data = await self._save_body(request)
+            await self._send_json(writer, request, *self.save_delta(data))
+        elif method == "GET" and path == "/game/load":
+            save = self.load_game(request["query"])
+            await self._send_json(writer, request, 200 if save else 404, save or {"error": "Save not found"}, latency="load")
+        elif method == "GET" and path == "/game/history" and self.profile["features"]["delta_saves"]:
+            page = self.history_page(request["query"])
+            await self._send_json(writer, request, 200 if page else 404, page or {"error": "Save not found"}, latency="load")
+        elif method == "GET" and path == "/game/media" and self.profile["features"]["delta_saves"]:
+            await asyncio.sleep(request["model"].delay("load"))
+            data = self.media.get(request["query"].get("hash"))
+            await self._send_json(writer, request, 200 if data else 404, {"data": data} if data else {"error": "Media not found"})
+        elif method == "GET" and path.startswith("/game/image/"):
+            await self.serve_image(request, writer)
+        elif method == "GET" and path == "/game/list":
+            await self._send_json(writer, request, 200, self.list_games(request["query"]), latency="list")
+        elif method == "POST" and path == "/game/delete":
+            self.saves.pop(self._json_body(request).get("saveId"), None)
+            await self._send_json(writer, request, 200, {"success": True})
+        elif method == "GET" and path == "/__standin/stats":
+            await self._send_json(writer, request, 200, {**self.stats, "saves": len(self.saves), "media": len(self.media)})
+        elif method == "POST" and path == "/__standin/profile":
+            # Runtime override (e.g. {"features": {"delta_saves": false}}) for benchmarks comparing modes
+            self.profile = _merge(self.profile, self._json_body(request))
+            await self._send_json(writer, request, 200, self.profile)
+        elif method == "POST" and path == "/__standin/seed":
+            # Synthetic account for list/load benchmarks, e.g. {"saves": 1000, "turns": 30}
+            await self._send_json(writer, request, 200, self.seed_saves(**self._json_body(request)))
+        elif method == "POST" and path == "/__standin/perf":
+            # Target for the app's telemetry beacons (REACT_APP_PERF_BEACON_URL=http://localhost:3001/__standin/perf)
+            self.stats["perf_beacons"] += 1
+            self.stats["perf_entries"] += len(self._json_body(request).get("entries", []))
+            writer.write(self._head(request, 204, {"Content-Length": "0"}))
+            await writer.drain()
+        elif method == "GET" and path == "/":
+            await self._send_json(writer, request, 200, {"status": "ok", "standin": True})
+        else:
+            await self._send_json(writer, request, 404, {"error": f"No stand-in route for {method} {path}"})
+
+    async def synthesize(self, request, writer):
+        """Stand-in TTS: a silent WAV as long as the sentence would take to read."""
+        model = request["model"]
+        text = self._json_body(request).get("text", "")
+        self.stats["tts_requests"] += 1
+        self.stats["tts_chars"] += len(text)
+        per_char = self.profile["latency"].get("tts", {}).get("per_char_ms", 0)
+        await asyncio.sleep(model.delay("tts") + len(text) * per_char / 1000)
+        if model.chance("tts_failure"):
+            self.stats["errors_injected"] += 1
+            await self._send_json(writer, request, 503, {"error": "Injected TTS failure"})
+            return
+        payloads = self.profile["payloads"]
+        audio = synthetic_wav(len(text) * payloads["audio_ms_per_char"], payloads["sample_rate"])
+        await self._send_json(writer, request, 200, {"audio": audio})
+
+    async def serve_image(self, request, writer):
+        """A referenced image at the smallest offered width >= ?w= (the largest when none is)."""
+        model = request["model"]
+        await asyncio.sleep(model.delay("image_fetch"))
+        image_id = request["path"].rsplit("/", 1)[-1]
+        try:
+            wanted = int(request["query"].get("w", IMAGE_SIZE[0]))
+        except ValueError:
+            wanted = IMAGE_SIZE[0]
+        width = next((w for w in IMAGE_WIDTHS if w >= wanted), IMAGE_WIDTHS[-1])
+        body = image_variant(image_id, width, self.profile["payloads"]["image_bytes"])
+        self.stats["image_requests"] += 1
+        self.stats["image_bytes"] += len(body)
+        # Chunked like the stream so the same bandwidth cap applies to both delivery modes
+        writer.write(self._head(request, 200, {
+            "Content-Type": "image/png",
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "Transfer-Encoding": "chunked",
+        }))
+        await self._write_chunks(writer, body, model)
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _save_body(self, request):
+        """Parse a save body, counting its wire size and the per-KB store cost."""
+        self.stats["save_requests"] += 1
+        self.stats["save_bytes"] += len(request["body"])
+        data = self._json_body(request)
+        raw_kb = len(json.dumps(data)) / 1024
+        per_kb = self.profile["latency"].get("save", {}).get("per_kb_ms", 0)
+        await asyncio.sleep(request["model"].delay("save") + raw_kb * per_kb / 1000)
+        return data
+
+    def save_game(self, data):
+        now = datetime.now(timezone.utc).isoformat()
+        save_id = data.get("_id") or uuid.uuid4().hex[:24]
+        existing = self.saves.get(save_id, {})
+        self.saves[save_id] = {**existing, **data, "_id": save_id, "createdAt": existing.get("createdAt", now), "updatedAt": now,
+                               "revision": existing.get("revision", 0) + 1}
+        return self.saves[save_id]
+
+    def save_delta(self, delta):
+        """Apply a SaveSession delta; 409 when the base revision or referenced media don't match."""
+        self.media.update(delta.get("media") or {})
+        existing = self.saves.get(delta.get("_id")) if delta.get("_id") else None
+        history = existing["gameHistory"] if existing else []
+        revision = existing["revision"] if existing else 0
+        offset = delta.get("historyOffset", 0)
+        missing = [ref[len("media:"):] for ref in delta.get("currentImages", [])
+                   if ref.startswith("media:") and ref[len("media:"):] not in self.media]
+        if delta.get("baseRevision") != revision or offset > len(history) or missing:
+            self.stats["save_conflicts"] += 1
+            return 409, {"error": "Save conflict", "revision": revision, "historyTotal": len(history), "missingMedia": missing}
+
+        header = {k: v for k, v in delta.items() if k not in ("media", "appendHistory", "historyOffset", "baseRevision")}
+        save = self.save_game({**header, "_id": delta.get("_id"), "gameHistory": history[:offset] + delta.get("appendHistory", [])})
+        return 200, {"_id": save["_id"], "revision": save["revision"], "historyTotal": len(save["gameHistory"])}
+
+    def load_game(self, query):
+        """The save; with delta_saves, `historyLimit` pages the history and `media=ref` swaps inline images for references."""
+        save = self.saves.get(query.get("saveId"))
+        if not save or not self.profile["features"]["delta_saves"]:
+            return save
+        limit = int(query.get("historyLimit", 0) or 0)
+        if limit:
+            history = save["gameHistory"]
+            offset = max(0, len(history) - limit)
+            save = {**save, "gameHistory": history[offset:], "historyOffset": offset, "historyTotal": len(history)}
+        if query.get("media") == "ref":
+            save = {**save, "currentImages": [self._media_ref(image) for image in save.get("currentImages") or []]}
+        return save
+
+    def _media_ref(self, image):
+        """`media:<hash>` for an inline data URL (stored for GET /game/media); anything else as is."""
+        if not image or not image.startswith("data:"):
+            return image
+        digest = hashlib.sha256(image.encode("utf-8")).hexdigest()
+        self.media.setdefault(digest, image)
+        return "media:" + digest
+
+    def history_page(self, query):
+        save = self.saves.get(query.get("saveId"))
+        if not save:
+            return None
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", 20))
+        return {"offset": offset, "entries": save["gameHistory"][offset:offset + limit]}
+
+    def list_games(self, query):
+        """Newest first. With `limit`: one page of summaries and the cursor of the next; without: the legacy array."""
+        saves = sorted(self.saves.values(), key=lambda s: (s["updatedAt"], s["_id"]), reverse=True)
+        if "limit" not in query and "cursor" not in query:
+            return [{k: s.get(k) for k in ("_id", "genreKey", "updatedAt", "createdAt")} for s in saves]
+        limit = max(1, min(MAX_LIST_PAGE, int(query.get("limit") or 20)))
+        if query.get("cursor"):
+            # Keyset paging: saves created or updated meanwhile never shift the pages still to come
+            after = tuple(json.loads(base64.urlsafe_b64decode(query["cursor"].encode("ascii"))))
+            saves = [s for s in saves if (s["updatedAt"], s["_id"]) < after]
+        page = saves[:limit]
+        next_cursor = None
+        if len(saves) > limit:
+            last = page[-1]
+            next_cursor = base64.urlsafe_b64encode(json.dumps([last["updatedAt"], last["_id"]]).encode("utf-8")).decode("ascii")
+        return {"items": [self._save_summary(s) for s in page], "nextCursor": next_cursor}
+
+    @staticmethod
+    def _save_summary(save):
+        content = " ".join(save.get("gameContent") or [])
+        summary = content[:SUMMARY_CHARS].rsplit(" ", 1)[0] + "…" if len(content) > SUMMARY_CHARS else content
+        image = next((i for i in reversed(save.get("currentImages") or []) if i), None)
+        return {
+            **{k: save.get(k) for k in ("_id", "genreKey", "updatedAt", "createdAt")},
+            "turns": len(save.get("gameHistory") or []) // 2,
+            "summary": summary,
+            "thumbnail": image_placeholder(hashlib.sha1(image.encode("utf-8")).hexdigest()) if image else None,
+        }
+
+    def seed_saves(self, saves=1000, turns=30, images=8, image_bytes=None, genres=("fantasy", "scifi", "horror", "superheroes", "romance")):
+        """Adds `saves` legacy saves (full history, inline base64 images) spread over the last weeks."""
+        rng = random.Random(f"seed:{len(self.saves)}")
+        image_bytes = image_bytes or self.profile["payloads"]["image_bytes"]
+        # A few distinct images shared by every save: realistic payload sizes without gigabytes of memory
+        pool = [synthetic_png(image_bytes, rng) for _ in range(images)]
+        now = datetime.now(timezone.utc).timestamp()
+        for _ in range(saves):
+            history = []
+            for _ in range(turns):
+                history.append({"role": "user", "parts": [{"text": rng.choice(OPTIONS)}]})
+                history.append({"role": "model", "parts": [{"text": " ".join(rng.choice(SENTENCES) for _ in range(9))}]})
+            created = now - rng.uniform(0, 30 * 86400)
+            save_id = uuid.UUID(int=rng.getrandbits(128)).hex[:24]
+            self.saves[save_id] = {
+                "_id": save_id, "userId": "seed", "genreKey": rng.choice(genres), "revision": 1,
+                "gameHistory": history,
+                "gameContent": [" ".join(rng.choice(SENTENCES) for _ in range(3)) for _ in range(3)],
+                "currentOptions": rng.sample(OPTIONS, 3),
+                "currentImages": [rng.choice(pool) for _ in range(3)],
+                "createdAt": datetime.fromtimestamp(created, timezone.utc).isoformat(),
+                "updatedAt": datetime.fromtimestamp(rng.uniform(created, now), timezone.utc).isoformat(),
+            }
+        return {"saves": len(self.saves), "seeded": saves}
+
+    async def stream_turn(self, request, writer):
+        model = request["model"]
+        per_kb = self.profile["latency"]["connect"].get("per_kb_ms", 0)
+        await asyncio.sleep(model.delay("connect") + len(request["body"]) / 1024 * per_kb / 1000)
+        if model.chance("connect_failure"):
+            self.stats["errors_injected"] += 1
+            await self._send_json(writer, request, self.profile["errors"]["connect_status"], {"error": "Injected failure"})
+            return
+
+        self.stats["streams"] += 1
+        turn, after = self._resumed_turn(request["headers"].get("last-event-id"))
+        if turn is None:
+            turn = self._new_turn(request)
+        else:
+            self.stats["resumed_streams"] += 1
+        writer.write(self._head(request, 200, {
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            "Transfer-Encoding": "chunked",
+        }))
+        await writer.drain()
+
+        pending = [(seq, event) for seq, event in enumerate(turn["events"]) if seq > after]
+        messages = [sse_message(event, f"{turn['id']}:{seq}") for seq, event in pending]
+        drop_at = None
+        if model.chance("drop_connection"):
+            drop_at = model.rng.randrange(1, sum(len(m) for m in messages) or 2)
+
+        sent = 0
+        for (seq, event), message in zip(pending, messages):
+            # Events keep the turn's original schedule; a resume sends what is already due at once
+            wait = turn["started"] + turn["due"][seq] - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            elif after >= 0:
+                self.stats["replayed_events"] += 1
+            if drop_at is not None and sent + len(message) > drop_at:
+                await self._write_chunks(writer, message[:drop_at - sent], model)
+                self.stats["drops_injected"] += 1
+                self.stats["stream_bytes"] += drop_at - sent
+                writer.transport.abort()
+                return
+            await self._write_chunks(writer, message, model)
+            sent += len(message)
+            self.stats["stream_bytes"] += len(message)
+            if event["type"] == "image":
+                self.stats["stream_image_bytes"] += len(message)
+            if event["type"] == "error":
+                break
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    def _new_turn(self, request):
+        model = request["model"]
+        self.stats["turns_generated"] += 1
+        self.stats["stream_request_bytes"] += len(request["body"])
+        try:
+            # Turns the client generates ahead of the player's choice (see SpeculativeTurns)
+            if self._json_body(request).get("speculative"):
+                self.stats["speculative_streams"] += 1
+        except ValueError:
+            pass
+        events = build_turn(self.profile, model.rng)
+        if model.chance("stream_error_event"):
+            image = next((i for i, e in enumerate(events) if e["type"] == "image"), None)
+            if image is not None:
+                self.stats["errors_injected"] += 1
+                events[image] = {"type": "error", "error": "Injected stream error"}
+                del events[image + 1:]
+        # Offsets from the start of the turn at which each event is ready
+        due, elapsed = [], 0.0
+        for event in events:
+            elapsed += model.delay(event["type"])
+            due.append(elapsed)
+        turn = {"id": f"{model.rng.getrandbits(48):012x}", "events": events, "due": due, "started": time.monotonic()}
+        self.turns[turn["id"]] = turn
+        while len(self.turns) > MAX_STORED_TURNS:
+            self.turns.popitem(last=False)
+        return turn
+
+    def _resumed_turn(self, last_event_id):
+        """(turn, last seq the client has) for a Last-Event-ID this server issued, else (None, -1)."""
+        turn_id, _, seq = (last_event_id or "").rpartition(":")
+        turn = self.turns.get(turn_id)
+        if turn is None or not seq.isdigit():
+            return None, -1
+        return turn, int(seq)
+
+    async def _write_chunks(self, writer, data, model):
+        chunking = self.profile["chunking"]
+        offset = 0
+        while offset < len(data):
+            size = model.rng.randint(chunking["min_bytes"], max(chunking["min_bytes"], chunking["max_bytes"]))
+            piece = data[offset:offset + size]
+            offset += len(piece)
+            writer.write(f"{len(piece):x}\r\n".encode("ascii") + piece + b"\r\n")
+            await writer.drain()
+            delay = chunking["delay_ms"] / 1000
+            if chunking["bandwidth_kbps"]:
+                delay += len(piece) * 8 / (chunking["bandwidth_kbps"] * 1000)
+            if delay:
+                await asyncio.sleep(delay)
+
+
+async def serve(profile, host="127.0.0.1", port=3001):
+    server = StandinServer(profile)
+    # A deep accept backlog so load runs (audit/load_bench.py) can open hundreds of streams at once
+    tcp = await asyncio.start_server(server.handle, host, port, limit=1 << 20, backlog=1024)
+    print(f"[STANDIN] Listening on http://{host}:{port} (seed {profile['seed']})")
+    async with tcp:
+        await tcp.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", default=None, help="Profile name in audit/standin_profiles/ or a JSON file path")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3001)
+    parser.add_argument("--seed", type=int, default=None, help="Override the profile seed")
+    args = parser.parse_args()
+
+    profile = load_profile(args.profile)
+    if args.seed is not None:
+        profile["seed"] = args.seed
+    started = time.time()
+    try:
+        asyncio.run(serve(profile, args.host, args.port))
+    except KeyboardInterrupt:
+        print(f"[STANDIN] Stopped after {time.time() - started:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Small statistics helpers shared by the audit benchmarks.
+"""
+import math
+
+# Histogram bucket upper edges in ms (last bucket is open-ended)
+LATENCY_BUCKETS_MS = [50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 7500, 10000, 15000, 20000, 30000, 60000]
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers (pct in 0-100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def histogram(values, edges=LATENCY_BUCKETS_MS):
+    counts = [0] * (len(edges) + 1)
+    for value in values:
+        for i, edge in enumerate(edges):
+            if value <= edge:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    return {"edges": list(edges), "counts": counts}
+
+
+def summarize(values, edges=LATENCY_BUCKETS_MS):
+    """p50/p95/p99, min/max/mean and a histogram; ignores missing samples."""
+    samples = [v for v in values if v is not None]
+    if not samples:
+        return {"n": 0, "missing": len(values)}
+    return {
+        "n": len(samples),
+        "missing": len(values) - len(samples),
+        "min": round(min(samples), 1),
+        "max": round(max(samples), 1),
+        "mean": round(sum(samples) / len(samples), 1),
+        "p50": round(percentile(samples, 50), 1),
+        "p95": round(percentile(samples, 95), 1),
+        "p99": round(percentile(samples, 99), 1),
+        "samples": [round(v, 1) for v in samples],
+        "histogram": histogram(samples, edges),
+    }
+
+
+def linear_slope(xs, ys):
+    """Least-squares slope of ys over xs (e.g. heap bytes per turn); None with fewer than 2 points."""
+    points = [(x, y) for x, y in zip(xs, ys) if y is not None]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var_x:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
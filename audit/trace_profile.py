@@ -0,0 +1,330 @@
+"""
+Trace Profiling - Adventure Forge
+Opt-in profiling for the matrix runner (--profile-trace, one cell at a time
+per browser since Chrome runs a single trace per browser): every audit pass
+(main menu, adventure selection, game start, option buttons) records a Chrome
+trace with the V8 sampling profiler through the page's CDP session, plus
+Performance.getMetrics before and after. Each trace is written as
+<prefix>_trace_<pass>.json, which the DevTools Performance panel opens
+directly ("Load profile"), and analyzed into the cell report:
+
+  long_tasks        main-thread tasks over 50 ms (count, total, the worst five)
+  main_thread_ms    self time on the renderer main thread by kind: script,
+                    style/layout, paint/composite, gc, parse, other
+  js_heap           used heap at the end of the pass and its peak in the trace
+  top_functions     JS functions by sampled self time, with url:line:column
+  watched           self time of WATCHED_FUNCTIONS (Typewriter ticks, SSE
+                    parsing, audio decoding), wherever they rank
+  metrics           Performance.getMetrics deltas (task, script, layout and
+                    style time, layout count, DOM nodes)
+
+Function names come from the bundle as served: a development build (npm
+start) keeps them, a production build only has url:line:column (load the
+trace in DevTools with source maps to resolve those).
+
+Usage:
+    python -m audit.matrix_runner --devices pixel-5 --networks 4g --cpus mid-tier-mobile --profile-trace
+    python -m audit.trace_profile analyze audit_runs/audit_v2_pixel-5__4g__mid-tier-mobile_trace_game_start.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from collections import defaultdict
+
+TRACE_CATEGORIES = [
+    "__metadata",
+    "toplevel",
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame",
+    "v8",
+    "v8.execute",
+    "disabled-by-default-v8.cpu_profiler",
+    "blink",
+    "blink.user_timing",
+    "loading",
+    "latencyInfo",
+]
+LONG_TASK_MS = 50
+TOP_FUNCTIONS = 15
+TRACE_COMPLETE_TIMEOUT_S = 60
+WATCHED_FUNCTIONS = ("Typewriter", "processSSEBuffer", "base64ToArrayBuffer")
+TASK_EVENTS = {"RunTask", "ThreadControllerImpl::RunTask"}
+# Trace event name -> main thread bucket; unlisted events count towards their parent, or "other" at the top
+EVENT_KINDS = {
+    "script": {"EvaluateScript", "v8.evaluateModule", "FunctionCall", "TimerFire", "EventDispatch", "FireAnimationFrame",
+               "FireIdleCallback", "RunMicrotasks", "V8.Execute", "v8.run", "XHRReadyStateChange", "XHRLoad"},
+    "compile": {"v8.compile", "v8.compileModule", "V8.CompileCode", "CompileScript", "CacheScript"},
+    "style_layout": {"UpdateLayoutTree", "RecalculateStyles", "Layout", "InvalidateLayout", "ScheduleStyleRecalculation",
+                     "UpdateLayerTree", "IntersectionObserverController::computeIntersections"},
+    "paint": {"Paint", "PaintImage", "PrePaint", "Layerize", "CompositeLayers", "UpdateLayer", "Commit",
+              "Decode Image", "ImageDecodeTask", "Decode LazyPixelRef"},
+    "gc": {"MajorGC", "MinorGC", "V8.GCScavenger", "V8.GCCompactor", "V8.GCFinalizeMC", "BlinkGC.AtomicPhase",
+           "ThreadState::performIdleLazySweep"},
+    "parse": {"ParseHTML", "ParseAuthorStyleSheet"},
+}
+KIND_OF = {name: kind for kind, names in EVENT_KINDS.items() for name in names}
+# Sampling profiler pseudo-frames that are not JS functions
+PSEUDO_FRAMES = {"(root)", "(program)", "(idle)", "(garbage collector)"}
+METRIC_SECONDS = ("TaskDuration", "ScriptDuration", "LayoutDuration", "RecalcStyleDuration")
+METRIC_COUNTS = ("LayoutCount", "RecalcStyleCount")
+
+
+class PassProfiler:
+    """Records one trace per audit pass on a CDP session; `start` closes the pass before it."""
+
+    def __init__(self, cdp, out_dir, prefix, enabled=True):
+        self.cdp = cdp
+        self.out_dir = out_dir
+        self.prefix = prefix
+        self.enabled = enabled
+        self.passes = {}
+        self._current = None
+        self._events = []
+        self._complete = None
+        self._metrics = None
+        self._frame_id = None
+        if enabled:
+            cdp.on("Tracing.dataCollected", lambda params: self._events.extend(params["value"]))
+            cdp.on("Tracing.tracingComplete", self._on_complete)
+
+    def _on_complete(self, _params):
+        if self._complete and not self._complete.done():
+            self._complete.set_result(True)
+
+    async def _metrics_now(self):
+        return {m["name"]: m["value"] for m in (await self.cdp.send("Performance.getMetrics"))["metrics"]}
+
+    async def start(self, name):
+        if not self.enabled:
+            return
+        await self.stop()
+        if not self.passes:
+            await self.cdp.send("Performance.enable", {"timeDomain": "timeTicks"})
+        self._current, self._events = name, []
+        self._metrics = await self._metrics_now()
+        self._frame_id = (await self.cdp.send("Page.getFrameTree"))["frameTree"]["frame"]["id"]
+        await self.cdp.send("Tracing.start", {
+            "transferMode": "ReportEvents",
+            "traceConfig": {"includedCategories": TRACE_CATEGORIES, "recordMode": "recordUntilFull"},
+        })
+
+    async def stop(self):
+        """Ends the current pass, writes its trace and stores its analysis in `passes`."""
+        if not self.enabled or self._current is None:
+            return None
+        name, self._current = self._current, None
+        self._complete = asyncio.get_running_loop().create_future()
+        try:
+            await self.cdp.send("Tracing.end")
+            await asyncio.wait_for(self._complete, TRACE_COMPLETE_TIMEOUT_S)
+            metrics = await self._metrics_now()
+        except Exception as e:
+            print(f"[TRACE] {self.prefix} {name}: trace incomplete ({e})")
+            self.passes[name] = {"error": str(e)}
+            return None
+        path = os.path.join(self.out_dir, f"{self.prefix}_trace_{name}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self._events, "metadata": {"pass": name, "source": "adventure-forge audit"}}, f)
+        summary = analyze_trace(self._events, frame_id=self._frame_id)
+        summary["metrics"] = metric_deltas(self._metrics, metrics)
+        summary["trace"] = path
+        self.passes[name] = summary
+        self._events = []
+        print_summary(summary, f"{self.prefix} {name}")
+        return summary
+
+    async def finish(self):
+        """Stops the last pass; safe to call after the page has crashed."""
+        try:
+            await self.stop()
+        except Exception as e:
+            print(f"[TRACE] {self.prefix}: could not stop tracing ({e})")
+        return self.passes
+
+
+# --- Analysis -------------------------------------------------------------------
+
+def metric_deltas(before, after):
+    deltas = {f"{name}_ms": round((after.get(name, 0) - before.get(name, 0)) * 1000, 1) for name in METRIC_SECONDS}
+    deltas.update({name: int(after.get(name, 0) - before.get(name, 0)) for name in METRIC_COUNTS})
+    deltas["JSHeapUsedSize_mb"] = round(after.get("JSHeapUsedSize", 0) / 1048576, 2)
+    deltas["JSHeapTotalSize_mb"] = round(after.get("JSHeapTotalSize", 0) / 1048576, 2)
+    deltas["Nodes"] = int(after.get("Nodes", 0))
+    deltas["JSEventListeners"] = int(after.get("JSEventListeners", 0))
+    return deltas
+
+
+def renderer_pid(events, frame_id):
+    """Renderer process that hosted `frame_id`, from the browser's frame bookkeeping events."""
+    for e in events:
+        data = e.get("args", {}).get("data", {})
+        for frame in data.get("frames", []) if e.get("name") == "TracingStartedInBrowser" else []:
+            if frame.get("frame") == frame_id and frame.get("processId"):
+                return frame["processId"]
+        if data.get("frame") == frame_id and data.get("processId") and e.get("name") in ("FrameCommittedInBrowser", "TracingStartedInPage"):
+            return data["processId"]
+    return None
+
+
+def main_thread(events, frame_id=None):
+    """(pid, tid) of the page's renderer main thread; the busiest renderer when the frame cannot be matched."""
+    renderers = {(e["pid"], e["tid"]) for e in events
+                 if e.get("ph") == "M" and e.get("name") == "thread_name" and e.get("args", {}).get("name") == "CrRendererMain"}
+    pid = renderer_pid(events, frame_id) if frame_id else None
+    if pid is not None:
+        own = [r for r in renderers if r[0] == pid]
+        if own:
+            return own[0]
+    busy = defaultdict(int)
+    for e in events:
+        if e.get("ph") == "X" and e.get("name") in TASK_EVENTS:
+            busy[(e["pid"], e["tid"])] += e.get("dur", 0)
+    candidates = {k: v for k, v in busy.items() if k in renderers} or busy
+    return max(candidates, key=candidates.get) if candidates else None
+
+
+def main_thread_breakdown(events, thread):
+    """Self time by kind; an unlisted event inherits the kind of the nearest listed ancestor."""
+    on_thread = [e for e in events if (e.get("pid"), e.get("tid")) == thread]
+    ordered = sorted((e for e in on_thread if e.get("ph") == "X" and "dur" in e), key=lambda e: (e["ts"], -e["dur"]))
+    totals = defaultdict(float)
+    stack = []  # [event, self_us, kind]
+    for e in ordered + [None]:
+        while stack and (e is None or stack[-1][0]["ts"] + stack[-1][0]["dur"] <= e["ts"]):
+            done = stack.pop()
+            totals[done[2]] += max(0, done[1])
+        if e is None:
+            break
+        if stack:
+            parent = stack[-1]
+            parent[1] -= min(e["dur"], parent[0]["ts"] + parent[0]["dur"] - e["ts"])
+        inherited = stack[-1][2] if stack else "other"
+        stack.append([e, e["dur"], KIND_OF.get(e["name"], inherited)])
+    return {kind: round(us / 1000, 1) for kind, us in sorted(totals.items(), key=lambda kv: -kv[1])}
+
+
+def long_tasks(events, thread, threshold_ms=LONG_TASK_MS):
+    tasks = [e for e in events if (e.get("pid"), e.get("tid")) == thread and e.get("ph") == "X"
+             and e.get("name") in TASK_EVENTS and e.get("dur", 0) > threshold_ms * 1000]
+    # Nested RunTask (a task posted and run synchronously) would count twice
+    tasks.sort(key=lambda e: e["ts"])
+    outer, end = [], -1
+    for e in tasks:
+        if e["ts"] >= end:
+            outer.append(e)
+            end = e["ts"] + e["dur"]
+    origin = min((e["ts"] for e in events if e.get("ts")), default=0)
+    worst = sorted(outer, key=lambda e: -e["dur"])[:5]
+    return {
+        "count": len(outer),
+        "total_ms": round(sum(e["dur"] for e in outer) / 1000, 1),
+        "blocking_ms": round(sum(e["dur"] - threshold_ms * 1000 for e in outer) / 1000, 1),
+        "worst": [{"at_ms": round((e["ts"] - origin) / 1000, 1), "ms": round(e["dur"] / 1000, 1)} for e in worst],
+    }
+
+
+def js_heap_peak_mb(events):
+    peak = 0
+    for e in events:
+        if e.get("name") == "UpdateCounters":
+            peak = max(peak, e.get("args", {}).get("data", {}).get("jsHeapSizeUsed", 0))
+    return round(peak / 1048576, 2) if peak else None
+
+
+def _frame_label(frame):
+    name = frame.get("functionName") or "(anonymous)"
+    url = frame.get("url") or ""
+    if not url:
+        return name
+    return f"{name} {url.rsplit('/', 1)[-1]}:{frame.get('lineNumber', -1) + 1}:{frame.get('columnNumber', -1) + 1}"
+
+
+def sampled_self_times(events):
+    """Self time (ms) per JS function from the sampling profiler's ProfileChunk events."""
+    nodes = defaultdict(dict)      # profile id -> node id -> callFrame
+    samples = defaultdict(list)    # profile id -> [(node id, delta us)]
+    for e in events:
+        if e.get("name") != "ProfileChunk":
+            continue
+        data = e.get("args", {}).get("data", {})
+        profile = data.get("cpuProfile", {})
+        for node in profile.get("nodes", []):
+            nodes[e.get("id")][node["id"]] = node.get("callFrame", {})
+        samples[e.get("id")].extend(zip(profile.get("samples", []), data.get("timeDeltas", [])))
+    totals = defaultdict(float)
+    for pid, series in samples.items():
+        # A delta is the time since the previous sample, so it belongs to that sample
+        for (node, _), (_, delta) in zip(series, series[1:]):
+            frame = nodes[pid].get(node, {})
+            totals[_frame_label(frame)] += max(0, delta) / 1000
+    return totals
+
+
+def analyze_trace(events, top=TOP_FUNCTIONS, frame_id=None):
+    """Analysis of the page's renderer; sibling tabs' processes in the same trace are left out."""
+    thread = main_thread(events, frame_id)
+    if thread:
+        events = [e for e in events if e.get("pid") in (thread[0], None) or e.get("ph") == "M"]
+    functions = sampled_self_times(events)
+    ranked = [(label, ms) for label, ms in sorted(functions.items(), key=lambda kv: -kv[1])
+              if label.split(" ", 1)[0] not in PSEUDO_FRAMES]
+    watched = {}
+    for name in WATCHED_FUNCTIONS:
+        matches = [(label, ms) for label, ms in functions.items() if name in label.split(" ", 1)[0]]
+        watched[name] = {"self_ms": round(sum(ms for _, ms in matches), 1), "frames": len(matches)}
+    return {
+        "events": len(events),
+        "main_thread": list(thread) if thread else None,
+        "long_tasks": long_tasks(events, thread) if thread else None,
+        "main_thread_ms": main_thread_breakdown(events, thread) if thread else {},
+        "js_heap_peak_mb": js_heap_peak_mb(events),
+        "gc_sampled_ms": round(functions.get("(garbage collector)", 0), 1),
+        "top_functions": [{"function": label, "self_ms": round(ms, 1)} for label, ms in ranked[:top]],
+        "watched": watched,
+    }
+
+
+def print_summary(summary, label):
+    tasks = summary.get("long_tasks") or {}
+    kinds = summary.get("main_thread_ms", {})
+    metrics = summary.get("metrics", {})
+    print(f"[TRACE] {label}: {tasks.get('count', 0)} long tasks ({tasks.get('total_ms', 0):.0f} ms), "
+          f"script {kinds.get('script', 0):.0f} ms, layout {kinds.get('style_layout', 0):.0f} ms, "
+          f"paint {kinds.get('paint', 0):.0f} ms, heap {metrics.get('JSHeapUsedSize_mb', '?')} MB")
+    for entry in summary.get("top_functions", [])[:3]:
+        print(f"  → {entry['self_ms']:>7.1f} ms  {entry['function']}")
+
+
+def load_trace(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["traceEvents"] if isinstance(data, dict) else data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    analyze = sub.add_parser("analyze", help="Analyze a trace written by the audits or saved from DevTools")
+    analyze.add_argument("traces", nargs="+")
+    analyze.add_argument("--top", type=int, default=TOP_FUNCTIONS)
+    analyze.add_argument("--out", default=None, help="Write the analyses as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for path in args.traces:
+        results[path] = analyze_trace(load_trace(path), args.top)
+        print_summary(results[path], os.path.basename(path))
+        for entry in results[path]["top_functions"][3:]:
+            print(f"  → {entry['self_ms']:>7.1f} ms  {entry['function']}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"Trace analysis saved: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
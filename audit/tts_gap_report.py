@@ -0,0 +1,189 @@
+"""
+TTS Gap Report - Adventure Forge
+Plays turns like a listener and measures, for every narrated sentence:
+
+  wait_ms      sentence appears on screen -> its narration starts playing
+  gap_ms       previous narration ended -> this one starts (the silence heard)
+
+The listener clicks to advance as soon as a clip ends, so gap_ms is the pure
+pipeline cost: scheduling, synthesis not yet finished, decoding. Clips played
+through <audio> elements and through the Web Audio narration player (its
+`af-narration` events) are both counted. Run it against the stand-in with the
+`tts-only` profile so every sentence goes through /ai/audio instead of
+arriving on the stream, and compare lookahead settings
+(REACT_APP_TTS_LOOKAHEAD) between runs.
+
+Usage:
+    npm run standin -- --profile tts-only &
+    REACT_APP_API_URL=http://localhost:3001 REACT_APP_TTS_LOOKAHEAD=2 npm start &
+    AUDIT_BASE_URL=http://localhost:3000 python -m audit.tts_gap_report --turns 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+from playwright.async_api import async_playwright
+
+from audit.profiles import BASE_URL, DEVICES, NETWORK_PROFILES, context_options, network_conditions
+from audit.readiness import AsyncReadiness, install_stream_probe
+from audit.stats import summarize
+
+DEFAULT_REPORT = "audit_v2_tts_gap_report.json"
+OPTION_BUTTON = '[data-testid="game-options-container"] button:not([disabled])'
+
+# Narration clips are object URLs (blob:); the background music is not.
+NARRATION_PROBE_JS = r"""
+(() => {
+    if (window.__afNarration) return;
+    const log = window.__afNarration = { shown: [], playing: [], ended: [] };
+    const play = HTMLMediaElement.prototype.play;
+    HTMLMediaElement.prototype.play = function () {
+        if (!this.__afTracked) {
+            this.__afTracked = true;
+            this.addEventListener('playing', () => {
+                if (this.currentSrc.startsWith('blob:')) log.playing.push(performance.now());
+            });
+            this.addEventListener('ended', () => {
+                if (this.currentSrc.startsWith('blob:')) log.ended.push(performance.now());
+            });
+        }
+        return play.apply(this, arguments);
+    };
+    // Narration played through Web Audio (NarrationPlayer) reports itself instead
+    window.addEventListener('af-narration', e => log[e.detail.state].push(performance.now()));
+    let visible = false;
+    new MutationObserver(() => {
+        const overlay = document.querySelector('.cinematic-text-overlay');
+        const now = !!overlay && overlay.classList.contains('visible');
+        if (now && !visible) log.shown.push(performance.now());
+        visible = now;
+    }).observe(document, { subtree: true, childList: true, attributes: true, attributeFilter: ['class'] });
+})();
+"""
+
+_OPTIONS_CLICKABLE_JS = """() => {
+    const container = document.querySelector('[data-testid="game-options-container"]');
+    return !!container && getComputedStyle(container).display !== 'none' && !!container.querySelector('button:not([disabled])');
+}"""
+
+_ENDED_AFTER_JS = "(count) => window.__afNarration.ended.length > count"
+
+
+def sentence_gaps(log):
+    """Pair every shown sentence with the first narration that started after it."""
+    shown, playing, ended = log["shown"], log["playing"], log["ended"]
+    rows = []
+    for i, shown_at in enumerate(shown):
+        next_shown = shown[i + 1] if i + 1 < len(shown) else float("inf")
+        started = next((t for t in playing if shown_at <= t < next_shown), None)
+        previous_end = max((t for t in ended if t <= shown_at), default=None)
+        rows.append({
+            "sentence": i + 1,
+            "shown_at": round(shown_at, 1),
+            "playing_at": round(started, 1) if started is not None else None,
+            "wait_ms": round(started - shown_at, 1) if started is not None else None,
+            "gap_ms": round(started - previous_end, 1) if started is not None and previous_end is not None else None,
+        })
+    return rows
+
+
+async def listen_through_turn(page, ready, clip_timeout_ms, max_sentences=40):
+    """Advance each sentence right after its narration ends, until the options show."""
+    for _ in range(max_sentences):
+        if await page.evaluate(_OPTIONS_CLICKABLE_JS):
+            return True
+        if not await ready.selector('.cinematic-text-overlay.visible .click-hint', "sentence shown", timeout_ms=30000):
+            continue
+        ended = await page.evaluate("() => window.__afNarration.ended.length")
+        try:
+            await page.wait_for_function(_ENDED_AFTER_JS, arg=ended, timeout=clip_timeout_ms)
+        except Exception:
+            pass  # No narration (speech synthesis fallback or failure): move on like an impatient player
+        await page.click('[data-testid="game-cinematic-container"]')
+    return await page.evaluate(_OPTIONS_CLICKABLE_JS)
+
+
+async def run_session(device_id, network_id, turns, base_url, clip_timeout_ms):
+    tts_requests = []
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=["--autoplay-policy=no-user-gesture-required"])
+        context = await browser.new_context(**context_options(p, device_id))
+        await install_stream_probe(context)
+        await context.add_init_script(script=NARRATION_PROBE_JS)
+        page = await context.new_page()
+        page.on("requestfinished", lambda r: tts_requests.append(r.timing) if r.url.endswith("/ai/audio") else None)
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Network.emulateNetworkConditions", network_conditions(network_id))
+        ready = AsyncReadiness(page)
+        try:
+            await page.goto(base_url)
+            await ready.test_id("new-adventure-btn", "main menu", probe="app_shell")
+            await page.click('[data-testid="new-adventure-btn"]')
+            await ready.test_id("start-adventure-btn", "adventure selection")
+            await page.click('[data-testid="start-adventure-btn"]')
+            played = 0
+            for turn in range(1, turns + 1):
+                if not await listen_through_turn(page, ready, clip_timeout_ms):
+                    print(f"[TTS] Turn {turn}: options never became clickable, stopping")
+                    break
+                played = turn
+                print(f"[TTS] Turn {turn}/{turns} narrated")
+                if turn < turns:
+                    await page.click(OPTION_BUTTON)
+            log = await page.evaluate("() => window.__afNarration")
+            scheduler = await page.evaluate("() => window.__afTts ? window.__afTts.stats() : null")
+            cache = await page.evaluate("() => window.__afAudioCache ? window.__afAudioCache.stats() : null")
+        finally:
+            await context.close()
+            await browser.close()
+    return {
+        "turns_played": played,
+        "sentences": sentence_gaps(log),
+        "scheduler": scheduler,
+        "audio_cache": cache,
+        "tts_requests": len(tts_requests),
+        "readiness": ready.log.summary(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--device", default="desktop-1440", choices=list(DEVICES))
+    parser.add_argument("--network", default="4g", choices=list(NETWORK_PROFILES))
+    parser.add_argument("--url", default=BASE_URL)
+    parser.add_argument("--clip-timeout-ms", type=int, default=20000, help="Longest wait for one clip to finish")
+    parser.add_argument("--out", default=DEFAULT_REPORT)
+    args = parser.parse_args()
+
+    result = asyncio.run(run_session(args.device, args.network, args.turns, args.url, args.clip_timeout_ms))
+    rows = result["sentences"]
+    report = {
+        "audit_version": "v2-tts-gaps",
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": args.url,
+        "device": DEVICES[args.device]["label"],
+        "network": NETWORK_PROFILES[args.network]["label"],
+        "lookahead": (result["scheduler"] or {}).get("lookahead"),
+        "wait_ms": summarize([r["wait_ms"] for r in rows]),
+        "gap_ms": summarize([r["gap_ms"] for r in rows]),
+        **result,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"\nTTS gap report saved: {args.out}")
+    for key in ("wait_ms", "gap_ms"):
+        stats = report[key]
+        if stats["n"]:
+            print(f"  {key:<8} n={stats['n']:<3} p50={stats['p50']:>7.0f}  p95={stats['p95']:>7.0f}  max={stats['max']:>7.0f}  (no narration: {stats['missing']})")
+    print(f"  lookahead={report['lookahead']}  tts requests={report['tts_requests']}  scheduler={result['scheduler']}")
+    return 0 if rows else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+"""
+Visual Regression - Adventure Forge
+Compares audit screenshots with approved baselines instead of by eye.
+
+Baselines live in a content-addressed store (default audit_baselines/, or
+AUDIT_BASELINE_DIR): PNGs under objects/<sha[:2]>/<sha>.png and an index.json
+that maps "<screen>/<device>/<locale>" to up to MAX_VARIANTS approved
+variants, newest first, each with its 64-bit perceptual hash. A screenshot
+whose bytes match a variant passes without being decoded. Otherwise the
+variants nearest by perceptual hash are shortlisted and diffed tile by tile
+with NumPy; pixels under masks (the typewriter overlay, the carousel,
+generated images, spinners; rectangles recorded by capture() next to each
+PNG as <name>.visual.json) are ignored. A screenshot fails when more than
+--max-changed of its tiles differ, and gets a heatmap next to the report.
+Comparisons run in a process pool, one screenshot per task.
+
+Usage:
+    python -m audit.visual_diff compare audit_runs --out audit_runs/audit_v2_visual_report.json
+    python -m audit.visual_diff compare audit_runs --approve   # accept the current screenshots
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+from PIL import Image
+
+DEFAULT_BASELINE_DIR = os.environ.get("AUDIT_BASELINE_DIR", "audit_baselines")
+DEFAULT_REPORT = "audit_v2_visual_report.json"
+SIDECAR_SUFFIX = ".visual.json"
+# Regions that change from run to run by design
+MASK_SELECTORS = [
+    ".cinematic-text-overlay",
+    ".genre-selection-carousel",
+    ".carousel-container",
+    ".game-image-container",
+    ".spinner",
+    ".loading-spinner",
+    '[role="progressbar"]',
+]
+MAX_VARIANTS = 5
+SHORTLIST = 2              # Variants diffed per screenshot, nearest perceptual hash first
+TILE_PX = 32
+PIXEL_TOLERANCE = 24       # Largest channel difference still counted as the same pixel (antialiasing, dithering)
+TILE_CHANGED_FRACTION = 0.02
+MAX_CHANGED_TILES = 0.005  # Fraction of unmasked tiles that may differ before a screenshot fails
+
+MASK_RECTS_JS = """([selectors, fullPage]) => {
+    const dx = fullPage ? scrollX : 0, dy = fullPage ? scrollY : 0;
+    const rects = [];
+    document.querySelectorAll(selectors.join(',')).forEach(el => {
+        const r = el.getBoundingClientRect();
+        if (r.width > 0 && r.height > 0) rects.push([r.x + dx, r.y + dy, r.width, r.height]);
+    });
+    return { dpr: devicePixelRatio, rects };
+}"""
+
+
+def screen_key(screen, device, locale):
+    return f"{screen}/{device}/{locale}"
+
+
+def write_sidecar(path, screen, device, locale, masks):
+    """Records what capture() knows about a screenshot; `masks` is a MASK_RECTS_JS result."""
+    dpr = masks["dpr"] if masks else 1
+    sidecar = {
+        "screen": screen,
+        "device": device,
+        "locale": locale,
+        "masks": [[round(v * dpr) for v in rect] for rect in (masks["rects"] if masks else [])],
+    }
+    with open(path + SIDECAR_SUFFIX, "w", encoding="utf-8") as f:
+        json.dump(sidecar, f)
+
+
+# --- Image math ---------------------------------------------------------------
+
+def _dct_matrix(n):
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    m[0] /= np.sqrt(2)
+    return m
+
+
+_DCT32 = _dct_matrix(32)
+
+
+def mask_array(shape, masks):
+    """Boolean (h, w) array, True where a mask rectangle covers the pixel."""
+    h, w = shape[:2]
+    mask = np.zeros((h, w), dtype=bool)
+    for x, y, mw, mh in masks:
+        mask[max(0, y):max(0, min(h, y + mh)), max(0, x):max(0, min(w, x + mw))] = True
+    return mask
+
+
+def perceptual_hash(rgb, mask=None):
+    """64-bit DCT hash of the image with masked pixels flattened to grey."""
+    gray = np.array(Image.fromarray(rgb).convert("L"))
+    if mask is not None:
+        gray[mask] = 128
+    small = np.asarray(Image.fromarray(gray).resize((32, 32), Image.BILINEAR), dtype=np.float64)
+    low = (_DCT32 @ small @ _DCT32.T)[:8, :8].ravel()
+    bits = low > np.median(low[1:])
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def tile_diff(candidate, baseline, mask, tile=TILE_PX, tolerance=PIXEL_TOLERANCE):
+    """Per-tile fraction of differing pixels, and which tiles have any unmasked pixel."""
+    # max - min stays in uint8, half the memory traffic of a signed difference
+    changed = (np.maximum(candidate, baseline) - np.minimum(candidate, baseline)).max(axis=2) > tolerance
+    changed &= ~mask
+    h, w = changed.shape
+    rows, cols = -(-h // tile), -(-w // tile)
+    pad = ((0, rows * tile - h), (0, cols * tile - w))
+    counts = np.pad(changed, pad).reshape(rows, tile, cols, tile).sum(axis=(1, 3))
+    unmasked = np.pad(~mask, pad).reshape(rows, tile, cols, tile).sum(axis=(1, 3))
+    fraction = np.divide(counts, unmasked, out=np.zeros(counts.shape), where=unmasked > 0)
+    return fraction, unmasked > 0
+
+
+def heatmap(candidate, fraction, mask, path, tile=TILE_PX):
+    """Dimmed screenshot with changed tiles in red (stronger = more pixels changed) and masks in blue."""
+    h, w = candidate.shape[:2]
+    gray = candidate.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    out = np.repeat((gray * 0.35)[:, :, None], 3, axis=2)
+    heat = np.kron(np.minimum(fraction * 4, 1), np.ones((tile, tile)))[:h, :w]
+    out[:, :, 0] += heat * 220
+    out[mask, 2] += 90
+    Image.fromarray(np.clip(out, 0, 255).astype(np.uint8)).save(path, optimize=False, compress_level=1)
+
+
+def object_path(root, sha):
+    return os.path.join(root, "objects", sha[:2], f"{sha}.png")
+
+
+def load_rgb(path):
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGB"))
+
+
+# --- Baseline store -----------------------------------------------------------
+
+class BaselineStore:
+    def __init__(self, root=DEFAULT_BASELINE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, "index.json")
+        self.index = {"version": 1, "screens": {}}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+
+    def variants(self, key):
+        return self.index["screens"].get(key, [])
+
+    def approve(self, key, path, sha, phash, size):
+        target = object_path(self.root, sha)
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(path, target)
+        variants = [v for v in self.variants(key) if v["sha256"] != sha]
+        variants.insert(0, {
+            "sha256": sha,
+            "phash": f"{phash:016x}",
+            "size": size,
+            "approved": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        })
+        self.index["screens"][key] = variants[:MAX_VARIANTS]
+
+    def prune(self):
+        """Deletes objects no index entry points at."""
+        referenced = {v["sha256"] for variants in self.index["screens"].values() for v in variants}
+        removed = 0
+        for path in glob.glob(os.path.join(self.root, "objects", "*", "*.png")):
+            if os.path.splitext(os.path.basename(path))[0] not in referenced:
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+
+
+# --- Comparison ---------------------------------------------------------------
+
+def shot_from_sidecar(path, device="unknown", locale="unknown"):
+    """Screenshot description for compare(): sidecar data if capture() wrote one, else the file name."""
+    sidecar = path + SIDECAR_SUFFIX
+    if os.path.exists(sidecar):
+        with open(sidecar, encoding="utf-8") as f:
+            meta = json.load(f)
+    else:
+        meta = {"screen": os.path.splitext(os.path.basename(path))[0], "device": device, "locale": locale, "masks": []}
+    return dict(meta, path=path)
+
+
+def compare_one(job):
+    """Runs in a pool worker: one screenshot against its shortlisted baselines."""
+    started = time.perf_counter()
+    shot, variants = job["shot"], job["variants"]
+    with open(shot["path"], "rb") as f:
+        data = f.read()
+    sha = hashlib.sha256(data).hexdigest()
+    result = {"key": job["key"], "path": shot["path"], "sha256": sha}
+
+    if any(v["sha256"] == sha for v in variants):
+        return dict(result, status="identical", ms=round((time.perf_counter() - started) * 1000, 1))
+
+    candidate = load_rgb(shot["path"])
+    mask = mask_array(candidate.shape, shot.get("masks", []))
+    phash = perceptual_hash(candidate, mask)
+    result.update(phash=f"{phash:016x}", size=[candidate.shape[1], candidate.shape[0]],
+                  masked_fraction=round(float(mask.mean()), 4))
+    if not variants:
+        return dict(result, status="new", ms=round((time.perf_counter() - started) * 1000, 1))
+
+    shortlist = sorted(variants, key=lambda v: hamming(phash, int(v["phash"], 16)))[:SHORTLIST]
+    best = None
+    for variant in shortlist:
+        entry = {"baseline": variant["sha256"], "phash_distance": hamming(phash, int(variant["phash"], 16))}
+        if variant["size"] != result["size"]:
+            entry.update(changed_tiles=1.0, reason="size changed")
+        else:
+            fraction, counted = tile_diff(candidate, load_rgb(object_path(job["baselines"], variant["sha256"])), mask)
+            changed = (fraction > TILE_CHANGED_FRACTION) & counted
+            entry.update(changed_tiles=round(float(changed.sum() / max(1, counted.sum())), 5), fraction=fraction)
+        if best is None or entry["changed_tiles"] < best["changed_tiles"]:
+            best = entry
+        if best["changed_tiles"] == 0:
+            break
+
+    fraction = best.pop("fraction", None)
+    status = "passed" if best["changed_tiles"] <= job["max_changed"] else "failed"
+    if status == "failed" and fraction is not None:
+        os.makedirs(job["heatmap_dir"], exist_ok=True)
+        # Named after the screenshot, not the baseline key: cells that differ only by network or CPU share a key
+        stem = os.path.splitext(os.path.basename(shot["path"]))[0]
+        tag = hashlib.sha256(os.path.abspath(shot["path"]).encode()).hexdigest()[:8]
+        best["heatmap"] = os.path.join(job["heatmap_dir"], f"{stem}_{tag}_diff.png")
+        heatmap(candidate, fraction, mask, best["heatmap"])
+    return dict(result, status=status, **best, ms=round((time.perf_counter() - started) * 1000, 1))
+
+
+def compare(shots, store, heatmap_dir, max_changed=MAX_CHANGED_TILES, workers=None, approve=False):
+    """Compares screenshots (shot_from_sidecar() dicts) in a process pool; returns the visual summary."""
+    started = time.perf_counter()
+    jobs = []
+    for shot in shots:
+        key = screen_key(shot["screen"], shot["device"], shot["locale"])
+        jobs.append({"shot": shot, "key": key, "variants": store.variants(key), "baselines": store.root,
+                     "heatmap_dir": heatmap_dir, "max_changed": max_changed})
+    results = []
+    if jobs:
+        workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(compare_one, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+    if approve:
+        for result in results:
+            if result["status"] in ("new", "failed"):
+                store.approve(result["key"], result["path"], result["sha256"], int(result["phash"], 16), result["size"])
+        store.save()
+
+    counts = {status: sum(1 for r in results if r["status"] == status) for status in ("identical", "passed", "failed", "new")}
+    return {
+        "baselines": store.root,
+        "screenshots": len(results),
+        **counts,
+        "passed_all": counts["failed"] == 0,
+        "approved": approve,
+        "max_changed_tiles": max_changed,
+        "wall_clock_s": round(time.perf_counter() - started, 2),
+        "results": sorted(results, key=lambda r: r["key"]),
+    }
+
+
+def print_summary(summary, label="VISUAL"):
+    print(f"[{label}] {summary['screenshots']} screenshots in {summary['wall_clock_s']}s: {summary['identical']} identical, "
+          f"{summary['passed']} within tolerance, {summary['failed']} failed, {summary['new']} without baseline")
+    for r in summary["results"]:
+        if r["status"] == "failed":
+            print(f"  ✗ {r['key']}: {r['changed_tiles'] * 100:.2f}% tiles changed"
+                  f"{' (' + r['reason'] + ')' if r.get('reason') else ''} → {r.get('heatmap', '')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("compare", help="Compare every PNG under a directory with its baseline")
+    run.add_argument("directory")
+    run.add_argument("--baselines", default=DEFAULT_BASELINE_DIR)
+    run.add_argument("--device", default="unknown", help="Device for PNGs without a sidecar")
+    run.add_argument("--locale", default="unknown", help="Locale for PNGs without a sidecar")
+    run.add_argument("--max-changed", type=float, default=MAX_CHANGED_TILES, help="Fraction of tiles that may differ")
+    run.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    run.add_argument("--approve", action="store_true", help="Store the current screenshots as the newest baselines")
+    run.add_argument("--out", default=None, help=f"Report path (default: <directory>/{DEFAULT_REPORT})")
+    prune = sub.add_parser("prune", help="Delete baseline objects the index no longer references")
+    prune.add_argument("--baselines", default=DEFAULT_BASELINE_DIR)
+    args = parser.parse_args()
+
+    store = BaselineStore(args.baselines)
+    if args.command == "prune":
+        print(f"[VISUAL] Removed {store.prune()} unreferenced baseline objects")
+        return 0
+
+    paths = sorted(p for p in glob.glob(os.path.join(args.directory, "**", "*.png"), recursive=True)
+                   if not p.endswith("_diff.png") and not os.path.abspath(p).startswith(os.path.abspath(args.baselines)))
+    shots = [shot_from_sidecar(p, args.device, args.locale) for p in paths]
+    out = args.out or os.path.join(args.directory, DEFAULT_REPORT)
+    summary = compare(shots, store, os.path.join(os.path.dirname(os.path.abspath(out)), "visual_diff"),
+                      args.max_changed, args.workers, args.approve)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({"audit_version": "v2-visual", "date": datetime.now(timezone.utc).isoformat(timespec="seconds"), **summary},
+                  f, indent=2, ensure_ascii=False)
+    print_summary(summary)
+    print(f"Visual report saved: {out}")
+    return 0 if summary["passed_all"] or args.approve else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,28 @@
+import type { MediaStore } from './src/common/services/MediaStore';
+import type { AudioCache } from './src/common/services/AudioCache';
+import type { TtsScheduler } from './src/common/services/TtsScheduler';
+import type { SaveSession } from './src/common/services/SaveSession';
+import type { ImageLoader } from './src/common/services/ImageLoader';
+import type { SpeculativeTurns } from './src/common/services/SpeculativeTurns';
+import type { PerfTelemetry } from './src/common/services/PerfTelemetry';
+
 declare global {
     interface Window {
         utterances: SpeechSynthesisUtterance[];
+        __afMedia?: MediaStore;
+        __afAudioCache?: AudioCache;
+        __afTts?: TtsScheduler;
+        __afSave?: SaveSession;
+        __afImages?: ImageLoader;
+        __afSpeculation?: SpeculativeTurns;
+        __afPerf?: PerfTelemetry;
+    }
+
+    // Not in the TypeScript 4.9 DOM typings yet
+    class CompressionStream {
+        constructor(format: 'gzip' | 'deflate' | 'deflate-raw');
+        readonly readable: ReadableStream<Uint8Array>;
+        readonly writable: WritableStream<Uint8Array>;
     }
 }
 
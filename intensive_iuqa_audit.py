@@ -1,7 +1,9 @@
 from playwright.sync_api import sync_playwright
-import time
 import os
 
+from audit.profiles import BASE_URL
+from audit.readiness import Readiness, install_stream_probe
+
 def run_intensive_audit():
     with sync_playwright() as p:
         # Simulate mobile device
@@ -14,7 +16,9 @@ def run_intensive_audit():
             locale='es-ES',
             timezone_id='Europe/Madrid'
         )
+        install_stream_probe(context)
         page = context.new_page()
+        ready = Readiness(page)
         
         # Emulate slow 3G (approximate)
         client = page.context.new_cdp_session(page)
@@ -27,15 +31,15 @@ def run_intensive_audit():
 
         try:
             print("--- Scenario: Slow Mobile Network (Game Selection) ---")
-            page.goto('https://adventure-forge.vercel.app')
+            page.goto(BASE_URL)
             
             # 1. Loading State Audit
             # Capture early state to see if there's a flicker or empty screen
-            time.sleep(1)
+            ready.first_paint()
             page.screenshot(path='audit_loading_initial.png')
             
             # Wait for content
-            page.wait_for_selector('button', timeout=60000)
+            ready.selector('button', "main menu shell", probe="app_shell", timeout_ms=60000)
             page.screenshot(path='audit_main_menu_mobile.png')
             
             # Check Hit Areas (Min 44px)
@@ -59,17 +63,17 @@ def run_intensive_audit():
                 # Fallback to text search if testid is missing in current version
                 page.get_by_role("button", name="Nueva Aventura").click()
 
-            page.wait_for_load_state('networkidle')
-            time.sleep(2) # Animation buffer
+            ready.test_id("start-adventure-btn", "adventure selection")
+            ready.animations_settled("selection transition")
             page.screenshot(path='audit_selection_screen_mobile.png')
 
             # 3. Intensive Carousel Check
             print("Testing Carousel Responsiveness...")
             next_btn = page.locator('.carousel-nav.next')
             if next_btn.count() > 0:
-                for _ in range(3):
+                for i in range(3):
                     next_btn.click()
-                    time.sleep(0.5)
+                    ready.animations_settled(f"carousel rotation {i + 1}")
                 page.screenshot(path='audit_selection_rotated_mobile.png')
 
             # 4. Game Loop - Stressing the Typewriter/Overlay
@@ -82,8 +86,10 @@ def run_intensive_audit():
 
             # Wait for narrative
             print("Waiting for narrative stream...")
-            # Let's wait for the typewriter or a text container
-            time.sleep(10) # Heavy stream
+            # Heavy stream: wait for the paragraphs to arrive and the overlay to start typing
+            ready.stream_event("text_structure")
+            ready.cinematic()
+            ready.selector('.cinematic-text-overlay.visible', "narrative overlay")
             page.screenshot(path='audit_game_stream_mobile.png')
             
             # Check for text clipping in the overlay
@@ -96,6 +102,7 @@ def run_intensive_audit():
             print(f"ERROR: {e}")
             page.screenshot(path='audit_error_crash.png')
         finally:
+            print(f"Readiness waits: {ready.log.summary()['total_wait_ms']:.0f}ms total")
             browser.close()
 
 if __name__ == "__main__":
@@ -5,87 +5,39 @@ Date: 2026-02-19 (Second Run - Fresh Capture)
 Scope: Game Loop + Mobile UX + Visual Quality
 """
 from playwright.sync_api import sync_playwright
-import time
+import argparse
 import json
 
-PROD_URL = "https://adventure-forge.vercel.app"
+from audit.dom_audit import audit_screen
+from audit.profiles import BASE_URL
+from audit.readiness import Readiness, ReadinessLog, install_stream_probe, is_console_bug
+from audit.visual_diff import (
+    DEFAULT_BASELINE_DIR,
+    MASK_RECTS_JS,
+    MASK_SELECTORS,
+    BaselineStore,
+    compare,
+    print_summary,
+    shot_from_sidecar,
+    write_sidecar,
+)
+
+# AUDIT_BASE_URL overrides the production URL (e.g. a local build wired to the stand-in API)
+PROD_URL = BASE_URL
 OUT_DIR = "audit_v2_"
 
 findings = []
+screenshots = []
 
-def capture(page, name, note=""):
+def capture(page, name, note="", device="iphone-13", locale="es-ES"):
     path = f"{OUT_DIR}{name}.png"
+    masks = page.evaluate(MASK_RECTS_JS, [MASK_SELECTORS, False])
     page.screenshot(path=path, full_page=False)
+    write_sidecar(path, name, device, locale, masks)
+    screenshots.append(path)
     print(f"[SCREENSHOT] {path} — {note}")
     return path
 
-def check_hit_areas(page, context_label):
-    """Audit all interactive elements for minimum 44px touch targets."""
-    results = []
-    elements = page.query_selector_all('button, a, [role="button"], input[type="checkbox"], input[type="radio"]')
-    small_count = 0
-    for el in elements:
-        box = el.bounding_box()
-        if box:
-            is_small = box['width'] < 44 or box['height'] < 44
-            if is_small:
-                small_count += 1
-                text = (el.inner_text() or "").strip()[:30]
-                results.append({
-                    "context": context_label,
-                    "element": text or "[icon/no-text]",
-                    "size": f"{box['width']:.0f}x{box['height']:.0f}px",
-                    "issue": "BELOW 44px"
-                })
-    print(f"[HIT-AREA] {context_label}: {len(elements)} elements, {small_count} too small")
-    return results
-
-def check_text_overflow(page, context_label):
-    """Detect text containers that might be clipping content."""
-    overflow_els = page.evaluate("""
-        () => {
-            const issues = [];
-            document.querySelectorAll('p, h1, h2, h3, span, button, a').forEach(el => {
-                if (el.scrollWidth > el.clientWidth + 2 || el.scrollHeight > el.clientHeight + 2) {
-                    issues.push({
-                        tag: el.tagName,
-                        text: el.innerText?.substring(0, 40) || '',
-                        scrollW: el.scrollWidth,
-                        clientW: el.clientWidth,
-                        scrollH: el.scrollHeight,
-                        clientH: el.clientHeight
-                    });
-                }
-            });
-            return issues.slice(0, 10); // top 10
-        }
-    """)
-    if overflow_els:
-        print(f"[OVERFLOW] {context_label}: {len(overflow_els)} elements with text overflow")
-        for item in overflow_els[:5]:
-            print(f"  → <{item['tag']}> '{item['text']}' scroll={item['scrollW']}x{item['scrollH']} client={item['clientW']}x{item['clientH']}")
-    return overflow_els
-
-def check_color_contrast(page):
-    """Check if any text elements have potentially low contrast."""
-    contrast_data = page.evaluate("""
-        () => {
-            const issues = [];
-            const textEls = document.querySelectorAll('p, h1, h2, h3, button, span, a, label');
-            textEls.forEach(el => {
-                const style = window.getComputedStyle(el);
-                const color = style.color;
-                const bg = style.backgroundColor;
-                // Flag rgba(255,255,255) on rgba(255,255,255) or transparent/near-transparent
-                if (color && bg && color === bg) {
-                    issues.push({ text: el.innerText?.substring(0, 30), color, bg });
-                }
-            });
-            return issues.slice(0, 5);
-        }
-    """)
-    return contrast_data
-
 def check_loading_states(page, context_label):
     """Check for spinner/skeleton presence."""
     spinners = page.query_selector_all('[class*="spinner"], [class*="skeleton"], [class*="loading"], [role="progressbar"], [aria-busy="true"]')
@@ -104,7 +56,7 @@ def get_click_depth(steps):
         "screen": "Full Flow"
     })
 
-def run_audit():
+def run_audit(visual=False, baselines=DEFAULT_BASELINE_DIR):
     with sync_playwright() as p:
         # =========================================================
         # SESSION 1: iPhone 13 (375x812) — Slow Network
@@ -117,7 +69,10 @@ def run_audit():
             locale='es-ES',
             timezone_id='Europe/Madrid'
         )
+        install_stream_probe(context)
         page = context.new_page()
+        readiness_log = ReadinessLog()
+        ready = Readiness(page, readiness_log)
         
         # Slow 3G simulation
         cdp = page.context.new_cdp_session(page)
@@ -134,21 +89,18 @@ def run_audit():
         print("\n=== PASS 1: MAIN MENU (iPhone 13, Slow 3G) ===")
         page.goto(PROD_URL, wait_until="commit")
         
-        # T+1s: Capture early loading state
-        time.sleep(1)
-        capture(page, "01_loading_t1s", "T+1s loading state")
-        spinners_initial = check_loading_states(page, "T+1s Loading")
+        # First paint: Capture early loading state
+        ready.first_paint()
+        capture(page, "01_loading_first_paint", "First paint loading state")
+        spinners_initial = check_loading_states(page, "First Paint Loading")
         
         # Wait for main content
-        try:
-            page.wait_for_selector('button', timeout=30000)
-            page.wait_for_load_state('networkidle', timeout=30000)
-        except Exception as e:
-            print(f"[TIMEOUT] Main load: {e}")
+        ready.selector('button', "main menu shell", probe="app_shell")
+        ready.fonts()
+        ready.network_idle("main menu network idle")
         
         capture(page, "02_main_menu", "Main menu loaded")
-        hit_issues = check_hit_areas(page, "Main Menu")
-        overflow_main = check_text_overflow(page, "Main Menu")
+        screens = [audit_screen(page, "Main Menu")]
         spinners_menu = check_loading_states(page, "Main Menu Loaded")
         
         # =========================================================
@@ -184,11 +136,10 @@ def run_audit():
                         click_steps += 1
                         break
             
-            time.sleep(2)
-            page.wait_for_load_state('networkidle', timeout=15000)
+            ready.test_id("start-adventure-btn", "adventure selection")
+            ready.animations_settled("selection transition")
             capture(page, "03_adventure_selection", "Adventure selection screen")
-            hit_issues += check_hit_areas(page, "Adventure Selection")
-            overflow_selection = check_text_overflow(page, "Adventure Selection")
+            screens.append(audit_screen(page, "Adventure Selection"))
             
             # Carousel navigation test
             print("[CAROUSEL] Testing navigation arrows...")
@@ -215,7 +166,7 @@ def run_audit():
                 print(f"[GENRE] {genre_btns.count()} genre cards found")
                 genre_btns.first.click()
                 click_steps += 1
-                time.sleep(1)
+                ready.animations_settled("genre selection")
                 capture(page, "04_genre_selected", "Genre selected state")
             
         except Exception as e:
@@ -252,7 +203,7 @@ def run_audit():
             get_click_depth(click_steps + 1)  # +1 for initial page load
             
             # Check loading state during stream
-            time.sleep(2)
+            ready.selector('.spinner, [data-testid="game-cinematic-container"]', "game loading state")
             capture(page, "05_game_starting", "Game starting - loading state")
             spinners_game = check_loading_states(page, "Game Starting")
             
@@ -261,10 +212,11 @@ def run_audit():
             print(f"[SKELETON] {len(skeletons)} skeleton/shimmer elements during load")
             
             # Wait for narrative
-            print("[NARRATIVE] Waiting for AI stream (up to 20s)...")
+            print("[NARRATIVE] Waiting for AI stream...")
             try:
-                page.wait_for_selector('.narrative-text, [class*="narrative"], [class*="story"], [class*="typewriter"]', timeout=20000)
-                time.sleep(3)
+                if not (ready.stream_event("text_structure") and ready.cinematic()):
+                    raise TimeoutError("narrative stream did not start")
+                ready.selector('.cinematic-text-overlay.visible', "narrative overlay")
                 capture(page, "06_narrative_active", "Narrative streaming")
                 
                 # Check narrative text container
@@ -303,8 +255,10 @@ def run_audit():
         # =========================================================
         print("\n=== PASS 4: OPTION BUTTONS VALIDATION ===")
         try:
-            # Wait for options to appear
-            time.sleep(5)
+            # Wait for the turn to finish streaming and options to appear
+            ready.stream_event("done")
+            ready.not_busy("game turn settled")
+            ready.selector('[data-testid="game-options-container"] button', "option buttons", probe="options")
             option_selectors = [
                 '[data-testid*="option"]',
                 '[class*="option-btn"]',
@@ -359,9 +313,9 @@ def run_audit():
         print("\n=== PASS 5: FULL PAGE SCROLL & OVERFLOW ===")
         try:
             page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            time.sleep(1)
+            ready.animations_settled("scroll settled")
             capture(page, "08_scroll_bottom", "Bottom of page / overflow check")
-            overflow_game = check_text_overflow(page, "Game Screen")
+            screens.append(audit_screen(page, "Game Screen"))
         except Exception as e:
             print(f"[ERROR] Scroll check: {e}")
         
@@ -370,6 +324,11 @@ def run_audit():
         for err in console_errors[:10]:
             print(f"  [{err['type'].upper()}] {err['text'][:100]}")
         
+        stream_timeline = ready.stream_timeline()
+        perf = ready.perf()
+        if perf:
+            for name, span in sorted(perf["spans"].items()):
+                print(f"[PERF] {name}: {span['count']}x, p50 {span['p50']}ms, p95 {span['p95']}ms")
         browser.close()
         
         # =========================================================
@@ -379,10 +338,12 @@ def run_audit():
         browser2 = p.chromium.launch(headless=True)
         ctx2 = browser2.new_context(viewport={"width": 1440, "height": 900})
         page2 = ctx2.new_page()
+        ready2 = Readiness(page2, readiness_log)
         
         page2.goto(PROD_URL)
-        page2.wait_for_load_state('networkidle', timeout=30000)
-        capture(page2, "09_desktop_main_menu", "Desktop - Main menu")
+        ready2.network_idle("desktop network idle")
+        ready2.fonts()
+        capture(page2, "09_desktop_main_menu", "Desktop - Main menu", device="desktop-1440", locale="default")
         
         # Full page desktop screenshot
         page2.screenshot(path=f"{OUT_DIR}10_desktop_full.png", full_page=True)
@@ -404,9 +365,19 @@ def run_audit():
         # FINAL REPORT
         # =========================================================
         print("\n=== AUDIT COMPLETE ===")
+        hit_issues = [i for screen in screens for i in screen["touch_target"] + screen["hidden_interactive"]]
+        contrast_issues = [c for screen in screens for c in screen["contrast"]]
         print(f"Hit-area issues found: {len(hit_issues)}")
+        print(f"Contrast issues found: {len(contrast_issues)}")
+        if visual:
+            visual = compare([shot_from_sidecar(path) for path in screenshots], BaselineStore(baselines),
+                             f"{OUT_DIR}visual_diff")
+            print_summary(visual)
+        else:
+            visual = None
         print(f"Console errors captured: {len(console_errors)}")
         print(f"Programmatic findings: {len(findings)}")
+        print(f"Time spent waiting on readiness probes: {readiness_log.summary()['total_wait_ms']:.0f}ms")
         
         # Compile all issues
         all_issues = hit_issues + [
@@ -417,7 +388,7 @@ def run_audit():
                 "title": e['text'][:80],
                 "context": "Browser Console",
                 "screen": "Runtime"
-            } for i, e in enumerate(console_errors[:5])
+            } for i, e in enumerate([e for e in console_errors if is_console_bug(e)][:5])
         ] + findings
         
         # Save JSON report
@@ -429,7 +400,13 @@ def run_audit():
             "network": "Slow 3G (300kbps/500ms latency)",
             "total_issues": len(all_issues),
             "issues": all_issues,
-            "console_errors": console_errors[:20]
+            "contrast_issues": contrast_issues,
+            "overflow_issues": [o for screen in screens for o in screen["text_overflow"]],
+            "visual": visual,
+            "console_errors": console_errors[:20],
+            "readiness": readiness_log.summary(),
+            "stream_timeline": stream_timeline,
+            "perf": perf
         }
         
         with open("audit_v2_report.json", "w", encoding="utf-8") as f:
@@ -440,4 +417,8 @@ def run_audit():
         return report
 
 if __name__ == "__main__":
-    run_audit()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--visual", action="store_true", help="Compare the screenshots with the baselines (audit/visual_diff.py)")
+    parser.add_argument("--baselines", default=DEFAULT_BASELINE_DIR)
+    args = parser.parse_args()
+    run_audit(args.visual, args.baselines)
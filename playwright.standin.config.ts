@@ -0,0 +1,43 @@
+import { defineConfig, devices } from '@playwright/test';
+
+// Runs the e2e specs against the local stand-in API (audit/standin_server.py),
+// so flows are repeatable on a CI box without network access or AI keys.
+const STANDIN_PORT = process.env.STANDIN_PORT || '3001';
+const STANDIN_PROFILE = process.env.STANDIN_PROFILE || 'ci-fast';
+
+export default defineConfig({
+  testDir: './tests/e2e',
+  fullyParallel: true,
+  forbidOnly: !!process.env.CI,
+  retries: 0,
+  workers: process.env.CI ? 1 : undefined,
+  reporter: 'html',
+  use: {
+    baseURL: 'http://localhost:3000',
+    trace: 'on-first-retry',
+  },
+  projects: [
+    {
+      name: 'chromium',
+      use: { ...devices['Desktop Chrome'] },
+    },
+  ],
+  webServer: [
+    {
+      command: `python -m audit.standin_server --port ${STANDIN_PORT} --profile ${STANDIN_PROFILE}`,
+      url: `http://localhost:${STANDIN_PORT}/`,
+      reuseExistingServer: !process.env.CI,
+      timeout: 30 * 1000,
+    },
+    {
+      command: 'npm start',
+      url: 'http://localhost:3000',
+      reuseExistingServer: !process.env.CI,
+      timeout: 120 * 1000,
+      env: {
+        BROWSER: 'none',
+        REACT_APP_API_URL: `http://localhost:${STANDIN_PORT}`,
+      },
+    },
+  ],
+});
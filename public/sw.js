@@ -0,0 +1,232 @@
+/* eslint-disable no-restricted-globals */
+/*
+ * Adventure Forge service worker.
+ *
+ *   app shell     index.html: served from cache, revalidated in the background
+ *   static        hashed JS/CSS/media from asset-manifest.json: precached, cache-first
+ *   music         public/music/*.m4a: network until the whole track has been
+ *                 downloaded once in the background, then every Range request
+ *                 (media elements seek with them) is answered from the cache
+ *   game list     GET <api>/game/list: first page stale-while-revalidate, keyed
+ *                 per user, dropped when the same user saves or deletes a game;
+ *                 later pages (?cursor=) always go to the network
+ *   fonts         Google Fonts CSS and files: stale-while-revalidate
+ *
+ * Registered from src/common/utils/serviceWorker.ts with the API origin in
+ * the `api` query parameter.
+ */
+const VERSION = 'v1';
+const SHELL_CACHE = `af-shell-${VERSION}`;
+const STATIC_CACHE = `af-static-${VERSION}`;
+const MUSIC_CACHE = `af-music-${VERSION}`;
+const API_CACHE = `af-api-${VERSION}`;
+const FONT_CACHE = `af-fonts-${VERSION}`;
+const CACHES = [SHELL_CACHE, STATIC_CACHE, MUSIC_CACHE, API_CACHE, FONT_CACHE];
+
+const SCOPE = new URL(self.registration.scope);
+const API_ORIGIN = new URL(self.location.href).searchParams.get('api') || '';
+const SHELL_URL = new URL('index.html', SCOPE).href;
+const MANIFEST_URL = new URL('asset-manifest.json', SCOPE).href;
+const FONT_HOSTS = ['fonts.googleapis.com', 'fonts.gstatic.com'];
+
+// ---------- install / activate ----------
+
+self.addEventListener('install', event => {
+    event.waitUntil(precache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        const names = await caches.keys();
+        await Promise.all(names.filter(name => name.startsWith('af-') && !CACHES.includes(name)).map(name => caches.delete(name)));
+        await self.clients.claim();
+    })());
+});
+
+/** Shell, every hashed asset of the current build and the public icons. Stale build assets are pruned. */
+async function precache() {
+    const manifestResponse = await fetch(MANIFEST_URL, { cache: 'no-store' });
+    if (!manifestResponse.ok) throw new Error(`asset-manifest.json: ${manifestResponse.status}`);
+    const manifest = await manifestResponse.json();
+    const urls = Object.values(manifest.files || {})
+        .filter(url => !/\.map$|\.txt$|index\.html$/.test(url))
+        .map(url => new URL(url, SCOPE).href);
+    ['favicon.ico', 'logo192.png', 'manifest.json'].forEach(name => urls.push(new URL(name, SCOPE).href));
+
+    const staticCache = await caches.open(STATIC_CACHE);
+    const cached = new Set((await staticCache.keys()).map(request => request.url));
+    await Promise.all(urls.filter(url => !cached.has(url)).map(url =>
+        fetch(url, { cache: 'no-cache' }).then(response => response.ok && staticCache.put(url, response)).catch(() => undefined)
+    ));
+    const current = new Set(urls);
+    await Promise.all(Array.from(cached).filter(url => !current.has(url)).map(url => staticCache.delete(url)));
+
+    const shell = await fetch(SHELL_URL, { cache: 'no-cache' });
+    if (shell.ok) await (await caches.open(SHELL_CACHE)).put(SHELL_URL, shell);
+}
+
+// ---------- routing ----------
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    const url = new URL(request.url);
+
+    if (request.method !== 'GET') {
+        if (API_ORIGIN && url.origin === API_ORIGIN && /\/game\/(save|delete)/.test(url.pathname)) {
+            event.waitUntil(forgetGameList(request));
+        }
+        return;
+    }
+    if (request.mode === 'navigate' && url.origin === SCOPE.origin) {
+        event.respondWith(appShell(event));
+    } else if (url.origin === SCOPE.origin && url.pathname.endsWith('.m4a')) {
+        event.respondWith(music(event));
+    } else if (url.origin === SCOPE.origin && (url.pathname.includes('/static/') || /\.(png|ico)$|\/manifest\.json$/.test(url.pathname))) {
+        event.respondWith(cacheFirst(request, STATIC_CACHE));
+    } else if (API_ORIGIN && url.origin === API_ORIGIN && url.pathname.endsWith('/game/list')) {
+        event.respondWith(gameList(event));
+    } else if (FONT_HOSTS.includes(url.hostname)) {
+        event.respondWith(staleWhileRevalidate(event, request, FONT_CACHE));
+    }
+});
+
+async function cacheFirst(request, cacheName) {
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(request, { ignoreSearch: true });
+    if (cached) return cached;
+    const response = await fetch(request);
+    if (response.ok) cache.put(request, response.clone());
+    return response;
+}
+
+async function staleWhileRevalidate(event, request, cacheName, key = request) {
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(key);
+    const refresh = fetch(request).then(async response => {
+        if (response.ok || response.type === 'opaque') await cache.put(key, response.clone());
+        return response;
+    });
+    if (cached) {
+        event.waitUntil(refresh.catch(() => undefined));
+        return cached;
+    }
+    return refresh;
+}
+
+/** Cached shell first; the background refresh also precaches a newly deployed build for the next start. */
+async function appShell(event) {
+    const cache = await caches.open(SHELL_CACHE);
+    const cached = await cache.match(SHELL_URL);
+    const refresh = fetch(SHELL_URL, { cache: 'no-cache' }).then(async response => {
+        if (!response.ok) return response;
+        const previous = cached ? await cached.clone().text() : null;
+        const fresh = response.clone();
+        await cache.put(SHELL_URL, response.clone());
+        if (previous !== null && previous !== await fresh.text()) await precache().catch(() => undefined);
+        return response;
+    });
+    if (cached) {
+        event.waitUntil(refresh.catch(() => undefined));
+        return cached;
+    }
+    return refresh.catch(() => Response.error());
+}
+
+// ---------- music ----------
+
+const musicDownloads = new Map();
+
+async function music(event) {
+    const request = event.request;
+    const cache = await caches.open(MUSIC_CACHE);
+    const cached = await cache.match(request.url);
+    if (cached) return rangeResponse(cached, request.headers.get('range'));
+
+    // Until the track is stored the network answers each range, so playback starts right away.
+    // One full download per track fills the cache in the background for later plays and seeks.
+    if (!musicDownloads.has(request.url)) {
+        const download = fetch(request.url)
+            .then(response => (response.ok && response.status === 200 ? cache.put(request.url, response) : undefined))
+            .catch(() => undefined)
+            .then(() => { musicDownloads.delete(request.url); });
+        musicDownloads.set(request.url, download);
+    }
+    event.waitUntil(musicDownloads.get(request.url));
+    return fetch(request);
+}
+
+/** Answers `Range: bytes=start-end` from a complete cached file (media elements seek this way). */
+async function rangeResponse(response, range) {
+    const match = range && /^bytes=(\d*)-(\d*)$/.exec(range.trim());
+    if (!match) return response;
+    const blob = await response.blob();
+    const size = blob.size;
+    let start = match[1] === '' ? size - Number(match[2]) : Number(match[1]);
+    let end = match[1] !== '' && match[2] !== '' ? Number(match[2]) : size - 1;
+    start = Math.max(0, start);
+    end = Math.min(end, size - 1);
+    if (start > end) {
+        return new Response(null, { status: 416, headers: { 'Content-Range': `bytes */${size}` } });
+    }
+    return new Response(blob.slice(start, end + 1), {
+        status: 206,
+        statusText: 'Partial Content',
+        headers: {
+            'Content-Type': response.headers.get('Content-Type') || 'audio/mp4',
+            'Content-Length': String(end - start + 1),
+            'Content-Range': `bytes ${start}-${end}/${size}`,
+            'Accept-Ranges': 'bytes',
+        },
+    });
+}
+
+// ---------- game list ----------
+
+/** Cache key prefix per signed-in user: the list URL plus a hash of the Authorization header. */
+async function gameListUserKey(request) {
+    const auth = request.headers.get('authorization') || '';
+    const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(auth));
+    const user = Array.from(new Uint8Array(digest).slice(0, 12), b => b.toString(16).padStart(2, '0')).join('');
+    const url = new URL(request.url);
+    return `${url.origin}${url.pathname.replace(/\/game\/.*$/, '/game/list')}?sw-user=${user}`;
+}
+
+/** The first page is cached per page size (the menu asks for one save, the load dialog for a page). */
+async function gameListKey(request) {
+    const limit = new URL(request.url).searchParams.get('limit');
+    return `${await gameListUserKey(request)}${limit ? `&limit=${limit}` : ''}`;
+}
+
+async function gameList(event) {
+    const request = event.request;
+    if (new URL(request.url).searchParams.has('cursor')) return fetch(request);
+    const key = await gameListKey(request);
+    const cache = await caches.open(API_CACHE);
+    const cached = await cache.match(key);
+    const previous = cached ? await cached.clone().text() : null;
+    const refresh = fetch(request).then(async response => {
+        if (!response.ok) return response;
+        const body = await response.clone().text();
+        await cache.put(key, response.clone());
+        // Tell the menu when the list it already shows has changed
+        if (previous !== null && previous !== body) notifyClients({ type: 'af-sw:game-list-updated' });
+        return response;
+    });
+    if (cached) {
+        event.waitUntil(refresh.catch(() => undefined));
+        return cached;
+    }
+    return refresh;
+}
+
+async function forgetGameList(request) {
+    const cache = await caches.open(API_CACHE);
+    const prefix = await gameListUserKey(request);
+    const keys = await cache.keys();
+    await Promise.all(keys.filter(key => key.url.startsWith(prefix)).map(key => cache.delete(key)));
+}
+
+async function notifyClients(message) {
+    const clients = await self.clients.matchAll({ type: 'window' });
+    clients.forEach(client => client.postMessage(message));
+}
@@ -1,16 +1,32 @@
-import React, { useRef, useEffect } from 'react';
+import React, { useRef, useEffect, useState } from 'react';
 import { useSettings } from '../../contexts/SettingsContext';
+import { whenIdle } from '../../utils/deferred';
 
 interface BackgroundMusicProps {
     audioFile: string;
 }
 
+// Music is a few MB per genre: let the first turn's stream and images go first
+const MUSIC_DELAY_MS = 3000;
+
 const BackgroundMusic: React.FC<BackgroundMusicProps> = ({ audioFile }) => {
     const { musicVolume } = useSettings();
     const audioRef = useRef<HTMLAudioElement | null>(null);
+    const [src, setSrc] = useState<string | undefined>(undefined);
 
     useEffect(() => {
-        if (audioRef.current) {
+        let cancelIdle: (() => void) | null = null;
+        const timer = setTimeout(() => {
+            cancelIdle = whenIdle(() => setSrc(audioFile));
+        }, MUSIC_DELAY_MS);
+        return () => {
+            clearTimeout(timer);
+            cancelIdle?.();
+        };
+    }, [audioFile]);
+
+    useEffect(() => {
+        if (audioRef.current && src) {
             audioRef.current.loop = true;
             try {
                 audioRef.current.volume = musicVolume;
@@ -19,7 +35,7 @@ const BackgroundMusic: React.FC<BackgroundMusicProps> = ({ audioFile }) => {
                 console.warn("Audio error", e);
             }
         }
-    }, [audioFile]); // Re-run if file changes
+    }, [src]); // Re-run once the (deferred) file is attached
 
     useEffect(() => {
         if (audioRef.current) {
@@ -29,7 +45,8 @@ const BackgroundMusic: React.FC<BackgroundMusicProps> = ({ audioFile }) => {
 
     return (
         <div style={{ display: 'none' }}>
-            <audio ref={audioRef} src={audioFile} />
+            {/* preload="none": the file streams as it plays instead of being downloaded up front */}
+            <audio ref={audioRef} src={src} preload="none" />
         </div>
     );
 };
@@ -1,127 +1,49 @@
 import React, { useRef, useEffect } from 'react';
 import { useSettings } from '../../contexts/SettingsContext';
+import { audioBlobFromBytes, base64ToBytes } from '../../utils/audioFormat';
+import { narrationClock } from '../../services/NarrationClock';
+import { NarrationPlayer, narrationPlayer } from '../../services/NarrationPlayer';
 
 interface TextNarratorProps {
     text: string;
     voice?: SpeechSynthesisVoice;
-    audioData?: string; // Base64 audio data (PCM)
+    audioData?: string; // Object URL from mediaStore, or base64 audio data (WAV/MP3/PCM)
     isLoadingAudio?: boolean; // New prop to signal that audio is being fetched
+    nextAudioData?: string; // Object URL of the clip that follows audioData, queued to play without a gap
     onComplete?: () => void;
 }
 
-const TextNarrator: React.FC<TextNarratorProps> = ({ text, voice, audioData, isLoadingAudio, onComplete }) => {
+const TextNarrator: React.FC<TextNarratorProps> = ({ text, voice, audioData, nextAudioData, isLoadingAudio, onComplete }) => {
     const { sfxVolume } = useSettings();
     const audioRef = useRef<HTMLAudioElement | null>(null);
     const onCompleteRef = useRef(onComplete);
+    // Read by the audio effect's cleanup: a clip already queued on the Web Audio player keeps playing
+    const latestAudioRef = useRef(audioData);
+    latestAudioRef.current = audioData;
 
     useEffect(() => {
         onCompleteRef.current = onComplete;
     }, [onComplete]);
 
-    // Helper to convert base64 to ArrayBuffer
-    const base64ToArrayBuffer = (base64: string) => {
-        const binaryString = window.atob(base64);
-        const len = binaryString.length;
-        const bytes = new Uint8Array(len);
-        for (let i = 0; i < len; i++) {
-            bytes[i] = binaryString.charCodeAt(i);
-        }
-        return bytes.buffer;
-    };
-
-    // Helper to create WAV header
-    const createWavHeader = (dataLength: number, sampleRate: number = 24000, numChannels: number = 1, bitsPerSample: number = 16) => {
-        const header = new ArrayBuffer(44);
-        const view = new DataView(header);
-
-        const writeString = (view: DataView, offset: number, string: string) => {
-            for (let i = 0; i < string.length; i++) {
-                view.setUint8(offset + i, string.charCodeAt(i));
-            }
-        };
-
-        writeString(view, 0, 'RIFF');
-        view.setUint32(4, 36 + dataLength, true);
-        writeString(view, 8, 'WAVE');
-        writeString(view, 12, 'fmt ');
-        view.setUint32(16, 16, true);
-        view.setUint16(20, 1, true);
-        view.setUint16(22, numChannels, true);
-        view.setUint32(24, sampleRate, true);
-        view.setUint32(28, sampleRate * numChannels * (bitsPerSample / 8), true);
-        view.setUint16(32, numChannels * (bitsPerSample / 8), true);
-        view.setUint16(34, bitsPerSample, true);
-        writeString(view, 36, 'data');
-        view.setUint32(40, dataLength, true);
-
-        return header;
-    };
-
-    // Helper to identify WAV header
-    const hasWavHeader = (buffer: ArrayBuffer) => {
-        if (buffer.byteLength < 44) return false;
-        const view = new DataView(buffer);
-        return (
-            view.getUint8(0) === 0x52 &&
-            view.getUint8(1) === 0x49 &&
-            view.getUint8(2) === 0x46 &&
-            view.getUint8(3) === 0x46 &&
-            view.getUint8(8) === 0x57 &&
-            view.getUint8(9) === 0x41 &&
-            view.getUint8(10) === 0x56 &&
-            view.getUint8(11) === 0x45
-        );
-    };
-
-    // Helper to identify MP3 header
-    const isMp3 = (buffer: ArrayBuffer) => {
-        if (buffer.byteLength < 3) return false;
-        const view = new DataView(buffer);
-        if (view.getUint8(0) === 0x49 && view.getUint8(1) === 0x44 && view.getUint8(2) === 0x33) {
-            return true;
-        }
-        if (view.getUint16(0) >= 0xFFE0) {
-            return true;
-        }
-        return false;
-    };
-
     // Effect for Audio
     useEffect(() => {
-        if (audioData) {
-            // Stop any existing speech synthesis
-            speechSynthesis.cancel();
-
-            if (audioRef.current) {
-                audioRef.current.pause();
-                audioRef.current = null;
-            }
-
+        let ownedUrl: string | null = null;
+        let cancelled = false;
+        const playElement = (data: string) => {
             try {
-                const audioBuffer = base64ToArrayBuffer(audioData);
-                let blobParts: BlobPart[] = [];
-                let mimeType = 'audio/wav';
-
-                if (hasWavHeader(audioBuffer)) {
-                    blobParts = [audioBuffer];
-                } else if (isMp3(audioBuffer)) {
-                    blobParts = [audioBuffer];
-                    mimeType = 'audio/mpeg';
-                } else {
-                    // Assume raw PCM 16-bit 24kHz mono
-                    const wavHeader = createWavHeader(audioBuffer.byteLength);
-                    blobParts = [wavHeader, audioBuffer];
+                // Object URLs are owned (and revoked) by mediaStore; base64 gets a URL we own here
+                if (!data.startsWith('blob:')) {
+                    ownedUrl = URL.createObjectURL(audioBlobFromBytes(base64ToBytes(data)));
                 }
 
-                const audioBlob = new Blob(blobParts, { type: mimeType });
-                const audioUrl = URL.createObjectURL(audioBlob);
-
-                const audio = new Audio(audioUrl);
+                const audio = new Audio(ownedUrl || data);
                 audio.volume = sfxVolume;
                 audio.onended = () => {
                     onCompleteRef.current && onCompleteRef.current();
                 };
                 audioRef.current = audio;
+                // The Typewriter paces its reveal on this clip's playback position
+                narrationClock.attach(audio);
 
                 audio.play().catch(e => console.error("Error playing audio:", e));
 
@@ -129,6 +51,30 @@ const TextNarrator: React.FC<TextNarratorProps> = ({ text, voice, audioData, isL
                 console.error("Error processing audio data:", e);
                 onCompleteRef.current && onCompleteRef.current();
             }
+        };
+
+        if (audioData) {
+            // Stop any existing speech synthesis
+            speechSynthesis.cancel();
+
+            if (audioRef.current) {
+                audioRef.current.pause();
+                audioRef.current = null;
+            }
+
+            if (narrationPlayer.isActive(audioData)) {
+                // Queued behind the previous clip and already playing (or about to): nothing to start
+            } else if (audioData.startsWith('blob:') && NarrationPlayer.isSupported()) {
+                narrationPlayer.setVolume(sfxVolume);
+                narrationPlayer.play(audioData, () => onCompleteRef.current && onCompleteRef.current())
+                    .catch(e => {
+                        if (cancelled) return;
+                        console.warn("[Narration] Web Audio playback failed, using an audio element:", e);
+                        playElement(audioData);
+                    });
+            } else {
+                playElement(audioData);
+            }
 
         } else if (voice && !isLoadingAudio) {
             // Fallback to speech synthesis
@@ -136,19 +82,33 @@ const TextNarrator: React.FC<TextNarratorProps> = ({ text, voice, audioData, isL
         }
 
         return () => {
+            cancelled = true;
             if (audioRef.current) {
                 audioRef.current.pause();
                 audioRef.current.onended = null;
+                narrationClock.detach(audioRef.current);
             }
+            if (!narrationPlayer.isActive(latestAudioRef.current)) narrationPlayer.stop();
+            if (ownedUrl) URL.revokeObjectURL(ownedUrl);
             speechSynthesis.cancel();
         };
     }, [audioData, text, voice, isLoadingAudio]); // Re-run if audioData or isLoadingAudio changes
 
+    // Queue the following clip so it starts on the sample the current one ends
+    useEffect(() => {
+        if (!nextAudioData || !narrationPlayer.isActive(latestAudioRef.current) || narrationPlayer.isActive(nextAudioData)) return;
+        narrationPlayer.enqueue(nextAudioData, () => onCompleteRef.current && onCompleteRef.current())
+            .catch(e => console.warn("[Narration] Could not queue the next clip:", e));
+    }, [nextAudioData, audioData]);
+
+    useEffect(() => () => narrationPlayer.stop(), []);
+
     // Update volume for active audio
     useEffect(() => {
         if (audioRef.current) {
             audioRef.current.volume = sfxVolume;
         }
+        narrationPlayer.setVolume(sfxVolume);
     }, [sfxVolume]);
 
 
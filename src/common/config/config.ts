@@ -1,5 +1,21 @@
 export const config = {
     // In development (npm start), defaults to localhost:3001
     // In production (npm run build), uses REACT_APP_API_URL from environment
-    apiUrl: process.env.REACT_APP_API_URL || 'https://adventure-forge-api.onrender.com'
+    apiUrl: process.env.REACT_APP_API_URL || 'https://adventure-forge-api.onrender.com',
+    // Sentences synthesized ahead of the one being narrated
+    ttsLookahead: Number(process.env.REACT_APP_TTS_LOOKAHEAD ?? 2),
+    // Gzip large save bodies (only sent to servers that accept delta saves)
+    saveCompression: process.env.REACT_APP_SAVE_COMPRESSION !== 'false',
+    // 'frame' (requestAnimationFrame, narration-paced) or 'interval' (previous per-character timer)
+    typewriterMode: (process.env.REACT_APP_TYPEWRITER_MODE === 'interval' ? 'interval' : 'frame') as 'frame' | 'interval',
+    // Offline-capable asset/API cache (public/sw.js); production builds only
+    serviceWorker: process.env.NODE_ENV === 'production' && process.env.REACT_APP_SERVICE_WORKER !== 'false',
+    // Generate the likeliest next turn while the player reads the options (opt-in: costs extra generations)
+    speculativeTurns: process.env.REACT_APP_SPECULATIVE_TURNS === 'true',
+    // /game/stream requests carry this many recent turns verbatim, older ones as a summary (0 = whole history)
+    contextTurns: Number(process.env.REACT_APP_CONTEXT_TURNS ?? 6),
+    // Size budget (KB of JSON) for the history sent with each turn
+    contextBudgetKb: Number(process.env.REACT_APP_CONTEXT_BUDGET_KB ?? 24),
+    // Endpoint for batched performance telemetry beacons (PerfBeacon); empty = keep it in the page only
+    perfBeaconUrl: process.env.REACT_APP_PERF_BEACON_URL || ''
 };
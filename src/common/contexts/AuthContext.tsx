@@ -1,6 +1,5 @@
 import React, { createContext, useContext, useState, useEffect, ReactNode } from 'react';
 import axios from 'axios';
-import { googleLogout } from '@react-oauth/google';
 import { config } from '../config/config';
 
 // Define User Interface matching Backend Schema
@@ -62,7 +61,8 @@ export const AuthProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
     };
 
     const logout = () => {
-        googleLogout();
+        // The Google SDK is only loaded with the sign-in button; no need to pull it in just to log out
+        import('@react-oauth/google').then(({ googleLogout }) => googleLogout()).catch(() => undefined);
         setUser(null);
         setToken(null);
         localStorage.removeItem('user');
@@ -1,5 +1,6 @@
 import React, { createContext, useContext, useState, ReactNode, useEffect } from 'react';
 import { GameSaveData } from '../services/GameService';
+import { deferredStorage } from '../utils/deferred';
 
 export type Screen = 'main_menu' | 'apikey' | 'selection' | 'game';
 
@@ -27,12 +28,12 @@ export const NavigationProvider: React.FC<{ children: ReactNode }> = ({ children
     // Start at main_menu
     const [screenStack, setScreenStack] = useState<Screen[]>(['main_menu']);
 
-    // Initialize from localStorage
-    const [userToken, setUserToken] = useState<string>(() => localStorage.getItem("adventure_forge_token") || "");
-    const [openaiKey, setOpenaiKey] = useState<string>(() => localStorage.getItem("adventure_forge_openai_key") || "");
-    const [pollinationsToken, setPollinationsToken] = useState<string>(() => localStorage.getItem("adventure_forge_pollinations_token") || "");
+    // Initialize from localStorage (read once, cached by deferredStorage)
+    const [userToken, setUserToken] = useState<string>(() => deferredStorage.get("adventure_forge_token") || "");
+    const [openaiKey, setOpenaiKey] = useState<string>(() => deferredStorage.get("adventure_forge_openai_key") || "");
+    const [pollinationsToken, setPollinationsToken] = useState<string>(() => deferredStorage.get("adventure_forge_pollinations_token") || "");
     const [selectedGenreIndex, setSelectedGenreIndex] = useState<number>(() => {
-        const saved = localStorage.getItem("adventure_forge_genre_index");
+        const saved = deferredStorage.get("adventure_forge_genre_index");
         return saved ? parseInt(saved, 10) : 0;
     });
 
@@ -43,21 +44,21 @@ export const NavigationProvider: React.FC<{ children: ReactNode }> = ({ children
 
     const currentScreen = screenStack[screenStack.length - 1];
 
-    // Persistence Effects
+    // Persistence Effects: unchanged values are not written back on startup, changes are flushed when idle
     useEffect(() => {
-        localStorage.setItem("adventure_forge_token", userToken);
+        deferredStorage.set("adventure_forge_token", userToken);
     }, [userToken]);
 
     useEffect(() => {
-        localStorage.setItem("adventure_forge_openai_key", openaiKey);
+        deferredStorage.set("adventure_forge_openai_key", openaiKey);
     }, [openaiKey]);
 
     useEffect(() => {
-        localStorage.setItem("adventure_forge_pollinations_token", pollinationsToken);
+        deferredStorage.set("adventure_forge_pollinations_token", pollinationsToken);
     }, [pollinationsToken]);
 
     useEffect(() => {
-        localStorage.setItem("adventure_forge_genre_index", selectedGenreIndex.toString());
+        deferredStorage.set("adventure_forge_genre_index", selectedGenreIndex.toString());
     }, [selectedGenreIndex]);
 
     const navigate = (screen: Screen) => {
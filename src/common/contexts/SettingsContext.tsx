@@ -1,4 +1,5 @@
 import React, { createContext, useContext, useState, ReactNode } from 'react';
+import { deferredStorage } from '../utils/deferred';
 
 interface SettingsContextType {
     showSettings: boolean;
@@ -15,21 +16,21 @@ export const SettingsProvider: React.FC<{ children: ReactNode }> = ({ children }
     const [showSettings, setShowSettings] = useState(false);
     // Initialize from localStorage or default
     const [musicVolume, setMusicVolume] = useState(() => {
-        const saved = localStorage.getItem("adventure_forge_music_volume");
+        const saved = deferredStorage.get("adventure_forge_music_volume");
         return saved ? parseFloat(saved) : 0.3;
     });
     const [sfxVolume, setSfxVolume] = useState(() => {
-        const saved = localStorage.getItem("adventure_forge_sfx_volume");
+        const saved = deferredStorage.get("adventure_forge_sfx_volume");
         return saved ? parseFloat(saved) : 1.0;
     });
 
-    // Persistence
+    // Persistence (slider drags are coalesced into one write)
     React.useEffect(() => {
-        localStorage.setItem("adventure_forge_music_volume", musicVolume.toString());
+        deferredStorage.set("adventure_forge_music_volume", musicVolume.toString());
     }, [musicVolume]);
 
     React.useEffect(() => {
-        localStorage.setItem("adventure_forge_sfx_volume", sfxVolume.toString());
+        deferredStorage.set("adventure_forge_sfx_volume", sfxVolume.toString());
     }, [sfxVolume]);
 
     return (
@@ -0,0 +1,121 @@
+import { TextDecoder, TextEncoder } from 'util';
+import { readEventStream } from './resumableStream';
+import { StreamEvent } from './useGameStream';
+
+// jsdom has no TextDecoder
+(global as any).TextDecoder ??= TextDecoder;
+
+const FAST = { maxReconnects: 5, baseDelayMs: 1, maxDelayMs: 2 };
+
+const TURN: object[] = [
+  { type: 'status', message: 'Thinking...' },
+  { type: 'text_structure', paragraphs: ['One.', 'Two.'], options: ['a', 'b'] },
+  { type: 'image', index: 0, data: 'x'.repeat(300) },
+  { type: 'audio', pIndex: 0, sIndex: 0, text: 'One.', data: 'y'.repeat(200) },
+  { type: 'image', index: 1, data: 'z'.repeat(300) },
+  { type: 'audio', pIndex: 1, sIndex: 0, text: 'Two.', data: 'w'.repeat(200) },
+  { type: 'done' },
+];
+
+const message = (event: object, seq: number) => `id: t1:${seq}\ndata: ${JSON.stringify(event)}\n\n`;
+
+/** Deterministic PRNG so a failing chaos run can be replayed. */
+const mulberry32 = (seed: number) => () => {
+  seed = (seed + 0x6D2B79F5) | 0;
+  let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+  t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+  return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+};
+
+/**
+ * A body that hands out `text` in small chunks and then either ends or fails,
+ * like a connection the network cut mid-event.
+ */
+const body = (text: string, fail: boolean, chunk = 64) => {
+  const bytes = new TextEncoder().encode(text);
+  let offset = 0;
+  return {
+    getReader: () => ({
+      read: async () => {
+        if (offset < bytes.length) {
+          const value = bytes.slice(offset, offset + chunk);
+          offset += chunk;
+          return { done: false, value };
+        }
+        if (fail) throw new TypeError('network error');
+        return { done: true, value: undefined };
+      },
+      cancel: async () => undefined,
+    }),
+  } as unknown as ReadableStream<Uint8Array>;
+};
+
+/**
+ * Serves TURN after Last-Event-ID, cutting each connection at a random byte
+ * offset while `drops` last. The first cut comes after the status event: a
+ * connection lost before any event is the caller's to retry.
+ */
+const chaosServer = (random: () => number, drops: number) => {
+  const opened: (string | null)[] = [];
+  const open = async (lastEventId: string | null) => {
+    opened.push(lastEventId);
+    const after = lastEventId === null ? -1 : Number(lastEventId.split(':')[1]);
+    const text = TURN.map(message).filter((_, seq) => seq > after).join('');
+    if (opened.length > drops) return body(text, false);
+    const from = lastEventId === null ? message(TURN[0], 0).length : 0;
+    return body(text.substring(0, from + Math.floor(random() * (text.length - from))), random() < 0.5);
+  };
+  return { open, opened };
+};
+
+describe('Resumable turn stream (readEventStream)', () => {
+  it('should pass events through and finish on done', async () => {
+    const events: StreamEvent[] = [];
+    const result = await readEventStream(async () => body(TURN.map(message).join(''), false), e => events.push(e), new AbortController().signal, {}, FAST);
+    expect(events.map(e => e.type)).toEqual(['status', 'text_structure', 'image', 'audio', 'image', 'audio', 'done']);
+    expect(events[6].id).toBe('t1:6');
+    expect(result).toEqual({ lastEventId: 't1:6', reconnects: 0, complete: true });
+  });
+
+  it('should complete every turn exactly once when connections are cut at random offsets', async () => {
+    const random = mulberry32(17);
+    for (let run = 0; run < 50; run++) {
+      const server = chaosServer(random, 3);
+      const events: StreamEvent[] = [];
+      const result = await readEventStream(server.open, e => events.push(e), new AbortController().signal, {}, FAST);
+
+      // No event lost or repeated, and the text was generated once
+      expect(events.map(e => e.id)).toEqual(TURN.map((_, seq) => `t1:${seq}`));
+      expect(events.filter(e => e.type === 'text_structure')).toHaveLength(1);
+      expect(result.complete).toBe(true);
+      // Every reconnection asked for what came after the last event seen
+      expect(server.opened[0]).toBeNull();
+      server.opened.slice(1).forEach(id => expect(id).toMatch(/^t1:\d+$/));
+    }
+  });
+
+  it('should drop events a server replays twice', async () => {
+    const texts = [TURN.slice(0, 3).map(message).join(''), TURN.map(message).join('')];
+    const events: StreamEvent[] = [];
+    await readEventStream(async () => body(texts.shift()!, true), e => events.push(e), new AbortController().signal, {}, FAST);
+    expect(events.map(e => e.id)).toEqual(TURN.map((_, seq) => `t1:${seq}`));
+  });
+
+  it('should fail without resuming when nothing was received or the server sends no ids', async () => {
+    const open = jest.fn(async () => body('', true));
+    await expect(readEventStream(open, () => undefined, new AbortController().signal, {}, FAST)).rejects.toThrow('network error');
+    expect(open).toHaveBeenCalledTimes(1);
+
+    const events: StreamEvent[] = [];
+    const legacy = await readEventStream(async () => body(`data: ${JSON.stringify(TURN[0])}\n\n`, false), e => events.push(e), new AbortController().signal, {}, FAST);
+    expect(events).toHaveLength(1);
+    expect(legacy.complete).toBe(false);
+  });
+
+  it('should give up after too many reconnects without progress', async () => {
+    let calls = 0;
+    const open = async () => body(calls++ === 0 ? message(TURN[0], 0) : '', true);
+    await expect(readEventStream(open, () => undefined, new AbortController().signal, {}, FAST)).rejects.toThrow('network error');
+    expect(calls).toBe(FAST.maxReconnects + 1);
+  });
+});
@@ -0,0 +1,114 @@
+import { StreamEvent } from './useGameStream';
+import { SSEStreamParser } from './sseUtils';
+
+/** Opens the event stream; `lastEventId` is null for the first connection and set on every resume. */
+export type OpenEventStream = (lastEventId: string | null, signal: AbortSignal) => Promise<ReadableStream<Uint8Array>>;
+
+export interface ResumeOptions {
+    maxReconnects: number; // Consecutive reconnects that deliver no new event before giving up
+    baseDelayMs: number;
+    maxDelayMs: number;
+}
+
+export const DEFAULT_RESUME_OPTIONS: ResumeOptions = {
+    maxReconnects: 5,
+    baseDelayMs: 500,
+    maxDelayMs: 8000,
+};
+
+export interface EventStreamHooks {
+    // Runs before every read; returning a promise pauses reading (speculative turns park this way)
+    beforeRead?: () => Promise<void> | void;
+    onBytes?: (bytes: number) => void;
+}
+
+export interface EventStreamResult {
+    lastEventId: string | null;
+    reconnects: number;
+    complete: boolean;
+}
+
+const isTerminal = (event: StreamEvent) => event.type === 'done' || event.type === 'error';
+
+/** Splits "<turn>:<seq>" ids; servers that send other ids are only resumed, never deduplicated. */
+const parseEventId = (id: string): { turn: string; seq: number } | null => {
+    const colon = id.lastIndexOf(':');
+    const seq = Number(id.substring(colon + 1));
+    return colon > 0 && Number.isFinite(seq) ? { turn: id.substring(0, colon), seq } : null;
+};
+
+const sleep = (ms: number, signal: AbortSignal) => new Promise<void>((resolve, reject) => {
+    const timer = setTimeout(resolve, ms);
+    signal.addEventListener('abort', () => {
+        clearTimeout(timer);
+        reject(new DOMException('Aborted', 'AbortError'));
+    }, { once: true });
+});
+
+/**
+ * Reads a `/game/stream` response and survives dropped connections. Every
+ * event the server tags with an id is remembered; when the connection breaks
+ * (or closes before `done`), the stream is reopened with that id as
+ * Last-Event-ID after an exponential backoff with jitter, and the server
+ * replays only what came after it. Events already seen are dropped, so a
+ * server that replays too much never duplicates a paragraph.
+ *
+ * Streams without ids behave as before: a broken connection is an error and
+ * an early close simply ends the turn.
+ */
+export const readEventStream = async (
+    open: OpenEventStream,
+    onEvent: (event: StreamEvent) => void,
+    signal: AbortSignal,
+    hooks: EventStreamHooks = {},
+    options: ResumeOptions = DEFAULT_RESUME_OPTIONS
+): Promise<EventStreamResult> => {
+    let lastEventId: string | null = null;
+    let last: { turn: string; seq: number } | null = null;
+    let complete = false;
+    let reconnects = 0;
+    let failures = 0;
+
+    while (true) {
+        let progressed = false;
+        const parser = new SSEStreamParser(event => {
+            if (event.id !== undefined) {
+                const parsed = parseEventId(event.id);
+                if (parsed && last && parsed.turn === last.turn && parsed.seq <= last.seq) return;
+                lastEventId = event.id;
+                last = parsed;
+            }
+            progressed = true;
+            if (isTerminal(event)) complete = true;
+            onEvent(event);
+        });
+        try {
+            const body = await open(lastEventId, signal);
+            const reader = body.getReader();
+            const decoder = new TextDecoder();
+            while (true) {
+                const pause = hooks.beforeRead?.();
+                if (pause) await pause;
+                const { done, value } = await reader.read();
+                if (done) break;
+                hooks.onBytes?.(value.byteLength);
+                parser.push(decoder.decode(value, { stream: true }));
+            }
+            parser.push(decoder.decode());
+            if (complete || lastEventId === null) return { lastEventId, reconnects, complete };
+            throw new Error("Stream closed before the turn was complete");
+        } catch (e: any) {
+            if (signal.aborted || e.name === 'AbortError') throw e;
+            // A connection reset after `done` loses nothing
+            if (complete) return { lastEventId, reconnects, complete };
+            // Nothing to resume from: let the caller retry or report it
+            if (lastEventId === null) throw e;
+            failures = progressed ? 1 : failures + 1;
+            if (failures > options.maxReconnects) throw e;
+            const delay = Math.min(options.maxDelayMs, options.baseDelayMs * Math.pow(2, failures - 1));
+            console.warn(`[Stream] Connection lost after event ${lastEventId}; resuming in ${Math.round(delay)}ms`, e?.message);
+            await sleep(delay * (0.5 + Math.random() * 0.5), signal);
+            reconnects++;
+        }
+    }
+};
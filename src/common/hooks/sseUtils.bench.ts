@@ -0,0 +1,142 @@
+/**
+ * SSE parser micro-benchmark (run with `npm run bench`).
+ * Feeds multi-megabyte synthetic streams, split at adversarial chunk
+ * boundaries, through the legacy concatenate-and-substring loop and the
+ * incremental SSEStreamParser, and reports time per stream.
+ */
+import { StreamEvent } from './useGameStream';
+import { SSEStreamParser } from './sseUtils';
+
+// Verbatim copy of the pre-cursor implementation, kept as the baseline
+const legacyProcessSSEBuffer = (buffer: string, onEvent: (event: StreamEvent) => void): string => {
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+        const block = buffer.substring(0, boundary).trim();
+        buffer = buffer.substring(boundary + 2);
+        for (let line of block.split('\n')) {
+            line = line.trim();
+            if (line.startsWith('data: ')) {
+                const jsonStr = line.substring(6).trim();
+                if (jsonStr) onEvent(JSON.parse(jsonStr) as StreamEvent);
+            }
+        }
+        boundary = buffer.indexOf('\n\n');
+    }
+    return buffer;
+};
+
+// Deterministic LCG so every run splits the stream identically
+const makeRandom = (seed: number) => () => {
+    seed = (seed * 1664525 + 1013904223) % 4294967296;
+    return seed / 4294967296;
+};
+
+const buildStream = (images: number, imageBytes: number, audios: number, audioBytes: number): string => {
+    const payload = (bytes: number) => 'QUJD'.repeat(Math.ceil(bytes / 4)).substring(0, bytes);
+    const events: StreamEvent[] = [
+        { type: 'status', message: 'Thinking...' },
+        { type: 'text_structure', paragraphs: ['One.', 'Two.', 'Three.'], options: ['A', 'B', 'C'] },
+    ];
+    for (let i = 0; i < images; i++) events.push({ type: 'image', index: i, data: `data:image/png;base64,${payload(imageBytes)}` });
+    for (let i = 0; i < audios; i++) events.push({ type: 'audio', pIndex: i % 3, sIndex: i, text: `Sentence ${i}.`, data: payload(audioBytes) });
+    events.push({ type: 'done' });
+    return events.map(e => `data: ${JSON.stringify(e)}\n\n`).join('');
+};
+
+type Splitter = (stream: string) => string[];
+
+const fixedChunks = (size: number): Splitter => (stream) => {
+    const chunks: string[] = [];
+    for (let i = 0; i < stream.length; i += size) chunks.push(stream.substring(i, i + size));
+    return chunks;
+};
+
+const randomChunks = (maxSize: number): Splitter => (stream) => {
+    const random = makeRandom(42);
+    const chunks: string[] = [];
+    let i = 0;
+    while (i < stream.length) {
+        const size = 1 + Math.floor(random() * maxSize);
+        chunks.push(stream.substring(i, i + size));
+        i += size;
+    }
+    return chunks;
+};
+
+// Cuts between the two newlines of every boundary and inside every "data:" prefix
+const adversarialChunks: Splitter = (stream) => {
+    const cuts: number[] = [];
+    let i = stream.indexOf('\n\n');
+    while (i !== -1) {
+        cuts.push(i + 1, i + 4);
+        i = stream.indexOf('\n\n', i + 2);
+    }
+    const chunks: string[] = [];
+    let last = 0;
+    cuts.forEach(cut => {
+        if (cut > last && cut < stream.length) {
+            // Large messages still arrive in network-sized reads
+            for (let j = last; j < cut; j += 16384) chunks.push(stream.substring(j, Math.min(cut, j + 16384)));
+            last = cut;
+        }
+    });
+    chunks.push(stream.substring(last));
+    return chunks;
+};
+
+const timeIt = (fn: () => number, repeat = 3) => {
+    let best = Infinity;
+    let count = 0;
+    for (let r = 0; r < repeat; r++) {
+        const start = performance.now();
+        count = fn();
+        best = Math.min(best, performance.now() - start);
+    }
+    return { ms: best, count };
+};
+
+describe('SSE parser benchmark', () => {
+    const streams = {
+        '4 MB (4 images, 20 audio)': buildStream(4, 500 * 1024, 20, 100 * 1024),
+        '12 MB (8 images, 60 audio)': buildStream(8, 800 * 1024, 60, 90 * 1024),
+    };
+    const splitters: Record<string, Splitter> = {
+        'fixed 64KB': fixedChunks(64 * 1024),
+        'fixed 1KB': fixedChunks(1024),
+        'random 1..4096B': randomChunks(4096),
+        'adversarial boundaries': adversarialChunks,
+    };
+
+    Object.entries(streams).forEach(([streamName, stream]) => {
+        Object.entries(splitters).forEach(([splitName, split]) => {
+            it(`${streamName} / ${splitName}`, () => {
+                const chunks = split(stream);
+
+                // Both consumers read `data`, so lazy decoding is paid for inside the timing
+                const legacy = timeIt(() => {
+                    let bytes = 0;
+                    let buffer = '';
+                    chunks.forEach(chunk => {
+                        buffer += chunk;
+                        buffer = legacyProcessSSEBuffer(buffer, (e) => { bytes += (e.data?.length || 0) + 1; });
+                    });
+                    return bytes;
+                });
+
+                const incremental = timeIt(() => {
+                    let bytes = 0;
+                    const parser = new SSEStreamParser((e) => { bytes += (e.data?.length || 0) + 1; });
+                    chunks.forEach(chunk => parser.push(chunk));
+                    return bytes;
+                });
+
+                console.log(
+                    `[SSE bench] ${streamName} / ${splitName} (${chunks.length} chunks): ` +
+                    `legacy ${legacy.ms.toFixed(1)}ms, incremental ${incremental.ms.toFixed(1)}ms ` +
+                    `(${(legacy.ms / Math.max(incremental.ms, 0.01)).toFixed(1)}x)`
+                );
+                expect(incremental.count).toBe(legacy.count);
+            });
+        });
+    });
+});
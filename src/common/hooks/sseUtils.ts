@@ -1,43 +1,197 @@
 import { StreamEvent } from './useGameStream';
 
+// Above this size a message's `data` field is sliced out and only decoded when read
+export const LAZY_DATA_THRESHOLD = 64 * 1024;
+
+const NEWLINE = 10; // '\n'
+const DATA_FIELD = /[{,]\s*"data"\s*:\s*"/g;
+
+/**
+ * Finds the opening quote of the envelope's own `data` string, i.e. a
+ * `"data"` key at depth 1. Matches nested in objects/arrays or inside string
+ * values are skipped. Brace and string state is tracked incrementally up to
+ * each candidate, so the prefix is only walked once. Returns -1 if none.
+ */
+const findTopLevelData = (json: string): number => {
+    let depth = 0;
+    let inString = false;
+    let pos = 0;
+
+    DATA_FIELD.lastIndex = 0;
+    for (let match = DATA_FIELD.exec(json); match; match = DATA_FIELD.exec(json)) {
+        for (; pos < match.index; pos++) {
+            const code = json.charCodeAt(pos);
+            if (inString) {
+                if (code === 92 /* \ */) pos++;
+                else if (code === 34 /* " */) inString = false;
+            } else if (code === 34) {
+                inString = true;
+            } else if (code === 123 /* { */ || code === 91 /* [ */) {
+                depth++;
+            } else if (code === 125 /* } */ || code === 93 /* ] */) {
+                depth--;
+            }
+        }
+        if (!inString && pos === match.index && depth === (json[pos] === '{' ? 0 : 1)) {
+            return match.index + match[0].length - 1; // opening quote
+        }
+    }
+    return -1;
+};
+
+/**
+ * Parses one `data:` JSON payload. For large payloads the (base64) `data`
+ * string is cut out of the envelope and exposed through a lazy getter, so
+ * the envelope parse stays cheap and the payload is only materialized once,
+ * by whoever actually consumes it.
+ */
+const parseEventJson = (json: string): StreamEvent => {
+    if (json.length < LAZY_DATA_THRESHOLD) {
+        return JSON.parse(json) as StreamEvent;
+    }
+
+    const valueStart = findTopLevelData(json);
+    if (valueStart === -1) return JSON.parse(json) as StreamEvent;
+
+    // Closing quote = first quote not escaped by an odd run of backslashes (base64 has none)
+    let valueEnd = json.indexOf('"', valueStart + 1);
+    while (valueEnd !== -1) {
+        let slashes = 0;
+        while (json.charCodeAt(valueEnd - 1 - slashes) === 92 /* \ */) slashes++;
+        if (slashes % 2 === 0) break;
+        valueEnd = json.indexOf('"', valueEnd + 1);
+    }
+    if (valueEnd === -1) return JSON.parse(json) as StreamEvent;
+
+    const event = JSON.parse(json.substring(0, valueStart) + '""' + json.substring(valueEnd + 1)) as StreamEvent;
+    const literal = json.substring(valueStart, valueEnd + 1);
+    let decoded: string | undefined;
+    Object.defineProperty(event, 'data', {
+        enumerable: true,
+        configurable: true,
+        get: () => (decoded ??= JSON.parse(literal) as string),
+        set: (value: string) => { decoded = value; }
+    });
+    return event;
+};
+
+/**
+ * Emits every `data:` line of one message block, tagged with the block's
+ * `id:` (used to resume the stream with Last-Event-ID).
+ * Walks lines with indexOf instead of split() so huge blocks aren't copied line by line.
+ */
+const emitBlock = (block: string, onEvent: (event: StreamEvent) => void) => {
+    let lineStart = 0;
+    let id: string | undefined;
+    const events: StreamEvent[] = [];
+    while (lineStart < block.length) {
+        let lineEnd = block.indexOf('\n', lineStart);
+        if (lineEnd === -1) lineEnd = block.length;
+        const line = block.substring(lineStart, lineEnd).trim();
+        lineStart = lineEnd + 1;
+
+        // A block might contain multiple lines (id, event, data, retry)
+        // We only care about 'id:' and 'data:' lines for this implementation
+        if (line.startsWith('id:')) {
+            id = line.substring(3).trim();
+            continue;
+        }
+        if (!line.startsWith('data:')) continue;
+        try {
+            const jsonStr = line.substring(5).trim();
+            if (jsonStr) {
+                events.push(parseEventJson(jsonStr));
+            }
+        } catch (e) {
+            // Critical improvement: Log but don't crash the loop
+            console.error("Failed to parse SSE JSON block:", line.substring(0, 200), e);
+        }
+    }
+    events.forEach(event => {
+        if (id !== undefined && event.id === undefined) event.id = id;
+        onEvent(event);
+    });
+};
+
 /**
  * Robust SSE message extractor.
  * Handles split chunks, multiple messages, and malformed lines.
+ * Walks the buffer with an offset cursor and slices the remainder once.
  */
 export const processSSEBuffer = (
-    buffer: string, 
+    buffer: string,
     onEvent: (event: StreamEvent) => void
 ): string => {
     // SSE chunks can be split by \n\n (standard) or single \n (lines within event)
     // We strictly look for \n\n as the boundary of a "message block"
+    let cursor = 0;
     let boundary = buffer.indexOf('\n\n');
-    
+
     while (boundary !== -1) {
-        const block = buffer.substring(0, boundary).trim();
-        buffer = buffer.substring(boundary + 2);
+        emitBlock(buffer.substring(cursor, boundary).trim(), onEvent);
+        cursor = boundary + 2;
+        boundary = buffer.indexOf('\n\n', cursor);
+    }
 
-        // A block might contain multiple lines (id, event, data, retry)
-        // We only care about 'data:' lines for this implementation
-        const lines = block.split('\n');
-        
-        for (let line of lines) {
-            line = line.trim();
-            if (line.startsWith('data: ')) {
-                try {
-                    const jsonStr = line.substring(6).trim();
-                    if (jsonStr) {
-                        const event = JSON.parse(jsonStr) as StreamEvent;
-                        onEvent(event);
-                    }
-                } catch (e) {
-                    // Critical improvement: Log but don't crash the loop
-                    console.error("Failed to parse SSE JSON block:", line, e);
-                }
-            }
+    return cursor === 0 ? buffer : buffer.substring(cursor); // Return remaining partial block
+};
+
+/**
+ * Incremental SSE parser for a live stream.
+ * Partial messages are kept as a list of chunks and only the newly received
+ * chunk is scanned for a boundary, so a multi-hundred-KB `image`/`audio`
+ * message arriving in many reads is joined exactly once instead of the whole
+ * buffer being re-copied on every read.
+ */
+export class SSEStreamParser {
+    private readonly onEvent: (event: StreamEvent) => void;
+    private pending: string[] = [];
+    private endsWithNewline = false;
+
+    constructor(onEvent: (event: StreamEvent) => void) {
+        this.onEvent = onEvent;
+    }
+
+    push(chunk: string): void {
+        if (!chunk) return;
+        let cursor = 0;
+
+        // Boundary split across reads: previous chunk ended in '\n', this one starts with '\n'
+        if (this.endsWithNewline && chunk.charCodeAt(0) === NEWLINE) {
+            emitBlock(this.takePending().trim(), this.onEvent);
+            cursor = 1;
+        }
+
+        let boundary = chunk.indexOf('\n\n', cursor);
+        while (boundary !== -1) {
+            const tail = chunk.substring(cursor, boundary);
+            const block = this.pending.length > 0 ? this.takePending() + tail : tail;
+            emitBlock(block.trim(), this.onEvent);
+            cursor = boundary + 2;
+            boundary = chunk.indexOf('\n\n', cursor);
+        }
+
+        if (cursor < chunk.length) {
+            this.pending.push(cursor === 0 ? chunk : chunk.substring(cursor));
+            this.endsWithNewline = chunk.charCodeAt(chunk.length - 1) === NEWLINE;
+        } else {
+            this.endsWithNewline = false;
         }
-        
-        boundary = buffer.indexOf('\n\n');
     }
 
-    return buffer; // Return remaining partial block
-};
+    /** Unterminated text still waiting for its boundary. */
+    get remainder(): string {
+        return this.pending.join('');
+    }
+
+    reset(): void {
+        this.pending = [];
+        this.endsWithNewline = false;
+    }
+
+    private takePending(): string {
+        const joined = this.pending.length === 1 ? this.pending[0] : this.pending.join('');
+        this.pending = [];
+        return joined;
+    }
+}
@@ -1,4 +1,4 @@
-import { processSSEBuffer } from './sseUtils';
+import { processSSEBuffer, SSEStreamParser, LAZY_DATA_THRESHOLD } from './sseUtils';
 
 describe('SSE Buffer Processing Logic (sseUtils)', () => {
   it('should handle standard SSE line with double newline', () => {
@@ -92,3 +92,85 @@ describe('SSE Buffer Processing Logic (sseUtils)', () => {
     expect(buffer).toBe('');
   });
 });
+
+describe('Incremental SSE parser (SSEStreamParser)', () => {
+  const stream = [
+    'id: 1\nevent: message\ndata: {"type": "status", "message": "Thinking..."}\n\n',
+    'data: {"type": "text_structure", "paragraphs": ["He said \\"data\\": \\"no\\""], "options": ["A"]}\n\n',
+    `data: {"type": "image", "index": 0, "data": "data:image/png;base64,${'A'.repeat(LAZY_DATA_THRESHOLD)}"}\n\n`,
+    'data: {"type": "done"}\n\n',
+  ].join('');
+
+  const parseWhole = () => {
+    const events: any[] = [];
+    processSSEBuffer(stream, (e) => events.push({ ...e }));
+    return events;
+  };
+
+  it('should emit the same events as processSSEBuffer when fed one character at a time', () => {
+    const events: any[] = [];
+    const parser = new SSEStreamParser((e) => events.push({ ...e }));
+
+    for (const char of stream) parser.push(char);
+
+    expect(events).toEqual(parseWhole());
+    expect(events.map(e => e.type)).toEqual(['status', 'text_structure', 'image', 'done']);
+    expect(parser.remainder).toBe('');
+  });
+
+  it('should handle a boundary split between two reads', () => {
+    const events: any[] = [];
+    const parser = new SSEStreamParser((e) => events.push(e));
+
+    parser.push('data: {"type": "status"}\n');
+    expect(events).toHaveLength(0);
+    parser.push('\ndata: {"type": "do');
+    expect(events).toHaveLength(1);
+    parser.push('ne"}\n\n');
+
+    expect(events.map(e => e.type)).toEqual(['status', 'done']);
+  });
+
+  it('should keep unterminated text as remainder', () => {
+    const parser = new SSEStreamParser(() => {});
+    parser.push('data: {"type": "status"}\n\nda');
+    expect(parser.remainder).toBe('da');
+  });
+
+  it('should decode large data payloads lazily with the same value', () => {
+    const events: any[] = [];
+    processSSEBuffer(stream, (e) => events.push(e));
+
+    const image = events[2];
+    const descriptor = Object.getOwnPropertyDescriptor(image, 'data');
+    expect(descriptor?.get).toBeDefined();
+    expect(image.index).toBe(0);
+    expect(image.data).toBe(`data:image/png;base64,${'A'.repeat(LAZY_DATA_THRESHOLD)}`);
+  });
+
+  it('should only slice out the top-level data field of large payloads', () => {
+    const payload = 'B'.repeat(LAZY_DATA_THRESHOLD);
+    const envelope = {
+      type: 'image',
+      meta: { data: 'nested', list: [{ data: 'deeper' }] },
+      caption: ', "data": "in a string"',
+      data: payload,
+    };
+    const events: any[] = [];
+    processSSEBuffer(`data: ${JSON.stringify(envelope)}\n\n`, (e) => events.push(e));
+
+    expect(events).toHaveLength(1);
+    expect(events[0].meta).toEqual({ data: 'nested', list: [{ data: 'deeper' }] });
+    expect(events[0].caption).toBe(', "data": "in a string"');
+    expect(events[0].data).toBe(payload);
+  });
+
+  it('should fall back to a full parse when a large payload has no top-level data field', () => {
+    const envelope = { type: 'status', meta: { data: 'C'.repeat(LAZY_DATA_THRESHOLD) } };
+    const events: any[] = [];
+    processSSEBuffer(`data: ${JSON.stringify(envelope)}\n\n`, (e) => events.push(e));
+
+    expect(events).toEqual([envelope]);
+    expect(Object.getOwnPropertyDescriptor(events[0], 'data')).toBeUndefined();
+  });
+});
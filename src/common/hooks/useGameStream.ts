@@ -1,8 +1,12 @@
-import { useState, useRef, useCallback } from 'react';
+import { useState, useRef, useCallback, useEffect } from 'react';
 import { config } from '../config/config';
 import { withRetry } from '../utils/resilience';
+import { ImageRef } from '../services/ImageLoader';
+import { SpeculativeTurns, TurnRequest } from '../services/SpeculativeTurns';
+import { perf } from '../services/PerfTelemetry';
+import { ConversationContext } from '../services/ConversationContext';
 
-import { processSSEBuffer } from './sseUtils';
+import { readEventStream } from './resumableStream';
 
 export interface StreamEvent {
     type: 'status' | 'text_structure' | 'image' | 'audio' | 'done' | 'error' | 'image_error';
@@ -14,9 +18,32 @@ export interface StreamEvent {
     sIndex?: number; // Sentence Index (for audio)
     text?: string; // Text content (for audio key)
     data?: string; // Base64 or Text
+    ref?: ImageRef; // Image fetched by reference instead of inline `data`
+    id?: string; // SSE event id ("<turn>:<seq>"), sent back as Last-Event-ID to resume
     error?: string;
 }
 
+// Audit scripts compare both modes by setting this key before the app loads
+const speculativeTurnsEnabled = (): boolean => {
+    try {
+        const stored = localStorage.getItem('adventure_forge_speculative_turns');
+        if (stored === 'true' || stored === 'false') return stored === 'true';
+    } catch (e) {
+        // Storage disabled: use the build setting
+    }
+    return config.speculativeTurns;
+};
+
+// Audit scripts set this key to 'full' to compare against sending the whole history
+const contextTurns = (): number => {
+    try {
+        if (localStorage.getItem('adventure_forge_context') === 'full') return 0;
+    } catch (e) {
+        // Storage disabled: use the build setting
+    }
+    return config.contextTurns;
+};
+
 export const useGameStream = (
     userToken: string,
     authToken: string | null,
@@ -32,6 +59,79 @@ export const useGameStream = (
     // rather than just buffering, to allow "Event Drive" UI
     const onEventRef = useRef<((event: StreamEvent) => void) | null>(null);
 
+    // Windows the history of every request; the caller's history stays whole (saves, speculation keys)
+    const contextRef = useRef<ConversationContext | null>(null);
+    contextRef.current ??= new ConversationContext({ recentTurns: contextTurns(), maxBytes: config.contextBudgetKb * 1024 });
+
+    const openTurn = useCallback(async (
+        request: TurnRequest,
+        signal: AbortSignal,
+        speculative: boolean,
+        lastEventId: string | null = null
+    ): Promise<Response> => {
+        const headers: Record<string, string> = {
+            'Content-Type': 'application/json',
+            'x-google-api-key': userToken,
+            'x-pollinations-token': pollinationsToken,
+            'x-openai-api-key': openaiKey || ''
+        };
+
+        if (authToken) {
+            headers['Authorization'] = `Bearer ${authToken}`;
+        }
+        // Resuming a dropped stream: the server replays only the events after this one
+        if (lastEventId) {
+            headers['Last-Event-ID'] = lastEventId;
+        }
+
+        const context = contextRef.current!.build(request.history);
+        const payload = { ...request, history: context.history };
+        // `speculative` lets the server deprioritize turns the player may never pick
+        const body = JSON.stringify(speculative ? { ...payload, speculative: true } : payload);
+        if (!lastEventId) perf.mark('stream.request', { historyBytes: context.bytes, folded: context.foldedTurns, speculative });
+
+        const res = await fetch(`${config.apiUrl}/game/stream`, {
+            method: 'POST',
+            headers,
+            body,
+            signal,
+            priority: speculative ? 'low' : 'auto'
+        } as RequestInit);
+        if (!res.ok) {
+            const errorMsg = `Stream connection failed: ${res.status}`;
+            // Special handling for auth errors
+            if (res.status === 401 || res.status === 403) {
+                throw new Error("AUTH_ERROR");
+            }
+            throw new Error(errorMsg);
+        }
+        return res;
+    }, [userToken, authToken, pollinationsToken, openaiKey]);
+
+    const openTurnRef = useRef(openTurn);
+    openTurnRef.current = openTurn;
+
+    // Next turns generated while the player reads (opt-in, see SpeculativeTurns)
+    const speculationRef = useRef<SpeculativeTurns | null>(null);
+    if (!speculationRef.current && speculativeTurnsEnabled()) {
+        speculationRef.current = new SpeculativeTurns(async (request, signal, lastEventId) => {
+            const res = await openTurnRef.current(request, signal, true, lastEventId);
+            if (!res.body) throw new Error("Stream body is missing");
+            return res.body;
+        });
+        window.__afSpeculation = speculationRef.current;
+    }
+    useEffect(() => () => speculationRef.current?.cancelAll(), []);
+
+    /** Starts generating the likeliest next turns ahead of the choice (no-op unless enabled). */
+    const prefetchTurns = useCallback((requests: TurnRequest[]) => {
+        speculationRef.current?.prefetch(requests);
+    }, []);
+
+    const cancelPrefetch = useCallback(() => {
+        speculationRef.current?.cancelAll();
+    }, []);
+
     const startStream = useCallback(async (
         prompt: string,
         history: any[],
@@ -45,28 +145,40 @@ export const useGameStream = (
         if (abortControllerRef.current) {
             abortControllerRef.current.abort();
         }
-        abortControllerRef.current = new AbortController();
+        const request: TurnRequest = { prompt, history, voice, genre, lang, saveId };
+        const speculation = speculationRef.current?.take(request) ?? null;
+        // A promoted speculation keeps its own controller, so aborting this stream cancels it too
+        abortControllerRef.current = speculation ? speculation.controller : new AbortController();
 
         setIsStreaming(true);
         setStreamError(null);
         onEventRef.current = onEvent;
 
+        // Turn timings (first event, done) from the moment the turn was requested
+        const started = performance.now();
+        const turnData = { speculative: !!speculation };
+        let firstEvent = true;
+        const emit = (event: StreamEvent) => {
+            if (firstEvent) {
+                firstEvent = false;
+                perf.record('stream.first_event', started, { ...turnData, type: event.type });
+            }
+            if (event.type === 'done') perf.record('stream.done', started, turnData);
+            if (onEventRef.current) onEventRef.current(event);
+        };
+
         try {
-            const headers: Record<string, string> = {
-                'Content-Type': 'application/json',
-                'x-google-api-key': userToken,
-                'x-pollinations-token': pollinationsToken,
-                'x-openai-api-key': openaiKey || ''
-            };
-
-            if (authToken) {
-                headers['Authorization'] = `Bearer ${authToken}`;
+            if (speculation) {
+                // Generated while the player was reading: replay what already arrived, then keep reading
+                await speculation.promote(emit);
+                return;
             }
 
             // Set a timeout to abort the stream if it takes too long to start or respond
             const timeoutId = setTimeout(() => {
                 if (abortControllerRef.current) {
                     console.warn("Stream timed out after 45 seconds");
+                    perf.mark('stream.timeout');
                     abortControllerRef.current.abort();
                     // We throw a specific error to catch it below
                     const timeoutError = new Error("TIMEOUT_ERROR");
@@ -76,46 +188,23 @@ export const useGameStream = (
                 }
             }, 45000); // 45 seconds timeout
 
-            const response = await withRetry(async () => {
-                const res = await fetch(`${config.apiUrl}/game/stream`, {
-                    method: 'POST',
-                    headers,
-                    body: JSON.stringify({ prompt, history, voice, genre, lang, saveId }),
-                    signal: abortControllerRef.current?.signal
-                });
-                if (!res.ok) {
-                    const errorMsg = `Stream connection failed: ${res.status}`;
-                    // Special handling for auth errors
-                    if (res.status === 401 || res.status === 403) {
-                        throw new Error("AUTH_ERROR");
-                    }
-                    throw new Error(errorMsg);
-                }
-                return res;
-            }, { retries: 3, baseDelay: 1000, name: 'Stream Connection' });
-
-            // Clear timeout once we start receiving the body
-            clearTimeout(timeoutId);
-
-            if (!response.body) {
-                throw new Error("Stream body is missing");
-            }
-
-            const reader = response.body.getReader();
-            const decoder = new TextDecoder();
-            let buffer = '';
-
-            while (true) {
-                const { done, value } = await reader.read();
-                if (done) break;
+            // The first connection retries as before; drops after that resume from the last event id
+            const result = await readEventStream(async (lastEventId, signal) => {
+                const connecting = performance.now();
+                const response = lastEventId === null
+                    ? await withRetry(() => openTurn(request, signal, false), { retries: 3, baseDelay: 1000, name: 'Stream Connection' })
+                    : await openTurn(request, signal, false, lastEventId);
 
-                const chunk = decoder.decode(value, { stream: true });
-                buffer += chunk;
+                // Clear timeout once we start receiving the body
+                clearTimeout(timeoutId);
+                perf.record('stream.connect', connecting, { resume: lastEventId !== null });
 
-                buffer = processSSEBuffer(buffer, (event) => {
-                    if (onEventRef.current) onEventRef.current(event);
-                });
-            }
+                if (!response.body) {
+                    throw new Error("Stream body is missing");
+                }
+                return response.body;
+            }, emit, abortControllerRef.current.signal);
+            if (result.reconnects > 0) perf.mark('stream.resumed', { reconnects: result.reconnects });
 
         } catch (e: any) {
             if (e.name === 'AbortError' || e.name === 'TimeoutError') {
@@ -134,10 +223,12 @@ export const useGameStream = (
             abortControllerRef.current = null;
         }
 
-    }, [userToken, authToken, pollinationsToken, openaiKey]);
+    }, [openTurn]);
 
     return {
         startStream,
+        prefetchTurns,
+        cancelPrefetch,
         isStreaming,
         streamError
     };
@@ -1,7 +1,14 @@
 
-import { useState, useRef } from 'react';
-import { splitFirstSentence } from '../utils/textSplitter';
+import { useState, useRef, useEffect } from 'react';
+import { splitIntoSentences } from '../utils/textSplitter';
 import { AudioGenerator } from '../services/ai/AudioGenerator';
+import { mediaStore, MediaHandle } from '../services/MediaStore';
+import { AudioCache, audioCacheKey } from '../services/AudioCache';
+import { persistAudio } from '../services/ai/CachedAudioGenerator';
+import { TtsScheduler, sentencesOf, DEFAULT_TTS_LOOKAHEAD } from '../services/TtsScheduler';
+import { narrationPlayer } from '../services/NarrationPlayer';
+import { audioDecoder } from '../workers/audioDecoder';
+import { perf } from '../services/PerfTelemetry';
 
 export const useSmartAudio = (
     userToken: string,
@@ -9,18 +16,21 @@ export const useSmartAudio = (
     genreKey: string,
     setDuration: (ms: number) => void,
     onSequenceEnd: () => void,
-    audioGenerator: AudioGenerator | null
+    audioGenerator: AudioGenerator | null,
+    voice: string = 'alloy',
+    lookahead: number = DEFAULT_TTS_LOOKAHEAD
 ) => {
+    // Object URL of the clip to play; the decoded bytes live in mediaStore
     const [audioData, setAudioData] = useState<string | undefined>(undefined);
+    // Clip of the part after audioData, once synthesized, so TextNarrator can queue it gaplessly
+    const [nextAudioData, setNextAudioData] = useState<string | undefined>(undefined);
     const [isLoading, setIsLoading] = useState(false);
     const [visualText, setVisualText] = useState("");
     const [visualDuration, setVisualDuration] = useState(0);
 
-    const pendingAudioRef = useRef<Promise<string | null> | null>(null);
-    const hasNextChunkRef = useRef(false);
     // Staging refs for the prepared first chunk
     const nextStartDataRef = useRef<{
-        audio: string;
+        audio: MediaHandle;
         text: string;
         duration: number;
         fullText: string;
@@ -28,30 +38,100 @@ export const useSmartAudio = (
 
     // To handle the full text for final state
     const fullTextRef = useRef("");
-    const part2TextRef = useRef("");
-    const cacheRef = useRef<Map<string, Promise<string | null>>>(new Map());
-
-    const calculateDuration = (base64Data: string, text: string) => {
-        // Check for MP3 header (ID3 or Frame Sync) - rudimentary check
-        // First few bytes of base64 for ID3: "SUQz" (which decodes to ID3)
-        // or frame sync
-        // Or if it starts with // which is u32 or something? No, base64 for ID3 often starts with SUQz
-
-        const isMp3 = base64Data.startsWith("SUQz") || base64Data.startsWith("//"); // Typical MP3 starts or similar
-
-        if (isMp3) {
-            // For MP3, byte-based duration is unreliable without decoding.
-            // Fallback to text-based estimation: avg speaking rate ~15 chars/sec = ~66ms/char
-            // Pollinations/OpenAI is relatively fast, maybe 50-60ms/char
-            return text.length * 60;
-        }
+    // Sentence parts of the prepared text (more than one only when the generator splits, e.g. Kokoro)
+    const partsRef = useRef<string[]>([]);
+    const partIndexRef = useRef(0);
+    const nextPartRef = useRef<Promise<MediaHandle | null> | null>(null);
+    const nextPartUrlRef = useRef<string | null>(null);
+    const playingUrlRef = useRef<string | null>(null);
+
+    // The cache owns every clip's object URL. Clips evicted while playing or
+    // staged are retired and released once nothing references them anymore.
+    const retiredUrlsRef = useRef<Set<string>>(new Set());
+    const isInUse = (url: string) =>
+        url === playingUrlRef.current || url === nextStartDataRef.current?.audio.url || url === nextPartUrlRef.current;
+    const releaseRetired = () => {
+        Array.from(retiredUrlsRef.current).forEach(url => {
+            if (isInUse(url)) return;
+            mediaStore.release(url);
+            retiredUrlsRef.current.delete(url);
+        });
+    };
+
+    const cacheRef = useRef<AudioCache | null>(null);
+    if (!cacheRef.current) {
+        cacheRef.current = new AudioCache(undefined, handle => {
+            if (isInUse(handle.url)) retiredUrlsRef.current.add(handle.url);
+            else mediaStore.release(handle.url);
+        });
+    }
+    const cache = cacheRef.current;
+    const keyFor = (text: string) => audioCacheKey(text, voice, language, genreKey);
+
+    // Clip for one sentence: cached, in flight, or generated now. The real
+    // duration is known before anyone schedules against it (exact for WAV,
+    // measured by the browser otherwise), and the clip is decoded for Web Audio ahead of playback.
+    const synthesizeClip = (text: string, signal?: AbortSignal): Promise<MediaHandle | null> => {
+        const key = keyFor(text);
+        perf.mark(cache.has(key) ? 'audio.cache_hit' : 'audio.cache_miss');
+        return cache.getOrCreate(key, () => generateChunk(text, signal)).then(async handle => {
+            if (handle && handle.durationMs === undefined) await mediaStore.measureDuration(handle.url);
+            if (handle) narrationPlayer.prepare(handle.url);
+            return handle;
+        });
+    };
+    const synthesizeRef = useRef(synthesizeClip);
+    synthesizeRef.current = synthesizeClip; // The scheduler outlives renders; always use the latest generator
+
+    const schedulerRef = useRef<TtsScheduler | null>(null);
+    if (!schedulerRef.current) {
+        schedulerRef.current = new TtsScheduler((text, signal) => synthesizeRef.current(text, signal), lookahead);
+    }
+    const scheduler = schedulerRef.current;
+    scheduler.lookahead = lookahead;
+
+    useEffect(() => {
+        // Read by the audit harness to check that prefetching pays off
+        window.__afAudioCache = cache;
+        window.__afTts = scheduler;
+        return () => {
+            scheduler.cancelAll();
+            playingUrlRef.current = null;
+            nextStartDataRef.current = null;
+            nextPartUrlRef.current = null;
+            cache.clear();
+            releaseRetired();
+            if (window.__afAudioCache === cache) delete window.__afAudioCache;
+            if (window.__afTts === scheduler) delete window.__afTts;
+        };
+    }, [cache, scheduler]);
+
+    // Scheduled sentences come from the turn's lookahead window; anything else is synthesized on demand
+    const clipFor = async (text: string): Promise<MediaHandle | null> => {
+        const index = scheduler.indexOf(text);
+        const handle = index >= 0 ? await scheduler.get(index) : await synthesizeClip(text);
+        // A shared request can come back empty after a cancellation; ask once more directly
+        return handle || (index >= 0 ? synthesizeClip(text) : null);
+    };
+
+    // Read from the WAV header or measured by the browser; the text estimate only covers clips it can't decode
+    const calculateDuration = (handle: MediaHandle, text: string) => handle.durationMs ?? text.length * 60;
+
+    const play = (handle: MediaHandle, text: string) => {
+        playingUrlRef.current = handle.url;
+        setAudioData(handle.url);
+        setDuration(calculateDuration(handle, text));
+        releaseRetired();
+    };
 
-        // Approx duration for 24kHz 16-bit mono PCM (Kokoro)
-        const byteLength = (base64Data.length * 3) / 4;
-        return (byteLength / 48000) * 1000; // in ms
+    /** Hands a turn's paragraphs to the scheduler, which then synthesizes ahead of the playhead. */
+    const scheduleTurn = (paragraphs: string[]) => {
+        scheduler.load(sentencesOf(paragraphs, language));
     };
 
-    const generateChunk = async (text: string): Promise<string | null> => {
+    const skipParagraph = (paragraph: number) => scheduler.skipParagraph(paragraph);
+
+    const generateChunk = async (text: string, signal?: AbortSignal): Promise<MediaHandle | null> => {
         if (!text.trim()) return null;
         if (!audioGenerator) {
             console.warn("Audio Generator not initialized in hook");
@@ -59,31 +139,26 @@ export const useSmartAudio = (
         }
 
         try {
-            return await audioGenerator.generate(text);
+            const base64 = await perf.measure('tts.synthesize', audioGenerator.generate(text, signal), { chars: text.length });
+            if (!base64 || signal?.aborted) return null;
+            // Base64 decoding and WAV framing run in the decode worker
+            const clip = await audioDecoder.ingest(base64);
+            return signal?.aborted ? null : mediaStore.putAudioBlob(clip.blob, clip.durationMs);
         } catch (e) {
+            if (signal?.aborted) return null;
             console.error("Audio generation failed via service", e);
             return null;
         }
     };
 
     // New Prefetch Method
-    const prefetch = (text: string): Promise<string | null> | undefined => {
-        let part1 = text;
+    const prefetch = (text: string): Promise<MediaHandle | null> | undefined => {
         // Logic must match prepareText
-        if (audioGenerator?.shouldSplitText) {
-            const parts = splitFirstSentence(text);
-            part1 = parts[0];
-        }
+        const part1 = audioGenerator?.shouldSplitText ? (splitIntoSentences(text, language)[0] || text) : text;
 
         if (part1.trim()) {
-            if (!cacheRef.current.has(part1)) {
-                console.log("Prefetching audio for:", part1.substring(0, 20) + "...");
-                const promise = generateChunk(part1);
-                cacheRef.current.set(part1, promise);
-                return promise;
-            } else {
-                return cacheRef.current.get(part1);
-            }
+            if (!cache.has(keyFor(part1))) perf.mark('audio.prefetch', { chars: part1.length });
+            return synthesizeClip(part1);
         }
         return undefined;
     };
@@ -93,78 +168,88 @@ export const useSmartAudio = (
         // ... (existing implementation)
         if (!texts || texts.length === 0) return;
         if (!audioGenerator?.generateBatch) return;
-        const needed = texts.filter(t => t.trim() && !cacheRef.current.has(t));
+        const needed = texts.filter(t => t.trim() && !cache.has(keyFor(t)));
         if (needed.length === 0) return;
-        console.log("Batch Prefetching:", needed.length, "items");
+        perf.mark('audio.prefetch_batch', { items: needed.length });
         const batchPromise = audioGenerator.generateBatch(needed);
         needed.forEach((text, index) => {
-            const itemPromise = batchPromise.then(res => {
+            const itemPromise = batchPromise.then(async res => {
                 if (res && res.audios && res.audios[index]) {
-                    return res.audios[index];
+                    const clip = await audioDecoder.ingest(res.audios[index]!);
+                    return mediaStore.putAudioBlob(clip.blob, clip.durationMs);
                 }
                 return null;
             });
-            cacheRef.current.set(text, itemPromise);
+            cache.set(keyFor(text), itemPromise);
         });
     };
 
     // New Manual Cache Injection (for Streaming)
     const cacheAudio = (text: string, audioData: string) => {
         if (!text || !audioData) return;
-        console.log("Injecting audio into cache:", text.substring(0, 20) + "...");
-        cacheRef.current.set(text, Promise.resolve(audioData));
+        perf.mark('audio.inject', { chars: text.length });
+        const pending = audioDecoder.ingest(audioData).then(clip => {
+            // Also keep it across reloads, under the key the cached generator looks up
+            persistAudio(text, clip.blob, { voice, lang: language, genre: genreKey })
+                .catch(e => console.warn("[MediaCache] Persist failed:", e));
+            return mediaStore.putAudioBlob(clip.blob, clip.durationMs);
+        }).catch(e => {
+            console.error("Audio decode failed", e);
+            return null;
+        });
+        cache.set(keyFor(text), pending);
+    };
+
+    const stageNextPart = () => {
+        const next = partIndexRef.current + 1;
+        nextPartRef.current = null;
+        nextPartUrlRef.current = null;
+        setNextAudioData(undefined);
+        if (next >= partsRef.current.length) return;
+        const pending = clipFor(partsRef.current[next]).then(handle => {
+            // Staged for playNextPart, so keep it alive even if evicted meanwhile
+            if (nextPartRef.current === pending) {
+                nextPartUrlRef.current = handle?.url || null;
+                setNextAudioData(handle?.url);
+            }
+            return handle;
+        });
+        nextPartRef.current = pending;
     };
 
     const prepareText = async (text: string) => {
         setAudioData(undefined); // Clear previous audio immediately
+        setNextAudioData(undefined);
         setIsLoading(true);
         // Clear previous pending states
-        hasNextChunkRef.current = false;
-        pendingAudioRef.current = null;
         nextStartDataRef.current = null;
-        part2TextRef.current = "";
+        nextPartRef.current = null;
+        nextPartUrlRef.current = null;
+        releaseRetired();
 
         fullTextRef.current = text;
 
-        let part1 = text;
-        let part2 = "";
+        // Only split if the generator requests it (e.g., Kokoro): every sentence becomes its own clip
+        const parts = audioGenerator?.shouldSplitText ? splitIntoSentences(text, language) : [text];
+        partsRef.current = parts.length > 0 ? parts : [text];
+        partIndexRef.current = 0;
+        const part1 = partsRef.current[0];
 
-        // Only split if the generator requests it (e.g., Kokoro)
-        if (audioGenerator?.shouldSplitText) {
-            const parts = splitFirstSentence(text);
-            part1 = parts[0];
-            part2 = parts[1];
-        }
+        console.log("Audio prep:", { shouldSplit: audioGenerator?.shouldSplitText, part1: part1.substring(0, 20) + "...", parts: partsRef.current.length });
 
-        console.log("Audio prep:", { shouldSplit: audioGenerator?.shouldSplitText, part1: part1.substring(0, 20) + "...", part2Length: part2.length });
-
-        // Fetch 1st chunk (Check Cache First)
-        let audio1: string | null = null;
-        if (cacheRef.current.has(part1)) {
-            console.log("Using cached audio for:", part1.substring(0, 20) + "...");
-            audio1 = await cacheRef.current.get(part1) || null;
-            cacheRef.current.delete(part1); // Consume cache
-        } else {
-            audio1 = await generateChunk(part1);
-        }
+        // Fetch 1st chunk (Check Cache First). Clips stay cached for reuse across turns and retries.
+        const audio1 = await clipFor(part1);
 
         if (audio1) {
-            const duration1 = calculateDuration(audio1, part1);
-
             // Stash data for start()
             nextStartDataRef.current = {
                 audio: audio1,
                 text: part1,
-                duration: duration1,
+                duration: calculateDuration(audio1, part1),
                 fullText: text
             };
-
-            // Start 2nd chunk fetch SEQUENTIALLY (after 1st is done)
-            if (part2.trim().length > 0) {
-                hasNextChunkRef.current = true;
-                pendingAudioRef.current = generateChunk(part2);
-                part2TextRef.current = part2;
-            }
+            // The following part is already in the scheduler's window; keep its clip at hand
+            stageNextPart();
         }
 
         setIsLoading(false);
@@ -178,12 +263,12 @@ export const useSmartAudio = (
             const { audio, text, duration } = nextStartDataRef.current;
 
             // Apply state updates to trigger UI and Audio
-            setAudioData(audio);
+            play(audio, text);
             setVisualText(text);
             setVisualDuration(duration);
 
-            // We expect Typewriter to finish in `duration`. 
-            // If there's a second chunk, onAudioComplete will pick it up
+            // We expect Typewriter to finish in `duration`.
+            // Further parts are picked up by playNextPart
         } else {
             // Fallback if preparation failed or was empty
             setVisualText(fullTextRef.current);
@@ -192,46 +277,50 @@ export const useSmartAudio = (
         }
     };
 
-    const onAudioComplete = async () => {
-        if (hasNextChunkRef.current && pendingAudioRef.current) {
-            // We are expecting a second chunk
-            hasNextChunkRef.current = false; // Only one extra chunk supported for now
-
-            try {
-                const audio2 = await pendingAudioRef.current;
-                pendingAudioRef.current = null;
-
-                if (audio2) {
-                    setAudioData(audio2);
-                    const duration2 = calculateDuration(audio2, part2TextRef.current);
+    /**
+     * Moves on to the next part of a split text once the current clip ends.
+     * Resolves false when there is no further part to play.
+     */
+    const playNextPart = async (): Promise<boolean> => {
+        if (!nextPartRef.current) return false; // No more chunks
 
-                    // Update visuals for Part 2
-                    // We set visualText to FULL text. Typewriter will type extension.
-                    setVisualText(fullTextRef.current);
-                    setVisualDuration(duration2);
-
-                } else {
-                    onSequenceEnd();
-                }
-            } catch (e) {
-                onSequenceEnd();
-            }
-        } else {
-            // No more chunks
-            onSequenceEnd();
+        try {
+            const nextAudio = await nextPartRef.current;
+            if (!nextAudio) return false;
+            partIndexRef.current++;
+            const partText = partsRef.current[partIndexRef.current];
+
+            // Usually already queued by TextNarrator and audible; this hands it the playing slot
+            play(nextAudio, partText);
+            stageNextPart();
+
+            // Typewriter types the extension up to the end of this part
+            setVisualText(partsRef.current.slice(0, partIndexRef.current + 1).join(' '));
+            setVisualDuration(calculateDuration(nextAudio, partText));
+            return true;
+        } catch (e) {
+            return false;
         }
     };
 
+    const onAudioComplete = async () => {
+        if (!await playNextPart()) onSequenceEnd();
+    };
+
     return {
         audioData,
+        nextAudioData,
         isLoading,
         visualText,
         visualDuration,
         prepareText,
+        scheduleTurn,
+        skipParagraph,
         prefetch,
         prefetchBatch,
         cacheAudio,
         start,
+        playNextPart,
         onAudioComplete
     };
 };
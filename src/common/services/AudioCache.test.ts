@@ -0,0 +1,77 @@
+import { AudioCache, audioCacheKey } from './AudioCache';
+import { MediaHandle } from './MediaStore';
+
+const clip = (name: string, bytes: number): MediaHandle => ({ url: `blob:${name}`, kind: 'audio', bytes });
+const flush = () => new Promise(resolve => setTimeout(resolve, 0));
+
+describe('Bounded audio cache (AudioCache)', () => {
+  it('should normalize keys on text, voice, lang and genre', () => {
+    expect(audioCacheKey('  The door  opens. ', 'Alloy', 'ES', 'Fantasy'))
+      .toBe(audioCacheKey('The door opens.', 'alloy', 'es', 'fantasy'));
+    expect(audioCacheKey('The door opens.', 'alloy', 'es', 'fantasy'))
+      .not.toBe(audioCacheKey('The door opens.', 'alloy', 'en', 'fantasy'));
+  });
+
+  it('should evict least recently used clips once over the byte budget', async () => {
+    const evicted: string[] = [];
+    const cache = new AudioCache(250, (h) => evicted.push(h.url));
+
+    cache.set('a', clip('a', 100));
+    cache.set('b', clip('b', 100));
+    await flush();
+    cache.get('a'); // 'b' becomes least recently used
+    cache.set('c', clip('c', 100));
+    await flush();
+
+    expect(evicted).toEqual(['blob:b']);
+    expect(cache.has('a')).toBe(true);
+    expect(cache.has('c')).toBe(true);
+    expect(cache.stats()).toMatchObject({ entries: 2, bytes: 200, evictions: 1 });
+  });
+
+  it('should never evict generations still in flight', async () => {
+    const cache = new AudioCache(50);
+    let resolvePending: (h: MediaHandle) => void = () => { };
+    cache.set('pending', new Promise<MediaHandle>(resolve => { resolvePending = resolve; }));
+    cache.set('big', clip('big', 100));
+    await flush();
+
+    expect(cache.has('pending')).toBe(true);
+    resolvePending(clip('pending', 10));
+    await flush();
+    expect(cache.has('pending')).toBe(true);
+    expect(cache.has('big')).toBe(false);
+  });
+
+  it('should share one in-flight generation between callers', async () => {
+    const cache = new AudioCache();
+    const generate = jest.fn(() => Promise.resolve(clip('x', 10)));
+
+    const first = cache.getOrCreate('x', generate);
+    const second = cache.getOrCreate('x', generate);
+    await Promise.all([first, second]);
+    const third = await cache.getOrCreate('x', generate);
+
+    expect(generate).toHaveBeenCalledTimes(1);
+    expect(third?.url).toBe('blob:x');
+    expect(cache.stats()).toMatchObject({ misses: 1, inflightHits: 1, hits: 1 });
+  });
+
+  it('should drop failed generations so they can be retried', async () => {
+    const cache = new AudioCache();
+    await cache.getOrCreate('fail', () => Promise.resolve(null));
+    expect(cache.has('fail')).toBe(false);
+  });
+
+  it('should hand replaced clips to onEvict', async () => {
+    const evicted: string[] = [];
+    const cache = new AudioCache(1000, (h) => evicted.push(h.url));
+    cache.set('k', clip('old', 10));
+    await flush();
+    cache.set('k', clip('new', 10));
+    await flush();
+
+    expect(evicted).toEqual(['blob:old']);
+    expect(cache.stats().bytes).toBe(10);
+  });
+});
@@ -0,0 +1,135 @@
+import { MediaHandle } from './MediaStore';
+
+export interface AudioCacheStats {
+    entries: number;
+    pending: number;
+    bytes: number;
+    maxBytes: number;
+    hits: number;
+    inflightHits: number;
+    misses: number;
+    evictions: number;
+}
+
+interface CacheEntry {
+    promise: Promise<MediaHandle | null>;
+    handle?: MediaHandle; // Set once the promise resolves; pending entries are never evicted
+}
+
+export const DEFAULT_AUDIO_CACHE_BYTES = 8 * 1024 * 1024;
+
+/** Same sentence in the same voice/lang/genre maps to one key, whitespace and case of the settings aside. */
+export const audioCacheKey = (text: string, voice: string, lang: string, genre: string) =>
+    [voice.toLowerCase(), lang.toLowerCase(), genre.toLowerCase(), text.trim().replace(/\s+/g, ' ')].join('|');
+
+/**
+ * Bounded LRU cache of narrated clips.
+ * Entries are counted by the decoded byte size of their MediaHandle. Once over
+ * budget, the least recently used resolved clips are evicted and handed to
+ * `onEvict`, which releases their object URLs. Generations still in flight are
+ * shared by concurrent callers and never evicted.
+ */
+export class AudioCache {
+    private entries = new Map<string, CacheEntry>();
+    private bytes = 0;
+    private hits = 0;
+    private inflightHits = 0;
+    private misses = 0;
+    private evictions = 0;
+    readonly maxBytes: number;
+    private readonly onEvict: (handle: MediaHandle) => void;
+
+    constructor(maxBytes: number = DEFAULT_AUDIO_CACHE_BYTES, onEvict: (handle: MediaHandle) => void = () => { }) {
+        this.maxBytes = maxBytes;
+        this.onEvict = onEvict;
+    }
+
+    has(key: string): boolean {
+        return this.entries.has(key);
+    }
+
+    /** Looks up a clip (counting a hit or miss) and marks it most recently used. */
+    get(key: string): Promise<MediaHandle | null> | undefined {
+        const entry = this.entries.get(key);
+        if (!entry) {
+            this.misses++;
+            return undefined;
+        }
+        if (entry.handle) this.hits++;
+        else this.inflightHits++;
+        this.entries.delete(key);
+        this.entries.set(key, entry);
+        return entry.promise;
+    }
+
+    /** Returns the cached or in-flight clip, or starts `generate` exactly once. */
+    getOrCreate(key: string, generate: () => Promise<MediaHandle | null>): Promise<MediaHandle | null> {
+        return this.get(key) || this.set(key, generate());
+    }
+
+    set(key: string, value: Promise<MediaHandle | null> | MediaHandle): Promise<MediaHandle | null> {
+        this.delete(key);
+        const promise = value instanceof Promise ? value : Promise.resolve(value);
+        const entry: CacheEntry = { promise };
+        this.entries.set(key, entry);
+
+        promise.then(handle => {
+            if (this.entries.get(key) !== entry) {
+                // Replaced or deleted while generating
+                if (handle) this.onEvict(handle);
+                return;
+            }
+            if (!handle) {
+                // Don't cache failures so the next request retries
+                this.entries.delete(key);
+                return;
+            }
+            entry.handle = handle;
+            this.bytes += handle.bytes;
+            this.evict(key);
+        }, () => {
+            if (this.entries.get(key) === entry) this.entries.delete(key);
+        });
+        return promise;
+    }
+
+    delete(key: string): void {
+        const entry = this.entries.get(key);
+        if (!entry) return;
+        this.entries.delete(key);
+        if (entry.handle) {
+            this.bytes -= entry.handle.bytes;
+            this.onEvict(entry.handle);
+        }
+    }
+
+    clear(): void {
+        Array.from(this.entries.keys()).forEach(key => this.delete(key));
+    }
+
+    stats(): AudioCacheStats {
+        let pending = 0;
+        this.entries.forEach(entry => { if (!entry.handle) pending++; });
+        return {
+            entries: this.entries.size,
+            pending,
+            bytes: this.bytes,
+            maxBytes: this.maxBytes,
+            hits: this.hits,
+            inflightHits: this.inflightHits,
+            misses: this.misses,
+            evictions: this.evictions,
+        };
+    }
+
+    private evict(keep: string): void {
+        // Map iteration order is insertion order, refreshed on every get(): oldest first
+        const keys = Array.from(this.entries.keys());
+        for (let i = 0; i < keys.length && this.bytes > this.maxBytes; i++) {
+            const entry = this.entries.get(keys[i])!;
+            if (!entry.handle || keys[i] === keep) continue;
+            this.delete(keys[i]);
+            this.evictions++;
+        }
+    }
+}
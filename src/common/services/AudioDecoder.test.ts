@@ -0,0 +1,71 @@
+import { AudioDecoder } from './AudioDecoder';
+import { createWavHeader, parseWav, wavToFrames } from '../utils/audioFormat';
+
+const toBase64 = (bytes: Uint8Array) => btoa(Array.from(bytes, b => String.fromCharCode(b)).join(''));
+const readBlob = (blob: Blob) => new Promise<Uint8Array>(resolve => {
+  const reader = new FileReader();
+  reader.onloadend = () => resolve(new Uint8Array(reader.result as ArrayBuffer));
+  reader.readAsArrayBuffer(blob);
+});
+
+// 16-bit little-endian samples
+const pcm = (...samples: number[]) => {
+  const bytes = new Uint8Array(samples.length * 2);
+  const view = new DataView(bytes.buffer);
+  samples.forEach((s, i) => view.setInt16(i * 2, s, true));
+  return bytes;
+};
+
+const wav = (data: Uint8Array, sampleRate: number, channels: number) => {
+  const file = new Uint8Array(44 + data.byteLength);
+  file.set(new Uint8Array(createWavHeader(data.byteLength, sampleRate, channels)), 0);
+  file.set(data, 44);
+  return file;
+};
+
+describe('Narration decode pipeline (AudioDecoder)', () => {
+  it('should frame raw PCM as WAV with a sample-accurate duration when no worker is available', async () => {
+    const decoder = new AudioDecoder();
+    const clip = await decoder.ingest(toBase64(new Uint8Array(24000 * 2 * 1.5)));
+
+    expect(clip.blob.type).toBe('audio/wav');
+    expect(clip.blob.size).toBe(44 + 24000 * 2 * 1.5);
+    expect(clip.durationMs).toBe(1500);
+    expect(parseWav(await readBlob(clip.blob))).toMatchObject({ sampleRate: 24000, channels: 1, dataOffset: 44 });
+  });
+
+  it('should keep MP3 as is and leave its duration to the browser', async () => {
+    const clip = await new AudioDecoder().ingest(toBase64(new Uint8Array([0x49, 0x44, 0x33, 4, 0, 0, 0, 0, 0, 0])));
+    expect(clip.blob.type).toBe('audio/mpeg');
+    expect(clip.durationMs).toBeUndefined();
+  });
+
+  it('should find the data chunk behind extra header chunks', () => {
+    const data = pcm(1, 2, 3, 4);
+    const plain = wav(data, 16000, 1);
+    // Insert a LIST chunk between fmt and data, as many encoders do
+    const list = new Uint8Array([0x4c, 0x49, 0x53, 0x54, 4, 0, 0, 0, 0x49, 0x4e, 0x46, 0x4f]);
+    const file = new Uint8Array(plain.byteLength + list.byteLength);
+    file.set(plain.subarray(0, 36), 0);
+    file.set(list, 36);
+    file.set(plain.subarray(36), 36 + list.byteLength);
+
+    expect(parseWav(file)).toEqual({ sampleRate: 16000, channels: 1, bitsPerSample: 16, dataOffset: 56, dataLength: 8 });
+  });
+
+  it('should de-interleave 16-bit samples into float channels', () => {
+    const file = wav(pcm(16384, -16384, -32768, 0), 22050, 2);
+    const frames = wavToFrames(file)!;
+    expect(frames.sampleRate).toBe(22050);
+    expect(Array.from(frames.channels[0])).toEqual([0.5, -1]);
+    expect(Array.from(frames.channels[1])).toEqual([-0.5, 0]);
+  });
+
+  it('should fall back to decoding inline when the worker cannot be created', async () => {
+    const decoder = new AudioDecoder(() => { throw new Error('blocked by CSP'); });
+    jest.spyOn(console, 'warn').mockImplementation(() => undefined);
+    const clip = await decoder.ingest(toBase64(pcm(1, 2, 3)));
+    expect(clip.durationMs).toBeCloseTo((6 / 48000) * 1000);
+    jest.restoreAllMocks();
+  });
+});
@@ -0,0 +1,105 @@
+import { base64ToBytes, normalizeAudio, wavToFrames, PcmFrames } from '../utils/audioFormat';
+
+/** Messages understood by audioDecode.worker. */
+export type DecodeRequest =
+    | { id: number; op: 'ingest'; base64: string }
+    | { id: number; op: 'frames'; buffer: ArrayBuffer };
+
+export type DecodeResponse =
+    | { id: number; op: 'ingest'; buffer: ArrayBuffer; mime: string; durationMs?: number }
+    | { id: number; op: 'frames'; frames: PcmFrames | null }
+    | { id: number; error: string };
+
+export interface DecodedClip {
+    blob: Blob;
+    durationMs?: number;
+}
+
+/** The decode work itself: run by the worker, or inline where no worker is available (tests, old browsers). */
+export const handleDecodeRequest = (request: DecodeRequest): DecodeResponse => {
+    if (request.op === 'ingest') {
+        const audio = normalizeAudio(base64ToBytes(request.base64));
+        const buffer = audio.bytes.buffer.slice(audio.bytes.byteOffset, audio.bytes.byteOffset + audio.bytes.byteLength);
+        return { id: request.id, op: 'ingest', buffer, mime: audio.mime, durationMs: audio.durationMs };
+    }
+    return { id: request.id, op: 'frames', frames: wavToFrames(new Uint8Array(request.buffer)) };
+};
+
+/**
+ * Moves narration decoding off the main thread: base64 decoding, header
+ * detection, WAV framing and 16-bit to float conversion run in a worker, and
+ * every ArrayBuffer crosses the boundary as a transferable (no copy). When no
+ * worker can be created, or it fails, the same code runs inline.
+ */
+export class AudioDecoder {
+    private worker: Worker | null = null;
+    private workerFailed = false;
+    private nextId = 1;
+    private pending = new Map<number, { resolve: (response: DecodeResponse) => void; reject: (error: Error) => void }>();
+    private readonly createWorker: (() => Worker | null) | null;
+
+    constructor(createWorker: (() => Worker | null) | null = null) {
+        this.createWorker = createWorker;
+    }
+
+    /** Base64 from the API or the stream becomes a playable Blob plus its sample-accurate duration. */
+    async ingest(base64: string): Promise<DecodedClip> {
+        const request: DecodeRequest = { id: this.nextId++, op: 'ingest', base64 };
+        const response = await this.request(request).catch(() => handleDecodeRequest(request));
+        if ('error' in response) throw new Error(response.error);
+        if (response.op !== 'ingest') throw new Error('Unexpected decoder response');
+        return { blob: new Blob([response.buffer], { type: response.mime }), durationMs: response.durationMs };
+    }
+
+    /** Float PCM per channel for a WAV clip, ready for an AudioBuffer; null for MP3 (let Web Audio decode it). */
+    async frames(blob: Blob): Promise<PcmFrames | null> {
+        const buffer = await blob.arrayBuffer();
+        let response: DecodeResponse;
+        try {
+            response = await this.request({ id: this.nextId++, op: 'frames', buffer }, [buffer]);
+        } catch (e) {
+            // The transferred buffer went down with the worker; read the blob again
+            return wavToFrames(new Uint8Array(await blob.arrayBuffer()));
+        }
+        if ('error' in response) throw new Error(response.error);
+        return response.op === 'frames' ? response.frames : null;
+    }
+
+    private request(request: DecodeRequest, transfer: Transferable[] = []): Promise<DecodeResponse> {
+        const worker = this.getWorker();
+        if (!worker) return Promise.resolve(handleDecodeRequest(request));
+        return new Promise<DecodeResponse>((resolve, reject) => {
+            this.pending.set(request.id, { resolve, reject });
+            worker.postMessage(request, transfer);
+        });
+    }
+
+    private getWorker(): Worker | null {
+        if (this.worker || this.workerFailed || !this.createWorker) return this.worker;
+        try {
+            this.worker = this.createWorker();
+        } catch (e) {
+            console.warn("[AudioDecoder] Worker unavailable, decoding on the main thread:", e);
+        }
+        if (!this.worker) {
+            this.workerFailed = true;
+            return null;
+        }
+        this.worker.onmessage = (event: MessageEvent<DecodeResponse>) => {
+            const entry = this.pending.get(event.data.id);
+            this.pending.delete(event.data.id);
+            entry?.resolve(event.data);
+        };
+        this.worker.onerror = (event) => {
+            // A broken worker (e.g. blocked by CSP) fails everything in flight; later calls go inline
+            console.warn("[AudioDecoder] Worker error, decoding on the main thread:", event.message);
+            this.worker?.terminate();
+            this.worker = null;
+            this.workerFailed = true;
+            const pending = Array.from(this.pending.values());
+            this.pending.clear();
+            pending.forEach(p => p.reject(new Error('Audio decode worker failed')));
+        };
+        return this.worker;
+    }
+}
@@ -0,0 +1,67 @@
+import { ConversationContext } from './ConversationContext';
+
+const user = (text: string) => ({ role: 'user', parts: [{ text }] });
+const model = (text: string) => ({ role: 'model', parts: [{ text }] });
+
+/** Intro + `turns` played turns (choice + story) + the choice being requested. */
+const adventure = (turns: number) => {
+  const history: any[] = [user('You are the narrator of a fantasy adventure. Begin.'), model('The gate creaks open onto a misty courtyard. A bell tolls.\n\nOptions: a, b')];
+  for (let i = 1; i <= turns; i++) {
+    history.push(user(`I choose option 1: Walk to room ${i}. What happens next?`));
+    history.push(model(`Room ${i} is cold and silent. Dust covers every surface of room ${i}.\n\nOptions: north, south`));
+  }
+  history.push(user(`I choose option 2: Open door ${turns + 1}. What happens next?`));
+  return history;
+};
+
+describe('Bounded conversation context (ConversationContext)', () => {
+  it('should send short histories unchanged', () => {
+    const history = adventure(3);
+    const window = new ConversationContext({ recentTurns: 6 }).build(history);
+    expect(window.history).toBe(history);
+    expect(window.foldedTurns).toBe(0);
+  });
+
+  it('should keep the intro and the last turns verbatim and summarize the rest', () => {
+    const history = adventure(10);
+    const window = new ConversationContext({ recentTurns: 3 }).build(history);
+
+    expect(window.foldedTurns).toBe(9);
+    expect(window.history[0]).toBe(history[0]);
+    // The last two played turns and the pending choice, untouched
+    expect(window.history.slice(2)).toEqual(history.slice(-5));
+    const summary = window.history[1].parts[0].text;
+    expect(window.history[1].role).toBe('model');
+    expect(summary).toMatch(/^Story so far \(9 earlier turns/);
+    expect(summary).toContain('- The gate creaks open onto a misty courtyard.');
+    expect(summary).toContain('- Walk to room 8 → Room 8 is cold and silent.');
+    expect(summary).not.toContain('Options:');
+    expect(summary).not.toContain('room 9');
+  });
+
+  it('should keep the request size flat as the adventure grows', () => {
+    const context = new ConversationContext({ recentTurns: 4, maxBytes: 4096, summaryBytes: 1024 });
+    const sizes = [20, 50, 100].map(turns => context.build(adventure(turns)).bytes);
+    sizes.forEach(size => expect(size).toBeLessThanOrEqual(4096));
+    expect(Math.max(...sizes) - Math.min(...sizes)).toBeLessThan(64);
+
+    const summary = context.build(adventure(100)).history[1].parts[0].text;
+    expect(summary).toMatch(/earlier turns omitted/);
+    expect(summary).toContain('room 96');
+  });
+
+  it('should send fewer verbatim turns when they alone exceed the budget', () => {
+    const history = adventure(8);
+    // Turn 4 of the last six tells a very long story
+    history[9] = model('It goes on. '.repeat(2000));
+    const window = new ConversationContext({ recentTurns: 6, maxBytes: 16 * 1024 }).build(history);
+    expect(window.bytes).toBeLessThanOrEqual(16 * 1024);
+    expect(window.history.slice(2)).toEqual(history.slice(10));
+    expect(window.history[1].parts[0].text).toContain('- Walk to room 4 → It goes on.');
+  });
+
+  it('should send everything when windowing is off', () => {
+    const history = adventure(40);
+    expect(new ConversationContext({ recentTurns: 0 }).build(history).history).toBe(history);
+  });
+});
@@ -0,0 +1,108 @@
+import { splitFirstSentence } from '../utils/textSplitter';
+
+export interface ContextOptions {
+    recentTurns: number;  // Turns sent verbatim (the one being requested included); 0 = always the whole history
+    maxBytes: number;     // Budget for the whole history sent; fewer verbatim turns until it fits
+    summaryBytes: number; // Budget for the summary of the folded turns (the oldest lines go first)
+}
+
+export const DEFAULT_CONTEXT_OPTIONS: ContextOptions = { recentTurns: 6, maxBytes: 24 * 1024, summaryBytes: 4 * 1024 };
+
+export interface ContextWindow {
+    history: any[];
+    foldedTurns: number; // Turns replaced by the summary
+    bytes: number;       // UTF-8 size of `history` as JSON
+}
+
+const SUMMARY_LINE_CHARS = 200;
+const CHOICE_PATTERN = /^I choose option \d+: (.*?)\.? What happens next\?$/;
+
+const textOf = (entry: any): string => (entry?.parts || []).map((part: any) => part?.text || '').join(' ').trim();
+
+const clip = (text: string, max: number) => (text.length > max ? `${text.substring(0, max - 1).trimEnd()}…` : text);
+
+// Without TextEncoder (older jsdom) characters stand in for bytes
+const byteLength = (text: string): number =>
+    typeof TextEncoder !== 'undefined' ? new TextEncoder().encode(text).length : text.length;
+
+/** Groups history into turns: each starts at a user entry and holds the model replies after it. */
+const splitTurns = (history: any[]): any[][] => {
+    const turns: any[][] = [];
+    history.forEach(entry => {
+        if (entry?.role === 'user' || turns.length === 0) turns.push([entry]);
+        else turns[turns.length - 1].push(entry);
+    });
+    return turns;
+};
+
+/**
+ * Bounds what a /game/stream request carries. The intro prompt (which holds
+ * the game's instructions) and the last `recentTurns` turns go verbatim;
+ * older turns are folded into one "story so far" model entry: the choice
+ * and the first sentence of what followed, per turn. Each turn's line is
+ * computed once and cached by entry, so the summary grows incrementally.
+ * Only the request is windowed: gameHistory keeps every turn for saves.
+ */
+export class ConversationContext {
+    private readonly options: ContextOptions;
+    private lines = new WeakMap<object, string>();
+
+    constructor(options: Partial<ContextOptions> = {}) {
+        this.options = { ...DEFAULT_CONTEXT_OPTIONS, ...options };
+    }
+
+    build(history: any[]): ContextWindow {
+        const full = { history, foldedTurns: 0, bytes: byteLength(JSON.stringify(history)) };
+        const turns = splitTurns(history);
+        if (this.options.recentTurns <= 0 || turns.length < 2) return full;
+
+        let keep = Math.min(this.options.recentTurns, turns.length);
+        if (keep === turns.length && full.bytes <= this.options.maxBytes) return full;
+        keep = Math.min(keep, turns.length - 1);
+
+        let folded: ContextWindow;
+        do {
+            folded = this.fold(turns, keep);
+        } while (folded.bytes > this.options.maxBytes && --keep >= 1);
+        return folded.bytes < full.bytes ? folded : full;
+    }
+
+    /** Intro prompt + summary of everything before the last `keep` turns + those turns. */
+    private fold(turns: any[][], keep: number): ContextWindow {
+        const [intro, ...introReplies] = turns[0];
+        const older = turns.slice(1, turns.length - keep);
+        const lines = introReplies.length ? [this.line(introReplies[0], null, introReplies)] : [];
+        older.forEach(turn => lines.push(this.line(turn[turn.length - 1], turn[0], turn.slice(1))));
+
+        const summary = { role: 'model', parts: [{ text: this.summarize(lines, older.length + 1) }] };
+        const history = [intro, summary, ...([] as any[]).concat(...turns.slice(turns.length - keep))];
+        return { history, foldedTurns: older.length + 1, bytes: byteLength(JSON.stringify(history)) };
+    }
+
+    /** Newest lines first until the summary budget is spent; what does not fit is counted. */
+    private summarize(lines: string[], turnCount: number): string {
+        const header = `Story so far (${turnCount} earlier turns, summarized):`;
+        let used = byteLength(header) + 64; // Room for the "omitted" line
+        let first = lines.length;
+        while (first > 0 && used + byteLength(lines[first - 1]) + 1 <= this.options.summaryBytes) {
+            used += byteLength(lines[--first]) + 1;
+        }
+        const kept = lines.slice(first);
+        if (first > 0) kept.unshift(`- (${first} earlier turns omitted)`);
+        return [header, ...kept].join('\n');
+    }
+
+    private line(key: any, choice: any, replies: any[]): string {
+        const cacheable = key && typeof key === 'object';
+        const cached = cacheable ? this.lines.get(key) : undefined;
+        if (cached !== undefined) return cached;
+
+        const story = replies.map(textOf).join(' ').split('\n\nOptions:')[0].replace(/\s+/g, ' ').trim();
+        const outcome = clip(splitFirstSentence(story)[0] || story, SUMMARY_LINE_CHARS);
+        const chose = choice ? textOf(choice) : '';
+        const picked = chose ? clip(chose.match(CHOICE_PATTERN)?.[1] || chose, SUMMARY_LINE_CHARS / 2) : '';
+        const line = `- ${[picked, outcome].filter(Boolean).join(' → ')}`;
+        if (cacheable) this.lines.set(key, line);
+        return line;
+    }
+}
@@ -1,6 +1,7 @@
 import axios from 'axios';
 import { config } from '../config/config';
 import { withRetry } from '../utils/resilience';
+import { EncodedJson } from '../utils/compression';
 
 export interface GameSaveData {
     userId: string;
@@ -13,6 +14,46 @@ export interface GameSaveData {
     updatedAt?: Date;
     _id?: string;
     createdAt?: Date;
+    // Delta protocol: server revision and the window of history included in a paged load
+    revision?: number;
+    historyOffset?: number;
+    historyTotal?: number;
+}
+
+/**
+ * Incremental save: everything in the server's history from `historyOffset`
+ * on is replaced by `appendHistory`. Images are `media:<hash>` references;
+ * `media` carries only the payloads the server has not acknowledged yet.
+ */
+export interface GameSaveDelta {
+    _id?: string;
+    userId: string;
+    genreKey: string;
+    baseRevision: number;
+    historyOffset: number;
+    appendHistory: any[];
+    gameContent: string[];
+    currentOptions?: string[];
+    currentImages: string[];
+    media: Record<string, string>;
+}
+
+export interface GameSaveDeltaResult {
+    _id: string;
+    revision: number;
+    historyTotal: number;
+}
+
+/** 409 body: the server moved to another revision or is missing referenced media. */
+export interface GameSaveConflict {
+    revision: number;
+    historyTotal: number;
+    missingMedia?: string[];
+}
+
+export interface GameHistoryPage {
+    offset: number;
+    entries: any[];
 }
 
 export interface GameSaveDTO {
@@ -20,8 +61,20 @@ export interface GameSaveDTO {
     genreKey: string;
     updatedAt: string;
     createdAt: string;
+    // Paged listings add a small summary so the list never needs the save itself
+    turns?: number;
+    summary?: string;
+    thumbnail?: string; // Tiny data URL (LQIP) of the current scene
+}
+
+/** One page of `listGames`, newest first; `nextCursor` is null on the last page. */
+export interface GameSavePage {
+    items: GameSaveDTO[];
+    nextCursor: string | null;
 }
 
+export const SAVE_LIST_PAGE_SIZE = 30;
+
 export const GameService = {
     saveGame: async (saveData: GameSaveData, token: string) => {
         return withRetry(async () => {
@@ -32,22 +85,69 @@ export const GameService = {
         }, { retries: 3, baseDelay: 1000, name: 'Save Game' });
     },
 
-    loadGame: async (token: string, saveId?: string): Promise<GameSaveData | null> => {
+    /** Body is encoded by the caller (see SaveSession) so it can be gzipped and measured. */
+    saveGameDelta: async (encoded: EncodedJson, token: string): Promise<GameSaveDeltaResult> => {
+        return withRetry(async () => {
+            const headers: Record<string, string> = {
+                Authorization: `Bearer ${token}`,
+                'Content-Type': 'application/json'
+            };
+            if (encoded.encoding) headers['Content-Encoding'] = encoded.encoding;
+            const response = await axios.post(`${config.apiUrl}/game/save/delta`, encoded.body, { headers });
+            return response.data;
+        }, { retries: 3, baseDelay: 1000, name: 'Save Game Delta' });
+    },
+
+    /**
+     * With `historyLimit`, servers that support paging return only the newest
+     * entries plus `historyOffset`/`historyTotal`; older pages come from
+     * `loadHistory`. `mediaRefs` asks for images as `media:<hash>` references
+     * (resolved later through `loadMedia`) instead of inlined base64. Servers
+     * without paging ignore both and return everything.
+     */
+    loadGame: async (token: string, saveId?: string, historyLimit?: number, mediaRefs: boolean = false): Promise<GameSaveData | null> => {
         if (!saveId) return null;
+        const limit = historyLimit ? `&historyLimit=${historyLimit}` : '';
+        const media = mediaRefs ? '&media=ref' : '';
         return withRetry(async () => {
-            const response = await axios.get(`${config.apiUrl}/game/load?saveId=${saveId}`, {
+            const response = await axios.get(`${config.apiUrl}/game/load?saveId=${saveId}${limit}${media}`, {
                 headers: { Authorization: `Bearer ${token}` }
             });
             return response.data;
         }, { retries: 3, baseDelay: 1000, name: 'Load Game' });
     },
 
-    listGames: async (token: string): Promise<GameSaveDTO[]> => {
+    loadHistory: async (token: string, saveId: string, offset: number, limit: number): Promise<GameHistoryPage> => {
+        return withRetry(async () => {
+            const response = await axios.get(`${config.apiUrl}/game/history?saveId=${saveId}&offset=${offset}&limit=${limit}`, {
+                headers: { Authorization: `Bearer ${token}` }
+            });
+            return response.data;
+        }, { retries: 3, baseDelay: 1000, name: 'Load History' });
+    },
+
+    loadMedia: async (token: string, hash: string): Promise<{ data: string }> => {
         return withRetry(async () => {
-            const response = await axios.get(`${config.apiUrl}/game/list`, {
+            const response = await axios.get(`${config.apiUrl}/game/media?hash=${hash}`, {
                 headers: { Authorization: `Bearer ${token}` }
             });
             return response.data;
+        }, { retries: 2, baseDelay: 1000, name: 'Load Media' });
+    },
+
+    /**
+     * Newest saves first, `limit` at a time; pass the previous page's
+     * `nextCursor` for the next one. Servers without paging return the whole
+     * list as an array, which comes back as a single last page.
+     */
+    listGames: async (token: string, cursor?: string | null, limit: number = SAVE_LIST_PAGE_SIZE): Promise<GameSavePage> => {
+        const after = cursor ? `&cursor=${encodeURIComponent(cursor)}` : '';
+        return withRetry(async () => {
+            const response = await axios.get(`${config.apiUrl}/game/list?limit=${limit}${after}`, {
+                headers: { Authorization: `Bearer ${token}` }
+            });
+            const data = response.data;
+            return Array.isArray(data) ? { items: data, nextCursor: null } : data;
         }, { retries: 2, baseDelay: 1000, name: 'List Games' });
     },
 
@@ -0,0 +1,62 @@
+import { BandwidthEstimator, ImageLoader, ImageRef, pickImageWidth } from './ImageLoader';
+
+// jsdom has no object URLs (MediaStore.putImageBlob needs them)
+let objectUrls = 0;
+URL.createObjectURL ??= () => `blob:test/${++objectUrls}`;
+URL.revokeObjectURL ??= () => {};
+
+const ref: ImageRef = {
+  id: 'img-1',
+  url: '/game/image/img-1',
+  width: 1920,
+  height: 1080,
+  widths: [320, 640, 960, 1280, 1920],
+  bytes: 160000,
+};
+
+describe('Adaptive scene images (ImageLoader)', () => {
+  it('should pick the smallest width that covers the box at the device pixel ratio', () => {
+    // 800x450 at 1x needs 800 device pixels
+    expect(pickImageWidth(ref, { width: 800, height: 450, dpr: 1 }, 50000)).toBe(960);
+    // A tall phone box crops the sides (object-fit: cover) and is capped at 2x
+    expect(pickImageWidth(ref, { width: 390, height: 400, dpr: 3 }, 50000)).toBe(1920);
+    // Nothing is large enough: the biggest variant
+    expect(pickImageWidth(ref, { width: 2560, height: 1440, dpr: 1 }, 50000)).toBe(1920);
+  });
+
+  it('should step down to a width that fits the time budget on a slow link', () => {
+    // 300 kbps, 2.5s budget: ~93 KB at most
+    expect(pickImageWidth(ref, { width: 390, height: 400, dpr: 3 }, 300)).toBe(1280);
+    expect(pickImageWidth(ref, { width: 390, height: 400, dpr: 3 }, 50)).toBe(320);
+  });
+
+  it('should average measured throughput and ignore tiny transfers', () => {
+    const bandwidth = new BandwidthEstimator(1000);
+    bandwidth.record(2000, 1);
+    expect(bandwidth.estimate).toBe(1000);
+    bandwidth.record(100000, 100); // 8000 kbps
+    expect(bandwidth.estimate).toBe(8000);
+    bandwidth.record(100000, 400); // 2000 kbps
+    expect(bandwidth.estimate).toBeCloseTo(5600);
+  });
+
+  it('should fetch once per reference at the chosen width and learn from the transfer', async () => {
+    const fetchImpl = jest.fn(async () => ({ ok: true, status: 200, blob: async () => new Blob([new Uint8Array(64 * 1024)], { type: 'image/png' }) } as any));
+    const loader = new ImageLoader(() => 'http://api.test', fetchImpl, () => ({ width: 1440, height: 900, dpr: 1 }), new BandwidthEstimator(20000));
+
+    const [a, b] = await Promise.all([loader.load(ref), loader.load(ref, undefined, { width: 800, height: 450 })]);
+
+    expect(fetchImpl).toHaveBeenCalledTimes(1);
+    expect((fetchImpl.mock.calls[0] as any[])[0]).toBe('http://api.test/game/image/img-1?w=1920');
+    expect(a.url).toBe(b.url);
+    expect(a.kind).toBe('image');
+    expect(loader.getStats()).toMatchObject({ fetched: 1, bytes: 64 * 1024, lastWidth: 1920 });
+    expect(loader.resolve(ref, { width: 800, height: 450 }).url).toBe('http://api.test/game/image/img-1?w=960');
+  });
+
+  it('should count failed downloads and reject', async () => {
+    const loader = new ImageLoader(() => '', async () => ({ ok: false, status: 404 } as any), undefined, new BandwidthEstimator(1000));
+    await expect(loader.load({ ...ref, url: 'https://cdn.test/a.png?sig=1' })).rejects.toThrow('HTTP 404');
+    expect(loader.getStats().failed).toBe(1);
+  });
+});
@@ -0,0 +1,198 @@
+import { MediaHandle, mediaStore } from './MediaStore';
+import { config } from '../config/config';
+import { perf } from './PerfTelemetry';
+
+/**
+ * Scene image sent by reference (`image` events with `ref` instead of inline
+ * base64): the stream carries the placeholder and the sizes, the bytes are
+ * fetched separately at the width that fits the screen and the connection.
+ */
+export interface ImageRef {
+    id: string;
+    url: string;            // Absolute, or relative to the API origin; the width goes in `?w=`
+    width: number;          // Full-size dimensions
+    height: number;
+    widths?: number[];      // Widths the server can render; the full width when omitted
+    bytes?: number;         // Size of the full-width image, for transfer time estimates
+    placeholder?: string;   // Tiny data URL (LQIP) shown blurred until the image arrives
+}
+
+/** CSS size of the box the image is drawn into, plus the device pixel ratio. */
+export interface ImageViewport {
+    width: number;
+    height: number;
+    dpr: number;
+}
+
+export type ImageBox = { width: number; height: number };
+
+/** Rough size of a compressed scene image per pixel when the server does not say. */
+const BYTES_PER_PIXEL = 0.25;
+/** Device pixels beyond 2x are not visible behind the blurred cover crop. */
+const MAX_DPR = 2;
+/** Time a scene image may take before a smaller width is preferred. */
+const DEFAULT_BUDGET_MS = 2500;
+const DEFAULT_KBPS = 1600;
+
+const estimateBytes = (ref: ImageRef, width: number): number => {
+    const full = ref.bytes ?? ref.width * ref.height * BYTES_PER_PIXEL;
+    return Math.round(full * Math.pow(width / ref.width, 2));
+};
+
+/**
+ * Width to request for `ref`: the smallest variant that covers the viewport
+ * (object-fit: cover) at the device pixel ratio, stepped down while its
+ * estimated transfer time at `kbps` exceeds `budgetMs`.
+ */
+export const pickImageWidth = (ref: ImageRef, viewport: ImageViewport, kbps: number, budgetMs: number = DEFAULT_BUDGET_MS): number => {
+    const widths = (ref.widths && ref.widths.length > 0 ? ref.widths.slice() : [ref.width]).sort((a, b) => a - b);
+    const aspect = ref.width / ref.height;
+    const needed = Math.max(viewport.width, viewport.height * aspect) * Math.min(Math.max(viewport.dpr, 1), MAX_DPR);
+    let index = widths.findIndex(w => w >= needed);
+    if (index < 0) index = widths.length - 1;
+    while (index > 0 && (estimateBytes(ref, widths[index]) * 8) / kbps > budgetMs) index--;
+    return widths[index];
+};
+
+/**
+ * Download throughput in kbps: an exponentially weighted average of measured
+ * image fetches, seeded from the Network Information API when available.
+ */
+export class BandwidthEstimator {
+    private kbps: number;
+    private samples = 0;
+
+    constructor(initialKbps?: number) {
+        this.kbps = initialKbps ?? BandwidthEstimator.fromConnection();
+    }
+
+    static fromConnection(): number {
+        const connection = typeof navigator !== 'undefined' ? (navigator as any).connection : undefined;
+        if (connection?.saveData) return 300;
+        if (connection && typeof connection.downlink === 'number' && connection.downlink > 0) {
+            return connection.downlink * 1000;
+        }
+        return DEFAULT_KBPS;
+    }
+
+    /** Adds one transfer; small responses are mostly latency and are ignored. */
+    record(bytes: number, ms: number): void {
+        if (bytes < 16 * 1024 || ms <= 0) return;
+        const kbps = (bytes * 8) / ms;
+        this.kbps = this.samples === 0 ? kbps : this.kbps * 0.6 + kbps * 0.4;
+        this.samples++;
+    }
+
+    get estimate(): number {
+        return this.kbps;
+    }
+}
+
+export interface ImageLoaderStats {
+    fetched: number;
+    failed: number;
+    bytes: number;
+    kbps: number;
+    lastWidth: number | null;
+    lastMs: number | null;
+}
+
+export type ImageFetch = (url: string, init: RequestInit) => Promise<Response>;
+
+const currentViewport = (): ImageViewport => ({
+    width: typeof window !== 'undefined' ? window.innerWidth : 1280,
+    height: typeof window !== 'undefined' ? window.innerHeight : 720,
+    dpr: typeof window !== 'undefined' ? window.devicePixelRatio || 1 : 1,
+});
+
+/**
+ * Fetches referenced scene images at an adaptive width and registers them in
+ * the MediaStore (so saves and releases work exactly like streamed images).
+ * Concurrent loads of the same reference share one request. Stats are
+ * exposed as `window.__afImages` for the image benchmark.
+ */
+export class ImageLoader {
+    readonly bandwidth: BandwidthEstimator;
+    private pending = new Map<string, Promise<MediaHandle>>();
+    private readonly fetchImpl: ImageFetch;
+    private readonly baseUrl: () => string;
+    private readonly viewport: () => ImageViewport;
+    private stats: ImageLoaderStats = { fetched: 0, failed: 0, bytes: 0, kbps: 0, lastWidth: null, lastMs: null };
+
+    constructor(
+        baseUrl: () => string,
+        fetchImpl: ImageFetch = (url, init) => fetch(url, init),
+        viewport: () => ImageViewport = currentViewport,
+        bandwidth: BandwidthEstimator = new BandwidthEstimator()
+    ) {
+        this.baseUrl = baseUrl;
+        this.fetchImpl = fetchImpl;
+        this.viewport = viewport;
+        this.bandwidth = bandwidth;
+    }
+
+    /**
+     * URL for `ref` at the width this device and connection should download.
+     * `box` is the element the image fills; the whole viewport when omitted.
+     */
+    resolve(ref: ImageRef, box?: ImageBox): { url: string; width: number } {
+        const viewport = this.viewport();
+        const target = box && box.width > 0 && box.height > 0 ? { ...viewport, width: box.width, height: box.height } : viewport;
+        const width = pickImageWidth(ref, target, this.bandwidth.estimate);
+        const base = /^https?:/.test(ref.url) ? ref.url : `${this.baseUrl()}${ref.url}`;
+        return { url: `${base}${base.indexOf('?') >= 0 ? '&' : '?'}w=${width}`, width };
+    }
+
+    /** Milliseconds to wait for `ref` before giving up: three times the expected transfer, at least 8s. */
+    timeoutFor(ref: ImageRef, box?: ImageBox): number {
+        const { width } = this.resolve(ref, box);
+        return Math.max(8000, Math.round(((estimateBytes(ref, width) * 8) / this.bandwidth.estimate) * 3));
+    }
+
+    load(ref: ImageRef, signal?: AbortSignal, box?: ImageBox): Promise<MediaHandle> {
+        let pending = this.pending.get(ref.id);
+        if (!pending) {
+            pending = this.fetchImage(ref, signal, box).finally(() => this.pending.delete(ref.id));
+            this.pending.set(ref.id, pending);
+        }
+        return pending;
+    }
+
+    getStats(): ImageLoaderStats {
+        return { ...this.stats, kbps: Math.round(this.bandwidth.estimate) };
+    }
+
+    private async fetchImage(ref: ImageRef, signal?: AbortSignal, box?: ImageBox): Promise<MediaHandle> {
+        const { url, width } = this.resolve(ref, box);
+        // Adaptive deadline instead of a flat timeout: a slow link gets longer for the same image
+        const controller = new AbortController();
+        const onAbort = () => controller.abort();
+        signal?.addEventListener('abort', onAbort);
+        const timer = setTimeout(onAbort, this.timeoutFor(ref, box));
+        const started = Date.now();
+        try {
+            const response = await this.fetchImpl(url, { signal: controller.signal });
+            if (!response.ok) throw new Error(`Image ${ref.id}: HTTP ${response.status}`);
+            const blob = await response.blob();
+            const ms = Date.now() - started;
+            this.bandwidth.record(blob.size, ms);
+            this.stats.fetched++;
+            this.stats.bytes += blob.size;
+            this.stats.lastWidth = width;
+            this.stats.lastMs = ms;
+            perf.record('image.fetch', performance.now() - ms, { bytes: blob.size, width });
+            return mediaStore.putImageBlob(blob);
+        } catch (e) {
+            this.stats.failed++;
+            throw e;
+        } finally {
+            clearTimeout(timer);
+            signal?.removeEventListener('abort', onAbort);
+        }
+    }
+}
+
+export const imageLoader = new ImageLoader(() => config.apiUrl);
+
+// Exposed for the audit harness (image benchmark)
+if (typeof window !== 'undefined') window.__afImages = imageLoader;
@@ -0,0 +1,151 @@
+import { audioBlobFromBytes, base64ToBytes, estimateAudioDurationMs } from '../utils/audioFormat';
+
+export type MediaKind = 'image' | 'audio';
+
+/** Small, state-friendly reference to a decoded payload. */
+export interface MediaHandle {
+    url: string;        // Object URL (or the original URL when it wasn't inline data)
+    kind: MediaKind;
+    bytes: number;
+    durationMs?: number; // audio only
+}
+
+export interface MediaStoreStats {
+    live: number;
+    bytes: number;
+    images: number;
+    audio: number;
+    created: number;
+    revoked: number;
+}
+
+const DATA_URL = /^data:([^;,]+)?(;base64)?,/;
+
+/**
+ * Decodes base64 media from the stream exactly once into Blobs and hands out
+ * object URLs, so React state and caches only hold short `blob:` strings
+ * instead of multi-hundred-KB base64 copies. Owners must `release()` a URL
+ * once nothing displays or plays it anymore.
+ */
+export class MediaStore {
+    private entries = new Map<string, { blob: Blob; handle: MediaHandle; measured?: Promise<number | undefined> }>();
+    private created = 0;
+    private revoked = 0;
+
+    /** Accepts a `data:` URL or bare base64 PNG; remote URLs are passed through unowned. */
+    putImage(data: string): MediaHandle {
+        const match = DATA_URL.exec(data);
+        if (!match && /^(https?|blob):/.test(data)) {
+            return { url: data, kind: 'image', bytes: 0 };
+        }
+        if (match && !match[2]) {
+            // Non-base64 data URL (e.g. SVG): nothing to gain from decoding
+            return { url: data, kind: 'image', bytes: 0 };
+        }
+        const mime = (match && match[1]) || 'image/png';
+        const bytes = base64ToBytes(match ? data.substring(match[0].length) : data);
+        return this.register(new Blob([bytes], { type: mime }), 'image');
+    }
+
+    /** Registers an already decoded image (e.g. read back from the persistent cache). */
+    putImageBlob(blob: Blob): MediaHandle {
+        return this.register(blob, 'image');
+    }
+
+    /** Accepts base64 WAV, MP3 or raw Kokoro PCM. */
+    putAudio(base64: string, text: string = ''): MediaHandle {
+        const bytes = base64ToBytes(base64);
+        return this.register(audioBlobFromBytes(bytes), 'audio', estimateAudioDurationMs(bytes, text));
+    }
+
+    /** Registers a clip already decoded off the main thread (see AudioDecoder); WAV comes with its exact duration. */
+    putAudioBlob(blob: Blob, durationMs?: number): MediaHandle {
+        return this.register(blob, 'audio', durationMs);
+    }
+
+    /**
+     * Replaces the byte/text estimate of an audio handle with the duration the
+     * browser reports after decoding the clip's metadata.
+     */
+    measureDuration(url: string): Promise<number | undefined> {
+        const entry = this.entries.get(url);
+        if (!entry || entry.handle.kind !== 'audio' || typeof Audio === 'undefined') {
+            return Promise.resolve(entry?.handle.durationMs);
+        }
+        entry.measured ??= new Promise(resolve => {
+            const probe = new Audio();
+            probe.preload = 'metadata';
+            const done = (ms?: number) => {
+                probe.onloadedmetadata = probe.onerror = null;
+                probe.removeAttribute('src');
+                if (ms && isFinite(ms)) entry.handle.durationMs = ms;
+                resolve(entry.handle.durationMs);
+            };
+            probe.onloadedmetadata = () => done(probe.duration * 1000);
+            probe.onerror = () => done();
+            probe.src = url;
+        });
+        return entry.measured;
+    }
+
+    get(url: string | null | undefined): MediaHandle | undefined {
+        return url ? this.entries.get(url)?.handle : undefined;
+    }
+
+    getBlob(url: string | null | undefined): Blob | undefined {
+        return url ? this.entries.get(url)?.blob : undefined;
+    }
+
+    owns(url: string | null | undefined): boolean {
+        return !!url && this.entries.has(url);
+    }
+
+    release(url: string | null | undefined): void {
+        if (!url || !this.entries.has(url)) return;
+        this.entries.delete(url);
+        URL.revokeObjectURL(url);
+        this.revoked++;
+    }
+
+    releaseAll(kind?: MediaKind): void {
+        Array.from(this.entries.keys()).forEach(url => {
+            if (!kind || this.entries.get(url)!.handle.kind === kind) this.release(url);
+        });
+    }
+
+    /** Re-encodes an owned URL as a data URL (used by saves, which must stay self-contained). */
+    toDataUrl(url: string): Promise<string> {
+        const entry = this.entries.get(url);
+        if (!entry) return Promise.resolve(url);
+        return new Promise((resolve, reject) => {
+            const reader = new FileReader();
+            reader.onloadend = () => resolve(reader.result as string);
+            reader.onerror = () => reject(reader.error);
+            reader.readAsDataURL(entry.blob);
+        });
+    }
+
+    stats(): MediaStoreStats {
+        let bytes = 0;
+        let images = 0;
+        let audio = 0;
+        this.entries.forEach(({ handle }) => {
+            bytes += handle.bytes;
+            if (handle.kind === 'image') images++;
+            else audio++;
+        });
+        return { live: this.entries.size, bytes, images, audio, created: this.created, revoked: this.revoked };
+    }
+
+    private register(blob: Blob, kind: MediaKind, durationMs?: number): MediaHandle {
+        const handle: MediaHandle = { url: URL.createObjectURL(blob), kind, bytes: blob.size, durationMs };
+        this.entries.set(handle.url, { blob, handle });
+        this.created++;
+        return handle;
+    }
+}
+
+export const mediaStore = new MediaStore();
+
+// Exposed for the audit harness (memory benchmark)
+if (typeof window !== 'undefined') window.__afMedia = mediaStore;
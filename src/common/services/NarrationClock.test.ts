@@ -0,0 +1,58 @@
+import { NarrationClock, TypingPacer, CATCH_UP_RATE } from './NarrationClock';
+
+const clip = () => ({ currentTime: 0, paused: false, ended: false });
+
+describe('Narration-paced typewriter (TypingPacer)', () => {
+  it('should run on wall time until narration is heard', () => {
+    const pacer = new TypingPacer(new NarrationClock(), 0, 100, 1000, 0);
+    expect(pacer.frame(16)).toBe(1);
+    expect(pacer.frame(500)).toBe(50);
+    expect(pacer.frame(2000)).toBe(100);
+  });
+
+  it('should follow the narration clock and hold while the clip stalls', () => {
+    const clock = new NarrationClock();
+    const audio = clip();
+    clock.attach(audio);
+    const pacer = new TypingPacer(clock, 0, 100, 1000, 0);
+
+    audio.currentTime = 0.25;
+    expect(pacer.frame(100)).toBe(25);
+    // Buffering: wall time moves on, the voice does not
+    expect(pacer.frame(800)).toBe(25);
+    audio.currentTime = 0.6;
+    expect(pacer.frame(900)).toBe(60);
+  });
+
+  it('should catch up quickly once the voice has finished', () => {
+    const clock = new NarrationClock();
+    const audio = clip();
+    clock.attach(audio);
+    const pacer = new TypingPacer(clock, 0, 100, 1000, 0);
+    audio.currentTime = 0.5;
+    expect(pacer.frame(500)).toBe(50);
+
+    audio.ended = true;
+    clock.detach(audio);
+    expect(pacer.frame(600)).toBe(50 + (100 * CATCH_UP_RATE) / 10);
+  });
+
+  it('should only type the new part of an extended text', () => {
+    const pacer = new TypingPacer(new NarrationClock(), 40, 60, 1000, 0);
+    expect(pacer.frame(0)).toBe(40);
+    expect(pacer.frame(500)).toBe(50);
+  });
+
+  it('should keep a monotonic total across clips', () => {
+    const clock = new NarrationClock();
+    const first = clip();
+    clock.attach(first);
+    first.currentTime = 2;
+    const second = clip();
+    clock.attach(second);
+    second.currentTime = 0.5;
+    expect(clock.elapsedMs()).toBe(2500);
+    clock.detach(first);
+    expect(clock.isPlaying()).toBe(true);
+  });
+});
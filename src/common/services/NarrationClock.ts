@@ -0,0 +1,84 @@
+/** Minimal view of the narration element the clock reads (an HTMLAudioElement in the app). */
+export interface ClockSource {
+    currentTime: number;
+    paused: boolean;
+    ended: boolean;
+}
+
+/** How much faster than real time text catches up once the voice has finished early. */
+export const CATCH_UP_RATE = 4;
+
+/**
+ * Playback position of the narration that is currently audible. TextNarrator
+ * attaches every clip it plays; the Typewriter reads the clock once per
+ * animation frame so the text reveal follows the voice (including stalls
+ * while a clip buffers) instead of counting its own timer ticks.
+ */
+export class NarrationClock {
+    private source: ClockSource | null = null;
+    private completedMs = 0;
+
+    attach(source: ClockSource): void {
+        this.detach();
+        this.source = source;
+    }
+
+    /** Folds the clip's position into the total; ignores sources that are no longer attached. */
+    detach(source?: ClockSource): void {
+        if (!this.source || (source && source !== this.source)) return;
+        this.completedMs += this.source.currentTime * 1000;
+        this.source = null;
+    }
+
+    isPlaying(): boolean {
+        return !!this.source && !this.source.paused && !this.source.ended;
+    }
+
+    /** Narration time played since the app started; only advances while a clip plays. */
+    elapsedMs(): number {
+        return this.completedMs + (this.source ? this.source.currentTime * 1000 : 0);
+    }
+}
+
+export const narrationClock = new NarrationClock();
+
+/**
+ * Decides how many characters of a text should be visible at a given frame.
+ * Runs on wall time until narration is heard, then on the narration clock;
+ * if the voice ends before the text does, the rest catches up quickly.
+ * Progress never goes backwards.
+ */
+export class TypingPacer {
+    durationMs: number;
+    private progressMs = 0;
+    private lastFrame: number;
+    private heardNarration = false;
+    private readonly clockStart: number;
+    private readonly clock: NarrationClock;
+    private readonly from: number;
+    private readonly to: number;
+
+    /** Reveals characters `from`..`to` over `durationMs` of narration. */
+    constructor(clock: NarrationClock, from: number, to: number, durationMs: number, now: number) {
+        this.clock = clock;
+        this.from = from;
+        this.to = to;
+        this.durationMs = durationMs;
+        this.lastFrame = now;
+        this.clockStart = clock.elapsedMs();
+    }
+
+    /** Number of characters (from the start of the text) to show at `now`. */
+    frame(now: number): number {
+        const dt = Math.max(0, now - this.lastFrame);
+        this.lastFrame = now;
+        if (this.clock.isPlaying()) {
+            this.heardNarration = true;
+            this.progressMs = Math.max(this.progressMs, this.clock.elapsedMs() - this.clockStart);
+        } else {
+            this.progressMs += this.heardNarration ? dt * CATCH_UP_RATE : dt;
+        }
+        const fraction = this.durationMs > 0 ? Math.min(1, this.progressMs / this.durationMs) : 1;
+        return this.from + Math.floor((this.to - this.from) * fraction);
+    }
+}
@@ -0,0 +1,192 @@
+import { ClockSource, narrationClock } from './NarrationClock';
+import { mediaStore } from './MediaStore';
+import { audioDecoder } from '../workers/audioDecoder';
+
+/** Decoded clips kept around for instant (re)starts: the current one, the queued one and a few prepared ahead. */
+const DECODED_CLIPS = 6;
+
+interface ScheduledClip {
+    url: string;
+    source: AudioBufferSourceNode;
+    clock: ClockSource;
+    endAt: number;
+}
+
+export type NarrationEvent = { state: 'playing' | 'ended'; url: string };
+
+const getAudioContextClass = (): typeof AudioContext | undefined =>
+    typeof window === 'undefined' ? undefined : window.AudioContext || (window as any).webkitAudioContext;
+
+/**
+ * Plays narration through Web Audio so consecutive clips can be scheduled
+ * back to back on the audio clock (no gap while an <audio> element loads the
+ * next clip). WAV clips are framed by the decode worker and copied straight
+ * into AudioBuffers; anything else goes through decodeAudioData. Every clip
+ * also drives narrationClock, and announces itself with an `af-narration`
+ * window event for the audit harness.
+ */
+export class NarrationPlayer {
+    private context: AudioContext | null = null;
+    private gain: GainNode | null = null;
+    private volume = 1;
+    private decoded = new Map<string, Promise<AudioBuffer>>();
+    private scheduled: ScheduledClip[] = [];
+    // URLs handed to play()/enqueue() that are still decoding, scheduled or playing
+    private active: string[] = [];
+    private generation = 0;
+    private chain: Promise<void> = Promise.resolve();
+
+    static isSupported(): boolean {
+        return !!getAudioContextClass();
+    }
+
+    /** Stops whatever is playing and starts `url` as soon as it is decoded. */
+    play(url: string, onEnded: () => void): Promise<void> {
+        this.stop();
+        return this.enqueue(url, onEnded);
+    }
+
+    /** Starts `url` the moment the last scheduled clip ends (or right away if nothing is playing). */
+    enqueue(url: string, onEnded: () => void): Promise<void> {
+        const generation = this.generation;
+        this.active.push(url);
+        const step = this.chain.then(async () => {
+            const buffer = await this.decode(url);
+            if (generation !== this.generation) return;
+            this.schedule(url, buffer, onEnded);
+        });
+        // One failed clip must not block the ones queued after it
+        this.chain = step.catch(() => undefined);
+        return step.catch(e => {
+            this.active = this.active.filter(u => u !== url);
+            throw e;
+        });
+    }
+
+    /** Decodes a clip ahead of time so that playing it later starts without delay. */
+    prepare(url: string): void {
+        if (!NarrationPlayer.isSupported()) return;
+        this.decode(url).catch(() => this.decoded.delete(url));
+    }
+
+    isActive(url: string | null | undefined): boolean {
+        return !!url && this.active.indexOf(url) >= 0;
+    }
+
+    stop(): void {
+        this.generation++;
+        const clips = this.scheduled;
+        this.scheduled = [];
+        this.active = [];
+        clips.forEach(clip => {
+            clip.source.onended = null;
+            try {
+                clip.source.stop();
+            } catch (e) {
+                // Already stopped
+            }
+            narrationClock.detach(clip.clock);
+        });
+    }
+
+    setVolume(volume: number): void {
+        this.volume = volume;
+        if (this.gain) this.gain.gain.value = volume;
+    }
+
+    private getContext(): AudioContext {
+        if (!this.context) {
+            const Context = getAudioContextClass();
+            if (!Context) throw new Error('Web Audio is not available');
+            this.context = new Context();
+            this.gain = this.context.createGain();
+            this.gain.gain.value = this.volume;
+            this.gain.connect(this.context.destination);
+        }
+        if (this.context.state === 'suspended') this.context.resume().catch(() => undefined);
+        return this.context;
+    }
+
+    private decode(url: string): Promise<AudioBuffer> {
+        let pending = this.decoded.get(url);
+        if (pending) {
+            // Refresh its LRU position
+            this.decoded.delete(url);
+        } else {
+            pending = this.decodeClip(url);
+        }
+        this.decoded.set(url, pending);
+        while (this.decoded.size > DECODED_CLIPS) {
+            this.decoded.delete(this.decoded.keys().next().value as string);
+        }
+        return pending;
+    }
+
+    private async decodeClip(url: string): Promise<AudioBuffer> {
+        const context = this.getContext();
+        const blob = mediaStore.getBlob(url) ?? await fetch(url).then(r => r.blob());
+        const frames = await audioDecoder.frames(blob).catch(() => null);
+        let buffer: AudioBuffer;
+        if (frames && frames.channels.length > 0 && frames.channels[0].length > 0) {
+            buffer = context.createBuffer(frames.channels.length, frames.channels[0].length, frames.sampleRate);
+            frames.channels.forEach((samples, channel) => buffer.getChannelData(channel).set(samples));
+        } else {
+            buffer = await context.decodeAudioData(await blob.arrayBuffer());
+        }
+        // Sample-accurate duration for whoever schedules against this clip
+        const handle = mediaStore.get(url);
+        if (handle) handle.durationMs = buffer.duration * 1000;
+        return buffer;
+    }
+
+    private schedule(url: string, buffer: AudioBuffer, onEnded: () => void): void {
+        const context = this.getContext();
+        const previous = this.scheduled[this.scheduled.length - 1];
+        const startAt = Math.max(context.currentTime, previous ? previous.endAt : 0);
+        const endAt = startAt + buffer.duration;
+        const source = context.createBufferSource();
+        source.buffer = buffer;
+        source.connect(this.gain!);
+
+        const clock: ClockSource = {
+            get currentTime() {
+                return Math.min(buffer.duration, Math.max(0, context.currentTime - startAt));
+            },
+            get paused() {
+                return context.state !== 'running' || context.currentTime < startAt;
+            },
+            get ended() {
+                return context.currentTime >= endAt;
+            },
+        };
+        const clip: ScheduledClip = { url, source, clock, endAt };
+
+        source.onended = () => {
+            this.scheduled = this.scheduled.filter(c => c !== clip);
+            const index = this.active.indexOf(url);
+            if (index >= 0) this.active.splice(index, 1);
+            narrationClock.detach(clock);
+            // The clip queued behind this one is already audible; hand it the clock
+            if (this.scheduled.length > 0) narrationClock.attach(this.scheduled[0].clock);
+            this.announce('ended', url);
+            onEnded();
+        };
+        source.start(startAt);
+        this.scheduled.push(clip);
+        if (!previous) {
+            narrationClock.attach(clock);
+            this.announce('playing', url);
+        } else {
+            const delayMs = Math.max(0, (startAt - context.currentTime) * 1000);
+            setTimeout(() => {
+                if (this.scheduled.indexOf(clip) >= 0) this.announce('playing', url);
+            }, delayMs);
+        }
+    }
+
+    private announce(state: NarrationEvent['state'], url: string): void {
+        window.dispatchEvent(new CustomEvent<NarrationEvent>('af-narration', { detail: { state, url } }));
+    }
+}
+
+export const narrationPlayer = new NarrationPlayer();
@@ -0,0 +1,74 @@
+import { PerfBeacon, PerfTelemetry } from './PerfTelemetry';
+
+const clock = () => {
+  const state = { now: 0 };
+  return { state, now: () => state.now };
+};
+
+describe('Performance telemetry (PerfTelemetry)', () => {
+  it('should record marks and spans on the given clock', async () => {
+    const { state, now } = clock();
+    const perf = new PerfTelemetry(10, now);
+
+    state.now = 5;
+    perf.mark('audio.cache_hit');
+    const end = perf.span('stream.turn', { speculative: false });
+    state.now = 125;
+    end({ reconnects: 1 });
+    state.now = 130;
+    await expect(perf.measure('tts.synthesize', Promise.reject(new Error('boom')))).rejects.toThrow('boom');
+
+    expect(perf.entries()).toEqual([
+      { seq: 1, name: 'audio.cache_hit', t: 5, data: undefined },
+      { seq: 2, name: 'stream.turn', t: 5, ms: 120, data: { speculative: false, reconnects: 1 } },
+      { seq: 3, name: 'tts.synthesize', t: 130, ms: 0, data: { ok: false } },
+    ]);
+  });
+
+  it('should keep only the newest entries and let readers continue from a sequence number', () => {
+    const perf = new PerfTelemetry(3, () => 0);
+    for (let i = 0; i < 5; i++) perf.mark(`m${i}`);
+
+    expect(perf.entries().map(e => e.name)).toEqual(['m2', 'm3', 'm4']);
+    expect(perf.dropped).toBe(2);
+    expect(perf.entries(4).map(e => e.name)).toEqual(['m4']);
+
+    perf.clear();
+    perf.mark('after');
+    expect(perf.entries().map(e => e.seq)).toEqual([6]);
+    expect(perf.dropped).toBe(0);
+  });
+
+  it('should summarize mark counts and span percentiles', () => {
+    const perf = new PerfTelemetry(100, () => 100);
+    [10, 20, 30, 40].forEach(ms => perf.record('save', 100 - ms));
+    perf.mark('retry');
+    perf.mark('retry');
+
+    const snapshot = perf.snapshot();
+    expect(snapshot.marks).toEqual({ retry: 2 });
+    expect(snapshot.spans.save).toEqual({ count: 4, p50: 30, p95: 40, max: 40 });
+  });
+
+  it('should send new entries in batches and retry batches the browser refused', () => {
+    const perf = new PerfTelemetry(100, () => 0);
+    const sent: any[] = [];
+    let accept = true;
+    const beacon = new PerfBeacon(perf, 'https://telemetry.test/perf', { batchSize: 2 }, (url, body) => {
+      if (accept) sent.push(JSON.parse(body));
+      return accept;
+    });
+
+    for (let i = 0; i < 3; i++) perf.mark(`m${i}`);
+    expect(beacon.flush()).toBe(3);
+    expect(sent.map(b => b.entries.length)).toEqual([2, 1]);
+    expect(beacon.flush()).toBe(0);
+
+    perf.mark('m3');
+    accept = false;
+    expect(beacon.flush()).toBe(0);
+    accept = true;
+    expect(beacon.flush()).toBe(1);
+    expect(sent[2].entries[0].name).toBe('m3');
+  });
+});
@@ -0,0 +1,202 @@
+export type PerfData = Record<string, string | number | boolean | null | undefined>;
+
+/** One mark (`ms` undefined) or span, timed on the performance.now() clock. */
+export interface PerfEntry {
+    seq: number;
+    name: string;
+    t: number;   // When the mark happened / the span started
+    ms?: number; // Span duration
+    data?: PerfData;
+}
+
+export interface PerfSpanSummary {
+    count: number;
+    p50: number;
+    p95: number;
+    max: number;
+}
+
+export interface PerfSnapshot {
+    entries: PerfEntry[];
+    dropped: number;
+    marks: Record<string, number>;
+    spans: Record<string, PerfSpanSummary>;
+}
+
+export const DEFAULT_PERF_CAPACITY = 1000;
+
+const percentile = (sorted: number[], p: number) => sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))];
+
+/**
+ * Runtime performance log: marks and spans for stream connect / first event /
+ * done, audio cache hits, TTS latency, image decode, typewriter frame drops
+ * and saves. Entries live in a fixed-size ring buffer (the oldest are
+ * overwritten), so a long session costs the same memory as a short one.
+ * Exposed as `window.__afPerf` for the audit scripts; PerfBeacon ships it.
+ */
+export class PerfTelemetry {
+    private readonly ring: (PerfEntry | undefined)[];
+    private seq = 0;
+    private floor = 0; // Last seq before clear(); seq keeps counting so readers' cursors stay valid
+    private readonly now: () => number;
+
+    constructor(capacity: number = DEFAULT_PERF_CAPACITY, now: () => number = () => performance.now()) {
+        this.ring = new Array(Math.max(1, capacity));
+        this.now = now;
+    }
+
+    get capacity(): number {
+        return this.ring.length;
+    }
+
+    /** Entries overwritten by newer ones (the buffer keeps the last `capacity`). */
+    get dropped(): number {
+        return Math.max(0, this.seq - this.floor - this.ring.length);
+    }
+
+    get lastSeq(): number {
+        return this.seq;
+    }
+
+    mark(name: string, data?: PerfData): PerfEntry {
+        return this.push({ seq: 0, name, t: this.now(), data });
+    }
+
+    /** Records a span that started at `start` (a performance.now() timestamp) and ends now. */
+    record(name: string, start: number, data?: PerfData): PerfEntry {
+        return this.push({ seq: 0, name, t: start, ms: Math.max(0, this.now() - start), data });
+    }
+
+    /** Starts a span; call the returned function (with any extra data) to end it. */
+    span(name: string, data?: PerfData): (extra?: PerfData) => PerfEntry {
+        const start = this.now();
+        return extra => this.record(name, start, extra ? { ...data, ...extra } : data);
+    }
+
+    /** Times `promise`; a rejection is recorded with `ok: false` and passed on. */
+    measure<T>(name: string, promise: Promise<T>, data?: PerfData): Promise<T> {
+        const end = this.span(name, data);
+        return promise.then(
+            value => { end({ ok: true }); return value; },
+            e => { end({ ok: false }); throw e; }
+        );
+    }
+
+    /** Entries still in the buffer, oldest first; only those after `sinceSeq` when given. */
+    entries(sinceSeq: number = 0, name?: string): PerfEntry[] {
+        const first = Math.max(sinceSeq, this.floor, this.seq - this.ring.length) + 1;
+        const result: PerfEntry[] = [];
+        for (let seq = first; seq <= this.seq; seq++) {
+            const entry = this.ring[(seq - 1) % this.ring.length]!;
+            if (!name || entry.name === name) result.push(entry);
+        }
+        return result;
+    }
+
+    /** Mark counts and span percentiles per name, over what is still buffered. */
+    snapshot(sinceSeq: number = 0): PerfSnapshot {
+        const entries = this.entries(sinceSeq);
+        const marks: Record<string, number> = {};
+        const durations: Record<string, number[]> = {};
+        entries.forEach(entry => {
+            if (entry.ms === undefined) marks[entry.name] = (marks[entry.name] || 0) + 1;
+            else (durations[entry.name] ??= []).push(entry.ms);
+        });
+        const spans: Record<string, PerfSpanSummary> = {};
+        Object.keys(durations).forEach(name => {
+            const sorted = durations[name].sort((a, b) => a - b);
+            spans[name] = {
+                count: sorted.length,
+                p50: Math.round(percentile(sorted, 0.5)),
+                p95: Math.round(percentile(sorted, 0.95)),
+                max: Math.round(sorted[sorted.length - 1]),
+            };
+        });
+        return { entries, dropped: this.dropped, marks, spans };
+    }
+
+    clear(): void {
+        this.ring.fill(undefined);
+        this.floor = this.seq;
+    }
+
+    private push(entry: PerfEntry): PerfEntry {
+        entry.seq = ++this.seq;
+        if (entry.ms !== undefined) entry.ms = Math.round(entry.ms * 10) / 10;
+        this.ring[(entry.seq - 1) % this.ring.length] = entry;
+        return entry;
+    }
+}
+
+export interface PerfBeaconOptions {
+    batchSize: number;  // Entries per beacon
+    intervalMs: number; // How often buffered entries are sent
+}
+
+export const DEFAULT_PERF_BEACON_OPTIONS: PerfBeaconOptions = { batchSize: 100, intervalMs: 15000 };
+
+export type SendBeacon = (url: string, body: string) => boolean;
+
+/**
+ * Sends new telemetry entries to `url` in batches with navigator.sendBeacon:
+ * every `intervalMs`, and once more when the page is hidden or unloaded.
+ * A batch the browser refuses stays pending for the next flush.
+ */
+export class PerfBeacon {
+    private sentSeq = 0;
+    private timer: ReturnType<typeof setInterval> | null = null;
+    private readonly session = Math.random().toString(36).substring(2, 10);
+    private readonly perf: PerfTelemetry;
+    private readonly url: string;
+    private readonly options: PerfBeaconOptions;
+    private readonly send: SendBeacon;
+    private readonly onHidden = () => {
+        if (document.visibilityState === 'hidden') this.flush();
+    };
+    private readonly onPageHide = () => this.flush();
+
+    constructor(
+        perf: PerfTelemetry,
+        url: string,
+        options: Partial<PerfBeaconOptions> = {},
+        send: SendBeacon = (target, body) => navigator.sendBeacon(target, body)
+    ) {
+        this.perf = perf;
+        this.url = url;
+        this.options = { ...DEFAULT_PERF_BEACON_OPTIONS, ...options };
+        this.send = send;
+    }
+
+    start(): void {
+        if (this.timer) return;
+        this.timer = setInterval(() => this.flush(), this.options.intervalMs);
+        document.addEventListener('visibilitychange', this.onHidden);
+        window.addEventListener('pagehide', this.onPageHide);
+    }
+
+    stop(): void {
+        if (this.timer) clearInterval(this.timer);
+        this.timer = null;
+        document.removeEventListener('visibilitychange', this.onHidden);
+        window.removeEventListener('pagehide', this.onPageHide);
+    }
+
+    /** Sends everything recorded since the last successful beacon; returns the number of entries sent. */
+    flush(): number {
+        const pending = this.perf.entries(this.sentSeq);
+        let sent = 0;
+        for (let i = 0; i < pending.length; i += this.options.batchSize) {
+            const batch = pending.slice(i, i + this.options.batchSize);
+            const body = JSON.stringify({ session: this.session, page: location.pathname, dropped: this.perf.dropped, entries: batch });
+            if (!this.send(this.url, body)) break;
+            this.sentSeq = batch[batch.length - 1].seq;
+            sent += batch.length;
+        }
+        return sent;
+    }
+}
+
+export const perf = new PerfTelemetry();
+
+// Read by the audit scripts (real timings for the reports)
+if (typeof window !== 'undefined') window.__afPerf = perf;
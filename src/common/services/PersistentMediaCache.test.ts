@@ -0,0 +1,117 @@
+import { CacheRecord, contentHash, MEDIA_CACHE_VERSION, MediaCacheBackend, PersistentMediaCache } from './PersistentMediaCache';
+import { withPersistentCache } from './ai/CachedAudioGenerator';
+
+const scope = { voice: 'alloy', lang: 'es', genre: 'fantasy' };
+
+/** In-memory stand-in for the IndexedDB backend: records by key, eviction by lastUsed like the index. */
+class MemoryBackend implements MediaCacheBackend {
+  records = new Map<string, CacheRecord>();
+  version: unknown = MEDIA_CACHE_VERSION;
+
+  async get(key: string) { return this.records.get(key); }
+  async put(record: CacheRecord) { this.records.set(record.key, record); }
+  async evictOldest(visit: (record: CacheRecord) => boolean) {
+    const oldestFirst = Array.from(this.records.values()).sort((a, b) => a.lastUsed - b.lastUsed);
+    for (let i = 0; i < oldestFirst.length && visit(oldestFirst[i]); i++) this.records.delete(oldestFirst[i].key);
+  }
+  async clear() { this.records.clear(); }
+  async count() { return this.records.size; }
+  async totalBytes() { return Array.from(this.records.values()).reduce((sum, r) => sum + r.bytes, 0); }
+  async getVersion() { return this.version; }
+  async setVersion(version: number) { this.version = version; }
+}
+
+const blobOf = (bytes: number) => new Blob([new Uint8Array(bytes)]);
+
+describe('Persistent media cache (IndexedDB)', () => {
+  it('should hash the same content to the same key', async () => {
+    expect(await contentHash('audio', 'Hola.')).toBe(await contentHash('audio', 'Hola.'));
+    expect(await contentHash('audio', 'Hola.')).not.toBe(await contentHash('image', 'Hola.'));
+  });
+
+  it('should degrade to misses when IndexedDB is unavailable', async () => {
+    const cache = new PersistentMediaCache();
+    await cache.put('k', 'audio', new Blob(['abc']));
+    expect(await cache.get('k')).toBeNull();
+  });
+
+  it('should fall through to the wrapped generator on a miss', async () => {
+    const generate = jest.fn(() => Promise.resolve('UklGRg=='));
+    const generator = withPersistentCache({ shouldSplitText: false, generate }, scope, new PersistentMediaCache());
+
+    expect(await generator.generate('Hola.')).toBe('UklGRg==');
+    expect(generate).toHaveBeenCalledTimes(1);
+  });
+
+  describe('quota and eviction', () => {
+    let now = 1000;
+    beforeEach(() => {
+      now = 1000;
+      jest.spyOn(Date, 'now').mockImplementation(() => now++);
+    });
+    afterEach(() => jest.restoreAllMocks());
+
+    it('should count bytes on put and replace the size of an overwritten entry', async () => {
+      const backend = new MemoryBackend();
+      const cache = new PersistentMediaCache(1000, async () => backend);
+
+      await cache.put('a', 'audio', blobOf(100));
+      await cache.put('b', 'image', blobOf(200));
+      await cache.put('a', 'audio', blobOf(50));
+
+      expect(await cache.stats()).toEqual({ entries: 2, bytes: 250, maxBytes: 1000 });
+    });
+
+    it('should skip empty blobs and blobs over a quarter of the quota', async () => {
+      const backend = new MemoryBackend();
+      const cache = new PersistentMediaCache(1000, async () => backend);
+
+      await cache.put('empty', 'audio', blobOf(0));
+      await cache.put('huge', 'image', blobOf(251));
+
+      expect(backend.records.size).toBe(0);
+    });
+
+    it('should evict least recently used entries down to 90% of the quota', async () => {
+      const backend = new MemoryBackend();
+      const cache = new PersistentMediaCache(1000, async () => backend);
+      for (const key of ['a', 'b', 'c', 'd']) await cache.put(key, 'audio', blobOf(240));
+
+      await cache.put('e', 'audio', blobOf(240)); // 1200 bytes: over quota
+
+      expect(Array.from(backend.records.keys()).sort()).toEqual(['c', 'd', 'e']);
+      expect((await cache.stats()).bytes).toBe(720);
+      expect(await backend.totalBytes()).toBe(720);
+    });
+
+    it('should refresh lastUsed on get so recently read entries survive eviction', async () => {
+      const backend = new MemoryBackend();
+      const cache = new PersistentMediaCache(1000, async () => backend);
+      for (const key of ['a', 'b', 'c', 'd']) await cache.put(key, 'audio', blobOf(240));
+
+      const before = backend.records.get('a')!.lastUsed;
+      expect(await cache.get('a')).not.toBeNull();
+      expect(backend.records.get('a')!.lastUsed).toBeGreaterThan(before);
+
+      await cache.put('e', 'audio', blobOf(240));
+      expect(Array.from(backend.records.keys()).sort()).toEqual(['a', 'd', 'e']);
+    });
+
+    it('should clear entries written by another cache version and count the rest on open', async () => {
+      const stale = new MemoryBackend();
+      stale.version = MEDIA_CACHE_VERSION - 1;
+      await stale.put({ key: 'old', kind: 'audio', blob: blobOf(10), bytes: 10, lastUsed: 1 });
+      const cache = new PersistentMediaCache(1000, async () => stale);
+
+      expect(await cache.get('old')).toBeNull();
+      expect(stale.version).toBe(MEDIA_CACHE_VERSION);
+      expect(await cache.stats()).toEqual({ entries: 0, bytes: 0, maxBytes: 1000 });
+
+      const current = new MemoryBackend();
+      await current.put({ key: 'kept', kind: 'image', blob: blobOf(30), bytes: 30, lastUsed: 1 });
+      const reopened = new PersistentMediaCache(1000, async () => current);
+      expect(await reopened.get('kept')).not.toBeNull();
+      expect((await reopened.stats()).bytes).toBe(30);
+    });
+  });
+});
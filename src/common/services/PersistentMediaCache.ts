@@ -0,0 +1,265 @@
+/**
+ * IndexedDB cache for generated speech and scene images that survives reloads.
+ * Entries are keyed by a SHA-256 content hash, counted against a byte quota and
+ * evicted least-recently-used first. Bumping MEDIA_CACHE_VERSION invalidates
+ * everything stored by older builds (e.g. after a TTS voice or format change).
+ * Every operation degrades to a miss when IndexedDB is unavailable (private
+ * browsing, tests), so callers never need a fallback path of their own.
+ */
+import { mediaStore, MediaHandle } from './MediaStore';
+
+export const MEDIA_CACHE_VERSION = 1;
+export const DEFAULT_MEDIA_CACHE_BYTES = 50 * 1024 * 1024;
+
+const DB_NAME = 'adventure-forge-media';
+const ENTRIES = 'entries';
+const META = 'meta';
+
+export type CachedMediaKind = 'audio' | 'image';
+
+export interface CacheRecord {
+    key: string;
+    kind: CachedMediaKind;
+    blob: Blob;
+    bytes: number;
+    lastUsed: number;
+}
+
+/**
+ * Storage behind the cache. The quota, LRU and version rules live in
+ * PersistentMediaCache; a backend only stores records (IndexedDB in the app,
+ * an in-memory map in tests).
+ */
+export interface MediaCacheBackend {
+    get(key: string): Promise<CacheRecord | undefined>;
+    put(record: CacheRecord): Promise<void>;
+    /** Visits records least recently used first, deleting each one `visit` returns true for, until it returns false. */
+    evictOldest(visit: (record: CacheRecord) => boolean): Promise<void>;
+    clear(): Promise<void>;
+    count(): Promise<number>;
+    totalBytes(): Promise<number>;
+    getVersion(): Promise<unknown>;
+    setVersion(version: number): Promise<void>;
+}
+
+const requestToPromise = <T>(request: IDBRequest<T>): Promise<T> => new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+});
+
+const toHex = (buffer: ArrayBuffer) =>
+    Array.from(new Uint8Array(buffer)).map(b => b.toString(16).padStart(2, '0')).join('');
+
+/** 53-bit string hash for contexts without crypto.subtle (plain-http dev servers). */
+const fallbackHash = (input: string) => {
+    let h1 = 0xdeadbeef;
+    let h2 = 0x41c6ce57;
+    for (let i = 0; i < input.length; i++) {
+        const ch = input.charCodeAt(i);
+        h1 = Math.imul(h1 ^ ch, 2654435761);
+        h2 = Math.imul(h2 ^ ch, 1597334677);
+    }
+    h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+    h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+    return (4294967296 * (2097151 & h2) + (h1 >>> 0)).toString(16);
+};
+
+/** Content hash of the given parts (e.g. kind, voice, lang, genre, text or the payload itself). */
+export const contentHash = async (...parts: string[]): Promise<string> => {
+    const input = parts.join('\u0000');
+    if (typeof crypto !== 'undefined' && crypto.subtle) {
+        try {
+            return toHex(await crypto.subtle.digest('SHA-256', new TextEncoder().encode(input)));
+        } catch (e) {
+            // Fall through to the non-cryptographic hash
+        }
+    }
+    return fallbackHash(input);
+};
+
+class IndexedDBBackend implements MediaCacheBackend {
+    private readonly db: IDBDatabase;
+
+    constructor(db: IDBDatabase) {
+        this.db = db;
+    }
+
+    /** Opens (and on first use creates) the media database; null when IndexedDB is unavailable. */
+    static open(): Promise<MediaCacheBackend | null> {
+        if (typeof indexedDB === 'undefined') return Promise.resolve(null);
+        return new Promise(resolve => {
+            const request = indexedDB.open(DB_NAME, 1);
+            request.onupgradeneeded = () => {
+                const db = request.result;
+                const entries = db.createObjectStore(ENTRIES, { keyPath: 'key' });
+                entries.createIndex('lastUsed', 'lastUsed');
+                db.createObjectStore(META);
+            };
+            request.onsuccess = () => resolve(new IndexedDBBackend(request.result));
+            request.onerror = () => {
+                console.warn("[MediaCache] IndexedDB unavailable:", request.error);
+                resolve(null);
+            };
+        });
+    }
+
+    private entries(mode: IDBTransactionMode = 'readonly') {
+        return this.db.transaction(ENTRIES, mode).objectStore(ENTRIES);
+    }
+
+    get(key: string) {
+        return requestToPromise<CacheRecord | undefined>(this.entries().get(key));
+    }
+
+    async put(record: CacheRecord) {
+        await requestToPromise(this.entries('readwrite').put(record));
+    }
+
+    evictOldest(visit: (record: CacheRecord) => boolean): Promise<void> {
+        return new Promise((resolve, reject) => {
+            const request = this.entries('readwrite').index('lastUsed').openCursor();
+            request.onsuccess = () => {
+                const cursor = request.result;
+                if (!cursor || !visit(cursor.value as CacheRecord)) return resolve();
+                cursor.delete();
+                cursor.continue();
+            };
+            request.onerror = () => reject(request.error);
+        });
+    }
+
+    async clear() {
+        await requestToPromise(this.entries('readwrite').clear());
+    }
+
+    count() {
+        return requestToPromise(this.entries().count());
+    }
+
+    totalBytes(): Promise<number> {
+        return new Promise((resolve, reject) => {
+            let total = 0;
+            const request = this.entries().openCursor();
+            request.onsuccess = () => {
+                const cursor = request.result;
+                if (!cursor) return resolve(total);
+                total += (cursor.value as CacheRecord).bytes;
+                cursor.continue();
+            };
+            request.onerror = () => reject(request.error);
+        });
+    }
+
+    getVersion() {
+        return requestToPromise(this.db.transaction(META).objectStore(META).get('version'));
+    }
+
+    async setVersion(version: number) {
+        await requestToPromise(this.db.transaction(META, 'readwrite').objectStore(META).put(version, 'version'));
+    }
+}
+
+export class PersistentMediaCache {
+    private backendPromise: Promise<MediaCacheBackend | null> | null = null;
+    private totalBytes: number | null = null;
+    private readonly maxBytes: number;
+    private readonly openBackend: () => Promise<MediaCacheBackend | null>;
+
+    constructor(maxBytes: number = DEFAULT_MEDIA_CACHE_BYTES, openBackend: () => Promise<MediaCacheBackend | null> = IndexedDBBackend.open) {
+        this.maxBytes = maxBytes;
+        this.openBackend = openBackend;
+    }
+
+    async get(key: string): Promise<Blob | null> {
+        const backend = await this.open();
+        if (!backend) return null;
+        try {
+            const record = await backend.get(key);
+            if (!record) return null;
+            // The refreshed timestamp moves the entry to the back of the eviction order
+            await backend.put({ ...record, lastUsed: Date.now() });
+            return record.blob;
+        } catch (e) {
+            console.warn("[MediaCache] Read failed:", e);
+            return null;
+        }
+    }
+
+    async put(key: string, kind: CachedMediaKind, blob: Blob): Promise<void> {
+        if (blob.size === 0 || blob.size > this.maxBytes / 4) return;
+        const backend = await this.open();
+        if (!backend) return;
+        try {
+            const previous = await backend.get(key);
+            await backend.put({ key, kind, blob, bytes: blob.size, lastUsed: Date.now() });
+            this.totalBytes = (this.totalBytes ?? 0) + blob.size - (previous?.bytes ?? 0);
+            if (this.totalBytes > this.maxBytes) await this.evict(backend);
+        } catch (e) {
+            // Quota errors included: a cache write must never break playback
+            console.warn("[MediaCache] Write failed:", e);
+        }
+    }
+
+    async clear(): Promise<void> {
+        const backend = await this.open();
+        if (!backend) return;
+        await backend.clear();
+        this.totalBytes = 0;
+    }
+
+    async stats(): Promise<{ entries: number; bytes: number; maxBytes: number }> {
+        const backend = await this.open();
+        if (!backend) return { entries: 0, bytes: 0, maxBytes: this.maxBytes };
+        return { entries: await backend.count(), bytes: this.totalBytes ?? 0, maxBytes: this.maxBytes };
+    }
+
+    private open(): Promise<MediaCacheBackend | null> {
+        if (this.backendPromise) return this.backendPromise;
+        this.backendPromise = this.openBackend().then(async backend => {
+            if (!backend) return null;
+            try {
+                await this.invalidateIfStale(backend);
+                this.totalBytes = await backend.totalBytes();
+                return backend;
+            } catch (e) {
+                console.warn("[MediaCache] Initialization failed:", e);
+                return null;
+            }
+        });
+        return this.backendPromise;
+    }
+
+    private async invalidateIfStale(backend: MediaCacheBackend): Promise<void> {
+        if (await backend.getVersion() === MEDIA_CACHE_VERSION) return;
+        await backend.clear();
+        await backend.setVersion(MEDIA_CACHE_VERSION);
+    }
+
+    /** Deletes least recently used entries until the cache is back under 90% of its quota. */
+    private evict(backend: MediaCacheBackend): Promise<void> {
+        const target = this.maxBytes * 0.9;
+        return backend.evictOldest(record => {
+            if ((this.totalBytes ?? 0) <= target) return false;
+            this.totalBytes = (this.totalBytes ?? 0) - record.bytes;
+            return true;
+        });
+    }
+}
+
+export const persistentMediaCache = new PersistentMediaCache();
+
+/**
+ * Turns a stored image (inline data URL from a save) into a mediaStore handle,
+ * reading the decoded Blob from the cache when this device has seen it before.
+ */
+export const loadCachedImage = async (data: string, cache: PersistentMediaCache = persistentMediaCache): Promise<MediaHandle> => {
+    if (!data.startsWith('data:')) return mediaStore.putImage(data);
+    const key = await contentHash('image', data);
+    const cached = await cache.get(key);
+    if (cached) return mediaStore.putImageBlob(cached);
+
+    const handle = mediaStore.putImage(data);
+    const blob = mediaStore.getBlob(handle.url);
+    if (blob) cache.put(key, 'image', blob);
+    return handle;
+};
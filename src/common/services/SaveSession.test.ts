@@ -0,0 +1,85 @@
+import { SaveSession } from './SaveSession';
+import { GameService, GameSaveDelta } from './GameService';
+import { EncodedJson } from '../utils/compression';
+
+const turn = (text: string) => ({ role: 'model', parts: [{ text }] });
+const state = (gameHistory: any[]) => ({
+  userId: 'u1',
+  genreKey: 'fantasy',
+  gameHistory,
+  gameContent: ['...'],
+  currentOptions: ['A', 'B'],
+  images: ['https://example.com/scene.png']
+});
+
+const httpError = (status: number, data: any = {}) => Object.assign(new Error(`HTTP ${status}`), { response: { status, data } });
+
+describe('Delta game saves (SaveSession)', () => {
+  let sent: GameSaveDelta[];
+
+  beforeEach(() => {
+    sent = [];
+    jest.spyOn(GameService, 'saveGameDelta').mockImplementation(async (encoded: EncodedJson) => {
+      const delta: GameSaveDelta = JSON.parse(encoded.body as string);
+      sent.push(delta);
+      return { _id: 'save-1', revision: sent.length, historyTotal: delta.historyOffset + delta.appendHistory.length };
+    });
+  });
+
+  afterEach(() => jest.restoreAllMocks());
+
+  it('should send the base snapshot once and only appended turns afterwards', async () => {
+    const session = new SaveSession(null, false);
+    const history = [turn('one'), turn('two')];
+    await session.save(state(history), 'token');
+    await session.save(state([...history, turn('three')]), 'token');
+
+    expect(sent[0]).toMatchObject({ baseRevision: 0, historyOffset: 0 });
+    expect(sent[0].appendHistory).toHaveLength(2);
+    expect(sent[1]).toMatchObject({ _id: 'save-1', baseRevision: 1, historyOffset: 2 });
+    expect(sent[1].appendHistory).toEqual([turn('three')]);
+    expect(sent[1].currentImages).toEqual(['https://example.com/scene.png']);
+  });
+
+  it('should resend from the point where a retried turn rewrote history', async () => {
+    const session = new SaveSession(null, false);
+    const history = [turn('one'), turn('two'), turn('three')];
+    await session.save(state(history), 'token');
+    await session.save(state([history[0], turn('two, retried')]), 'token');
+
+    expect(sent[1]).toMatchObject({ historyOffset: 1, appendHistory: [turn('two, retried')] });
+  });
+
+  it('should continue after the history page a save was loaded with', async () => {
+    const loaded = [turn('nine'), turn('ten')];
+    const session = new SaveSession({ ...state(loaded), _id: 'save-1', revision: 4, historyOffset: 8, historyTotal: 10 }, false);
+    await session.save(state([...loaded, turn('eleven')]), 'token');
+
+    expect(sent[0]).toMatchObject({ baseRevision: 4, historyOffset: 10, appendHistory: [turn('eleven')] });
+    expect(session.hasEarlierHistory).toBe(true);
+  });
+
+  it('should rebase on everything it holds after a conflict', async () => {
+    const session = new SaveSession(null, false);
+    const history = [turn('one')];
+    await session.save(state(history), 'token');
+    (GameService.saveGameDelta as jest.Mock).mockRejectedValueOnce(httpError(409, { revision: 7, historyTotal: 3 }));
+    await session.save(state([...history, turn('two')]), 'token');
+
+    expect(session.stats()).toMatchObject({ conflicts: 1, deltaSaves: 2 });
+    expect(sent[sent.length - 1]).toMatchObject({ baseRevision: 7, historyOffset: 0 });
+  });
+
+  it('should fall back to full saves when the server has no delta endpoint', async () => {
+    (GameService.saveGameDelta as jest.Mock).mockRejectedValue(httpError(404));
+    const saveGame = jest.spyOn(GameService, 'saveGame').mockResolvedValue({ _id: 'legacy-1' });
+    const session = new SaveSession(null, false);
+    await session.save(state([turn('one')]), 'token');
+    await session.save(state([turn('one'), turn('two')]), 'token');
+
+    expect(GameService.saveGameDelta).toHaveBeenCalledTimes(1);
+    expect(saveGame).toHaveBeenCalledTimes(2);
+    expect(saveGame.mock.calls[1][0]).toMatchObject({ _id: 'legacy-1' });
+    expect(session.stats()).toMatchObject({ fullSaves: 2, deltaSaves: 0 });
+  });
+});
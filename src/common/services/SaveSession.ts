@@ -0,0 +1,236 @@
+import { GameService, GameSaveConflict, GameSaveData, GameSaveDelta } from './GameService';
+import { mediaStore, MediaHandle } from './MediaStore';
+import { contentHash, loadCachedImage, persistentMediaCache } from './PersistentMediaCache';
+import { encodeJson } from '../utils/compression';
+import { perf } from './PerfTelemetry';
+
+export const MEDIA_REF_PREFIX = 'media:';
+export const HISTORY_PAGE_SIZE = 20;
+// Opening a save fetches only the latest turn (the player's choice and the story it produced)
+export const LATEST_TURN_HISTORY = 2;
+
+export const isMediaRef = (value?: string | null) => !!value && value.startsWith(MEDIA_REF_PREFIX);
+
+export interface SaveState {
+    userId: string;
+    genreKey: string;
+    gameHistory: any[];
+    gameContent: string[];
+    currentOptions?: string[];
+    images: string[];   // mediaStore object URLs, remote URLs or ""
+}
+
+export interface SaveSessionStats {
+    saves: number;
+    deltaSaves: number;
+    fullSaves: number;
+    conflicts: number;
+    bytesSent: number;
+    lastSaveBytes: number;
+    lastSaveRawBytes: number;
+    lastSaveMs: number;
+    mediaUploaded: number;
+    historyBase: number;
+    historyTotal: number;
+}
+
+const statusOf = (error: any): number | undefined => error?.response?.status ?? error?.status;
+
+/** Length of the prefix `current` shares with `synced`, compared by entry identity. */
+const commonPrefix = (synced: any[], current: any[]) => {
+    const max = Math.min(synced.length, current.length);
+    let i = 0;
+    while (i < max && synced[i] === current[i]) i++;
+    return i;
+};
+
+/**
+ * Tracks what the server already holds for one save and sends only the
+ * difference: history entries appended since the last save (a retry that
+ * rewrote the tail truncates and re-appends from the divergence point), and
+ * image payloads the server has not acknowledged yet, everything else by
+ * content hash. Servers without `/game/save/delta` get the old self-contained
+ * full save. Loaded saves may hold only the newest history page;
+ * `loadEarlierHistory` pages in the rest.
+ */
+export class SaveSession {
+    private saveId?: string;
+    private revision: number;
+    private historyBase: number;       // Index of gameHistory[0] in the server's full history
+    private historyTotal: number;
+    private synced: any[];             // History entries (from historyBase) the server holds
+    private hashByUrl = new Map<string, string>();
+    private urlByHash = new Map<string, string>();
+    private uploaded = new Set<string>();
+    private deltaSupported: boolean | null = null;
+    private readonly compress: boolean;
+    private counters = { saves: 0, deltaSaves: 0, fullSaves: 0, conflicts: 0, bytesSent: 0, lastSaveBytes: 0, lastSaveRawBytes: 0, lastSaveMs: 0, mediaUploaded: 0 };
+
+    constructor(saved: GameSaveData | null = null, compress: boolean = true) {
+        this.saveId = saved?._id;
+        this.revision = saved?.revision ?? 0;
+        this.historyBase = saved?.historyOffset ?? 0;
+        this.synced = saved ? saved.gameHistory.slice() : [];
+        this.historyTotal = saved?.historyTotal ?? this.historyBase + this.synced.length;
+        (saved?.currentImages || []).forEach(ref => {
+            if (isMediaRef(ref)) this.uploaded.add(ref.substring(MEDIA_REF_PREFIX.length));
+        });
+        this.compress = compress;
+    }
+
+    get id(): string | undefined {
+        return this.saveId;
+    }
+
+    get hasEarlierHistory(): boolean {
+        return this.historyBase > 0 && !!this.saveId;
+    }
+
+    async save(state: SaveState, token: string): Promise<string | undefined> {
+        const started = performance.now();
+        this.counters.lastSaveBytes = this.counters.lastSaveRawBytes = 0;
+        let saved = false;
+        if (this.deltaSupported !== false) {
+            try {
+                await this.saveDelta(state, token);
+                this.deltaSupported = saved = true;
+            } catch (e) {
+                if (statusOf(e) !== 404 || this.deltaSupported) throw e;
+                this.deltaSupported = false;
+            }
+        }
+        if (!saved) await this.saveFull(state, token);
+        this.counters.saves++;
+        this.counters.lastSaveMs = Math.round(performance.now() - started);
+        perf.record('save', started, { delta: this.deltaSupported === true, bytes: this.counters.lastSaveBytes });
+        return this.saveId;
+    }
+
+    /** Prepends the previous page of history (if any) and returns it. */
+    async loadEarlierHistory(token: string, pageSize: number = HISTORY_PAGE_SIZE): Promise<any[]> {
+        if (!this.hasEarlierHistory) return [];
+        const offset = Math.max(0, this.historyBase - pageSize);
+        const page = await GameService.loadHistory(token, this.saveId!, offset, this.historyBase - offset);
+        this.historyBase = page.offset;
+        this.synced = page.entries.concat(this.synced);
+        return page.entries;
+    }
+
+    /** Turns a saved image (media reference, data URL or remote URL) into something displayable. */
+    async resolveImage(value: string, token: string): Promise<MediaHandle> {
+        if (!isMediaRef(value)) return loadCachedImage(value);
+        const hash = value.substring(MEDIA_REF_PREFIX.length);
+        const cached = await persistentMediaCache.get(hash);
+        const handle = cached
+            ? mediaStore.putImageBlob(cached)
+            : await loadCachedImage((await GameService.loadMedia(token, hash)).data);
+        this.remember(handle.url, hash);
+        this.uploaded.add(hash);
+        return handle;
+    }
+
+    stats(): SaveSessionStats {
+        return { ...this.counters, historyBase: this.historyBase, historyTotal: this.historyTotal };
+    }
+
+    private async saveDelta(state: SaveState, token: string): Promise<void> {
+        const media: Record<string, string> = {};
+        const currentImages = await Promise.all(state.images.map(url => this.imageRef(url, media)));
+        const prefix = commonPrefix(this.synced, state.gameHistory);
+        const delta: GameSaveDelta = {
+            _id: this.saveId,
+            userId: state.userId,
+            genreKey: state.genreKey,
+            baseRevision: this.revision,
+            historyOffset: this.historyBase + prefix,
+            appendHistory: state.gameHistory.slice(prefix),
+            gameContent: state.gameContent,
+            currentOptions: state.currentOptions,
+            currentImages,
+            media
+        };
+
+        try {
+            await this.sendDelta(delta, token);
+        } catch (e: any) {
+            if (statusOf(e) !== 409) throw e;
+            // Saved elsewhere in the meantime or media evicted server-side: resend all we hold
+            this.counters.conflicts++;
+            const conflict: GameSaveConflict = e.response.data;
+            await Promise.all((conflict.missingMedia || []).map(async hash => {
+                const url = this.urlByHash.get(hash);
+                if (url && mediaStore.owns(url)) delta.media[hash] = await mediaStore.toDataUrl(url);
+            }));
+            await this.sendDelta({
+                ...delta,
+                baseRevision: conflict.revision,
+                historyOffset: this.historyBase,
+                appendHistory: state.gameHistory
+            }, token);
+        }
+        this.synced = state.gameHistory.slice();
+        this.counters.deltaSaves++;
+    }
+
+    private async sendDelta(delta: GameSaveDelta, token: string): Promise<void> {
+        const encoded = await encodeJson(delta, this.compress);
+        this.countBytes(encoded.bytes, encoded.rawBytes);
+        const result = await GameService.saveGameDelta(encoded, token);
+        this.saveId = result._id;
+        this.revision = result.revision;
+        this.historyTotal = result.historyTotal;
+        Object.keys(delta.media).forEach(hash => {
+            if (!this.uploaded.has(hash)) this.counters.mediaUploaded++;
+            this.uploaded.add(hash);
+        });
+    }
+
+    private async saveFull(state: SaveState, token: string): Promise<void> {
+        // Legacy saves stay self-contained: object URLs are re-encoded as data URLs
+        const currentImages = await Promise.all(state.images.map(url => url ? mediaStore.toDataUrl(url) : ""));
+        const data: GameSaveData = {
+            userId: state.userId,
+            genreKey: state.genreKey,
+            gameHistory: state.gameHistory,
+            gameContent: state.gameContent,
+            currentOptions: state.currentOptions,
+            currentImages,
+            _id: this.saveId
+        };
+        const bytes = new Blob([JSON.stringify(data)]).size;
+        this.countBytes(bytes, bytes);
+        const result = await GameService.saveGame(data, token);
+        this.saveId = result?._id ?? this.saveId;
+        this.synced = state.gameHistory.slice();
+        this.historyTotal = this.historyBase + this.synced.length;
+        this.counters.fullSaves++;
+    }
+
+    /** `media:<hash>` for images we own; the payload is added to `media` until the server has it. */
+    private async imageRef(url: string, media: Record<string, string>): Promise<string> {
+        if (!url || !mediaStore.owns(url)) return url || "";
+        let hash = this.hashByUrl.get(url);
+        let data: string | undefined;
+        if (!hash) {
+            data = await mediaStore.toDataUrl(url);
+            hash = await contentHash('image', data);
+            this.remember(url, hash);
+            // Same key loadCachedImage uses, so reloading this save on this device skips the download
+            const blob = mediaStore.getBlob(url);
+            if (blob) persistentMediaCache.put(hash, 'image', blob);
+        }
+        if (!this.uploaded.has(hash)) media[hash] = data ?? await mediaStore.toDataUrl(url);
+        return MEDIA_REF_PREFIX + hash;
+    }
+
+    private remember(url: string, hash: string) {
+        this.hashByUrl.set(url, hash);
+        this.urlByHash.set(hash, url);
+    }
+
+    private countBytes(bytes: number, rawBytes: number) {
+        this.counters.bytesSent += bytes;
+        this.counters.lastSaveBytes += bytes;
+        this.counters.lastSaveRawBytes += rawBytes;
+    }
+}
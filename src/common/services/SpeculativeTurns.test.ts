@@ -0,0 +1,98 @@
+import { TextDecoder, TextEncoder } from 'util';
+import { rankOptions, SpeculativeTurns, TurnRequest } from './SpeculativeTurns';
+
+// jsdom has no TextDecoder
+(global as any).TextDecoder ??= TextDecoder;
+
+const sse = (...events: object[]) => events.map(e => `data: ${JSON.stringify(e)}\n\n`).join('');
+
+/** A response body that hands out one chunk per read and counts the reads. */
+const fakeBody = (chunks: string[]) => {
+  const state = { reads: 0 };
+  const encoder = new TextEncoder();
+  const body = {
+    getReader: () => ({
+      read: async () => state.reads < chunks.length
+        ? { done: false, value: encoder.encode(chunks[state.reads++]) }
+        : { done: true, value: undefined },
+      cancel: async () => undefined,
+    }),
+  };
+  return { state, body: body as unknown as ReadableStream<Uint8Array> };
+};
+
+const turn = (prompt: string): TurnRequest => ({ prompt, history: [{ role: 'model', parts: [{ text: 'intro' }] }], voice: 'alloy', genre: 'fantasy', lang: 'en' });
+const settle = () => new Promise(resolve => setTimeout(resolve, 0));
+
+const TURN = [
+  sse({ type: 'status', message: 'Thinking...' }, { type: 'text_structure', paragraphs: ['One.', 'Two.'], options: ['a', 'b'] }),
+  sse({ type: 'image', index: 0, data: 'img0' }),
+  sse({ type: 'audio', pIndex: 0, sIndex: 0, text: 'One.', data: 'aud0' }),
+  sse({ type: 'image', index: 1, data: 'img1' }),
+  sse({ type: 'done' }),
+];
+
+describe('Speculative next turns (SpeculativeTurns)', () => {
+  it('should stop reading after the first paragraph and replay everything on promotion', async () => {
+    const { state, body } = fakeBody(TURN);
+    const turns = new SpeculativeTurns(async () => body, {}, () => false);
+    turns.prefetch([turn('I choose option 1: a. What happens next?')]);
+    await settle();
+
+    expect(state.reads).toBe(3);
+    expect(turns.stats().live).toEqual(['parked:I choose option 1: a. What happens next?']);
+
+    const speculation = turns.take(turn('I choose option 1: a. What happens next?'))!;
+    const events: string[] = [];
+    await speculation.promote(e => events.push(`${e.type}${e.index ?? ''}`));
+
+    expect(events).toEqual(['status', 'text_structure', 'image0', 'audio', 'image1', 'done']);
+    expect(state.reads).toBe(TURN.length);
+    expect(turns.stats()).toMatchObject({ started: 1, promoted: 1, cancelled: 0 });
+  });
+
+  it('should park at the byte cap even when the first paragraph is incomplete', async () => {
+    const { state, body } = fakeBody([sse({ type: 'text_structure', paragraphs: ['One.'] }), sse({ type: 'done' })]);
+    const turns = new SpeculativeTurns(async () => body, { maxBytes: 10 }, () => false);
+    turns.prefetch([turn('a')]);
+    await settle();
+    expect(state.reads).toBe(1);
+  });
+
+  it('should cancel speculations the player did not pick', async () => {
+    const signals: AbortSignal[] = [];
+    const turns = new SpeculativeTurns(async (_, signal) => {
+      signals.push(signal);
+      return fakeBody(TURN).body;
+    }, { maxConcurrent: 2 }, () => false);
+    turns.prefetch([turn('a'), turn('b'), turn('c')]);
+    await settle();
+    expect(signals).toHaveLength(2);
+
+    // A choice that was not generated ahead cancels everything
+    expect(turns.take(turn('c'))).toBeNull();
+    expect(signals.every(s => s.aborted)).toBe(true);
+    expect(turns.stats()).toMatchObject({ started: 2, promoted: 0, cancelled: 2 });
+  });
+
+  it('should respect the per-session cap and skip constrained connections', () => {
+    const open = jest.fn(async () => fakeBody(TURN).body);
+    let constrained = false;
+    const turns = new SpeculativeTurns(open, { maxPerSession: 2 }, () => constrained);
+    turns.prefetch([turn('a')]);
+    turns.prefetch([turn('b')]);
+    turns.prefetch([turn('c')]);
+    expect(open).toHaveBeenCalledTimes(2);
+
+    constrained = true;
+    const fresh = new SpeculativeTurns(open, {}, () => constrained);
+    fresh.prefetch([turn('d')]);
+    expect(open).toHaveBeenCalledTimes(2);
+    expect(fresh.stats().skipped).toBe(1);
+  });
+
+  it('should rank options by how often their position was picked', () => {
+    expect(rankOptions(3)).toEqual([0, 1, 2]);
+    expect(rankOptions(3, [1, 4, 4])).toEqual([1, 2, 0]);
+  });
+});
@@ -0,0 +1,270 @@
+import { StreamEvent } from '../hooks/useGameStream';
+import { readEventStream } from '../hooks/resumableStream';
+import { deferredStorage } from '../utils/deferred';
+
+/** Everything `/game/stream` needs to generate one turn. */
+export interface TurnRequest {
+    prompt: string;
+    history: any[];
+    voice: string;
+    genre: string;
+    lang: string;
+    saveId?: string;
+}
+
+/** Opens a low-priority `/game/stream` for `request` (resuming after `lastEventId` when set) and returns its body. */
+export type OpenTurnStream = (request: TurnRequest, signal: AbortSignal, lastEventId: string | null) => Promise<ReadableStream<Uint8Array>>;
+
+export interface SpeculationLimits {
+    maxConcurrent: number;  // Choices generated ahead at the same time
+    maxPerSession: number;  // Cost cap: speculative turns started per game
+    maxBytes: number;       // Bandwidth cap: bytes read before a speculation stops reading
+    includeAudio: boolean;  // Also wait for the first paragraph's first audio sentence
+}
+
+export const DEFAULT_SPECULATION_LIMITS: SpeculationLimits = {
+    maxConcurrent: 1,
+    maxPerSession: 20,
+    maxBytes: 512 * 1024,
+    includeAudio: true,
+};
+
+export type SpeculationState = 'running' | 'parked' | 'done' | 'failed' | 'cancelled';
+
+export interface SpeculativeTurnsStats {
+    started: number;
+    promoted: number;
+    cancelled: number;
+    skipped: number;
+    bytes: number;
+    wastedBytes: number;
+    live: string[];
+}
+
+/** Same prompt on top of the same history (and save) means the same turn. */
+export const turnKey = (request: TurnRequest): string => `${request.saveId ?? ''}|${request.history.length}|${request.prompt}`;
+
+const isBeyondFirstParagraph = (event: StreamEvent): boolean => {
+    const paragraph = event.type === 'audio' ? event.pIndex : event.index;
+    return typeof paragraph === 'number' && paragraph > 0;
+};
+
+/**
+ * One turn generated ahead of the player's choice. Events are buffered until
+ * the first paragraph is complete (text, its image and optionally its first
+ * audio sentence); then the reader stops pulling, so the rest of the response
+ * waits in the network buffers instead of competing with the current turn.
+ * `promote()` replays the buffer and keeps reading the same connection.
+ */
+export class Speculation {
+    readonly key: string;
+    readonly controller = new AbortController();
+    state: SpeculationState = 'running';
+    bytes = 0;
+    private events: StreamEvent[] = [];
+    private sink: ((event: StreamEvent) => void) | null = null;
+    private resume: (() => void) | null = null;
+    private finished: Promise<void>;
+    private seen = { text: false, image: false, audio: false, beyond: false };
+    private readonly limits: SpeculationLimits;
+
+    constructor(request: TurnRequest, open: OpenTurnStream, limits: SpeculationLimits) {
+        this.key = turnKey(request);
+        this.limits = limits;
+        this.finished = this.run(request, open).then(
+            () => { if (this.state !== 'cancelled') this.state = 'done'; },
+            e => {
+                if (this.state !== 'cancelled') this.state = 'failed';
+                throw e;
+            }
+        );
+        // Nobody awaits an unpromoted speculation; its failure only makes it unusable
+        this.finished.catch(() => undefined);
+    }
+
+    get usable(): boolean {
+        return this.state !== 'failed' && this.state !== 'cancelled';
+    }
+
+    get bufferedEvents(): number {
+        return this.events.length;
+    }
+
+    /** Hands the turn to `sink`: buffered events first, then the live remainder. Resolves when the stream ends. */
+    promote(sink: (event: StreamEvent) => void): Promise<void> {
+        const buffered = this.events;
+        this.events = [];
+        this.sink = sink;
+        buffered.forEach(event => sink(event));
+        this.wake();
+        return this.finished;
+    }
+
+    cancel(): void {
+        if (this.state === 'cancelled') return;
+        this.state = 'cancelled';
+        this.events = [];
+        this.controller.abort();
+        this.wake();
+    }
+
+    private wake(): void {
+        const resume = this.resume;
+        this.resume = null;
+        resume?.();
+    }
+
+    private shouldPark(): boolean {
+        if (this.sink || this.state === 'cancelled') return false;
+        const seen = this.seen;
+        return this.bytes >= this.limits.maxBytes || seen.beyond ||
+            (seen.text && seen.image && (!this.limits.includeAudio || seen.audio));
+    }
+
+    private receive(event: StreamEvent): void {
+        if (event.type === 'text_structure') this.seen.text = true;
+        else if ((event.type === 'image' || event.type === 'image_error') && event.index === 0) this.seen.image = true;
+        else if (event.type === 'audio' && event.pIndex === 0) this.seen.audio = true;
+        if (isBeyondFirstParagraph(event)) this.seen.beyond = true;
+
+        if (this.sink) this.sink(event);
+        else if (this.state !== 'cancelled') this.events.push(event);
+    }
+
+    private async run(request: TurnRequest, open: OpenTurnStream): Promise<void> {
+        // Resumable like any turn: a dropped connection picks up after the last buffered event
+        await readEventStream(
+            (lastEventId, signal) => open(request, signal, lastEventId),
+            event => this.receive(event),
+            this.controller.signal,
+            {
+                beforeRead: () => this.park(),
+                onBytes: bytes => { this.bytes += bytes; },
+            }
+        );
+    }
+
+    private park(): Promise<void> | void {
+        if (!this.shouldPark()) return;
+        this.state = 'parked';
+        return new Promise<void>(resolve => { this.resume = resolve; }).then(() => {
+            if (this.state === 'cancelled') throw new DOMException('Aborted', 'AbortError');
+            this.state = 'running';
+        });
+    }
+}
+
+/** Slow or metered connections never speculate. */
+const isConstrainedConnection = (): boolean => {
+    const connection = typeof navigator !== 'undefined' ? (navigator as any).connection : undefined;
+    return !!connection && (connection.saveData === true || /(^|-)2g$/.test(connection.effectiveType || ''));
+};
+
+/**
+ * Speculative next turns. While the player reads, the likeliest choices are
+ * generated ahead (see Speculation), within the concurrency, per-session and
+ * byte caps. Picking one of them promotes it instantly; anything else is
+ * cancelled through its AbortController.
+ */
+export class SpeculativeTurns {
+    private speculations = new Map<string, Speculation>();
+    private readonly open: OpenTurnStream;
+    private readonly limits: SpeculationLimits;
+    private readonly constrained: () => boolean;
+    private counters = { started: 0, promoted: 0, cancelled: 0, skipped: 0, bytes: 0, wastedBytes: 0 };
+
+    constructor(open: OpenTurnStream, limits: Partial<SpeculationLimits> = {}, constrained: () => boolean = isConstrainedConnection) {
+        this.open = open;
+        this.limits = { ...DEFAULT_SPECULATION_LIMITS, ...limits };
+        this.constrained = constrained;
+    }
+
+    /**
+     * Makes the first `maxConcurrent` of `requests` (likeliest first) the
+     * speculated turns: missing ones start, ones that dropped out are cancelled.
+     */
+    prefetch(requests: TurnRequest[]): void {
+        const wanted = requests.slice(0, this.limits.maxConcurrent).map(turnKey);
+        Array.from(this.speculations.keys()).forEach(key => {
+            if (wanted.indexOf(key) < 0) this.drop(key);
+        });
+        if (this.constrained()) {
+            this.counters.skipped += wanted.filter(key => !this.speculations.has(key)).length;
+            return;
+        }
+        requests.slice(0, this.limits.maxConcurrent).forEach(request => {
+            const key = turnKey(request);
+            const existing = this.speculations.get(key);
+            if (existing && existing.usable) return;
+            if (existing) this.drop(key);
+            if (this.counters.started >= this.limits.maxPerSession) {
+                this.counters.skipped++;
+                return;
+            }
+            this.counters.started++;
+            this.speculations.set(key, new Speculation(request, this.open, this.limits));
+        });
+    }
+
+    /** The speculation for `request`, if one is usable; every other speculation is cancelled. */
+    take(request: TurnRequest): Speculation | null {
+        const key = turnKey(request);
+        const speculation = this.speculations.get(key);
+        this.speculations.delete(key);
+        this.cancelAll();
+        if (!speculation || !speculation.usable) {
+            if (speculation) this.counters.wastedBytes += speculation.bytes;
+            return null;
+        }
+        this.counters.promoted++;
+        this.counters.bytes += speculation.bytes;
+        return speculation;
+    }
+
+    cancelAll(): void {
+        Array.from(this.speculations.keys()).forEach(key => this.drop(key));
+    }
+
+    stats(): SpeculativeTurnsStats {
+        const live: string[] = [];
+        let bytes = this.counters.bytes;
+        this.speculations.forEach((speculation, key) => {
+            live.push(`${speculation.state}:${key.split('|').pop()}`);
+            bytes += speculation.bytes;
+        });
+        return { ...this.counters, bytes, live };
+    }
+
+    private drop(key: string): void {
+        const speculation = this.speculations.get(key);
+        if (!speculation) return;
+        this.speculations.delete(key);
+        this.counters.cancelled++;
+        this.counters.bytes += speculation.bytes;
+        this.counters.wastedBytes += speculation.bytes;
+        speculation.cancel();
+    }
+}
+
+const PICKS_KEY = 'adventure_forge_option_picks';
+
+/** How often the player picked each option position, from earlier turns. */
+export const loadOptionPicks = (): number[] => {
+    try {
+        const picks = JSON.parse(deferredStorage.get(PICKS_KEY) || '[]');
+        return Array.isArray(picks) ? picks.map(n => Number(n) || 0) : [];
+    } catch (e) {
+        return [];
+    }
+};
+
+export const recordOptionPick = (index: number): void => {
+    const picks = loadOptionPicks();
+    while (picks.length <= index) picks.push(0);
+    picks[index]++;
+    deferredStorage.set(PICKS_KEY, JSON.stringify(picks));
+};
+
+/** Option indexes, likeliest first: most picked position, ties to the earlier option. */
+export const rankOptions = (count: number, picks: number[] = []): number[] =>
+    Array.from({ length: count }, (_, i) => i).sort((a, b) => (picks[b] || 0) - (picks[a] || 0) || a - b);
@@ -0,0 +1,64 @@
+import { TtsScheduler, sentencesOf } from './TtsScheduler';
+import { MediaHandle } from './MediaStore';
+
+const clip = (text: string): MediaHandle => ({ url: `blob:${text}`, kind: 'audio', bytes: text.length });
+
+// Synthesizer whose requests stay pending until resolved by the test
+const controllable = () => {
+  const requests: { text: string; signal: AbortSignal; resolve: () => void }[] = [];
+  const synthesize = (text: string, signal: AbortSignal) =>
+    new Promise<MediaHandle | null>(resolve => requests.push({ text, signal, resolve: () => resolve(clip(text)) }));
+  return { requests, synthesize };
+};
+
+describe('Sentence TTS scheduler (TtsScheduler)', () => {
+  const paragraphs = ['First one. First two.', 'Second one. Second two. Second three.'];
+
+  it('should split every paragraph into sentences', () => {
+    expect(sentencesOf(paragraphs).map(s => s.paragraph)).toEqual([0, 0, 1, 1, 1]);
+  });
+
+  it('should keep the lookahead window in flight ahead of the playhead', () => {
+    const { requests, synthesize } = controllable();
+    const scheduler = new TtsScheduler(synthesize, 2);
+    scheduler.load(sentencesOf(paragraphs));
+
+    expect(requests.map(r => r.text)).toEqual(['First one.', 'First two.', 'Second one.']);
+    scheduler.get(1);
+    expect(requests.map(r => r.text)).toContain('Second two.');
+    expect(scheduler.stats()).toMatchObject({ playhead: 1, inFlight: 3, cancelled: 1 });
+  });
+
+  it('should cancel requests for skipped paragraphs', () => {
+    const { requests, synthesize } = controllable();
+    const scheduler = new TtsScheduler(synthesize, 1);
+    scheduler.load(sentencesOf(paragraphs));
+    scheduler.skipParagraph(0);
+
+    expect(requests[0].signal.aborted).toBe(true);
+    expect(requests[1].signal.aborted).toBe(true);
+    expect(scheduler.indexOf('Second one.')).toBe(2);
+    expect(requests.filter(r => !r.signal.aborted).map(r => r.text)).toEqual(['Second one.', 'Second two.']);
+  });
+
+  it('should return the same clip for a sentence already in flight', async () => {
+    const { requests, synthesize } = controllable();
+    const scheduler = new TtsScheduler(synthesize, 1);
+    scheduler.load(sentencesOf(paragraphs));
+
+    const pending = scheduler.get(0);
+    requests[0].resolve();
+    expect((await pending)?.url).toBe('blob:First one.');
+    expect(requests.filter(r => r.text === 'First one.')).toHaveLength(1);
+  });
+
+  it('should abort everything when a new turn is loaded', () => {
+    const { requests, synthesize } = controllable();
+    const scheduler = new TtsScheduler(synthesize, 2);
+    scheduler.load(sentencesOf(paragraphs));
+    scheduler.load(sentencesOf(['Next turn.']));
+
+    expect(requests.slice(0, 3).every(r => r.signal.aborted)).toBe(true);
+    expect(scheduler.stats()).toMatchObject({ sentences: 1, inFlight: 1 });
+  });
+});
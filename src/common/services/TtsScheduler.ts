@@ -0,0 +1,151 @@
+import { MediaHandle } from './MediaStore';
+import { splitIntoSentences } from '../utils/textSplitter';
+
+export interface ScheduledSentence {
+    text: string;
+    paragraph: number;
+}
+
+export interface TtsSchedulerStats {
+    sentences: number;
+    playhead: number;
+    lookahead: number;
+    inFlight: number;
+    started: number;
+    completed: number;
+    cancelled: number;
+}
+
+export type Synthesize = (text: string, signal: AbortSignal) => Promise<MediaHandle | null>;
+
+interface Job {
+    promise: Promise<MediaHandle | null>;
+    controller: AbortController;
+    done: boolean;
+}
+
+export const DEFAULT_TTS_LOOKAHEAD = 2;
+
+/** Splits every paragraph of a turn into the sentences the scheduler synthesizes. */
+export const sentencesOf = (paragraphs: string[], locale?: string): ScheduledSentence[] => {
+    const sentences: ScheduledSentence[] = [];
+    paragraphs.forEach((paragraph, index) => {
+        splitIntoSentences(paragraph, locale).forEach(text => sentences.push({ text, paragraph: index }));
+    });
+    return sentences;
+};
+
+/**
+ * Sentence-level TTS pipeline for one turn.
+ * Keeps synthesis for the sentence at the playhead plus `lookahead` sentences
+ * after it in flight, so each clip is usually ready before the previous one
+ * ends. Moving the playhead forward (or skipping a paragraph) aborts every
+ * request that fell behind it; loading a new turn aborts everything.
+ */
+export class TtsScheduler {
+    private sentences: ScheduledSentence[] = [];
+    private jobs = new Map<number, Job>();
+    private playhead = 0;
+    private started = 0;
+    private completed = 0;
+    private cancelled = 0;
+    lookahead: number;
+    private readonly synthesize: Synthesize;
+
+    constructor(synthesize: Synthesize, lookahead: number = DEFAULT_TTS_LOOKAHEAD) {
+        this.synthesize = synthesize;
+        this.lookahead = Math.max(0, lookahead);
+    }
+
+    load(sentences: ScheduledSentence[]): void {
+        this.cancelWhere(() => true);
+        this.sentences = sentences;
+        this.playhead = 0;
+        this.pump();
+    }
+
+    /** Index of `text` at or after the playhead (where the player is about to be), or -1. */
+    indexOf(text: string): number {
+        const target = text.trim();
+        for (let i = this.playhead; i < this.sentences.length; i++) {
+            if (this.sentences[i].text === target) return i;
+        }
+        for (let i = 0; i < this.playhead; i++) {
+            if (this.sentences[i].text === target) return i;
+        }
+        return -1;
+    }
+
+    /** Clip for sentence `index`; moves the playhead there and tops up the lookahead window. */
+    get(index: number): Promise<MediaHandle | null> {
+        if (index < 0 || index >= this.sentences.length) return Promise.resolve(null);
+        this.seek(index);
+        return this.jobs.get(index)!.promise;
+    }
+
+    seek(index: number): void {
+        this.playhead = Math.max(0, Math.min(index, this.sentences.length));
+        this.cancelWhere(i => i < this.playhead);
+        this.pump();
+    }
+
+    /** Aborts the rest of `paragraph` and continues from the first sentence of the next one. */
+    skipParagraph(paragraph: number): void {
+        const next = this.sentences.findIndex(s => s.paragraph > paragraph);
+        this.seek(next === -1 ? this.sentences.length : next);
+    }
+
+    cancelAll(): void {
+        this.cancelWhere(() => true);
+    }
+
+    stats(): TtsSchedulerStats {
+        let inFlight = 0;
+        this.jobs.forEach(job => { if (!job.done) inFlight++; });
+        return {
+            sentences: this.sentences.length,
+            playhead: this.playhead,
+            lookahead: this.lookahead,
+            inFlight,
+            started: this.started,
+            completed: this.completed,
+            cancelled: this.cancelled,
+        };
+    }
+
+    private pump(): void {
+        const end = Math.min(this.sentences.length, this.playhead + this.lookahead + 1);
+        for (let i = this.playhead; i < end; i++) {
+            if (!this.jobs.has(i)) this.start(i);
+        }
+    }
+
+    private start(index: number): void {
+        const controller = new AbortController();
+        const job: Job = { controller, done: false, promise: Promise.resolve(null) };
+        job.promise = this.synthesize(this.sentences[index].text, controller.signal)
+            .catch(e => {
+                if (!controller.signal.aborted) console.warn("TTS synthesis failed:", e);
+                return null;
+            })
+            .then(handle => {
+                job.done = true;
+                if (!controller.signal.aborted) this.completed++;
+                return controller.signal.aborted ? null : handle;
+            });
+        this.jobs.set(index, job);
+        this.started++;
+    }
+
+    private cancelWhere(predicate: (index: number) => boolean): void {
+        Array.from(this.jobs.keys()).forEach(index => {
+            if (!predicate(index)) return;
+            const job = this.jobs.get(index)!;
+            if (!job.done) {
+                job.controller.abort();
+                this.cancelled++;
+            }
+            this.jobs.delete(index);
+        });
+    }
+}
@@ -1,6 +1,6 @@
 
 export interface AudioGenerator {
     readonly shouldSplitText: boolean;
-    generate(text: string): Promise<string | null>;
+    generate(text: string, signal?: AbortSignal): Promise<string | null>;
     generateBatch?(texts: string[]): Promise<{ audios: (string | null)[] } | null>;
 }
@@ -0,0 +1,66 @@
+import { AudioGenerator } from './AudioGenerator';
+import { audioCacheKey } from '../AudioCache';
+import { contentHash, persistentMediaCache, PersistentMediaCache } from '../PersistentMediaCache';
+import { base64ToBytes, blobToBase64 } from '../../utils/audioFormat';
+
+export interface AudioScope {
+    voice: string;
+    lang: string;
+    genre: string;
+}
+
+export const persistentAudioKey = (text: string, scope: AudioScope) =>
+    contentHash('audio', audioCacheKey(text, scope.voice, scope.lang, scope.genre));
+
+/** Stores speech that arrived some other way (e.g. streamed `audio` events) under the generator's key. */
+export const persistAudio = async (text: string, audio: Blob | string, scope: AudioScope, cache: PersistentMediaCache = persistentMediaCache) => {
+    const blob = typeof audio === 'string' ? new Blob([base64ToBytes(audio)]) : audio;
+    await cache.put(await persistentAudioKey(text, scope), 'audio', blob);
+};
+
+/**
+ * Wraps a generator so every sentence is looked up in the IndexedDB media
+ * cache first and stored after generation. Resumed games and reloads reuse
+ * speech that was already narrated instead of calling TTS again.
+ */
+export const withPersistentCache = (
+    generator: AudioGenerator,
+    scope: AudioScope,
+    cache: PersistentMediaCache = persistentMediaCache
+): AudioGenerator => {
+    const lookup = async (text: string): Promise<string | null> => {
+        const blob = await cache.get(await persistentAudioKey(text, scope));
+        return blob ? blobToBase64(blob) : null;
+    };
+
+    const store = (text: string, audio: string | null) => {
+        if (audio) persistAudio(text, audio, scope, cache).catch(e => console.warn("[MediaCache] Persist failed:", e));
+    };
+
+    return {
+        shouldSplitText: generator.shouldSplitText,
+
+        generate: async (text: string, signal?: AbortSignal) => {
+            const cached = await lookup(text);
+            if (cached) return cached;
+            const audio = await generator.generate(text, signal);
+            store(text, audio);
+            return audio;
+        },
+
+        generateBatch: generator.generateBatch && (async (texts: string[]) => {
+            const audios = await Promise.all(texts.map(lookup));
+            const missing = texts.filter((_, i) => !audios[i]);
+            if (missing.length > 0) {
+                const generated = await generator.generateBatch!(missing);
+                let next = 0;
+                audios.forEach((audio, i) => {
+                    if (audio) return;
+                    audios[i] = generated?.audios?.[next++] || null;
+                    store(texts[i], audios[i]);
+                });
+            }
+            return { audios };
+        })
+    };
+};
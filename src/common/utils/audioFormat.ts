@@ -0,0 +1,175 @@
+/**
+ * Audio payload helpers shared by the media store and the narrator.
+ * The backend and Kokoro return base64 that is either a WAV file, an MP3
+ * stream or raw 16-bit 24kHz mono PCM (Kokoro).
+ */
+
+export const PCM_SAMPLE_RATE = 24000;
+const PCM_BYTES_PER_SECOND = PCM_SAMPLE_RATE * 2; // 16-bit mono
+
+// Text-based fallback when the bytes can't tell: avg speaking rate ~15-17 chars/sec
+const MS_PER_CHAR = 60;
+
+export const base64ToBytes = (base64: string): Uint8Array => {
+    // Global atob so the decode worker can use it too
+    const binaryString = atob(base64);
+    const len = binaryString.length;
+    const bytes = new Uint8Array(len);
+    for (let i = 0; i < len; i++) {
+        bytes[i] = binaryString.charCodeAt(i);
+    }
+    return bytes;
+};
+
+export const createWavHeader = (dataLength: number, sampleRate: number = PCM_SAMPLE_RATE, numChannels: number = 1, bitsPerSample: number = 16) => {
+    const header = new ArrayBuffer(44);
+    const view = new DataView(header);
+
+    const writeString = (offset: number, value: string) => {
+        for (let i = 0; i < value.length; i++) {
+            view.setUint8(offset + i, value.charCodeAt(i));
+        }
+    };
+
+    writeString(0, 'RIFF');
+    view.setUint32(4, 36 + dataLength, true);
+    writeString(8, 'WAVE');
+    writeString(12, 'fmt ');
+    view.setUint32(16, 16, true);
+    view.setUint16(20, 1, true);
+    view.setUint16(22, numChannels, true);
+    view.setUint32(24, sampleRate, true);
+    view.setUint32(28, sampleRate * numChannels * (bitsPerSample / 8), true);
+    view.setUint16(32, numChannels * (bitsPerSample / 8), true);
+    view.setUint16(34, bitsPerSample, true);
+    writeString(36, 'data');
+    view.setUint32(40, dataLength, true);
+
+    return header;
+};
+
+export const hasWavHeader = (bytes: Uint8Array) => {
+    if (bytes.byteLength < 44) return false;
+    return (
+        bytes[0] === 0x52 && bytes[1] === 0x49 && bytes[2] === 0x46 && bytes[3] === 0x46 && // RIFF
+        bytes[8] === 0x57 && bytes[9] === 0x41 && bytes[10] === 0x56 && bytes[11] === 0x45   // WAVE
+    );
+};
+
+export const isMp3 = (bytes: Uint8Array) => {
+    if (bytes.byteLength < 3) return false;
+    if (bytes[0] === 0x49 && bytes[1] === 0x44 && bytes[2] === 0x33) return true; // ID3
+    return bytes[0] === 0xFF && (bytes[1] & 0xE0) === 0xE0; // Frame sync
+};
+
+/** Wraps decoded audio bytes in a playable Blob, adding a WAV header to raw PCM. */
+export const audioBlobFromBytes = (bytes: Uint8Array): Blob => {
+    if (hasWavHeader(bytes)) return new Blob([bytes], { type: 'audio/wav' });
+    if (isMp3(bytes)) return new Blob([bytes], { type: 'audio/mpeg' });
+    // Assume raw PCM 16-bit 24kHz mono
+    return new Blob([createWavHeader(bytes.byteLength), bytes], { type: 'audio/wav' });
+};
+
+export interface WavInfo {
+    sampleRate: number;
+    channels: number;
+    bitsPerSample: number;
+    dataOffset: number;
+    dataLength: number;
+}
+
+/** Reads the fmt and data chunks of a WAV file (headers are not always 44 bytes). */
+export const parseWav = (bytes: Uint8Array): WavInfo | null => {
+    if (!hasWavHeader(bytes)) return null;
+    const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    const info: Partial<WavInfo> = {};
+    let offset = 12;
+    while (offset + 8 <= bytes.byteLength) {
+        const id = String.fromCharCode(bytes[offset], bytes[offset + 1], bytes[offset + 2], bytes[offset + 3]);
+        const size = view.getUint32(offset + 4, true);
+        if (id === 'fmt ') {
+            info.channels = view.getUint16(offset + 10, true);
+            info.sampleRate = view.getUint32(offset + 12, true);
+            info.bitsPerSample = view.getUint16(offset + 22, true);
+        } else if (id === 'data') {
+            info.dataOffset = offset + 8;
+            // Streamed WAVs may carry a placeholder size; trust the bytes we actually have
+            info.dataLength = Math.min(size, bytes.byteLength - offset - 8);
+            break;
+        }
+        offset += 8 + size + (size % 2);
+    }
+    return info.sampleRate && info.channels && info.dataOffset !== undefined ? info as WavInfo : null;
+};
+
+export interface NormalizedAudio {
+    bytes: Uint8Array;       // A playable file: WAV (raw PCM gets a header) or MP3
+    mime: 'audio/wav' | 'audio/mpeg';
+    durationMs?: number;     // Sample-accurate for WAV/PCM; unknown for MP3 until decoded
+}
+
+/** Header detection and PCM framing for one clip; used by the decode worker and its inline fallback. */
+export const normalizeAudio = (bytes: Uint8Array): NormalizedAudio => {
+    const wav = parseWav(bytes);
+    if (wav) {
+        const frameBytes = wav.channels * (wav.bitsPerSample / 8);
+        return { bytes, mime: 'audio/wav', durationMs: (wav.dataLength / frameBytes / wav.sampleRate) * 1000 };
+    }
+    if (isMp3(bytes)) return { bytes, mime: 'audio/mpeg' };
+    // Raw PCM 16-bit 24kHz mono (Kokoro); drop a trailing odd byte so frames stay aligned
+    const pcm = bytes.byteLength % 2 ? bytes.subarray(0, bytes.byteLength - 1) : bytes;
+    const file = new Uint8Array(44 + pcm.byteLength);
+    file.set(new Uint8Array(createWavHeader(pcm.byteLength)), 0);
+    file.set(pcm, 44);
+    return { bytes: file, mime: 'audio/wav', durationMs: (pcm.byteLength / PCM_BYTES_PER_SECOND) * 1000 };
+};
+
+export interface PcmFrames {
+    sampleRate: number;
+    channels: Float32Array[];
+}
+
+/** De-interleaves 16-bit WAV samples into one Float32Array per channel (Web Audio's format). */
+export const wavToFrames = (bytes: Uint8Array): PcmFrames | null => {
+    const wav = parseWav(bytes);
+    if (!wav || wav.bitsPerSample !== 16) return null;
+    const frames = Math.floor(wav.dataLength / (2 * wav.channels));
+    const view = new DataView(bytes.buffer, bytes.byteOffset + wav.dataOffset, frames * 2 * wav.channels);
+    const channels: Float32Array[] = [];
+    for (let c = 0; c < wav.channels; c++) channels.push(new Float32Array(frames));
+    for (let i = 0, offset = 0; i < frames; i++) {
+        for (let c = 0; c < wav.channels; c++, offset += 2) {
+            channels[c][i] = view.getInt16(offset, true) / 32768;
+        }
+    }
+    return { sampleRate: wav.sampleRate, channels };
+};
+
+/**
+ * Playback duration from the real bytes: WAV uses its byte rate, raw PCM the
+ * Kokoro format. MP3 can't be measured without decoding, so it falls back to
+ * a text-based estimate.
+ */
+export const estimateAudioDurationMs = (bytes: Uint8Array, text: string = ''): number => {
+    if (hasWavHeader(bytes)) {
+        const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+        const byteRate = view.getUint32(28, true);
+        if (byteRate > 0) return ((bytes.byteLength - 44) / byteRate) * 1000;
+    }
+    if (isMp3(bytes)) return text.length * MS_PER_CHAR;
+    return (bytes.byteLength / PCM_BYTES_PER_SECOND) * 1000;
+};
+
+/** Base64 body (no data: prefix) of a Blob, the format the audio generators hand around. */
+export const blobToBase64 = (blob: Blob): Promise<string | null> => new Promise(resolve => {
+    const reader = new FileReader();
+    reader.onloadend = () => {
+        const result = reader.result as string;
+        resolve(result ? result.split(',')[1] : null);
+    };
+    reader.onerror = () => {
+        console.error("Error reading blob");
+        resolve(null);
+    };
+    reader.readAsDataURL(blob);
+});
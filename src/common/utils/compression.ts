@@ -0,0 +1,27 @@
+/** Bodies below this size are sent as plain JSON: gzip framing and CPU would outweigh the savings. */
+export const GZIP_MIN_BYTES = 8 * 1024;
+
+export interface EncodedJson {
+    body: string | Uint8Array;
+    bytes: number;       // Size on the wire
+    rawBytes: number;    // Size of the JSON before compression
+    encoding?: 'gzip';
+}
+
+export const canGzip = () => typeof CompressionStream !== 'undefined';
+
+export const gzip = async (data: Blob): Promise<Uint8Array> => {
+    const stream = data.stream().pipeThrough(new CompressionStream('gzip'));
+    return new Uint8Array(await new Response(stream).arrayBuffer());
+};
+
+/** Serializes `payload`, gzipping it when asked to, supported and large enough to be worth it. */
+export const encodeJson = async (payload: unknown, compress: boolean): Promise<EncodedJson> => {
+    const json = JSON.stringify(payload);
+    const raw = new Blob([json], { type: 'application/json' });
+    if (!compress || !canGzip() || raw.size < GZIP_MIN_BYTES) {
+        return { body: json, bytes: raw.size, rawBytes: raw.size };
+    }
+    const zipped = await gzip(raw);
+    return { body: zipped, bytes: zipped.byteLength, rawBytes: raw.size, encoding: 'gzip' };
+};
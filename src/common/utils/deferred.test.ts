@@ -0,0 +1,53 @@
+import { DeferredStorage, lazyWithPreload } from './deferred';
+
+const memoryStorage = () => {
+  const data = new Map<string, string>();
+  const writes: string[] = [];
+  const storage = {
+    getItem: (key: string) => (data.has(key) ? data.get(key)! : null),
+    setItem: (key: string, value: string) => { writes.push(key); data.set(key, value); },
+    removeItem: (key: string) => { writes.push(key); data.delete(key); },
+  } as unknown as Storage;
+  return { data, writes, storage };
+};
+
+describe('Deferred startup work (deferred)', () => {
+  it('should not write back values that were just read', () => {
+    const { data, writes, storage } = memoryStorage();
+    data.set('token', 'abc');
+    const deferred = new DeferredStorage(() => storage);
+
+    expect(deferred.get('token')).toBe('abc');
+    deferred.set('token', 'abc');
+    deferred.flush();
+    expect(writes).toEqual([]);
+  });
+
+  it('should coalesce changes into one write per key on flush', () => {
+    const { data, writes, storage } = memoryStorage();
+    const deferred = new DeferredStorage(() => storage);
+
+    deferred.set('volume', '0.1');
+    deferred.set('volume', '0.2');
+    deferred.set('volume', '0.3');
+    expect(deferred.get('volume')).toBe('0.3');
+    expect(writes).toEqual([]);
+
+    deferred.flush();
+    expect(writes).toEqual(['volume']);
+    expect(data.get('volume')).toBe('0.3');
+  });
+
+  it('should let a failed chunk load be retried', async () => {
+    const Component = () => null;
+    const factory = jest.fn()
+      .mockRejectedValueOnce(new Error('ChunkLoadError'))
+      .mockResolvedValue({ default: Component });
+    const Lazy = lazyWithPreload(factory);
+
+    await expect(Lazy.preload()).rejects.toThrow('ChunkLoadError');
+    await expect(Lazy.preload()).resolves.toEqual({ default: Component });
+    await Lazy.preload();
+    expect(factory).toHaveBeenCalledTimes(2);
+  });
+});
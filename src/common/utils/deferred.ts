@@ -0,0 +1,107 @@
+import React from 'react';
+
+/**
+ * Runs `callback` once the browser is idle (or after `timeoutMs` at the
+ * latest). Used for work that must not compete with the first paint: chunk
+ * prefetches, storage writes, media warm-up. Returns a cancel function.
+ */
+export const whenIdle = (callback: () => void, timeoutMs: number = 2000): (() => void) => {
+    if (typeof window !== 'undefined' && typeof window.requestIdleCallback === 'function') {
+        const handle = window.requestIdleCallback(() => callback(), { timeout: timeoutMs });
+        return () => window.cancelIdleCallback(handle);
+    }
+    const handle = setTimeout(callback, Math.min(timeoutMs, 200));
+    return () => clearTimeout(handle);
+};
+
+export type PreloadableComponent<T extends React.ComponentType<any>> = React.LazyExoticComponent<T> & {
+    preload: () => Promise<{ default: T }>;
+};
+
+/**
+ * React.lazy with a `preload()` that starts downloading the chunk before the
+ * component renders (on idle, on hover), so code splitting does not add a
+ * spinner when the user actually gets there.
+ */
+export const lazyWithPreload = <T extends React.ComponentType<any>>(
+    factory: () => Promise<{ default: T }>
+): PreloadableComponent<T> => {
+    let pending: Promise<{ default: T }> | null = null;
+    const load = () => {
+        pending ??= factory().catch(e => {
+            // Let a later attempt retry (e.g. the chunk failed on a flaky connection)
+            pending = null;
+            throw e;
+        });
+        return pending;
+    };
+    const component = React.lazy(load) as PreloadableComponent<T>;
+    component.preload = load;
+    return component;
+};
+
+/**
+ * localStorage access for settings that change often or are written back on
+ * startup. Reads are cached, writes of unchanged values are skipped and the
+ * rest are coalesced and flushed when idle (or when the page is hidden).
+ */
+export class DeferredStorage {
+    private known = new Map<string, string | null>();
+    private pending = new Map<string, string | null>();
+    private cancelFlush: (() => void) | null = null;
+    private readonly storage: () => Storage | null;
+
+    constructor(storage: () => Storage | null = () => (typeof localStorage !== 'undefined' ? localStorage : null)) {
+        this.storage = storage;
+        if (typeof window !== 'undefined') {
+            window.addEventListener('pagehide', () => this.flush());
+            document.addEventListener('visibilitychange', () => {
+                if (document.visibilityState === 'hidden') this.flush();
+            });
+        }
+    }
+
+    get(key: string): string | null {
+        if (this.pending.has(key)) return this.pending.get(key)!;
+        if (!this.known.has(key)) {
+            let value: string | null = null;
+            try {
+                value = this.storage()?.getItem(key) ?? null;
+            } catch (e) {
+                // Storage disabled (private mode, quota): behave as empty
+            }
+            this.known.set(key, value);
+        }
+        return this.known.get(key)!;
+    }
+
+    set(key: string, value: string): void {
+        if (this.get(key) === value) return;
+        this.pending.set(key, value);
+        this.cancelFlush ??= whenIdle(() => this.flush());
+    }
+
+    remove(key: string): void {
+        if (this.get(key) === null) return;
+        this.pending.set(key, null);
+        this.cancelFlush ??= whenIdle(() => this.flush());
+    }
+
+    flush(): void {
+        this.cancelFlush?.();
+        this.cancelFlush = null;
+        const storage = this.storage();
+        this.pending.forEach((value, key) => {
+            try {
+                if (value === null) storage?.removeItem(key);
+                else storage?.setItem(key, value);
+                this.known.set(key, value);
+            } catch (e) {
+                console.warn("[Storage] Could not persist", key, e);
+            }
+        });
+        this.pending.clear();
+    }
+}
+
+export const deferredStorage = new DeferredStorage();
@@ -1,14 +1,24 @@
+import { blobToBase64 } from './audioFormat';
+import { contentHash, persistentMediaCache } from '../services/PersistentMediaCache';
 
 export async function generateKokoroAudio(text: string, lang: string, genre: string): Promise<string | null> {
     const url = "https://willyfox94-kokoro-tts-api.hf.space/tts";
+    const langCode = lang.substring(0, 2).toLowerCase();
+    const genreCode = genre.toLowerCase();
+
+    // Speech for this exact text/lang/genre survives reloads in IndexedDB
+    const cacheKey = await contentHash('kokoro', langCode, genreCode, text.trim());
+    const cached = await persistentMediaCache.get(cacheKey);
+    if (cached) return blobToBase64(cached);
+
     try {
         const response = await fetch(url, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({
                 text,
-                lang: lang.substring(0, 2).toLowerCase(),
-                genre: genre.toLowerCase()
+                lang: langCode,
+                genre: genreCode
             })
         });
 
@@ -18,20 +28,8 @@ export async function generateKokoroAudio(text: string, lang: string, genre: str
         }
 
         const blob = await response.blob();
-        return new Promise((resolve) => {
-            const reader = new FileReader();
-            reader.onloadend = () => {
-                const result = reader.result as string;
-                // Get base64 content
-                const base64 = result.split(',')[1];
-                resolve(base64);
-            };
-            reader.onerror = () => {
-                console.error("Error reading blob");
-                resolve(null);
-            };
-            reader.readAsDataURL(blob);
-        });
+        persistentMediaCache.put(cacheKey, 'audio', blob);
+        return blobToBase64(blob);
     } catch (error) {
         console.error("Kokoro TTS network error:", error);
         return null;
@@ -1,3 +1,5 @@
+import { perf } from '../services/PerfTelemetry';
+
 /**
  * Resilient execution wrapper with exponential retry.
  */
@@ -14,16 +16,19 @@ export async function withRetry<T>(
             
             // Check if error is retryable (Network errors or 429/5xx)
             const status = error.response?.status || error.status;
-            const isRetryable = !status || status === 429 || status >= 500 || 
+            // A cancelled request (AbortController) must not come back as a retry
+            const isAborted = error.name === 'AbortError' || error.name === 'CanceledError';
+            const isRetryable = !isAborted && (!status || status === 429 || status >= 500 || 
                                error.message?.toLowerCase().includes('network') || 
                                error.message?.toLowerCase().includes('timeout') ||
-                               error.code === 'ECONNABORTED';
+                               error.code === 'ECONNABORTED');
             
             if (!isRetryable || i === options.retries - 1) {
                 throw error;
             }
 
             const delay = options.baseDelay * Math.pow(2, i);
+            perf.mark('retry', { name: options.name, attempt: i + 1, delayMs: delay, status: status || null });
             console.warn(`[Resilience] ${options.name} failed (attempt ${i + 1}/${options.retries}). Retrying in ${delay}ms... Error: ${error.message}`);
             await new Promise(resolve => setTimeout(resolve, delay));
         }
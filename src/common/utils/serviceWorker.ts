@@ -0,0 +1,43 @@
+import { config } from '../config/config';
+
+/** Messages posted by public/sw.js to open pages. */
+export type ServiceWorkerMessage = { type: 'af-sw:game-list-updated' };
+
+/**
+ * Registers public/sw.js after the page has loaded, so installing it (and
+ * precaching the build) never competes with the cold start. The worker learns
+ * the API origin from its URL. With the worker disabled, any previously
+ * installed one is removed.
+ */
+export const registerServiceWorker = () => {
+    if (typeof navigator === 'undefined' || !('serviceWorker' in navigator)) return;
+    if (!config.serviceWorker) {
+        navigator.serviceWorker.getRegistrations()
+            .then(registrations => registrations.forEach(r => r.unregister()))
+            .catch(() => undefined);
+        return;
+    }
+    const register = () => {
+        let api = '';
+        try {
+            api = new URL(config.apiUrl, window.location.href).origin;
+        } catch (e) {
+            // Relative or malformed API URL: the worker just won't cache API responses
+        }
+        const url = `${process.env.PUBLIC_URL}/sw.js?api=${encodeURIComponent(api)}`;
+        navigator.serviceWorker.register(url, { scope: `${process.env.PUBLIC_URL}/` })
+            .catch(e => console.warn("[SW] Registration failed:", e));
+    };
+    if (document.readyState === 'complete') register();
+    else window.addEventListener('load', register, { once: true });
+};
+
+/** Subscribes to one kind of service worker message; returns the unsubscribe function. */
+export const onServiceWorkerMessage = (type: ServiceWorkerMessage['type'], handler: () => void): (() => void) => {
+    if (typeof navigator === 'undefined' || !('serviceWorker' in navigator)) return () => undefined;
+    const listener = (event: MessageEvent<ServiceWorkerMessage>) => {
+        if (event.data?.type === type) handler();
+    };
+    navigator.serviceWorker.addEventListener('message', listener);
+    return () => navigator.serviceWorker.removeEventListener('message', listener);
+};
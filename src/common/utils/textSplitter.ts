@@ -45,10 +45,19 @@ export const splitFirstSentence = (text: string): [string, string] => {
     return [text, ""];
 };
 
-export const splitIntoSentences = (text: string): string[] => {
+export const splitIntoSentences = (text: string, locale?: string): string[] => {
+    if (!text) return [];
+
+    // Intl.Segmenter knows abbreviations, ellipses and ¿…? / ¡…! better than the regex
+    const Segmenter = (Intl as any).Segmenter;
+    if (Segmenter) {
+        const sentences = Array.from(new Segmenter(locale, { granularity: 'sentence' }).segment(text), (s: any) => (s.segment as string).trim())
+            .filter(Boolean);
+        if (sentences.length > 0) return sentences;
+    }
+
     // Basic sentence splitting using regex
     // Looks for . ! ? followed by space or end of string
-    if (!text) return [];
     const segments = text.match(/[^.!?]+[.!?]+(\s|$)|[^.!?]+$/g);
     return segments ? segments.map(s => s.trim()) : [text];
 };
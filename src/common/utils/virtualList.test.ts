@@ -0,0 +1,23 @@
+import { visibleRange } from './virtualList';
+
+describe('Virtualized list window (visibleRange)', () => {
+  it('should render only the rows in view plus the overscan', () => {
+    expect(visibleRange(0, 400, 100, 1000, 2)).toEqual({ start: 0, end: 6, offsetTop: 0, totalHeight: 100000 });
+    expect(visibleRange(5050, 400, 100, 1000, 2)).toEqual({ start: 48, end: 57, offsetTop: 4800, totalHeight: 100000 });
+  });
+
+  it('should clamp to the ends of the list', () => {
+    // Overscrolled (e.g. rubber-banding) past the last row
+    expect(visibleRange(999999, 400, 100, 1000, 2)).toEqual({ start: 994, end: 1000, offsetTop: 99400, totalHeight: 100000 });
+    expect(visibleRange(-50, 400, 100, 3, 2)).toEqual({ start: 0, end: 3, offsetTop: 0, totalHeight: 300 });
+    expect(visibleRange(0, 400, 100, 0)).toEqual({ start: 0, end: 0, offsetTop: 0, totalHeight: 0 });
+  });
+
+  it('should keep the rendered row count independent of the list length', () => {
+    const rendered = [100, 1000, 100000].map(count => {
+      const range = visibleRange(count * 50, 600, 90, count);
+      return range.end - range.start;
+    });
+    expect(new Set(rendered).size).toBe(1);
+  });
+});
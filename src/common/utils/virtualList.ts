@@ -0,0 +1,57 @@
+import React, { useCallback, useEffect, useRef, useState } from 'react';
+
+export interface VisibleRange {
+    start: number;       // First row to render
+    end: number;         // One past the last row to render
+    offsetTop: number;   // Where row `start` sits inside the scroll content
+    totalHeight: number; // Height of the whole list, rendered or not
+}
+
+/**
+ * Rows of a fixed-height list that intersect the viewport, plus `overscan`
+ * rows on each side so fast scrolling does not show blank space.
+ */
+export const visibleRange = (
+    scrollTop: number,
+    viewportHeight: number,
+    rowHeight: number,
+    count: number,
+    overscan: number = 4
+): VisibleRange => {
+    const totalHeight = count * rowHeight;
+    if (count === 0 || rowHeight <= 0) return { start: 0, end: 0, offsetTop: 0, totalHeight };
+    const top = Math.min(Math.max(0, scrollTop), Math.max(0, totalHeight - viewportHeight));
+    const start = Math.max(0, Math.floor(top / rowHeight) - overscan);
+    const end = Math.min(count, Math.ceil((top + viewportHeight) / rowHeight) + overscan);
+    return { start, end, offsetTop: start * rowHeight, totalHeight };
+};
+
+/**
+ * Windowing for a scroll container of fixed-height rows: attach `ref` and
+ * `onScroll` to the container and render only `range.start`..`range.end`,
+ * shifted down by `range.offsetTop` inside a `range.totalHeight` spacer.
+ */
+export const useVirtualList = (count: number, rowHeight: number, overscan: number = 4) => {
+    const ref = useRef<HTMLDivElement | null>(null);
+    const [scrollTop, setScrollTop] = useState(0);
+    const [viewportHeight, setViewportHeight] = useState(0);
+    const mounted = count > 0; // The container usually renders only once there are rows
+
+    useEffect(() => {
+        const element = ref.current;
+        if (!element) return;
+        const measure = () => setViewportHeight(element.clientHeight);
+        measure();
+        if (typeof ResizeObserver === 'undefined') {
+            window.addEventListener('resize', measure);
+            return () => window.removeEventListener('resize', measure);
+        }
+        const observer = new ResizeObserver(measure);
+        observer.observe(element);
+        return () => observer.disconnect();
+    }, [mounted]);
+
+    const onScroll = useCallback((e: React.UIEvent<HTMLDivElement>) => setScrollTop(e.currentTarget.scrollTop), []);
+
+    return { ref, onScroll, range: visibleRange(scrollTop, viewportHeight, rowHeight, count, overscan) };
+};
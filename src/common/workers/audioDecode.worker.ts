@@ -0,0 +1,20 @@
+/* eslint-disable no-restricted-globals */
+import { handleDecodeRequest, DecodeRequest, DecodeResponse } from '../services/AudioDecoder';
+
+// Narration decoding off the main thread; see AudioDecoder for the protocol
+const scope = self as unknown as Worker;
+
+scope.onmessage = (event: MessageEvent<DecodeRequest>) => {
+    let response: DecodeResponse;
+    try {
+        response = handleDecodeRequest(event.data);
+    } catch (e: any) {
+        response = { id: event.data.id, error: e?.message || String(e) };
+    }
+    const transfer: Transferable[] = [];
+    if ('buffer' in response) transfer.push(response.buffer);
+    if ('frames' in response && response.frames) response.frames.channels.forEach(c => transfer.push(c.buffer));
+    scope.postMessage(response, transfer);
+};
+
+export { };
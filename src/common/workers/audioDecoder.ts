@@ -0,0 +1,9 @@
+import { AudioDecoder } from '../services/AudioDecoder';
+
+/**
+ * App-wide narration decoder backed by audioDecode.worker. Kept apart from
+ * AudioDecoder so tests can use the class without bundler-only worker syntax.
+ */
+export const audioDecoder = new AudioDecoder(() =>
+    typeof Worker !== 'undefined' ? new Worker(new URL('./audioDecode.worker.ts', import.meta.url)) : null
+);
@@ -1,13 +1,13 @@
 import React from "react";
 import { createRoot } from "react-dom/client";
-import { GoogleOAuthProvider } from '@react-oauth/google';
 import { LanguageProvider } from "./common/language/LanguageContext";
 import { ThemeProvider } from "./common/theme/ThemeContext";
 import { AuthProvider } from "./common/contexts/AuthContext";
 import StartScreen from "./views/StartScreen/StartScreen";
 import ErrorBoundary from "./common/components/ErrorBoundary";
-
-const GOOGLE_CLIENT_ID = process.env.REACT_APP_GOOGLE_CLIENT_ID || "YOUR_CLIENT_ID_HERE";
+import { registerServiceWorker } from "./common/utils/serviceWorker";
+import { config } from "./common/config/config";
+import { perf, PerfBeacon } from "./common/services/PerfTelemetry";
 
 const container = document.getElementById("game-layout");
 if (container) {
@@ -15,16 +15,21 @@ if (container) {
   root.render(
     <React.StrictMode>
       <ErrorBoundary>
-        <GoogleOAuthProvider clientId={GOOGLE_CLIENT_ID}>
-          <AuthProvider>
-            <LanguageProvider>
-              <ThemeProvider>
-                <StartScreen />
-              </ThemeProvider>
-            </LanguageProvider>
-          </AuthProvider>
-        </GoogleOAuthProvider>
+        {/* Google's SDK is loaded by the sign-in button (StartScreen/GoogleSignIn) once the menu is idle */}
+        <AuthProvider>
+          <LanguageProvider>
+            <ThemeProvider>
+              <StartScreen />
+            </ThemeProvider>
+          </LanguageProvider>
+        </AuthProvider>
       </ErrorBoundary>
     </React.StrictMode>
   );
 }
+
+registerServiceWorker();
+
+if (config.perfBeaconUrl) {
+  new PerfBeacon(perf, config.perfBeaconUrl).start();
+}
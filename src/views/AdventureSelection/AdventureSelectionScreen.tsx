@@ -4,6 +4,7 @@ import { useTheme } from '../../common/theme/ThemeContext';
 import { useNavigation } from '../../common/contexts/NavigationContext';
 import { ADVENTURE_TYPES } from '../../common/resources/availableTypes';
 import { FiChevronLeft, FiChevronRight, FiArrowLeft } from "react-icons/fi";
+import { whenIdle } from '../../common/utils/deferred';
 import "./AdventureSelectionScreen.css";
 
 const AdventureSelectionScreen: React.FC = () => {
@@ -18,6 +19,14 @@ const AdventureSelectionScreen: React.FC = () => {
 
     const selectedGenre = ADVENTURE_TYPES[selectedGenreIndex];
 
+    // Icons are fetched one at a time: the neighbours of the shown genre once the browser is idle
+    useEffect(() => whenIdle(() => {
+        const count = ADVENTURE_TYPES.length;
+        [selectedGenreIndex + 1, selectedGenreIndex + count - 1].forEach(i => {
+            new Image().src = ADVENTURE_TYPES[i % count].icon;
+        });
+    }), [selectedGenreIndex]);
+
     function rotateGenre(direction: 'prev' | 'next') {
         if (direction === 'prev') {
             setSelectedGenreIndex(selectedGenreIndex === 0 ? ADVENTURE_TYPES.length - 1 : selectedGenreIndex - 1);
@@ -45,7 +54,7 @@ const AdventureSelectionScreen: React.FC = () => {
 
                     <div className="selected-genre-display">
                         <div className="genre-card large selected">
-                            <img src={selectedGenre.icon} alt={selectedGenre.id} className="genre-icon" />
+                            <img src={selectedGenre.icon} alt={selectedGenre.id} className="genre-icon" decoding="async" />
                             <div className="genre-name">{t('genre_' + selectedGenre.id)}</div>
                         </div>
                     </div>
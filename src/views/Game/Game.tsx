@@ -10,16 +10,22 @@ import TextNarrator from "../../common/components/TextNarrator/TextNarrator";
 import { FiSave } from 'react-icons/fi';
 import BackgroundMusic from "../../common/components/BackgroundMusic/BackgroundMusic";
 import { useAuth } from "../../common/contexts/AuthContext";
-import { GameService } from "../../common/services/GameService";
+import { SaveSession } from "../../common/services/SaveSession";
 import toast, { Toaster } from 'react-hot-toast';
 import { withRetry } from "../../common/utils/resilience";
 
 import { getAdventureType, AdventureGenre } from "../../common/resources/availableTypes";
 import { AudioGenerator } from "../../common/services/ai/AudioGenerator";
+import { withPersistentCache } from "../../common/services/ai/CachedAudioGenerator";
 import { useTheme } from "../../common/theme/ThemeContext";
 import Typewriter from "./components/Typewriter";
 import StreamErrorState from "./components/StreamErrorState";
 import { GameImage } from "./components/GameImage";
+import { mediaStore } from "../../common/services/MediaStore";
+import { perf } from "../../common/services/PerfTelemetry";
+import { ImageRef, imageLoader } from "../../common/services/ImageLoader";
+import { loadOptionPicks, rankOptions, recordOptionPick } from "../../common/services/SpeculativeTurns";
+import { whenIdle } from "../../common/utils/deferred";
 
 interface GameProps {
   userToken: string; // Gemini API Key
@@ -40,10 +46,11 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
   const [voicesLoaded, setVoicesLoaded] = useState(false);
   const [voices, setVoices] = useState<SpeechSynthesisVoice[]>([]);
 
-  // Cinematic State
-  const [cinematicSegments, setCinematicSegments] = useState<{ text: string; image?: string }[]>([]);
+  // Cinematic State (segment images are mediaStore object URLs; placeholders are tiny LQIP data URLs)
+  const [cinematicSegments, setCinematicSegments] = useState<{ text: string; image?: string; placeholder?: string }[]>([]);
   const [currentSegmentIndex, setCurrentSegmentIndex] = useState(0);
   const [currentImage, setCurrentImage] = useState<string | null>(null);
+  const [currentPlaceholder, setCurrentPlaceholder] = useState<string | null>(null);
   const [imageError, setImageError] = useState(false);
 
   // Text & Interaction State
@@ -69,9 +76,32 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
   const audioFile = getAdventureType(genreKey).music;
 
   // AI Infrastructure Refs
-  const cinematicSegmentsRef = useRef<{ text: string; image?: string }[]>([]);
+  const cinematicSegmentsRef = useRef<{ text: string; image?: string; placeholder?: string }[]>([]);
   useEffect(() => { cinematicSegmentsRef.current = cinematicSegments; }, [cinematicSegments]);
 
+  // Paragraphs of the current turn, handed to the TTS scheduler once the stream is done
+  const turnParagraphsRef = useRef<string[]>([]);
+
+  // Object URLs created for the current turn's images, revoked when the segments are replaced
+  const turnImageUrlsRef = useRef<string[]>([]);
+  // Cancels the current turn's by-reference image downloads
+  const turnImageAbortRef = useRef(new AbortController());
+  const cinematicContainerRef = useRef<HTMLDivElement | null>(null);
+  const releaseTurnImages = () => {
+    turnImageAbortRef.current.abort();
+    turnImageAbortRef.current = new AbortController();
+    turnImageUrlsRef.current.forEach(url => mediaStore.release(url));
+    turnImageUrlsRef.current = [];
+  };
+  useEffect(() => () => releaseTurnImages(), []);
+
+  // Tracks what the server already holds for this game so saves only send the difference
+  const saveSessionRef = useRef<SaveSession | null>(null);
+  if (!saveSessionRef.current) {
+    saveSessionRef.current = new SaveSession(savedGameState, config.saveCompression);
+    window.__afSave = saveSessionRef.current;
+  }
+
   const isAdvancingRef = useRef(false);
   const currentSentenceIndexRef = useRef(0);
 
@@ -110,7 +140,7 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
   useEffect(() => {
     const backendAudioGenerator: AudioGenerator = {
       shouldSplitText: false,
-      generate: async (text: string) => {
+      generate: async (text: string, signal?: AbortSignal) => {
         try {
           const headers: Record<string, string> = {
             'Content-Type': 'application/json',
@@ -126,7 +156,8 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
             const res = await fetch(`${config.apiUrl}/ai/audio`, {
               method: 'POST',
               headers,
-              body: JSON.stringify({ text, voice: selectedVoice?.name || 'alloy', genre: genreKey, lang: language })
+              body: JSON.stringify({ text, voice: selectedVoice?.name || 'alloy', genre: genreKey, lang: language }),
+              signal
             });
             if (!res.ok) throw new Error("Backend Audio Failed");
             return res;
@@ -143,11 +174,17 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
         return { audios: [] };
       }
     };
-    setAudioGenerator(backendAudioGenerator);
+    setAudioGenerator(withPersistentCache(backendAudioGenerator, {
+      voice: selectedVoice?.name || 'alloy',
+      lang: language,
+      genre: genreKey
+    }));
   }, [userToken, authToken, openaiKey, pollinationsToken, language, genreKey, selectedVoice]);
 
   // --- Hooks ---
-  const handleDurationSet = useCallback((ms: number) => { }, []);
+  // Length of the clip narrating the current sentence; the Typewriter paces its reveal to it
+  const [narrationMs, setNarrationMs] = useState<number | null>(null);
+  const handleDurationSet = useCallback((ms: number) => setNarrationMs(ms), []);
 
   const advanceSentence = async () => {
     if (isAdvancingRef.current) return;
@@ -176,12 +213,13 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
 
   const {
     audioData,
+    nextAudioData,
     isLoading: isLoadingAudio,
     visualText,
     prepareText,
-    prefetch,
+    scheduleTurn,
     start,
-    onAudioComplete,
+    playNextPart,
     cacheAudio
   } = useSmartAudio(
     userToken,
@@ -190,9 +228,11 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
     handleDurationSet,
     handleSequenceEnd,
     audioGenerator,
+    selectedVoice?.name || 'alloy',
+    config.ttsLookahead,
   );
 
-  const { startStream, isStreaming: isStreamProcessing, streamError } = useGameStream(userToken, authToken, pollinationsToken, openaiKey);
+  const { startStream, prefetchTurns, isStreaming: isStreamProcessing, streamError } = useGameStream(userToken, authToken, pollinationsToken, openaiKey);
 
   // --- Helper Functions ---
   function toggleOptions(show: boolean) {
@@ -205,6 +245,31 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
 
   // --- Core Game Logic ---
 
+  /** Prompt and history for picking option `choiceIndex` (1-based); speculative turns must build the exact same request. */
+  const buildChoice = (choiceIndex: number, options: string[], history: any[]) => {
+    const choiceText = options[choiceIndex - 1] || `Option ${choiceIndex}`;
+    const prompt = `I choose option ${choiceIndex}: ${choiceText}. What happens next?`;
+    return { prompt, history: [...history, { role: "user", parts: [{ text: prompt }] }] };
+  };
+
+  /** Generates the likeliest choices ahead while the player is idle. */
+  const prefetchChoices = () => {
+    const order = rankOptions(currentOptions.length, loadOptionPicks());
+    prefetchTurns(order.filter(i => !!currentOptions[i]).map(i => ({
+      ...buildChoice(i + 1, currentOptions, gameHistory),
+      voice: selectedVoice?.name || 'alloy',
+      genre: genreKey,
+      lang: language,
+      saveId: saveSessionRef.current?.id
+    })));
+  };
+
+  // Once a turn has finished streaming, the player reads for a while: use that time for the next turn
+  useEffect(() => {
+    if (isStreamProcessing || currentOptions.length === 0) return;
+    return whenIdle(() => prefetchChoices(), 3000);
+  }, [isStreamProcessing, currentOptions, gameHistory]);
+
   async function sendChoice(choiceIndex: number) {
     toggleOptions(false);
     // #130: Clear stale options immediately so buttons don't show previous turn's choices
@@ -214,14 +279,13 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
     setIsProcessing(true);
     setIsInitialTurnLoading(true);
     setCurrentImage(null);
+    setCurrentPlaceholder(null);
     setIsImageMissing(false);
     setImageError(false);
 
-    const choiceText = currentOptions[choiceIndex - 1] || `Option ${choiceIndex}`;
-    const prompt = `I choose option ${choiceIndex}: ${choiceText}. What happens next?`;
-
-    const currentHistory = [...gameHistory, { role: "user", parts: [{ text: prompt }] }];
+    const { prompt, history: currentHistory } = buildChoice(choiceIndex, currentOptions, gameHistory);
     setGameHistory(currentHistory);
+    recordOptionPick(choiceIndex - 1);
 
     await startStream(
       prompt,
@@ -230,7 +294,7 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
       genreKey,
       language,
       handleStreamEvent,
-      savedGameState?._id
+      saveSessionRef.current?.id
     );
   }
 
@@ -239,10 +303,8 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
   const playSentence = async (text: string, index: number) => {
     if (!text) return;
 
-    const nextText = sentences[index + 1];
-    if (nextText) prefetch(nextText);
-
     setTimeout(async () => {
+      setNarrationMs(null);
       setCurrentSentence(text);
       setOverlayVisible(true);
       await prepareText(text);
@@ -269,6 +331,7 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
     if (currentSegment) {
       const text = currentSegment.text;
       setImageError(false); // Reset error state for new segment
+      setCurrentPlaceholder(currentSegment.placeholder ?? null);
 
       // FIX #34: Decouple text display from image loading
       // Text should ALWAYS render, regardless of image status
@@ -282,8 +345,8 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
         lastProcessedTextRef.current = text;
 
         // Update image state (null if missing)
-        if (currentSegment.image) {
-          setCurrentImage(currentSegment.image);
+        if (currentSegment.image || currentSegment.placeholder) {
+          setCurrentImage(currentSegment.image ?? null);
           setIsImageMissing(false);
         } else {
           setCurrentImage(null);
@@ -295,7 +358,7 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
         }
 
         // ALWAYS process text, even without image
-        const newSentences = splitIntoSentences(text);
+        const newSentences = splitIntoSentences(text, language);
         setSentences(newSentences);
         currentSentenceIndexRef.current = 0;
 
@@ -315,6 +378,34 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
     if (savedGameState && savedGameState.currentOptions) toggleOptions(true);
   }, [savedGameState]);
 
+  // Resumed games show the last saved scene; the decoded image comes from the media cache when possible
+  useEffect(() => {
+    const savedImage = savedGameState?.currentImages?.filter(Boolean).pop();
+    if (!savedImage) return;
+    let cancelled = false;
+    saveSessionRef.current!.resolveImage(savedImage, token || '').then(({ url }) => {
+      if (mediaStore.owns(url)) turnImageUrlsRef.current.push(url);
+      if (!cancelled) setCurrentImage(url);
+    }).catch(e => console.warn("Could not restore saved image:", e));
+    return () => { cancelled = true; };
+  }, [savedGameState]);
+
+  // Loaded saves start with the latest turn; the older history pages follow in the background
+  useEffect(() => {
+    const session = saveSessionRef.current!;
+    if (!token || !session.hasEarlierHistory) return;
+    let cancelled = false;
+    (async () => {
+      const end = perf.span('save.history');
+      while (!cancelled && session.hasEarlierHistory) {
+        const older = await session.loadEarlierHistory(token);
+        setGameHistory(prev => [...older, ...prev]);
+      }
+      if (!cancelled) end();
+    })().catch(e => console.warn("Could not load earlier history:", e));
+    return () => { cancelled = true; };
+  }, [token]);
+
   useEffect(() => {
     if (genreKey) setTheme(genreKey as AdventureGenre);
   }, [genreKey, setTheme]);
@@ -332,6 +423,7 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
     setIsGameStarted(true);
     setIsInitialTurnLoading(true);
     setCurrentImage(null);
+    setCurrentPlaceholder(null);
     setIsImageMissing(false);
     setImageError(false);
     setGameHistory([]);
@@ -348,7 +440,7 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
       genreKey,
       language,
       handleStreamEvent,
-      savedGameState?._id
+      saveSessionRef.current?.id
     );
   }
 
@@ -371,14 +463,13 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
     if (!user || !token) return;
     const toastId = toast.loading("Saving...");
     try {
-      await GameService.saveGame({
+      await saveSessionRef.current!.save({
         userId: user.googleId,
         genreKey,
         gameHistory,
         gameContent,
         currentOptions,
-        currentImages: cinematicSegments.map(s => s.image || ""),
-        _id: savedGameState?._id
+        images: cinematicSegments.map(s => s.image || "")
       }, token);
       toast.success("Saved!", { id: toastId });
     } catch (e) { toast.error("Save failed", { id: toastId }); }
@@ -416,7 +507,7 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
             genreKey,
             language,
             handleStreamEvent,
-            savedGameState?._id
+            saveSessionRef.current?.id
         );
       } else {
         startGame();
@@ -424,9 +515,34 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
     }
   };
 
+  // By-reference images: the placeholder shows at once, the bytes are fetched at a width picked for this screen and connection
+  const showImageRef = (index: number, ref: ImageRef) => {
+    setCinematicSegments(prev => prev.map((segment, i) => i === index ? { ...segment, placeholder: ref.placeholder } : segment));
+    if (index === currentSegmentIndex) {
+      setCurrentPlaceholder(ref.placeholder ?? null);
+      setIsImageMissing(false);
+      if (index === 0) setIsInitialTurnLoading(false);
+    }
+    const signal = turnImageAbortRef.current.signal;
+    const box = cinematicContainerRef.current?.getBoundingClientRect();
+    imageLoader.load(ref, signal, box).then(({ url }) => {
+      if (signal.aborted) {
+        mediaStore.release(url);
+        return;
+      }
+      turnImageUrlsRef.current.push(url);
+      // The segment effect swaps it in when this segment is on screen
+      setCinematicSegments(prev => prev.map((segment, i) => i === index ? { ...segment, image: url } : segment));
+    }).catch(e => {
+      if (!signal.aborted) console.warn(`Could not load image for segment ${index}:`, e);
+    });
+  };
+
   const handleStreamEvent = (event: any) => {
     if (event.type === 'text_structure') {
       if (event.paragraphs) {
+        releaseTurnImages();
+        turnParagraphsRef.current = event.paragraphs;
         const newSegments = event.paragraphs.map((p: string) => ({ text: p, image: undefined }));
         setCinematicSegments(newSegments);
         setCurrentSegmentIndex(0);
@@ -450,16 +566,16 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
       }
     }
     else if (event.type === 'image') {
-      if (typeof event.index === 'number' && event.data) {
-        setCinematicSegments(prev => {
-          const copy = [...prev];
-          if (copy[event.index!]) copy[event.index!].image = event.data;
-          return copy;
-        });
-        const img = new Image();
-        img.src = event.data;
+      if (typeof event.index === 'number' && event.ref) {
+        showImageRef(event.index, event.ref);
+      }
+      else if (typeof event.index === 'number' && event.data) {
+        // Decode once into a Blob; state only keeps the short object URL
+        const { url } = mediaStore.putImage(event.data);
+        if (mediaStore.owns(url)) turnImageUrlsRef.current.push(url);
+        setCinematicSegments(prev => prev.map((segment, i) => i === event.index ? { ...segment, image: url } : segment));
         if (event.index === currentSegmentIndex) {
-          setCurrentImage(event.data);
+          setCurrentImage(url);
           setIsImageMissing(false);
           if (event.index === 0) setIsInitialTurnLoading(false);
         }
@@ -468,6 +584,10 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
     else if (event.type === 'audio') {
       if (event.text && event.data) cacheAudio(event.text, event.data);
     }
+    else if (event.type === 'done') {
+      // Streamed clips are cached by now; the scheduler synthesizes whatever is still missing
+      if (turnParagraphsRef.current.length > 0) scheduleTurn(turnParagraphsRef.current);
+    }
     else if (event.type === 'error') {
       const errorMsg = event.error || event.message || "An unknown stream error occurred";
       toast.error(`Stream Error: ${errorMsg}`);
@@ -479,7 +599,7 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
 
 
   return (
-    <div className={`game-container`}>
+    <div className={`game-container`} aria-busy={isInitialTurnLoading || isStreamProcessing}>
       <Toaster position="top-right" />
       <BackgroundMusic audioFile={audioFile} />
 
@@ -500,11 +620,14 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
               text={currentSentence}
               voice={selectedVoice}
               audioData={audioData}
+              nextAudioData={nextAudioData}
               isLoadingAudio={isLoadingAudio}
+              onComplete={playNextPart}
             />
           )}
 
           <div
+            ref={cinematicContainerRef}
             className="game-image-container fade-in"
             data-testid="game-cinematic-container"
             onClick={() => {
@@ -516,6 +639,7 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
           >
             <GameImage 
               src={currentImage} 
+              placeholder={currentPlaceholder}
               alt="Scene" 
               onRetry={() => {
                 // Image retry logic is handled inside GameImage
@@ -528,7 +652,7 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
                 <Typewriter 
                   text={currentSentence} 
                   isActive={overlayVisible} 
-                  duration={currentSentence.length * 40}
+                  duration={narrationMs ?? currentSentence.length * 40}
                 />
               </p>
               <div className="click-hint">{t('click_to_advance') || "Click to advance ▶"}</div>
@@ -550,13 +674,22 @@ const Game: React.FC<GameProps> = ({ userToken, authToken, openaiKey, gameType,
             ) : (
               <>
                 <p className="choose-instruction fade-in-delayed">{t("choose_option")}</p>
-                <button onClick={() => sendChoice(1)} disabled={!currentOptions[0]}>
+                <button
+                  onClick={() => sendChoice(1)}
+                  disabled={!currentOptions[0]}
+                >
                   {currentOptions[0] || t("choose_option")}
                 </button>
-                <button onClick={() => sendChoice(2)} disabled={!currentOptions[1]}>
+                <button
+                  onClick={() => sendChoice(2)}
+                  disabled={!currentOptions[1]}
+                >
                   {currentOptions[1] || t("choose_option")}
                 </button>
-                <button onClick={() => sendChoice(3)} disabled={!currentOptions[2]}>
+                <button
+                  onClick={() => sendChoice(3)}
+                  disabled={!currentOptions[2]}
+                >
                   {currentOptions[2] || t("choose_option")}
                 </button>
               </>
@@ -1,9 +1,12 @@
 import React, { useState, useEffect, useRef } from 'react';
+import { perf } from '../../../../common/services/PerfTelemetry';
 import './GameImage.css';
 
 interface GameImageProps {
   src: string | null;
   alt: string;
+  // Tiny preview (LQIP data URL) shown blurred while `src` is still being fetched
+  placeholder?: string | null;
   timeoutMs?: number;
   onRetry?: () => void;
 }
@@ -11,6 +14,7 @@ interface GameImageProps {
 export const GameImage: React.FC<GameImageProps> = ({
   src,
   alt,
+  placeholder,
   timeoutMs = 15000,
   onRetry
 }) => {
@@ -19,10 +23,13 @@ export const GameImage: React.FC<GameImageProps> = ({
   const [isVisible, setIsVisible] = useState(false);
   const timeoutRef = useRef<NodeJS.Timeout | null>(null);
   const imgRef = useRef<HTMLImageElement | null>(null);
+  // When the current src was set, for the load+decode time in window.__afPerf
+  const srcSetAtRef = useRef(0);
 
   useEffect(() => {
     // Reset states when src changes
     if (src) {
+      srcSetAtRef.current = performance.now();
       setIsLoading(true);
       setHasError(false);
       setIsVisible(false);
@@ -52,6 +59,10 @@ export const GameImage: React.FC<GameImageProps> = ({
     if (timeoutRef.current) {
       clearTimeout(timeoutRef.current);
     }
+    if (srcSetAtRef.current) {
+      perf.record('image.decode', srcSetAtRef.current, { width: imgRef.current?.naturalWidth ?? null });
+      srcSetAtRef.current = 0;
+    }
     setIsLoading(false);
     setHasError(false);
     // Trigger cross-fade transition
@@ -91,13 +102,26 @@ export const GameImage: React.FC<GameImageProps> = ({
     }
   };
 
-  if (!src) {
+  if (!src && !placeholder) {
     return null;
   }
 
+  // The placeholder stays underneath, so the full image fades in over it rather than over a blank frame
+  const showPlaceholder = !!placeholder && !hasError;
+
   return (
     <div className="game-image-container">
-      {isLoading && !hasError && (
+      {showPlaceholder && (
+        <img
+          src={placeholder!}
+          alt=""
+          aria-hidden="true"
+          className="game-image-placeholder"
+          data-testid="game-image-placeholder"
+        />
+      )}
+
+      {isLoading && !hasError && !placeholder && (
         <div className="game-image-loading">
           <div className="loading-spinner"></div>
           <p className="loading-text">Visualizing scene...</p>
@@ -117,7 +141,7 @@ export const GameImage: React.FC<GameImageProps> = ({
         </div>
       )}
 
-      <img
+      {src && <img
         ref={imgRef}
         src={src}
         alt={alt}
@@ -125,7 +149,7 @@ export const GameImage: React.FC<GameImageProps> = ({
         onLoad={handleImageLoad}
         onError={handleImageError}
         style={{ display: isLoading || hasError ? 'none' : 'block' }}
-      />
+      />}
     </div>
   );
 };
@@ -1,13 +1,132 @@
 import React, { useState, useEffect, useRef } from 'react';
+import { config } from '../../../common/config/config';
+import { narrationClock, NarrationClock, TypingPacer } from '../../../common/services/NarrationClock';
+import { perf } from '../../../common/services/PerfTelemetry';
+
+export type TypewriterMode = 'frame' | 'interval';
 
 interface TypewriterProps {
     text: string;
     duration?: number; // Total duration in ms
     isActive: boolean; // Only animate if active
     onComplete?: () => void;
+    mode?: TypewriterMode;
+    clock?: NarrationClock;
 }
 
-const Typewriter: React.FC<TypewriterProps> = ({ text, duration = 3000, isActive, onComplete }) => {
+// Audit scripts compare renderers by setting this key before the app loads
+const storedMode = (): TypewriterMode | null => {
+    try {
+        const mode = localStorage.getItem('adventure_forge_typewriter_mode');
+        return mode === 'frame' || mode === 'interval' ? mode : null;
+    } catch (e) {
+        return null;
+    }
+};
+
+const defaultMode: TypewriterMode = storedMode() || config.typewriterMode;
+
+// A gap this long between animation frames means at least one 60 Hz frame was skipped
+const DROPPED_FRAME_MS = 1000 / 60 * 1.5;
+
+/**
+ * Reveals text on requestAnimationFrame, several characters per frame, paced
+ * by the narration clock (see TypingPacer). Characters are appended to a text
+ * node directly, so React renders once per text instead of once per character.
+ */
+const FrameTypewriter: React.FC<TypewriterProps> = ({ text, duration = 3000, isActive, onComplete, clock = narrationClock }) => {
+    const spanRef = useRef<HTMLSpanElement>(null);
+    const nodeRef = useRef<Text | null>(null);
+    const shownRef = useRef('');
+    const durationRef = useRef(duration);
+    const pacerRef = useRef<TypingPacer | null>(null);
+    const onCompleteRef = useRef(onComplete);
+    const completedRef = useRef(false);
+
+    useEffect(() => { onCompleteRef.current = onComplete; }, [onComplete]);
+
+    // A new duration (e.g. the measured clip length arriving) rescales the running reveal
+    useEffect(() => {
+        durationRef.current = duration;
+        if (pacerRef.current) pacerRef.current.durationMs = duration;
+    }, [duration]);
+
+    useEffect(() => {
+        const span = spanRef.current;
+        if (!span) return;
+        if (!nodeRef.current) {
+            nodeRef.current = document.createTextNode('');
+            span.appendChild(nodeRef.current);
+        }
+        const node = nodeRef.current;
+
+        const show = (chars: number) => {
+            if (chars === shownRef.current.length) return;
+            if (chars > shownRef.current.length) node.appendData(text.substring(shownRef.current.length, chars));
+            else node.data = text.substring(0, chars);
+            shownRef.current = text.substring(0, chars);
+            span.dataset.done = String(chars === text.length);
+        };
+
+        const complete = () => {
+            if (completedRef.current) return;
+            completedRef.current = true;
+            onCompleteRef.current && onCompleteRef.current();
+        };
+
+        // A continuation of what is on screen only types the new part
+        const isExtension = shownRef.current.length > 0 && text.startsWith(shownRef.current);
+        if (!isExtension) show(0);
+
+        if (!isActive || shownRef.current === text) {
+            show(text.length);
+            pacerRef.current = null;
+            complete();
+            return;
+        }
+
+        completedRef.current = false;
+        const pacer = new TypingPacer(clock, shownRef.current.length, text.length, durationRef.current, performance.now());
+        pacerRef.current = pacer;
+        let frame = 0;
+        // Frame pacing of this reveal, reported to window.__afPerf when it ends
+        const frames = { count: 0, dropped: 0, worstMs: 0, last: 0, start: performance.now(), reported: false };
+        const report = () => {
+            if (frames.reported || frames.count === 0) return;
+            frames.reported = true;
+            perf.record('typewriter.reveal', frames.start, {
+                chars: text.length, frames: frames.count, dropped: frames.dropped, worstMs: Math.round(frames.worstMs),
+            });
+        };
+        const step = (now: number) => {
+            if (frames.last) {
+                const gap = now - frames.last;
+                if (gap > DROPPED_FRAME_MS) frames.dropped++;
+                frames.worstMs = Math.max(frames.worstMs, gap);
+            }
+            frames.last = now;
+            frames.count++;
+            show(pacer.frame(now));
+            if (shownRef.current.length >= text.length) {
+                pacerRef.current = null;
+                report();
+                complete();
+                return;
+            }
+            frame = requestAnimationFrame(step);
+        };
+        frame = requestAnimationFrame(step);
+        return () => {
+            cancelAnimationFrame(frame);
+            report();
+        };
+    }, [text, isActive, clock]);
+
+    return <span ref={spanRef} data-testid="typewriter" data-done="false" />;
+};
+
+/** Previous renderer: one state update per character on a timer. Kept for comparison audits. */
+const IntervalTypewriter: React.FC<TypewriterProps> = ({ text, duration = 3000, isActive, onComplete }) => {
     const [displayedText, setDisplayedText] = useState('');
     const completedRef = useRef(false);
 
@@ -80,8 +199,11 @@ const Typewriter: React.FC<TypewriterProps> = ({ text, duration = 3000, isActive
     }, [text, duration, isActive, onComplete]);
 
     return (
-        <span>{displayedText}</span>
+        <span data-testid="typewriter" data-done={String(displayedText === text)}>{displayedText}</span>
     );
 };
 
+const Typewriter: React.FC<TypewriterProps> = ({ mode = defaultMode, ...props }) =>
+    mode === 'interval' ? <IntervalTypewriter {...props} /> : <FrameTypewriter {...props} />;
+
 export default Typewriter;
@@ -1,11 +1,17 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import { GameService, GameSaveDTO } from '../../common/services/GameService';
+import { useVirtualList } from '../../common/utils/virtualList';
 import { useAuth } from '../../common/contexts/AuthContext';
 import { useTranslation } from '../../common/language/LanguageContext';
 import { ADVENTURE_TYPES } from '../../common/resources/availableTypes';
 import { FiTrash2, FiPlay, FiX } from 'react-icons/fi';
 import './LoadGameModal.css';
 
+// Must match .save-item height + margin in LoadGameModal.css
+const ROW_HEIGHT = 94;
+// Fetch the next page when the window gets this close to the last loaded save
+const PREFETCH_ROWS = 10;
+
 interface LoadGameModalProps {
     onClose: () => void;
     onLoadGame: (saveId: string, genreKey: string) => void;
@@ -15,27 +21,52 @@ const LoadGameModal: React.FC<LoadGameModalProps> = ({ onClose, onLoadGame }) =>
     const { user, token } = useAuth();
     const { t } = useTranslation();
     const [saves, setSaves] = useState<GameSaveDTO[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [isLoading, setIsLoading] = useState(true);
+    const fetchingRef = useRef(false);
+    const { ref: listRef, onScroll, range } = useVirtualList(saves.length, ROW_HEIGHT);
 
     useEffect(() => {
         loadSaves();
         // eslint-disable-next-line react-hooks/exhaustive-deps
     }, [user]);
 
+    // Pages arrive as the window approaches the end of what is loaded, not up front
+    useEffect(() => {
+        if (nextCursor && range.end >= saves.length - PREFETCH_ROWS) loadMore();
+        // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, [range.end, saves.length, nextCursor]);
+
     const loadSaves = async () => {
         if (!user?.googleId || !token) return;
         setIsLoading(true);
-        const list = await GameService.listGames(token);
-        setSaves(list);
+        const page = await GameService.listGames(token);
+        setSaves(page.items);
+        setNextCursor(page.nextCursor);
         setIsLoading(false);
     };
 
+    const loadMore = async () => {
+        if (!token || !nextCursor || fetchingRef.current) return;
+        fetchingRef.current = true;
+        try {
+            const page = await GameService.listGames(token, nextCursor);
+            setSaves(prev => prev.concat(page.items));
+            setNextCursor(page.nextCursor);
+        } catch (e) {
+            console.warn("Could not load more saves:", e);
+        } finally {
+            fetchingRef.current = false;
+        }
+    };
+
     const handleDelete = async (saveId: string, e: React.MouseEvent) => {
         e.stopPropagation();
         if (!user?.googleId || !token) return;
         if (window.confirm("Are you sure you want to delete this save?")) {
             await GameService.deleteGame(token, saveId);
-            loadSaves(); // Reload list
+            // Drop it locally: reloading would walk every page again
+            setSaves(prev => prev.filter(save => save._id !== saveId));
         }
     };
 
@@ -52,29 +83,37 @@ const LoadGameModal: React.FC<LoadGameModalProps> = ({ onClose, onLoadGame }) =>
                 ) : saves.length === 0 ? (
                     <p className="no-saves">No saved games found.</p>
                 ) : (
-                    <div className="saves-list">
-                        {saves.map(save => {
-                            const genre = ADVENTURE_TYPES.find(g => g.id === save.genreKey);
-                            return (
-                                <div key={save._id} className="save-item" onClick={() => onLoadGame(save._id, save.genreKey)}>
-                                    <div className="save-icon">
-                                        <img src={genre?.icon || "https://img.icons8.com/dusk/64/question-mark.png"} alt={save.genreKey} />
-                                    </div>
-                                    <div className="save-details">
-                                        <span className="save-genre">{t('genre_' + save.genreKey) || save.genreKey}</span>
-                                        <span className="save-date">{new Date(save.updatedAt).toLocaleString()}</span>
-                                    </div>
-                                    <div className="save-actions">
-                                        <button className="action-btn play" onClick={() => onLoadGame(save._id, save.genreKey)}>
-                                            <FiPlay />
-                                        </button>
-                                        <button className="action-btn delete" onClick={(e) => handleDelete(save._id, e)}>
-                                            <FiTrash2 />
-                                        </button>
-                                    </div>
-                                </div>
-                            );
-                        })}
+                    <div className="saves-list" ref={listRef} onScroll={onScroll} data-testid="saves-list">
+                        <div className="saves-list-spacer" style={{ height: range.totalHeight }}>
+                            <div className="saves-list-window" style={{ transform: `translateY(${range.offsetTop}px)` }}>
+                                {saves.slice(range.start, range.end).map(save => {
+                                    const genre = ADVENTURE_TYPES.find(g => g.id === save.genreKey);
+                                    return (
+                                        <div key={save._id} className="save-item" data-testid="save-item" onClick={() => onLoadGame(save._id, save.genreKey)}>
+                                            <div className="save-icon">
+                                                <img src={save.thumbnail || genre?.icon || "https://img.icons8.com/dusk/64/question-mark.png"} alt={save.genreKey} loading="lazy" decoding="async" />
+                                            </div>
+                                            <div className="save-details">
+                                                <span className="save-genre">{t('genre_' + save.genreKey) || save.genreKey}</span>
+                                                {save.summary && <span className="save-summary">{save.summary}</span>}
+                                                <span className="save-date">
+                                                    {new Date(save.updatedAt).toLocaleString()}
+                                                    {save.turns ? ` · ${save.turns} turns` : ''}
+                                                </span>
+                                            </div>
+                                            <div className="save-actions">
+                                                <button className="action-btn play" onClick={() => onLoadGame(save._id, save.genreKey)}>
+                                                    <FiPlay />
+                                                </button>
+                                                <button className="action-btn delete" onClick={(e) => handleDelete(save._id, e)}>
+                                                    <FiTrash2 />
+                                                </button>
+                                            </div>
+                                        </div>
+                                    );
+                                })}
+                            </div>
+                        </div>
                     </div>
                 )}
             </div>
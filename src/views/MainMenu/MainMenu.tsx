@@ -2,11 +2,14 @@ import React, { useEffect, useState } from 'react';
 import { useAuth } from '../../common/contexts/AuthContext';
 import { useNavigation } from '../../common/contexts/NavigationContext';
 import { GameService } from '../../common/services/GameService';
+import { LATEST_TURN_HISTORY } from '../../common/services/SaveSession';
+import { perf } from '../../common/services/PerfTelemetry';
 import { useTranslation } from '../../common/language/LanguageContext';
 import './MainMenu.css';
 import { ADVENTURE_TYPES, AdventureGenre } from '../../common/resources/availableTypes';
 import { useTheme } from '../../common/theme/ThemeContext';
 import LoadGameModal from './LoadGameModal';
+import { onServiceWorkerMessage } from '../../common/utils/serviceWorker';
 
 const MainMenu: React.FC = () => {
     const { user, token } = useAuth();
@@ -20,6 +23,8 @@ const MainMenu: React.FC = () => {
     useEffect(() => {
         if (user?.googleId) {
             checkSave();
+            // The list above may come from the service worker's cache; re-check when its refresh differs
+            return onServiceWorkerMessage('af-sw:game-list-updated', checkSave);
         }
     }, [user]);
 
@@ -27,7 +32,7 @@ const MainMenu: React.FC = () => {
         if (!user || !token) return;
         setIsLoading(true);
         // We just check if there are ANY games to show the button
-        const saves = await GameService.listGames(token);
+        const saves = (await GameService.listGames(token, null, 1)).items;
         if (saves && saves.length > 0) {
             setHasSave(true);
             // Optionally set theme from the latest save?
@@ -48,7 +53,9 @@ const MainMenu: React.FC = () => {
     const onSelectLoadGame = async (saveId: string, genreKey: string) => {
         if (!user || !token) return;
         setIsLoading(true);
-        const save = await GameService.loadGame(token, saveId);
+        // Phase one: the latest turn with images as media references. The game
+        // renders it right away and pages in older history and images after.
+        const save = await perf.measure('save.load', GameService.loadGame(token, saveId, LATEST_TURN_HISTORY, true));
         if (save) {
             setSavedGameState(save);
             // Ensure theme is set for game as well (though Game.tsx does it too)
@@ -0,0 +1,33 @@
+import React from "react";
+import { GoogleOAuthProvider, GoogleLogin } from '@react-oauth/google';
+import { useAuth } from "../../common/contexts/AuthContext";
+
+const GOOGLE_CLIENT_ID = process.env.REACT_APP_GOOGLE_CLIENT_ID || "YOUR_CLIENT_ID_HERE";
+
+/**
+ * Google sign-in button. Lives in its own chunk with the OAuth provider, so
+ * the Google Identity script is only requested once the main menu is usable.
+ */
+const GoogleSignIn = (): React.ReactElement => {
+    const { login } = useAuth();
+
+    return (
+        <GoogleOAuthProvider clientId={GOOGLE_CLIENT_ID}>
+            <GoogleLogin
+                onSuccess={credentialResponse => {
+                    if (credentialResponse.credential) {
+                        login(credentialResponse.credential);
+                    }
+                }}
+                onError={() => {
+                    console.log('Login Failed');
+                }}
+                useOneTap
+                theme="filled_black"
+                shape="pill"
+            />
+        </GoogleOAuthProvider>
+    );
+};
+
+export default GoogleSignIn;
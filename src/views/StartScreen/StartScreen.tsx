@@ -1,23 +1,25 @@
-import React from "react";
-import Game from "../Game/Game";
+import React, { Suspense, useEffect, useState } from "react";
 import { useTranslation } from "../../common/language/LanguageContext";
 import "./StartScreen.css";
 
 import { ADVENTURE_TYPES } from "../../common/resources/availableTypes";
 import { NavigationProvider, useNavigation } from "../../common/contexts/NavigationContext";
-import AdventureSelectionScreen from "../AdventureSelection/AdventureSelectionScreen";
 import MainMenu from "../MainMenu/MainMenu";
 
 
 import { SettingsProvider, useSettings } from "../../common/contexts/SettingsContext";
-import SettingsModal from "../../common/components/modals/SettingsModal/SettingsModal";
 import { IoSettingsSharp } from "react-icons/io5";
 
-import { GoogleLogin } from '@react-oauth/google';
 import { useAuth } from "../../common/contexts/AuthContext";
-import { motion, AnimatePresence } from "framer-motion";
+import { LazyMotion, m, AnimatePresence } from "framer-motion";
+import { lazyWithPreload, whenIdle } from "../../common/utils/deferred";
 
-// ... previous imports
+// Only the main menu is in the entry bundle; every other screen is its own chunk
+const AdventureSelectionScreen = lazyWithPreload(() => import(/* webpackChunkName: "adventure-selection" */ "../AdventureSelection/AdventureSelectionScreen"));
+const Game = lazyWithPreload(() => import(/* webpackChunkName: "game" */ "../Game/Game"));
+const SettingsModal = lazyWithPreload(() => import(/* webpackChunkName: "settings" */ "../../common/components/modals/SettingsModal/SettingsModal"));
+const GoogleSignIn = React.lazy(() => import(/* webpackChunkName: "google-sign-in" */ "./GoogleSignIn"));
+const loadMotionFeatures = () => import(/* webpackChunkName: "motion-features" */ "./motionFeatures").then(module => module.default);
 
 const StartScreen = (): React.ReactElement => {
     return (
@@ -31,10 +33,26 @@ const StartScreen = (): React.ReactElement => {
 
 const StartScreenContent = (): React.ReactElement => {
     const { currentScreen, userToken, openaiKey, selectedGenreIndex, gameKey } = useNavigation();
-    const { setShowSettings } = useSettings();
+    const { showSettings, setShowSettings } = useSettings();
     const { t } = useTranslation();
-    const { login, user, token, logout } = useAuth();
+    const { user, token, logout } = useAuth();
     const selectedGenre = ADVENTURE_TYPES[selectedGenreIndex];
+    // The sign-in button (and Google's script) waits until the menu has rendered and the browser is idle
+    const [showSignIn, setShowSignIn] = useState(false);
+
+    useEffect(() => whenIdle(() => setShowSignIn(true)), []);
+
+    // Warm the next screen's chunk while the player is still on the current one
+    useEffect(() => {
+        if (currentScreen === 'main_menu') {
+            return whenIdle(() => {
+                AdventureSelectionScreen.preload().catch(() => undefined);
+                // Genre icons are large; fetch only the one the selection screen opens on
+                new Image().src = selectedGenre.icon;
+            }, 4000);
+        }
+        if (currentScreen === 'selection') return whenIdle(() => { Game.preload().catch(() => undefined); });
+    }, [currentScreen]);
 
     return (
         <div className="App">
@@ -46,24 +64,16 @@ const StartScreenContent = (): React.ReactElement => {
                         <span>{user.firstName}</span>
                         <button onClick={logout} style={{ background: 'transparent', border: '1px solid white', color: 'white', padding: '5px', cursor: 'pointer' }}>Logout</button>
                     </div>
-                ) : (
-                    <GoogleLogin
-                        onSuccess={credentialResponse => {
-                            if (credentialResponse.credential) {
-                                login(credentialResponse.credential);
-                            }
-                        }}
-                        onError={() => {
-                            console.log('Login Failed');
-                        }}
-                        useOneTap
-                        theme="filled_black"
-                        shape="pill"
-                    />
+                ) : showSignIn && (
+                    <Suspense fallback={null}>
+                        <GoogleSignIn />
+                    </Suspense>
                 )}
                 <button
                     className="settings-trigger-btn"
                     onClick={() => setShowSettings(true)}
+                    onPointerEnter={() => { SettingsModal.preload().catch(() => undefined); }}
+                    onFocus={() => { SettingsModal.preload().catch(() => undefined); }}
                     title={t('settings') || "Settings"}
                     style={{ position: 'static' }}
                     data-testid="settings-open-btn"
@@ -72,42 +82,55 @@ const StartScreenContent = (): React.ReactElement => {
                 </button>
             </div>
 
-            <SettingsModal />
+            {showSettings && (
+                <Suspense fallback={null}>
+                    <SettingsModal />
+                </Suspense>
+            )}
 
-            <AnimatePresence mode="wait">
-                {currentScreen !== 'game' ? (
-                    <motion.div 
-                        key="start-screen"
-                        initial={{ opacity: 0, y: 20 }}
-                        animate={{ opacity: 1, y: 0 }}
-                        exit={{ opacity: 0, y: -20 }}
-                        transition={{ duration: 0.5, ease: "easeInOut" }}
-                        className="start-screen-container"
-                    >
-                        <div id="welcome-message">{t("welcome")}</div>
-                        {currentScreen === 'main_menu' && <MainMenu />}
-                        {currentScreen === 'selection' && <AdventureSelectionScreen />}
-                    </motion.div>
-                ) : (
-                    <motion.div
-                        key="game-screen"
-                        initial={{ opacity: 0 }}
-                        animate={{ opacity: 1 }}
-                        exit={{ opacity: 0 }}
-                        transition={{ duration: 0.8 }}
-                        style={{ width: '100%', height: '100%' }}
-                    >
-                        <Game
-                            key={gameKey} // Force remount on reset
-                            userToken={userToken}
-                            authToken={token}
-                            openaiKey={openaiKey}
-                            gameType={t(selectedGenre.id)}
-                            genreKey={selectedGenre.id}
-                        />
-                    </motion.div>
-                )}
-            </AnimatePresence>
+            <LazyMotion features={loadMotionFeatures} strict>
+                {/* No entrance animation on first paint: the menu must not wait for the motion features chunk */}
+                <AnimatePresence mode="wait" initial={false}>
+                    {currentScreen !== 'game' ? (
+                        <m.div 
+                            key="start-screen"
+                            initial={{ opacity: 0, y: 20 }}
+                            animate={{ opacity: 1, y: 0 }}
+                            exit={{ opacity: 0, y: -20 }}
+                            transition={{ duration: 0.5, ease: "easeInOut" }}
+                            className="start-screen-container"
+                        >
+                            <div id="welcome-message">{t("welcome")}</div>
+                            {currentScreen === 'main_menu' && <MainMenu />}
+                            {currentScreen === 'selection' && (
+                                <Suspense fallback={null}>
+                                    <AdventureSelectionScreen />
+                                </Suspense>
+                            )}
+                        </m.div>
+                    ) : (
+                        <m.div
+                            key="game-screen"
+                            initial={{ opacity: 0 }}
+                            animate={{ opacity: 1 }}
+                            exit={{ opacity: 0 }}
+                            transition={{ duration: 0.8 }}
+                            style={{ width: '100%', height: '100%' }}
+                        >
+                            <Suspense fallback={<div className="spinner"><p>{t('game_loading') || "Forging your destiny..."}</p></div>}>
+                                <Game
+                                    key={gameKey} // Force remount on reset
+                                    userToken={userToken}
+                                    authToken={token}
+                                    openaiKey={openaiKey}
+                                    gameType={t(selectedGenre.id)}
+                                    genreKey={selectedGenre.id}
+                                />
+                            </Suspense>
+                        </m.div>
+                    )}
+                </AnimatePresence>
+            </LazyMotion>
         </div>
     );
 };
@@ -0,0 +1,4 @@
+// Animation features for LazyMotion, split into their own chunk (loaded after the first render)
+import { domAnimation } from "framer-motion";
+
+export default domAnimation;
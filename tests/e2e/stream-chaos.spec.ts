@@ -0,0 +1,71 @@
+import { test, expect, Page } from '@playwright/test';
+
+// Runs against the stand-in API only (playwright.standin.config.ts): it needs
+// /__standin/profile to inject dropped connections and /__standin/stats to
+// count how many turns the server actually generated.
+// Run with: npx playwright test --config playwright.standin.config.ts stream-chaos.spec.ts
+const STANDIN_URL = `http://localhost:${process.env.STANDIN_PORT || '3001'}`;
+const TURNS = 3;
+
+const standinStats = async (page: Page) => (await page.request.get(`${STANDIN_URL}/__standin/stats`)).json();
+
+const setDropRate = (page: Page, dropConnection: number) =>
+    page.request.post(`${STANDIN_URL}/__standin/profile`, { data: { errors: { drop_connection: dropConnection } } });
+
+const advanceToOptions = async (page: Page) => {
+    const container = page.getByTestId('game-cinematic-container');
+    const options = page.getByTestId('game-options-container');
+    await expect(container).toBeVisible({ timeout: 60000 });
+    for (let i = 0; i < 20 && !(await options.isVisible()); i++) {
+        const errorToast = page.locator('.hot-toast-error');
+        if (await errorToast.isVisible()) {
+            throw new Error(`Turn failed with toast error: ${await errorToast.textContent()}`);
+        }
+        const clickHint = page.locator('.cinematic-text-overlay.visible .click-hint');
+        try {
+            await clickHint.waitFor({ state: 'visible', timeout: 10000 });
+            await container.click();
+        } catch (e) {
+            await page.waitForTimeout(1000);
+        }
+    }
+    await expect(options).toBeVisible({ timeout: 30000 });
+    return options;
+};
+
+test.describe('Resumable turn stream', () => {
+    test.beforeEach(async ({ page }) => {
+        const reachable = await page.request.get(`${STANDIN_URL}/`).then(r => r.ok(), () => false);
+        test.skip(!reachable, 'Needs the stand-in API (playwright.standin.config.ts)');
+    });
+
+    test.afterEach(async ({ page }) => {
+        await setDropRate(page, 0);
+    });
+
+    test('turns survive dropped connections without being generated twice', async ({ page }) => {
+        test.setTimeout(300000);
+        // Most connections are cut at a random byte offset somewhere inside the turn
+        await setDropRate(page, 0.8);
+        const before = await standinStats(page);
+
+        await page.goto('/');
+        await page.getByTestId('new-adventure-btn').click();
+        await page.getByTestId('start-adventure-btn').click();
+
+        for (let turn = 1; turn <= TURNS; turn++) {
+            const options = await advanceToOptions(page);
+            await expect(options.locator('button')).not.toHaveCount(0);
+            if (turn < TURNS) {
+                await options.locator('button').first().click();
+                await expect(options).not.toBeVisible();
+            }
+        }
+
+        const after = await standinStats(page);
+        // Every turn was generated exactly once; drops were resumed from the last event id
+        expect(after.turns_generated - before.turns_generated).toBe(TURNS);
+        expect(after.drops_injected - before.drops_injected).toBeGreaterThan(0);
+        expect(after.resumed_streams - before.resumed_streams).toBe(after.drops_injected - before.drops_injected);
+    });
+});
@@ -1,11 +1,15 @@
 from playwright.sync_api import sync_playwright
-import time
+
+from audit.readiness import Readiness, install_stream_probe
 
 def run_audit():
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         # iPhone 12/13/14 Pro viewport
-        page = browser.new_page(viewport={'width': 390, 'height': 844})
+        context = browser.new_context(viewport={'width': 390, 'height': 844})
+        install_stream_probe(context)
+        page = context.new_page()
+        ready = Readiness(page)
         try:
             print("Navigating to app...")
             page.goto('http://localhost:3000')
@@ -51,14 +55,15 @@ def run_audit():
             # Test carousel rotation
             print("Rotating carousel...")
             page.click('.carousel-nav.next')
-            time.sleep(1) # wait for transition
+            ready.animations_settled("carousel rotation")
             page.screenshot(path='ux_audit_mobile_selection_rotated.png')
             
             # 3. Game Screen Initial Load (Quick check)
             print("Starting game...")
             page.click('[data-testid="start-adventure-btn"]')
-            # Give it some time to start generating
-            time.sleep(8)
+            # Wait until generation has actually started rendering
+            ready.stream_event("text_structure")
+            ready.cinematic()
             page.screenshot(path='ux_audit_mobile_game_start.png')
             print("Game Start screenshot saved.")
             
@@ -67,6 +72,7 @@ def run_audit():
             page.screenshot(path='ux_audit_error.png')
             print(f"Page Content on error: {page.content()[:1000]}")
         finally:
+            print(f"Readiness waits: {ready.log.summary()['total_wait_ms']:.0f}ms total")
             browser.close()
 
 if __name__ == "__main__":